@@ -0,0 +1,28 @@
+"""add posts timestamp id index
+
+Revision ID: 8c1f4e2a9b10
+Revises: 357f992bc737
+Create Date: 2026-10-19 09:12:40.118231
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f4e2a9b10'
+down_revision: Union[str, None] = '357f992bc737'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_posts_timestamp_id', 'posts', ['timestamp', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_timestamp_id', table_name='posts')
@@ -0,0 +1,40 @@
+"""add tagging cache table
+
+Revision ID: a3d94e7f2c18
+Revises: f5c8b3a61e07
+Create Date: 2026-10-19 18:05:13.402911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d94e7f2c18'
+down_revision: Union[str, None] = 'f5c8b3a61e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'tagging_cache',
+        sa.Column('key', sa.String(length=64), primary_key=True),
+        sa.Column('prompt_version', sa.String(length=16), nullable=False),
+        sa.Column('model', sa.String(), nullable=False),
+        sa.Column('tags', sa.Text(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('hits', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_tagging_cache_prompt_version', 'tagging_cache', ['prompt_version'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tagging_cache_prompt_version', table_name='tagging_cache')
+    op.drop_table('tagging_cache')
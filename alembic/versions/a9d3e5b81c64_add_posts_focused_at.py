@@ -0,0 +1,28 @@
+"""add posts.focused_at
+
+Revision ID: a9d3e5b81c64
+Revises: e8b1c4f07a26
+Create Date: 2026-10-19 22:02:41.730215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3e5b81c64'
+down_revision: Union[str, None] = 'e8b1c4f07a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('focused_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'focused_at')
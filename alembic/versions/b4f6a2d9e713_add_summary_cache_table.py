@@ -0,0 +1,40 @@
+"""add summary_cache table
+
+Revision ID: b4f6a2d9e713
+Revises: a9d3e5b81c64
+Create Date: 2026-10-19 22:48:10.518392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f6a2d9e713'
+down_revision: Union[str, None] = 'a9d3e5b81c64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'summary_cache',
+        sa.Column('key', sa.String(length=64), primary_key=True),
+        sa.Column('prompt_version', sa.String(length=16), nullable=False),
+        sa.Column('model', sa.String(), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('post_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('hits', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_summary_cache_prompt_version', 'summary_cache', ['prompt_version'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_summary_cache_prompt_version', table_name='summary_cache')
+    op.drop_table('summary_cache')
@@ -0,0 +1,45 @@
+"""add post archive table
+
+Revision ID: b7e2d91c4f35
+Revises: 8c1f4e2a9b10
+Create Date: 2026-10-19 14:03:27.504118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import zlib
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d91c4f35'
+down_revision: Union[str, None] = '8c1f4e2a9b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('archived_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_table(
+        'post_archive',
+        sa.Column('post_id', sa.Integer(), sa.ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('content', sa.LargeBinary(), nullable=False),
+        sa.Column('original_size', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Put archived bodies back into posts before the archive table goes away
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT post_id, content FROM post_archive")).fetchall()
+    for post_id, data in rows:
+        bind.execute(
+            sa.text("UPDATE posts SET content = :content WHERE id = :id"),
+            {"content": zlib.decompress(data).decode("utf-8"), "id": post_id},
+        )
+    op.drop_table('post_archive')
+    op.drop_column('posts', 'archived_at')
@@ -0,0 +1,30 @@
+"""add posts.tagged_by
+
+Revision ID: c6e0b2d74a91
+Revises: a3d94e7f2c18
+Create Date: 2026-10-19 19:12:40.551203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e0b2d74a91'
+down_revision: Union[str, None] = 'a3d94e7f2c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('tagged_by', sa.String(), nullable=True))
+    # Everything tagged so far came from the LLM
+    op.execute("UPDATE posts SET tagged_by = 'llm' WHERE tag_status = 'tagged'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'tagged_by')
@@ -0,0 +1,28 @@
+"""add jobs.progress
+
+Revision ID: c7e2d4a6f915
+Revises: b4f6a2d9e713
+Create Date: 2026-10-19 23:41:08.512377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2d4a6f915'
+down_revision: Union[str, None] = 'b4f6a2d9e713'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('progress', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('jobs', 'progress')
@@ -0,0 +1,29 @@
+"""add posts.entities
+
+Revision ID: d2f7a9c35e48
+Revises: c6e0b2d74a91
+Create Date: 2026-10-19 20:03:27.918644
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f7a9c35e48'
+down_revision: Union[str, None] = 'c6e0b2d74a91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled for existing posts by `python -m backend.app.run_entity_tagger`
+    op.add_column('posts', sa.Column('entities', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'entities')
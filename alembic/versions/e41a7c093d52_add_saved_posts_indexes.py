@@ -0,0 +1,30 @@
+"""add saved posts indexes
+
+Revision ID: e41a7c093d52
+Revises: b7e2d91c4f35
+Create Date: 2026-10-19 15:21:08.730194
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41a7c093d52'
+down_revision: Union[str, None] = 'b7e2d91c4f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_saved_posts_post_id', 'saved_posts', ['post_id'], unique=False)
+    op.create_index('ix_saved_posts_saved_at_id', 'saved_posts', ['saved_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_saved_posts_saved_at_id', table_name='saved_posts')
+    op.drop_index('ix_saved_posts_post_id', table_name='saved_posts')
@@ -0,0 +1,54 @@
+"""add jobs table
+
+Revision ID: e8b1c4f07a26
+Revises: d2f7a9c35e48
+Create Date: 2026-10-19 21:14:05.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b1c4f07a26'
+down_revision: Union[str, None] = 'd2f7a9c35e48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='5'),
+        sa.Column('run_at', sa.DateTime(), nullable=False),
+        sa.Column('lease_owner', sa.String(), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('dedupe_key', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_jobs_id', 'jobs', ['id'])
+    op.create_index('ix_jobs_kind', 'jobs', ['kind'])
+    op.create_index('ix_jobs_dedupe_key', 'jobs', ['dedupe_key'])
+    op.create_index('ix_jobs_ready', 'jobs', ['status', 'priority', 'run_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_ready', table_name='jobs')
+    op.drop_index('ix_jobs_dedupe_key', table_name='jobs')
+    op.drop_index('ix_jobs_kind', table_name='jobs')
+    op.drop_index('ix_jobs_id', table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,48 @@
+"""add post counters table
+
+Revision ID: f5c8b3a61e07
+Revises: e41a7c093d52
+Create Date: 2026-10-19 16:40:52.118377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c8b3a61e07'
+down_revision: Union[str, None] = 'e41a7c093d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'post_counters',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('day', sa.String(length=10), nullable=False),
+        sa.Column('source', sa.String(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('tag_status', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.UniqueConstraint('day', 'source', 'category', 'tag_status', name='uq_post_counters_bucket'),
+    )
+    # Backfill daily rollups and running totals from existing posts
+    op.execute(
+        "INSERT INTO post_counters (day, source, category, tag_status, count) "
+        "SELECT substr(CAST(coalesce(timestamp, created_at) AS VARCHAR), 1, 10), coalesce(source, ''), "
+        "coalesce(category, ''), coalesce(tag_status, ''), count(*) FROM posts GROUP BY 1, 2, 3, 4"
+    )
+    op.execute(
+        "INSERT INTO post_counters (day, source, category, tag_status, count) "
+        "SELECT 'all', coalesce(source, ''), coalesce(category, ''), coalesce(tag_status, ''), count(*) "
+        "FROM posts GROUP BY 2, 3, 4"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('post_counters')
@@ -1 +1,6 @@
- 
\ No newline at end of file
+# Keep post counters in step with every Session that touches posts
+from . import counters  # noqa: F401
+# Tag known entities on every new post
+from . import entities  # noqa: F401
+# Wake the tagging worker when posts are inserted
+from . import ingest_events  # noqa: F401
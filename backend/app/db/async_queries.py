@@ -0,0 +1,126 @@
+"""
+Async counterparts of the hot fetch, save and tagging queries, for use with
+AsyncSession (see database.get_async_db). They work on SQLite via aiosqlite
+and on PostgreSQL via asyncpg.
+"""
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from .models import Post, PostArchive, PostCounter
+from .counters import TOTAL_DAY
+from ..services.post_query_service import parse_date_range
+from ..services.retention_service import decompress_body
+from ..utils.data_versions import data_versions, POSTS
+
+
+async def fetch_articles(session: AsyncSession, sources: List[str], start_date: str, end_date: str) -> List[Post]:
+    """Posts from the given sources within an inclusive YYYY-MM-DD date range."""
+    date_start, date_end = parse_date_range(start_date, end_date)
+    result = await session.execute(
+        select(Post)
+        .where(Post.source.in_(sources), Post.timestamp >= date_start, Post.timestamp <= date_end)
+        .order_by(Post.timestamp)
+    )
+    return await hydrate_bodies(session, list(result.scalars().all()))
+
+
+async def hydrate_bodies(session: AsyncSession, posts: List[Post]) -> List[Post]:
+    """Async counterpart of retention_service.hydrate_bodies."""
+    archived = {p.id: p for p in posts if p.archived_at is not None}
+    if archived:
+        result = await session.execute(
+            select(PostArchive.post_id, PostArchive.content).where(PostArchive.post_id.in_(list(archived)))
+        )
+        for post_id, data in result.all():
+            set_committed_value(archived[post_id], "content", decompress_body(data))
+    return posts
+
+
+async def save_posts(session: AsyncSession, posts: List[dict]) -> int:
+    """
+    Insert scraped post dicts, skipping URLs already stored.
+    Duplicates are found with one IN query rather than one lookup per post.
+    Returns:
+        int: Number of new posts saved
+    """
+    urls = [p["url"] for p in posts]
+    existing = set()
+    if urls:
+        result = await session.execute(select(Post.url).where(Post.url.in_(urls)))
+        existing = set(result.scalars().all())
+    new_posts = []
+    for post in posts:
+        if post["url"] in existing:
+            continue
+        existing.add(post["url"])
+        new_posts.append(Post(
+            source=post["source"],
+            platform=post["platform"],
+            url=post["url"],
+            title=post.get("title"),
+            content=post["content"],
+            summary=post.get("summary"),
+            timestamp=post.get("timestamp"),
+            thumbnail=post.get("thumbnail"),
+            author=post.get("author"),
+        ))
+    session.add_all(new_posts)
+    try:
+        await session.commit()
+    except Exception as e:
+        logging.error(f"Error committing posts to database: {str(e)}")
+        await session.rollback()
+        raise
+    if new_posts:
+        data_versions.bump(POSTS)
+    logging.info(f"Saved {len(new_posts)} new posts to the database (out of {len(posts)} scraped).")
+    return len(new_posts)
+
+
+async def fetch_posts_for_tagging(session: AsyncSession, status_filter: str = "pending", batch_size: int = 3,
+                                  order_by: Optional[Sequence] = None) -> List[Post]:
+    """
+    Posts with the given tag_status, newest first unless order_by is given
+    (TaggingService passes its PriorityPolicy order).
+    """
+    result = await session.execute(
+        select(Post)
+        .where(Post.tag_status == status_filter)
+        .order_by(*(order_by or [Post.created_at.desc()]))
+        .limit(batch_size)
+    )
+    return list(result.scalars().all())
+
+
+async def apply_tagging_results(session: AsyncSession, results: Dict[int, Union[Tuple[list, str], Exception]], tagged_by: str = "llm"):
+    """
+    Store tagging outcomes keyed by post id: (tags, category) marks the post tagged
+    (recording tagged_by), an exception marks it as error. Commits once for the whole batch.
+    """
+    if not results:
+        return
+    posts = await session.execute(select(Post).where(Post.id.in_(list(results))))
+    for post in posts.scalars():
+        outcome = results[post.id]
+        if isinstance(outcome, Exception):
+            post.tag_status = "error"
+        else:
+            tags, category = outcome
+            post.apply_tags(tags)
+            post.category = category
+            post.tag_status = "tagged"
+            post.tagged_by = tagged_by
+    await session.commit()
+    data_versions.bump(POSTS)
+
+
+async def count_by_tag_status(session: AsyncSession) -> Dict[Optional[str], int]:
+    """Post counts per tag_status, read from the running-total counter rows rather than posts."""
+    result = await session.execute(
+        select(PostCounter.tag_status, func.sum(PostCounter.count))
+        .where(PostCounter.day == TOTAL_DAY)
+        .group_by(PostCounter.tag_status)
+    )
+    return {status: int(count) for status, count in result.all() if count}
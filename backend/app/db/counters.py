@@ -0,0 +1,153 @@
+"""
+Incrementally maintained post counters (see models.PostCounter).
+
+A before_flush listener turns every inserted, deleted or re-bucketed Post into
++1/-1 deltas and upserts them in the same transaction as the change, so the
+counters commit or roll back together with the posts. Bulk UPDATE/DELETE
+statements bypass the ORM and must not change source, category, tag_status or
+timestamp; call rebuild() if counters ever drift.
+"""
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import event, func, select, delete, insert, cast, String
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+from .models import Post, PostCounter
+
+TOTAL_DAY = "all"
+BUCKET_FIELDS = ("timestamp", "created_at", "source", "category", "tag_status")
+
+Bucket = Tuple[str, str, str, str]
+
+
+def _day(timestamp: Optional[datetime], created_at: Optional[datetime]) -> str:
+    value = timestamp or created_at or datetime.utcnow()
+    return value.date().isoformat()
+
+
+def _bucket(timestamp, created_at, source, category, tag_status) -> Bucket:
+    return (_day(timestamp, created_at), source or "", category or "", tag_status or "")
+
+
+def _current_bucket(post: Post) -> Bucket:
+    # tag_status falls back to its column default for posts not flushed yet
+    return _bucket(post.timestamp, post.created_at, post.source, post.category, post.tag_status or "pending")
+
+
+def _previous_bucket(post: Post) -> Optional[Bucket]:
+    """The bucket the post was counted in when loaded, or None if no bucket field changed."""
+    values = {}
+    changed = False
+    for field in BUCKET_FIELDS:
+        history = get_history(post, field)
+        if history.has_changes():
+            changed = True
+            values[field] = history.deleted[0] if history.deleted else None
+        else:
+            values[field] = getattr(post, field)
+    if not changed:
+        return None
+    return _bucket(**values)
+
+
+def collect_deltas(session: Session) -> Counter:
+    deltas = Counter()
+    for post in session.new:
+        if isinstance(post, Post):
+            deltas[_current_bucket(post)] += 1
+    for post in session.deleted:
+        if isinstance(post, Post):
+            deltas[_previous_bucket(post) or _current_bucket(post)] -= 1
+    for post in session.dirty:
+        if isinstance(post, Post) and session.is_modified(post):
+            previous = _previous_bucket(post)
+            current = _current_bucket(post)
+            if previous is not None and previous != current:
+                deltas[previous] -= 1
+                deltas[current] += 1
+    # Every dated delta also moves the running total for its bucket
+    for (day, source, category, tag_status), delta in list(deltas.items()):
+        deltas[(TOTAL_DAY, source, category, tag_status)] += delta
+    return Counter({bucket: delta for bucket, delta in deltas.items() if delta})
+
+
+def _upsert_statement(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    stmt = dialect_insert(PostCounter)
+    return stmt.on_conflict_do_update(
+        index_elements=["day", "source", "category", "tag_status"],
+        set_={"count": PostCounter.count + stmt.excluded.count},
+    )
+
+
+def apply_deltas(session: Session, deltas: Dict[Bucket, int]):
+    """Add deltas to the counter rows, creating missing buckets, on the session's connection."""
+    if not deltas:
+        return
+    connection = session.connection()
+    rows = [
+        {"day": day, "source": source, "category": category, "tag_status": tag_status, "count": delta}
+        for (day, source, category, tag_status), delta in deltas.items()
+    ]
+    stmt = _upsert_statement(connection.dialect.name)
+    if stmt is not None:
+        connection.execute(stmt, rows)
+        return
+    # Portable fallback: update, then insert buckets that did not exist
+    for row in rows:
+        result = connection.execute(
+            PostCounter.__table__.update()
+            .where(
+                PostCounter.day == row["day"], PostCounter.source == row["source"],
+                PostCounter.category == row["category"], PostCounter.tag_status == row["tag_status"],
+            )
+            .values(count=PostCounter.count + row["count"])
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(PostCounter), row)
+
+
+@event.listens_for(Session, "before_flush")
+def _track_post_counters(session, flush_context, instances):
+    apply_deltas(session, collect_deltas(session))
+
+
+def rebuild(session: Session) -> int:
+    """
+    Recompute every counter from the posts table (one grouped scan), e.g. after
+    creating the table on an existing database. Commits. Returns the number of posts.
+    """
+    day = func.substr(cast(func.coalesce(Post.timestamp, Post.created_at), String), 1, 10)
+    bucket_columns = (
+        func.coalesce(Post.source, ""),
+        func.coalesce(Post.category, ""),
+        func.coalesce(Post.tag_status, ""),
+    )
+    session.execute(delete(PostCounter))
+    total = 0
+    for day_expr in (day, None):
+        columns = ((day_expr,) if day_expr is not None else ()) + bucket_columns
+        rows = session.execute(select(*columns, func.count()).group_by(*columns)).all()
+        deltas = {}
+        for row in rows:
+            bucket = tuple(row[:-1]) if day_expr is not None else (TOTAL_DAY,) + tuple(row[:-1])
+            deltas[bucket] = row[-1]
+        if day_expr is None:
+            total = sum(deltas.values())
+        apply_deltas(session, deltas)
+    session.commit()
+    logging.info(f"Rebuilt post counters from {total} posts")
+    return total
+
+
+def ensure_counters(session: Session):
+    """Backfill the counters once if the table is empty but posts exist."""
+    if session.scalar(select(PostCounter.id).limit(1)) is None and session.scalar(select(Post.id).limit(1)) is not None:
+        rebuild(session)
@@ -1,5 +1,7 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
@@ -12,11 +14,61 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, 'posts.db')
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH}")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+# Connection pool settings (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# Async drivers used when DATABASE_URL names only the dialect
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def engine_kwargs(url: str) -> dict:
+    """Engine options for the configured backend: SQLite needs thread sharing, servers need a sized pool."""
+    if is_sqlite(url):
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+def to_async_url(url: str) -> str:
+    """
+    Map a sync URL to its async-driver equivalent, e.g.
+    postgresql://... or postgresql+psycopg2://... -> postgresql+asyncpg://...
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_kwargs(SQLALCHEMY_DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(SQLALCHEMY_DATABASE_URL)
+try:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_kwargs(ASYNC_DATABASE_URL))
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+except ImportError as e:
+    # The async driver (aiosqlite / asyncpg) is optional for sync-only tools
+    logging.warning(f"Async database driver unavailable, async sessions disabled: {e}")
+    async_engine = None
+    AsyncSessionLocal = None
+
 Base = declarative_base()
 
 def get_db():
@@ -26,4 +78,12 @@ def get_db():
         yield db
     finally:
         logging.info("Closing database session.")
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError(f"Async database driver for {ASYNC_DATABASE_URL.split(':', 1)[0]} is not installed")
+    logging.info("Opening new async database session.")
+    async with AsyncSessionLocal() as db:
+        yield db
+    logging.info("Closed async database session.")
@@ -0,0 +1,22 @@
+"""
+Entity tagging at ingest: a before_flush listener runs the gazetteer tagger
+(services/entity_tagger.py) over every new Post, so known models, labs and
+products are in post.tags as soon as the post is stored, whichever scraper
+or endpoint saved it.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .models import Post
+
+
+@event.listens_for(Session, "before_flush")
+def _tag_new_posts(session, flush_context, instances):
+    from ..services.entity_tagger import get_entity_tagger
+    new_posts = [obj for obj in session.new if isinstance(obj, Post) and obj.entities is None]
+    if not new_posts:
+        return
+    tagger = get_entity_tagger()
+    if tagger is None:
+        return
+    for post in new_posts:
+        tagger.tag_post(post)
@@ -0,0 +1,28 @@
+"""
+Signals utils.ingest_signal after any commit that inserted posts, whichever
+scraper, endpoint or script saved them, so the tagging worker wakes up
+without polling the database.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .models import Post
+from ..utils.ingest_signal import ingest_signal
+
+_NEW_POSTS = "ingest_new_posts"
+
+
+@event.listens_for(Session, "before_flush")
+def _note_new_posts(session, flush_context, instances):
+    if any(isinstance(obj, Post) for obj in session.new):
+        session.info[_NEW_POSTS] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _signal_new_posts(session):
+    if session.info.pop(_NEW_POSTS, False):
+        ingest_signal.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_new_posts(session):
+    session.info.pop(_NEW_POSTS, None)
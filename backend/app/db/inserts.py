@@ -0,0 +1,40 @@
+"""
+Insert-if-absent for cache tables that several processes write to.
+
+Checking for a key and then inserting it races with another writer (an API
+request and a job worker tagging or summarizing the same content); the loser's
+commit fails with IntegrityError and rolls back everything else in its
+transaction. insert_missing lets the database skip keys that already exist.
+"""
+from typing import List
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+
+def _insert_ignore_statement(dialect_name: str, model):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    keys = [column.name for column in model.__table__.primary_key.columns]
+    return dialect_insert(model).on_conflict_do_nothing(index_elements=keys)
+
+
+def insert_missing(session: Session, model, rows: List[dict]):
+    """Insert rows whose primary key is not taken yet, in the session's transaction."""
+    if not rows:
+        return
+    stmt = _insert_ignore_statement(session.connection().dialect.name, model)
+    if stmt is not None:
+        session.execute(stmt, rows)
+        return
+    # Portable fallback: one savepoint per row, so a conflict only skips that row
+    for row in rows:
+        try:
+            with session.begin_nested():
+                session.execute(insert(model), [row])
+        except IntegrityError:
+            pass
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float, ForeignKey, Index, LargeBinary, UniqueConstraint
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, query_expression
 from .database import Base
 import json
 
@@ -22,6 +22,21 @@ class Post(Base):
     tags = Column(Text, nullable=True)  # Store as JSON string
     category = Column(String, nullable=True)
     tag_status = Column(String, default="pending")  # pending, tagged, error
+    tagged_by = Column(String, nullable=True)  # "llm" or "local" (LocalTagClassifier)
+    # Gazetteer entities found at ingest (JSON list); also kept at the front of tags
+    entities = Column(Text, nullable=True)
+    # Set when the full body lives in post_archive; content then holds only a leading stub
+    archived_at = Column(DateTime(timezone=True), nullable=True)
+    # Last time the user looked at the post while untagged; tags it next (services/work_priority.py)
+    focused_at = Column(DateTime, nullable=True)
+    # Populated only by list queries that request it (see PostQueryService)
+    excerpt = query_expression()
+    is_saved = query_expression()
+
+    __table_args__ = (
+        # Keyset pagination order for /api/posts
+        Index("ix_posts_timestamp_id", "timestamp", "id"),
+    )
 
     def get_tags(self) -> list:
         """Get tags as a list"""
@@ -32,6 +47,78 @@ class Post(Base):
     def set_tags(self, tags_list):
         self.tags = json.dumps(tags_list) if tags_list else "[]"
 
+    def get_entities(self) -> list:
+        if self.entities:
+            return json.loads(self.entities)
+        return []
+
+    def set_entities(self, entities):
+        self.entities = json.dumps(entities) if entities else "[]"
+
+    def apply_tags(self, tags_list):
+        """Set tags from a tagger, keeping this post's entities at the front (case-insensitive dedupe)."""
+        seen = set()
+        merged = []
+        for tag in self.get_entities() + list(tags_list or []):
+            key = str(tag).strip().lower()
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(str(tag).strip())
+        self.set_tags(merged)
+
+class PostArchive(Base):
+    __tablename__ = "post_archive"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    content = Column(LargeBinary, nullable=False)  # zlib-compressed UTF-8 body
+    original_size = Column(Integer, nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class PostCounter(Base):
+    """
+    Post counts bucketed by (day, source, category, tag_status), kept in step with
+    posts by db/counters.py. day is the publication date (YYYY-MM-DD, falling back
+    to the ingest date) or "all" for the running totals. Missing values are stored as "".
+    """
+    __tablename__ = "post_counters"
+
+    id = Column(Integer, primary_key=True)
+    day = Column(String(10), nullable=False)
+    source = Column(String, nullable=False, default="")
+    category = Column(String, nullable=False, default="")
+    tag_status = Column(String, nullable=False, default="")
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("day", "source", "category", "tag_status", name="uq_post_counters_bucket"),
+    )
+
+class TaggingCacheEntry(Base):
+    """Tagging result for a normalized post text under one prompt and model version."""
+    __tablename__ = "tagging_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256 of normalized text + prompt version + model
+    prompt_version = Column(String(16), nullable=False, index=True)
+    model = Column(String, nullable=False)
+    tags = Column(Text, nullable=False)  # JSON list
+    category = Column(String, nullable=False)
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
+
+class SummaryCacheEntry(Base):
+    """Summary of one chunk of articles (see services/hierarchical_summarizer.py)."""
+    __tablename__ = "summary_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256 of chunk contents + prompt version + model
+    prompt_version = Column(String(16), nullable=False, index=True)
+    model = Column(String, nullable=False)
+    summary = Column(Text, nullable=False)
+    post_count = Column(Integer, nullable=False, default=0)
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
+
 class RssScrapeRun(Base):
     __tablename__ = "rss_scrape_runs"
 
@@ -49,6 +136,41 @@ class RssScrapeRun(Base):
     source = Column(String, nullable=True)
     run_type = Column(String, nullable=True)
 
+class Job(Base):
+    """Background work item; see services/job_queue.py for the lifecycle."""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False, index=True)
+    payload = Column(Text, nullable=False, default="{}")  # JSON
+    result = Column(Text, nullable=True)  # JSON
+    progress = Column(Text, nullable=True)  # JSON reported by the handler while it runs
+    status = Column(String, nullable=False, default="queued")  # queued, leased, done, dead
+    priority = Column(Integer, nullable=False, default=0)  # higher runs first
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime, nullable=False)  # UTC, not leased before this
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    dedupe_key = Column(String, nullable=True, index=True)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_ready", "status", "priority", "run_at"),
+    )
+
+    def get_payload(self) -> dict:
+        return json.loads(self.payload) if self.payload else {}
+
+    def get_result(self):
+        return json.loads(self.result) if self.result else None
+
+    def get_progress(self):
+        return json.loads(self.progress) if self.progress else None
+
 class UserPreferences(Base):
     __tablename__ = "user_preferences"
 
@@ -85,11 +207,16 @@ class SavedPost(Base):
     __tablename__ = "saved_posts"
 
     id = Column(Integer, primary_key=True, index=True)
-    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False, index=True)
     saved_at = Column(DateTime(timezone=True), server_default=func.now())
 
     post = relationship("Post")
 
+    __table_args__ = (
+        # Keyset pagination order for /api/saved
+        Index("ix_saved_posts_saved_at_id", "saved_at", "id"),
+    )
+
 class ArticleSummary(Base):
     __tablename__ = "article_summaries"
 
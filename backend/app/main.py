@@ -1,39 +1,77 @@
-from fastapi import FastAPI, HTTPException, Depends, Body, Path, Request
+from fastapi import FastAPI, HTTPException, Depends, Body, Path, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Optional
 from .scrapers import rss_scraper, substack_scraper
 from .db.models import Base, Post, RssScrapeRun, UserPreferences, SavedPost, Note
-from .db.database import engine, get_db, SessionLocal
+from .db.database import engine, get_db, SessionLocal, get_async_db, AsyncSessionLocal
+from .db import async_queries
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import logging
 import os
 import json
+import heapq
 import subprocess
 from pydantic import BaseModel, Field
 from .scrapers.rss_scraper import RSSFeedError, InvalidFeedURLError, FeedParsingError, NoEntriesFoundError
 import sys
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 import threading
 from .services.tagging_service import TaggingService
 import atexit
 import time
 import signal
 import queue
-from .utils.pipeline_logger import PipelineLogger
-from .services.openai_client import OpenAIClient
+from .run_rss_scraper import RSS_SOURCES_PATH
+from .utils import data_versions as dv
+from .utils.data_versions import data_versions, conditional_get
+from .utils.fast_json import fast_json, raw_json, dumps, FastJSONResponse
+from .utils.ttl_cache import TTLCache
+from .utils.sse import sse_response
+from .utils.compression import CompressionMiddleware
+from .services.llm_providers import ProviderRegistry, ProviderNotConfigured, TASK_SUMMARIZATION, TASK_GENERATE
+from .services.llm_response_cache import CachedLLMClient, with_response_cache
 import asyncio
-from backend.app.services.article_fetch_service import ArticleFetchService
+from backend.app.services.article_fetch_service import ArticleFetchService, AsyncArticleFetchService
 from backend.app.services.article_summarization_service import ArticleSummarizationService
-from backend.app.services.summary_storage_service import SummaryStorageService
+from backend.app.services.summary_storage_service import SummaryStorageService, AsyncSummaryStorageService
 from backend.app.services.article_batch_summarization_service import ArticleBatchSummarizationService
+from backend.app.services.hierarchical_summarizer import HierarchicalSummarizer
+from backend.app.services.post_query_service import PostQueryService, DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+from backend.app.services.post_export_service import export_chunks, MEDIA_TYPES
+from backend.app.services.retention_service import RetentionService
+from backend.app.services.post_stats_service import PostStatsService
+from backend.app.services.dashboard_service import DashboardService, DASHBOARD_CACHE_TTL
+from backend.app.services.tagging_cache import TaggingCache
+from backend.app.services.job_queue import JobQueue
+from backend.app.services.work_priority import PriorityPolicy, focus_posts
+from backend.app.services import job_handlers
+from .db import counters
 import traceback
-from datetime import datetime
+from contextlib import aclosing, asynccontextmanager
+from datetime import datetime, date
 import feedparser
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+# Backfill post counters the first time they are used on an existing database
+with SessionLocal() as _db:
+    counters.ensure_counters(_db)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.llm = llm_registry
+    # One tagging service (cache, local classifier) for the app's lifetime
+    try:
+        app.state.tagging_service = TaggingService(registry=llm_registry)
+    except ProviderNotConfigured as e:
+        logger.warning(f"Tagging unavailable until configured: {e}")
+        app.state.tagging_service = None
+    yield
+    # Close the providers' keep-alive connections
+    await llm_registry.aclose()
 
-app = FastAPI(title="AI Local Intellect Scraper API")
+app = FastAPI(title="AI Local Intellect Scraper API", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -42,8 +80,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Compress large bodies (brotli if installed, else gzip)
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
 # Configure logging
 log_dir = os.path.join(os.path.dirname(__file__), 'logs')
 os.makedirs(log_dir, exist_ok=True)
@@ -62,15 +104,28 @@ logger = logging.getLogger(__name__)
 running = True
 input_queue = queue.Queue()
 
-# Initialize the OpenAI client (replace LM Studio client)
-lm_client = OpenAIClient()
-
-# Initialize new services
-article_fetch_service = ArticleFetchService(SessionLocal())
+# Background work (scraping, tagging, summarization) goes through the job queue
+job_queue = JobQueue(SessionLocal)
+JOB_WORKER_PROCESSES = int(os.getenv("JOB_WORKER_PROCESSES", "1"))
+
+# LLM providers with pooled keep-alive clients, one per endpoint for the app's lifetime;
+# each task is routed to a provider and model (LLM_ROUTE_<TASK>, see services/llm_providers.py).
+# Identical requests are answered from the on-disk cache
+llm_registry = ProviderRegistry.from_env()
+lm_client = with_response_cache(llm_registry.client(TASK_SUMMARIZATION))
+generate_client = with_response_cache(llm_registry.client(TASK_GENERATE), getattr(lm_client, "cache", None))
+
+# Initialize new services (async sessions when an async driver is installed)
+if AsyncSessionLocal is not None:
+    article_fetch_service = AsyncArticleFetchService(AsyncSessionLocal)
+    summary_storage_service = AsyncSummaryStorageService(AsyncSessionLocal)
+else:
+    article_fetch_service = ArticleFetchService(SessionLocal())
+    summary_storage_service = SummaryStorageService(SessionLocal())
 article_summarization_service = ArticleSummarizationService(lm_client)
-summary_storage_service = SummaryStorageService(SessionLocal())
 batch_summarization_service = ArticleBatchSummarizationService(
-    article_fetch_service, article_summarization_service, summary_storage_service
+    article_fetch_service, article_summarization_service, summary_storage_service,
+    HierarchicalSummarizer(lm_client, SessionLocal),
 )
 
 def signal_handler(signum, frame):
@@ -85,8 +140,6 @@ def cleanup():
     global running
     running = False
     logger.info("Cleaning up resources...")
-    # Add this line to close the LM Studio client
-    asyncio.run(lm_client.close())
 
 atexit.register(cleanup)
 
@@ -98,6 +151,17 @@ def input_thread():
         except EOFError:
             break
 
+job_worker_process = None
+
+def start_job_worker():
+    """Launch the job workers unless the ones started earlier are still running."""
+    global job_worker_process
+    if job_worker_process is not None and job_worker_process.poll() is None:
+        return
+    job_worker_process = subprocess.Popen([
+        sys.executable, "-m", "backend.app.run_job_worker", "--processes", str(JOB_WORKER_PROCESSES)
+    ])
+
 def run_menu():
     global running
     
@@ -122,66 +186,18 @@ def run_menu():
                 continue
                 
             if choice == "0":
-                print("Running RSS scraping...")
-                rss_sources_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'rss_sources.json')
-                if os.path.exists(rss_sources_path):
-                    with open(rss_sources_path, 'r', encoding='utf-8') as f:
-                        feeds = json.load(f)
-                    db = SessionLocal()
-                    imported_count = 0
-                    skipped_count = 0
-                    failed_count = 0
-                    for feed in feeds:
-                        url = feed.get('url')
-                        source = feed.get('source')
-                        platform = feed.get('platform', 'RSS')
-                        if not url or not source:
-                            logging.warning(f"Skipped feed due to missing url or source: {feed}")
-                            skipped_count += 1
-                            continue
-                        logging.info(f"Fetching RSS feed: {source} ({url}) ...")
-                        try:
-                            rss_scraper.scrape_and_save_rss_feed(db, url, source, platform)
-                            logging.info(f"Saved feed: {source} ({url})")
-                            imported_count += 1
-                        except Exception as e:
-                            logging.warning(f"Failed to import {source} ({url}): {e}")
-                            failed_count += 1
-                    db.close()
-                    logging.info(f"RSS import complete. Imported: {imported_count}, Skipped: {skipped_count}, Failed: {failed_count}, Total: {len(feeds)}.")
-                print("Starting post tagging process...")
-                subprocess.Popen([sys.executable, "-m", "backend.app.scripts.tag_posts"])
+                print("Queueing RSS scraping and post tagging...")
+                job_handlers.submit(job_queue, job_handlers.SCRAPE_RSS_ALL)
+                job_handlers.submit(job_queue, job_handlers.TAG_POSTS)
+                start_job_worker()
             elif choice == "1":
-                print("Running RSS scraping...")
-                rss_sources_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'rss_sources.json')
-                if os.path.exists(rss_sources_path):
-                    with open(rss_sources_path, 'r', encoding='utf-8') as f:
-                        feeds = json.load(f)
-                    db = SessionLocal()
-                    imported_count = 0
-                    skipped_count = 0
-                    failed_count = 0
-                    for feed in feeds:
-                        url = feed.get('url')
-                        source = feed.get('source')
-                        platform = feed.get('platform', 'RSS')
-                        if not url or not source:
-                            logging.warning(f"Skipped feed due to missing url or source: {feed}")
-                            skipped_count += 1
-                            continue
-                        logging.info(f"Fetching RSS feed: {source} ({url}) ...")
-                        try:
-                            rss_scraper.scrape_and_save_rss_feed(db, url, source, platform)
-                            logging.info(f"Saved feed: {source} ({url})")
-                            imported_count += 1
-                        except Exception as e:
-                            logging.warning(f"Failed to import {source} ({url}): {e}")
-                            failed_count += 1
-                    db.close()
-                    logging.info(f"RSS import complete. Imported: {imported_count}, Skipped: {skipped_count}, Failed: {failed_count}, Total: {len(feeds)}.")
+                print("Queueing RSS scraping...")
+                job_handlers.submit(job_queue, job_handlers.SCRAPE_RSS_ALL)
+                start_job_worker()
             elif choice == "2":
-                print("Starting post tagging process...")
-                subprocess.Popen([sys.executable, "-m", "backend.app.scripts.tag_posts"])
+                print("Queueing post tagging...")
+                job_handlers.submit(job_queue, job_handlers.TAG_POSTS)
+                start_job_worker()
             elif choice == "3":
                 print("Exiting...")
                 running = False
@@ -199,53 +215,19 @@ menu_thread.start()
 
 logger.info("🚀 FastAPI backend is starting up...")
 
-# Remove the automatic RSS feed importing code and add a new endpoint
 @app.post("/api/scrape/rss/import-all")
-def import_all_rss_feeds(db: Session = Depends(get_db)):
+def import_all_rss_feeds():
     logger.info("POST /api/scrape/rss/import-all called")
     """
-    Import all RSS feeds defined in rss_sources.json
+    Queue a scrape_rss_all job for every feed in rss_sources.json.
+    Returns:
+        dict: The queued job id
     """
-    rss_sources_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'rss_sources.json')
-    if not os.path.exists(rss_sources_path):
+    if not os.path.exists(RSS_SOURCES_PATH):
         raise HTTPException(status_code=404, detail="rss_sources.json not found")
-    
-    with open(rss_sources_path, 'r', encoding='utf-8') as f:
-        feeds = json.load(f)
-    
-    imported_count = 0
-    skipped_count = 0
-    failed_count = 0
-    failed_feeds = []
-    
-    for feed in feeds:
-        url = feed.get('url')
-        source = feed.get('source')
-        platform = feed.get('platform', 'RSS')
-        if not url or not source:
-            logger.warning(f"Skipped feed due to missing url or source: {feed}")
-            skipped_count += 1
-            continue
-        logger.info(f"Fetching RSS feed: {source} ({url}) ...")
-        try:
-            rss_scraper.scrape_and_save_rss_feed(db, url, source, platform)
-            logger.info(f"Saved feed: {source} ({url})")
-            imported_count += 1
-        except Exception as e:
-            logger.warning(f"Failed to import {source} ({url}): {e}")
-            failed_count += 1
-            failed_feeds.append({"source": source, "url": url, "error": str(e)})
-    
-    return {
-        "status": "success",
-        "data": {
-            "imported": imported_count,
-            "skipped": skipped_count,
-            "failed": failed_count,
-            "total": len(feeds),
-            "failed_feeds": failed_feeds
-        }
-    }
+    job_id = job_handlers.submit(job_queue, job_handlers.SCRAPE_RSS_ALL)
+    start_job_worker()
+    return {"status": "queued", "job_id": job_id}
 
 class RSSRequest(BaseModel):
     """
@@ -270,7 +252,7 @@ class RSSRequest(BaseModel):
         yield from super().__get_validators__()
         yield cls.validate_url
 
-@app.get("/api/scrape/rss")
+@app.get("/api/scrape/rss", response_class=FastJSONResponse)
 async def scrape_rss(url: str, source: str, platform: str = "RSS"):
     logger.info("GET /api/scrape/rss called")
     """
@@ -278,20 +260,20 @@ async def scrape_rss(url: str, source: str, platform: str = "RSS"):
     """
     try:
         posts = rss_scraper.scrape_rss_feed(url, source, platform)
-        return {"status": "success", "data": posts}
+        return fast_json({"status": "success", "data": posts})
     except Exception as e:
         logger.error(f"Error scraping RSS feed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/scrape/rss/save")
-def scrape_and_save_rss(req: RSSRequest, db: Session = Depends(get_db)):
+@app.post("/api/scrape/rss/save", response_class=FastJSONResponse)
+async def scrape_and_save_rss(req: RSSRequest, db: AsyncSession = Depends(get_async_db)):
     logger.info("POST /api/scrape/rss/save called")
     """
     Scrape posts from an RSS feed and save them to the database.
     """
     try:
-        posts = rss_scraper.scrape_and_save_rss_feed(db, req.url, req.source, req.platform)
-        return {"status": "success", "data": posts}
+        posts = await rss_scraper.scrape_and_save_rss_feed_async(db, req.url, req.source, req.platform)
+        return fast_json({"status": "success", "data": posts})
     except rss_scraper.InvalidFeedURLError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except rss_scraper.FeedParsingError as e:
@@ -323,31 +305,159 @@ def post_to_dict(post):
         "tag_status": post.tag_status,
     }
 
-@app.get("/api/posts")
-def get_posts(db: Session = Depends(get_db)):
+def post_to_card_dict(post):
+    """Compact list representation of a post; see PostQueryService.with_card_projection."""
+    return {
+        "id": post.id,
+        "source": post.source,
+        "platform": post.platform,
+        "url": post.url,
+        "title": post.title,
+        "excerpt": post.excerpt,
+        "timestamp": post.timestamp.isoformat() if post.timestamp else None,
+        "thumbnail": post.thumbnail,
+        "author": post.author,
+        "tags": post.get_tags(),
+        "category": post.category,
+        "tag_status": post.tag_status,
+        "saved": bool(post.is_saved),
+    }
+
+@app.get("/api/posts", response_class=FastJSONResponse, dependencies=[Depends(conditional_get(dv.POSTS, dv.SAVED))])
+def get_posts(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    source: Optional[List[str]] = Query(None),
+    category: Optional[str] = None,
+    tag: Optional[str] = None,
+    tag_status: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     logger.info("GET /api/posts called")
-    posts = db.query(Post).order_by(Post.timestamp.desc()).all()
+    """
+    Get one page of posts, newest first, using keyset pagination on (timestamp, id).
+    Posts are returned as compact cards with a "saved" flag; use /api/posts/{post_id} for the full body.
+    Args:
+        limit: Page size (max MAX_PAGE_LIMIT)
+        cursor: next_cursor value from the previous page
+        source: Filter by source (repeatable)
+        category, tag, tag_status: Exact-match filters
+        start_date, end_date: Inclusive date range (YYYY-MM-DD)
+    Returns:
+        dict: Posts plus next_cursor (None on the last page)
+    """
+    filters = {
+        "sources": source,
+        "category": category,
+        "tag": tag,
+        "tag_status": tag_status,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    try:
+        posts, next_cursor = PostQueryService(db).list_posts(limit=limit, cursor=cursor, compact=True, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     logging.info(f"Fetched {len(posts)} posts from the database.")
-    if posts:
-        return {"status": "success", "data": [post_to_dict(p) for p in posts]}
+    if posts or cursor or any(filters.values()):
+        return fast_json({
+            "status": "success",
+            "data": [post_to_card_dict(p) for p in posts],
+            "next_cursor": next_cursor,
+            "limit": limit,
+        }, response)
     # Fallback to rss_feeds.json if DB is empty
     rss_feeds_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'rss_feeds.json')
     if os.path.exists(rss_feeds_path):
         with open(rss_feeds_path, 'r', encoding='utf-8') as f:
             feeds_data = json.load(f)
-            return {"status": "success", "data": feeds_data.get("posts", [])}
-    return {"status": "success", "data": []}
+            # The export is written in id order; serve the newest posts, like the database path
+            newest = heapq.nlargest(limit, feeds_data.get("posts", []),
+                                    key=lambda p: (p.get("timestamp") or "", p.get("id") or 0))
+            return {"status": "success", "data": newest, "next_cursor": None, "limit": limit}
+    return {"status": "success", "data": [], "next_cursor": None, "limit": limit}
+
+@app.get("/api/posts/{post_id}", dependencies=[Depends(conditional_get(dv.POSTS))])
+def get_post(post_id: int, db: Session = Depends(get_db)):
+    logger.info(f"GET /api/posts/{post_id} called")
+    post = PostQueryService(db).get_post(post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return {"status": "success", "data": post_to_dict(post)}
+
+def _focus(post_ids: List[int], db: Session) -> int:
+    marked = focus_posts(db, post_ids)
+    if marked:
+        job_handlers.submit(job_queue, job_handlers.TAG_POSTS, priority=job_handlers.FOCUS_PRIORITY)
+    return marked
+
+class FocusRequest(BaseModel):
+    post_ids: List[int] = Field(..., max_length=500)
+
+@app.post("/api/posts/focus")
+def focus_posts_endpoint(req: FocusRequest, db: Session = Depends(get_db)):
+    logger.info(f"POST /api/posts/focus called for {len(req.post_ids)} posts")
+    """
+    Report posts the user has on screen. Untagged ones are tagged before the
+    rest of the backlog for the next WORK_FOCUS_TTL_SECONDS.
+    Returns:
+        dict: Number of posts moved up
+    """
+    return {"status": "success", "data": {"focused": _focus(req.post_ids, db)}}
+
+@app.get("/api/export")
+def export_posts(
+    format: str = "ndjson",
+    gzip: bool = False,
+    source: Optional[List[str]] = Query(None),
+    category: Optional[str] = None,
+    tag: Optional[str] = None,
+    tag_status: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+):
+    logger.info(f"GET /api/export called (format={format}, gzip={gzip})")
+    """
+    Stream posts as NDJSON, CSV or JSON in a chunked response.
+    Rows are read in batches, so memory stays constant for any table size.
+    """
+    # The stream outlives the request scope, so it owns its session
+    db = SessionLocal()
+    try:
+        chunks = export_chunks(
+            db, fmt=format, gzip=gzip,
+            sources=source, category=category, tag=tag, tag_status=tag_status,
+            start_date=start_date, end_date=end_date,
+        )
+    except ValueError as e:
+        db.close()
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def stream():
+        try:
+            yield from chunks
+        finally:
+            db.close()
+
+    filename = f"posts.{format}" + (".gz" if gzip else "")
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    media_type = "application/gzip" if gzip else MEDIA_TYPES[format]
+    return StreamingResponse(stream(), media_type=media_type, headers=headers)
 
 @app.post("/api/scrape/rss/trigger")
 def trigger_rss_scraper():
     logger.info("POST /api/scrape/rss/trigger called")
     try:
-        subprocess.Popen([sys.executable, "-m", "backend.app.run_rss_scraper"])
-        return {"status": "started", "message": "RSS scraping script triggered."}
+        job_id = job_handlers.submit(job_queue, job_handlers.SCRAPE_RSS_ALL)
+        start_job_worker()
+        return {"status": "started", "job_id": job_id, "message": "RSS scraping job queued."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/rss-sources")
+@app.get("/api/rss-sources", dependencies=[Depends(conditional_get(dv.RSS_SOURCES))])
 def get_rss_sources():
     logger.info("GET /api/rss-sources called")
     """
@@ -360,7 +470,7 @@ def get_rss_sources():
         feeds = json.load(f)
     return {"status": "success", "data": feeds}
 
-@app.get("/api/rss-runs")
+@app.get("/api/rss-runs", dependencies=[Depends(conditional_get(dv.RSS_RUNS))])
 def get_rss_runs(db: Session = Depends(get_db)):
     logger.info("GET /api/rss-runs called")
     try:
@@ -385,16 +495,16 @@ def get_rss_runs(db: Session = Depends(get_db)):
         logging.error(f"Error in /api/rss-runs: {e}")
         raise 
 
-@app.get("/api/scrape/substack")
+@app.get("/api/scrape/substack", response_class=FastJSONResponse)
 async def scrape_substack(url: str):
     logger.info("GET /api/scrape/substack called")
     try:
         articles = substack_scraper.scrape_substack_articles(url)
-        return {"status": "success", "data": articles}
+        return fast_json({"status": "success", "data": articles})
     except substack_scraper.SubstackScraperError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/scrape/substack/save")
+@app.post("/api/scrape/substack/save", response_class=FastJSONResponse)
 def scrape_and_save_substack(
     url: str,
     db: Session = Depends(get_db)
@@ -402,7 +512,7 @@ def scrape_and_save_substack(
     logger.info("POST /api/scrape/substack/save called")
     try:
         posts = substack_scraper.scrape_and_save_substack(db, url)
-        return {"status": "success", "data": [
+        return fast_json({"status": "success", "data": [
             {
                 "id": p.id,
                 "source": p.source,
@@ -417,7 +527,7 @@ def scrape_and_save_substack(
                 "created_at": p.created_at.isoformat() if p.created_at else None,
                 "updated_at": p.updated_at.isoformat() if p.updated_at else None,
             } for p in posts
-        ]}
+        ]})
     except substack_scraper.SubstackScraperError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -448,11 +558,25 @@ def export_skipped_sources_markdown(run_id: int, db: Session = Depends(get_db)):
         md.append(f"| {src} | {url} | {reason} |")
     return "\n".join(md)
 
+def _queue_tagging(status_filter: str, batch_size: int) -> dict:
+    job_id = job_handlers.submit(job_queue, job_handlers.TAG_POSTS, {"status_filter": status_filter, "batch_size": batch_size})
+    start_job_worker()
+    return {"status": "queued", "job_id": job_id}
+
+def get_tagging_service(request: Request) -> TaggingService:
+    """The app-lifetime TaggingService; built here if the lifespan could not (raises ProviderNotConfigured)."""
+    service = getattr(request.app.state, "tagging_service", None)
+    if service is None:
+        service = request.app.state.tagging_service = TaggingService(registry=llm_registry)
+    return service
+
 @app.post("/api/tag-new-posts")
-def tag_new_posts_endpoint(
+async def tag_new_posts_endpoint(
+    request: Request,
     batch_size: int = 10,
     status_filter: str = "pending",
-    db: Session = Depends(get_db)
+    background: bool = False,
+    db: AsyncSession = Depends(get_async_db)
 ):
     logger.info("POST /api/tag-new-posts called")
     """
@@ -460,11 +584,15 @@ def tag_new_posts_endpoint(
     Args:
         batch_size: Number of posts to process per call (default 10)
         status_filter: Filter posts by tag_status ("pending" or "error")
+        background: Queue a tag_posts job instead (pending posts are then
+            drained, not just one batch) and return its id
     Returns:
-        dict: Tagging statistics
+        dict: Tagging statistics, or the queued job id
     """
-    tagging_service = TaggingService()
-    stats = tagging_service.tag_new_posts(
+    if background:
+        return await asyncio.to_thread(_queue_tagging, status_filter, batch_size)
+    tagging_service = get_tagging_service(request)
+    stats = await tagging_service.tag_new_posts_async(
         db,
         batch_size=batch_size,
         status_filter=status_filter
@@ -472,35 +600,97 @@ def tag_new_posts_endpoint(
     return {"status": "success", "data": stats}
 
 @app.post("/api/retry-failed-tags")
-def retry_failed_tags_endpoint(
+async def retry_failed_tags_endpoint(
+    request: Request,
     batch_size: int = 10,
-    db: Session = Depends(get_db)
+    background: bool = False,
+    db: AsyncSession = Depends(get_async_db)
 ):
     logger.info("POST /api/retry-failed-tags called")
     """
     Retry tagging for posts that previously failed.
     Args:
         batch_size: Number of posts to process per call (default 10)
+        background: Queue a tag_posts job instead and return its id
     Returns:
-        dict: Tagging statistics
+        dict: Tagging statistics, or the queued job id
     """
-    tagging_service = TaggingService()
-    stats = tagging_service.retry_failed_tags(db, batch_size=batch_size)
+    if background:
+        return await asyncio.to_thread(_queue_tagging, "error", batch_size)
+    tagging_service = get_tagging_service(request)
+    stats = await tagging_service.tag_new_posts_async(db, batch_size=batch_size, status_filter="error")
     return {"status": "success", "data": stats}
 
 @app.get("/api/tagging-stats")
-def get_tagging_stats(db: Session = Depends(get_db)):
+async def get_tagging_stats(db: AsyncSession = Depends(get_async_db)):
     logger.info("GET /api/tagging-stats called")
     """
-    Get statistics about post tagging status.
+    Get statistics about post tagging status, read from the post counters,
+    plus tagging cache size and hit counts for the current prompt version.
     Returns:
-        dict: Counts of posts by tag_status
+        dict: Counts of posts by tag_status and a "cache" summary
     """
-    stats = {
-        "pending": db.query(Post).filter(Post.tag_status == "pending").count(),
-        "tagged": db.query(Post).filter(Post.tag_status == "tagged").count(),
-        "error": db.query(Post).filter(Post.tag_status == "error").count(),
-    }
+    counts = await async_queries.count_by_tag_status(db)
+    stats = {status: counts.get(status, 0) for status in ("pending", "tagged", "error")}
+    stats["cache"] = await db.run_sync(TaggingCache().stats)
+    return {"status": "success", "data": stats}
+
+class JobRequest(BaseModel):
+    kind: str
+    payload: Dict = Field(default_factory=dict)
+    priority: Optional[int] = None
+
+@app.post("/api/jobs")
+def enqueue_job(req: JobRequest):
+    logger.info(f"POST /api/jobs called for {req.kind}")
+    """
+    Queue a background job (see services/job_handlers.py for the kinds).
+    Identical unfinished jobs are merged, so the returned job may be an existing one.
+    """
+    try:
+        job_id = job_handlers.submit(job_queue, req.kind, req.payload, priority=req.priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    start_job_worker()
+    return {"status": "success", "data": job_queue.get(job_id)}
+
+@app.get("/api/jobs")
+def list_jobs(status: Optional[str] = None, kind: Optional[str] = None, limit: int = Query(50, ge=1, le=500)):
+    logger.info("GET /api/jobs called")
+    """
+    Recent jobs, newest first, with queue counts. status=dead lists the dead letters.
+    """
+    return {"status": "success", "data": job_queue.list_jobs(status=status, kind=kind, limit=limit), "stats": job_queue.stats()}
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: int):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"status": "success", "data": job}
+
+@app.post("/api/jobs/{job_id}/requeue")
+def requeue_job(job_id: int):
+    logger.info(f"POST /api/jobs/{job_id}/requeue called")
+    if not job_queue.requeue(job_id):
+        raise HTTPException(status_code=409, detail="Only dead jobs can be requeued")
+    start_job_worker()
+    return {"status": "success", "data": job_queue.get(job_id)}
+
+@app.get("/api/post-stats", dependencies=[Depends(conditional_get(dv.POSTS))])
+def get_post_stats(start_date: Optional[str] = None, end_date: Optional[str] = None, db: Session = Depends(get_db)):
+    logger.info("GET /api/post-stats called")
+    """
+    Post counts by source, category and tag_status, read from the post counters.
+    Args:
+        start_date, end_date: Optional inclusive date range (YYYY-MM-DD); adds a per-day series
+    Returns:
+        dict: total, by_source, by_category, by_tag_status and daily counts
+    """
+    try:
+        stats = PostStatsService(db).summary(start_date=start_date, end_date=end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {"status": "success", "data": stats}
 
 class PreferencesRequest(BaseModel):
@@ -524,7 +714,7 @@ class PreferencesResponse(BaseModel):
     preferred_categories: list[str]
 
 # --- USER PREFERENCES ENDPOINTS ---
-@app.get("/api/preferences", response_model=PreferencesResponse)
+@app.get("/api/preferences", response_model=PreferencesResponse, dependencies=[Depends(conditional_get(dv.PREFERENCES))])
 def get_preferences(db: Session = Depends(get_db)):
     logger.info("GET /api/preferences called")
     prefs = db.query(UserPreferences).get(1)
@@ -549,11 +739,55 @@ def set_preferences(
     prefs.set_sources(req.preferred_sources)
     prefs.set_categories(req.preferred_categories)
     db.commit()
+    data_versions.bump(dv.PREFERENCES)
     return PreferencesResponse(
         preferred_sources=prefs.get_sources(),
         preferred_categories=prefs.get_categories()
     )
 
+# --- DASHBOARD ---
+dashboard_cache = TTLCache(ttl=DASHBOARD_CACHE_TTL)
+
+def _dashboard_day(request: Request) -> str:
+    return request.query_params.get("date") or date.today().isoformat()
+
+@app.get("/api/dashboard", response_class=FastJSONResponse, dependencies=[Depends(conditional_get(dv.POSTS, dv.SAVED, dv.PREFERENCES, variant=_dashboard_day))])
+def get_dashboard(
+    response: Response,
+    day: Optional[str] = Query(None, alias="date"),
+    db: Session = Depends(get_db)
+):
+    logger.info("GET /api/dashboard called")
+    """
+    Everything the dashboard needs in one round trip: the day's posts matching the
+    user's preferred sources or categories (compact cards), saved post ids, the
+    first page of saved posts and the preferences.
+    Payloads are cached for DASHBOARD_CACHE_TTL seconds per day and data version,
+    so ingest, saves and preference changes take effect immediately.
+    Args:
+        date: Day to show (YYYY-MM-DD, default: today on the server)
+    """
+    try:
+        day_value = datetime.strptime(day, "%Y-%m-%d").date() if day else date.today()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"date must be in YYYY-MM-DD format. Got '{day}'")
+    cache_key = (day_value.isoformat(),) + tuple(data_versions.get_version(r) for r in (dv.POSTS, dv.SAVED, dv.PREFERENCES))
+    body = dashboard_cache.get(cache_key)
+    if body is None:
+        data = DashboardService(db).bootstrap(day_value)
+        body = dumps({"status": "success", "data": {
+            **data,
+            "posts": [post_to_card_dict(p) for p in data["posts"]],
+            "saved": [{
+                "id": saved.id,
+                "post_id": saved.post_id,
+                "saved_at": saved.saved_at.isoformat(),
+                "post": post_to_card_dict(post),
+            } for saved, post in data["saved"]],
+        }})
+        dashboard_cache.set(cache_key, body)
+    return raw_json(body, response)
+
 class SavedPostRequest(BaseModel):
     """
     Request model for saving a post.
@@ -582,10 +816,16 @@ def save_post(req: SavedPostRequest, db: Session = Depends(get_db)):
     post = db.query(Post).filter(Post.id == req.post_id).first()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    saved_post = SavedPost(post_id=post.id)
-    db.add(saved_post)
-    db.commit()
-    db.refresh(saved_post)
+    # Saving is idempotent: return the existing record instead of a duplicate
+    saved_post = db.query(SavedPost).filter(SavedPost.post_id == post.id).first()
+    if saved_post is None:
+        saved_post = SavedPost(post_id=post.id)
+        db.add(saved_post)
+        db.commit()
+        data_versions.bump(dv.SAVED)
+        # Saved posts are pinned in the hot tier
+        RetentionService(db).restore([post.id])
+        db.refresh(saved_post)
     return {
         "id": saved_post.id,
         "post_id": saved_post.post_id,
@@ -593,21 +833,40 @@ def save_post(req: SavedPostRequest, db: Session = Depends(get_db)):
         "post": post_to_dict(post)
     }
 
-@app.get("/api/saved", response_model=List[SavedPostResponse])
-def get_saved_posts(db: Session = Depends(get_db)):
+@app.get("/api/saved", response_model=List[SavedPostResponse], dependencies=[Depends(conditional_get(dv.SAVED, dv.POSTS))])
+def get_saved_posts(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     logger.info("GET /api/saved called")
-    saved_posts = db.query(SavedPost).order_by(SavedPost.saved_at.desc()).all()
-    result = []
-    for saved in saved_posts:
-        post = db.query(Post).filter(Post.id == saved.post_id).first()
-        if post:
-            result.append({
-                "id": saved.id,
-                "post_id": saved.post_id,
-                "saved_at": saved.saved_at.isoformat(),
-                "post": post_to_dict(post)
-            })
-    return result
+    """
+    Get one page of saved posts, most recently saved first, with each post as a compact card.
+    The cursor for the next page is returned in the X-Next-Cursor header (absent on the last page).
+    """
+    try:
+        rows, next_cursor = PostQueryService(db).list_saved(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = [{
+        "id": saved.id,
+        "post_id": saved.post_id,
+        "saved_at": saved.saved_at.isoformat(),
+        "post": post_to_card_dict(post),
+    } for saved, post in rows]
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    # Trusted internal dicts: skip response_model validation
+    return fast_json(result, response)
+
+@app.get("/api/saved/ids", response_class=FastJSONResponse, dependencies=[Depends(conditional_get(dv.SAVED))])
+def get_saved_post_ids(response: Response, db: Session = Depends(get_db)):
+    logger.info("GET /api/saved/ids called")
+    """
+    Ids of all saved posts, for building a client-side set to answer "is this post saved?".
+    """
+    return fast_json({"status": "success", "data": PostQueryService(db).saved_post_ids()}, response)
 
 @app.delete("/api/saved/{post_id}")
 def delete_saved_post(post_id: int, db: Session = Depends(get_db)):
@@ -618,106 +877,27 @@ def delete_saved_post(post_id: int, db: Session = Depends(get_db)):
     for saved in saved_posts:
         db.delete(saved)
     db.commit()
+    data_versions.bump(dv.SAVED)
     return {"detail": "Deleted"}
 
-def run_full_pipeline(db: Session):
-    """
-    Orchestrate the full pipeline: scrape all RSS feeds, then tag new posts.
-    Returns a summary of both steps.
-    """
-    logger.info("Starting full pipeline: scrape all RSS feeds, then tag new posts.")
-    summary = {"scraping": {}, "tagging": {}, "errors": []}
-    try:
-        pipeline_logger = PipelineLogger(db)
-        run = pipeline_logger.start_run(source="pipeline", run_type="full_pipeline")
-        logger.info(f"Pipeline run started with id: {run.id}")
-    except Exception as e:
-        logger.error(f"Failed to start pipeline run: {e}", exc_info=True)
-        raise
-
-    try:
-        # Scrape all RSS feeds
-        rss_sources_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'rss_sources.json')
-        if not os.path.exists(rss_sources_path):
-            pipeline_logger.end_run(status="error", error_message="rss_sources.json not found")
-            raise HTTPException(status_code=404, detail="rss_sources.json not found")
-        with open(rss_sources_path, 'r', encoding='utf-8') as f:
-            feeds = json.load(f)
-        imported_count = 0
-        skipped_count = 0
-        failed_count = 0
-        failed_feeds = []
-        for feed in feeds:
-            url = feed.get('url')
-            source = feed.get('source')
-            platform = feed.get('platform', 'RSS')
-            article = {"url": url, "source": source, "platform": platform}
-            if not url or not source:
-                logger.warning(f"Skipped feed due to missing url or source: {feed}")
-                skipped_count += 1
-                pipeline_logger.log_article_processed(article, status="skipped", stage="scraping", error_message="Missing url or source")
-                continue
-            logger.info(f"Fetching RSS feed: {source} ({url}) ...")
-            try:
-                from .scrapers import rss_scraper
-                rss_scraper.scrape_and_save_rss_feed(db, url, source, platform)
-                logger.info(f"Saved feed: {source} ({url})")
-                imported_count += 1
-                pipeline_logger.log_article_processed(article, status="success", stage="scraping")
-            except Exception as e:
-                logger.warning(f"Failed to import {source} ({url}): {e}")
-                failed_count += 1
-                failed_feeds.append({"source": source, "url": url, "error": str(e)})
-                pipeline_logger.log_article_processed(article, status="error", stage="scraping", error_message=str(e))
-        summary["scraping"] = {
-            "imported": imported_count,
-            "skipped": skipped_count,
-            "failed": failed_count,
-            "total": len(feeds),
-            "failed_feeds": failed_feeds
-        }
-    except Exception as e:
-        logger.error(f"Pipeline scraping step failed: {e}")
-        summary["errors"].append(f"Scraping step failed: {str(e)}")
-        pipeline_logger.end_run(status="error", error_message=str(e))
-        logger.info(f"Pipeline run with id {run.id} ended with error.")
-        return {"status": "error", "summary": summary}
-
-    try:
-        # Tag new posts
-        from .services.tagging_service import TaggingService
-        tagging_service = TaggingService()
-        tagging_stats = tagging_service.tag_new_posts(db, batch_size=1000, status_filter="pending")
-        summary["tagging"] = tagging_stats
-        pipeline_logger.end_run(status="completed")
-        logger.info(f"Pipeline run with id {run.id} completed successfully.")
-    except Exception as e:
-        logger.error(f"Pipeline tagging step failed: {e}")
-        summary["errors"].append(f"Tagging step failed: {str(e)}")
-        pipeline_logger.end_run(status="error", error_message=str(e))
-        logger.info(f"Pipeline run with id {run.id} ended with error.")
-        return {"status": "error", "summary": summary}
-
-    logger.info("Pipeline completed successfully.")
-    return {"status": "success", "summary": summary}
-
 @app.post("/api/pipeline/refresh-all")
-def refresh_all_pipeline(db: Session = Depends(get_db)):
+def refresh_all_pipeline():
     logger.info("POST /api/pipeline/refresh-all called")
-    logger.info("[refresh_all_pipeline] Entered endpoint.")
-    if db is None:
-        logger.error("[refresh_all_pipeline] DB session is None!")
-    else:
-        logger.info("[refresh_all_pipeline] DB session received.")
-    logger.info("[refresh_all_pipeline] About to instantiate PipelineLogger.")
-    try:
-        pipeline_logger = PipelineLogger(db)
-        logger.info("[refresh_all_pipeline] PipelineLogger instantiated.")
-    except Exception as e:
-        logger.error(f"[refresh_all_pipeline] Failed to instantiate PipelineLogger: {e}", exc_info=True)
-        raise
-    # Call the actual pipeline logic
-    return run_full_pipeline(db)
+    """
+    Queue the full pipeline: a scrape_rss_all job (recorded as one RSS run),
+    then a tag_posts job for pending posts. Posts the scrape adds queue more
+    tagging on their own.
+    Returns:
+        dict: The queued job ids
+    """
+    if not os.path.exists(RSS_SOURCES_PATH):
+        raise HTTPException(status_code=404, detail="rss_sources.json not found")
+    jobs = {
+        "scraping": job_handlers.submit(job_queue, job_handlers.SCRAPE_RSS_ALL),
+        "tagging": job_handlers.submit(job_queue, job_handlers.TAG_POSTS),
+    }
+    start_job_worker()
+    return {"status": "queued", "jobs": jobs}
 
 # Add these new models after the other model definitions
 class SummaryRequest(BaseModel):
@@ -727,6 +907,7 @@ class SummaryRequest(BaseModel):
 class PromptRequest(BaseModel):
     prompt: str
     system_prompt: str = None
+    stream: bool = False  # Server-Sent Events: "token" events, then "done"
 
 # Add these new endpoints before the health check endpoint
 @app.post("/api/lm/summarize")
@@ -744,10 +925,16 @@ def test_alive():
     return {"status": "alive"} 
 
 @app.post("/api/lm/generate")
-async def generate_response(request: PromptRequest):
+async def generate_response(request: PromptRequest, http_request: Request):
     logger.info("POST /api/lm/generate called")
+    if request.stream:
+        async def tokens():
+            async with aclosing(generate_client.stream_response(request.prompt, request.system_prompt)) as pieces:
+                async for text in pieces:
+                    yield "token", {"text": text}
+        return sse_response(http_request, tokens())
     try:
-        response = await lm_client.generate_response(
+        response = await generate_client.generate_response(
             request.prompt,
             request.system_prompt
         )
@@ -755,59 +942,102 @@ async def generate_response(request: PromptRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/lm/providers")
+async def lm_providers():
+    """Configured providers with request counts, and the provider:model each task is routed to."""
+    return llm_registry.describe()
+
+@app.get("/api/lm/cache/stats")
+async def lm_cache_stats():
+    """Hit/miss counts for this process, plus entries and bytes on disk."""
+    if not isinstance(lm_client, CachedLLMClient):
+        return {"enabled": False}
+    return {"enabled": True, **await asyncio.to_thread(lm_client.stats)}
+
+@app.delete("/api/lm/cache")
+async def clear_lm_cache():
+    if not isinstance(lm_client, CachedLLMClient):
+        return {"removed": 0}
+    return {"removed": await asyncio.to_thread(lm_client.cache.clear)}
+
+def _priority_policy() -> PriorityPolicy:
+    with SessionLocal() as db:
+        return PriorityPolicy.load(db)
+
 class SummarizationRequest(BaseModel):
     sources: List[str]
     start_date: str  # YYYY-MM-DD
     end_date: str    # YYYY-MM-DD
     combined: bool = False
+    # Server-Sent Events: "token" events of the combined digest, or one "summary" event per article
+    stream: bool = False
+
+def _summary_events(request: SummarizationRequest):
+    args = (request.sources, request.start_date, request.end_date)
+
+    async def events():
+        if request.combined:
+            async with aclosing(batch_summarization_service.stream_articles_combined(*args)) as pieces:
+                async for text in pieces:
+                    yield "token", {"text": text}
+        else:
+            policy = await asyncio.to_thread(_priority_policy)
+            async with aclosing(batch_summarization_service.iter_article_summaries(*args, policy=policy)) as results:
+                async for result in results:
+                    yield "summary", result
+    return events()
 
 @app.post("/api/lm/summarize-articles")
-async def summarize_articles(request: SummarizationRequest):
+async def summarize_articles(request: SummarizationRequest, http_request: Request):
     logger.info(f"/api/lm/summarize-articles called with: sources={request.sources}, start_date={request.start_date}, end_date={request.end_date}, combined={request.combined}")
+    if request.stream:
+        return sse_response(http_request, _summary_events(request))
+    args = (request.sources, request.start_date, request.end_date)
     try:
         if request.combined:
-            logger.info("Calling summarize_articles_combined (single grouped summary)")
-            # Fetch articles for logging
-            all_posts = []
-            for source in request.sources:
-                posts = batch_summarization_service.fetch_service.fetch_articles(source, request.start_date, request.end_date)
-                all_posts.extend(posts)
-            logger.info(f"Fetched {len(all_posts)} articles for combined summary.")
-            for idx, post in enumerate(all_posts, 1):
-                logger.info(f"Article {idx}: Title='{getattr(post, 'title', '')}', Source='{getattr(post, 'source', '')}', Date='{getattr(post, 'timestamp', '')}'")
-            # Build the prompt for logging (same as in summarize_articles_combined)
-            prompt_lines = []
-            for idx, post in enumerate(all_posts, 1):
-                prompt_lines.append(f"Article {idx}:")
-                prompt_lines.append(f"Source: {getattr(post, 'source', '')}")
-                prompt_lines.append(f"URL: {getattr(post, 'url', '')}")
-                prompt_lines.append(f"Publish Date: {getattr(post, 'timestamp', '')}")
-                prompt_lines.append(f"Title: {getattr(post, 'title', '')}")
-                prompt_lines.append(f"Content: {getattr(post, 'content', '')}")
-                prompt_lines.append(f"Author: {getattr(post, 'author', '')}")
-                prompt_lines.append("")
-            prompt = "\n".join(prompt_lines)
-            logger.info(f"Combined prompt sent to model:\n{prompt}")
-            summary = await batch_summarization_service.summarize_articles_combined(
-                request.sources, request.start_date, request.end_date
-            )
-            return {"summary": summary}
-        else:
-            logger.info("Calling summarize_articles (per-article summaries)")
-            # Fetch articles for logging
-            all_posts = []
-            for source in request.sources:
-                posts = batch_summarization_service.fetch_service.fetch_articles(source, request.start_date, request.end_date)
-                all_posts.extend(posts)
-            logger.info(f"Fetched {len(all_posts)} articles for per-article summaries.")
-            for idx, post in enumerate(all_posts, 1):
-                logger.info(f"Article {idx}: Title='{getattr(post, 'title', '')}', Source='{getattr(post, 'source', '')}', Date='{getattr(post, 'timestamp', '')}'")
-            summaries = await batch_summarization_service.summarize_articles(
-                request.sources, request.start_date, request.end_date
-            )
-            return {"summaries": summaries}
+            return {"summary": await batch_summarization_service.summarize_articles_combined(*args)}
+        policy = await asyncio.to_thread(_priority_policy)
+        return {"summaries": await batch_summarization_service.summarize_articles(*args, policy=policy)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        return {"error": str(e), "trace": traceback.format_exc()}
+        logger.error(f"/api/lm/summarize-articles failed: {e}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _summarization_job(job_id: int) -> dict:
+    job = job_queue.get(job_id)
+    if job is None or job["kind"] != job_handlers.SUMMARIZE_ARTICLES:
+        raise HTTPException(status_code=404, detail="Summarization job not found")
+    return job
+
+@app.post("/api/lm/summarize-articles/jobs", status_code=202)
+def submit_summarization_job(request: SummarizationRequest):
+    """
+    Queue the summarization and return its job at once; poll
+    GET /api/lm/summarize-articles/jobs/{job_id} for progress and the result.
+    An identical request still queued or running returns that job instead.
+    """
+    logger.info(f"POST /api/lm/summarize-articles/jobs called with: sources={request.sources}, start_date={request.start_date}, end_date={request.end_date}, combined={request.combined}")
+    try:
+        for value in (request.start_date, request.end_date):
+            datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start_date and end_date must be in YYYY-MM-DD format")
+    if not request.sources:
+        raise HTTPException(status_code=400, detail="At least one source is required")
+    payload = {"sources": request.sources, "start_date": request.start_date,
+               "end_date": request.end_date, "combined": request.combined}
+    job_id = job_handlers.submit(job_queue, job_handlers.SUMMARIZE_ARTICLES, payload)
+    start_job_worker()
+    return {"status": "queued", "job_id": job_id, "data": _summarization_job(job_id)}
+
+@app.get("/api/lm/summarize-articles/jobs/{job_id}")
+def get_summarization_job(job_id: int):
+    """
+    Status (queued, leased while running, done, dead), progress, timing and,
+    once done, the result ({"summary"} or {"summaries"}).
+    """
+    return {"status": "success", "data": _summarization_job(job_id)}
 
 class NoteCreate(BaseModel):
     title: str
@@ -858,6 +1088,8 @@ def create_note(note: NoteCreate, db: Session = Depends(get_db)):
         db_note = Note(title=note.title, description=note.description)
         db.add(db_note)
         db.commit()
+        # Posts linked from a note are pinned in the hot tier
+        RetentionService(db).pin_urls(f"{db_note.title} {db_note.description or ''}")
         db.refresh(db_note)
         return db_note
     except Exception as e:
@@ -875,6 +1107,7 @@ def update_note(note_id: int, note_update: NoteUpdate, db: Session = Depends(get
     if note_update.description is not None:
         db_note.description = note_update.description
     db.commit()
+    RetentionService(db).pin_urls(f"{db_note.title} {db_note.description or ''}")
     db.refresh(db_note)
     return db_note
 
@@ -925,6 +1158,7 @@ def add_rss_source(req: RSSSourceRequest):
     sources.append(new_source)
     with open(rss_sources_path, 'w', encoding='utf-8') as f:
         json.dump(sources, f, indent=4, ensure_ascii=False)
+    data_versions.bump(dv.RSS_SOURCES)
     logger.info(f"Added new RSS source: {new_source}")
     return {"status": "success", "data": new_source}
 
@@ -963,6 +1197,7 @@ def update_rss_source(
     sources[idx] = req.dict(exclude_none=True)
     with open(rss_sources_path, 'w', encoding='utf-8') as f:
         json.dump(sources, f, indent=4, ensure_ascii=False)
+    data_versions.bump(dv.RSS_SOURCES)
     logger.info(f"Updated RSS source: {sources[idx]}")
     return {"status": "success", "data": sources[idx]}
 
@@ -1010,5 +1245,6 @@ async def bulk_import_rss_sources(request: Request):
             errors.append({"index": idx, "source": item, "error": str(e)})
     with open(rss_sources_path, 'w', encoding='utf-8') as f:
         json.dump(sources, f, indent=4, ensure_ascii=False)
+    data_versions.bump(dv.RSS_SOURCES)
     logger.info(f"Bulk import complete. Added: {added}, Skipped: {skipped}, Errors: {len(errors)}")
     return {"status": "success", "added": added, "skipped": skipped, "errors": errors}
@@ -0,0 +1,28 @@
+import argparse
+import time
+from backend.app.db.database import SessionLocal
+from backend.app.services.entity_tagger import EntityTagger, GAZETTEER_PATH, DEFAULT_BATCH_SIZE
+from sqlalchemy.orm import Session
+
+def main():
+    parser = argparse.ArgumentParser(description="Tag known models, labs and products from the entity gazetteer.")
+    parser.add_argument("--gazetteer", default=GAZETTEER_PATH, help=f"Gazetteer JSON (default: {GAZETTEER_PATH}, env ENTITY_GAZETTEER_PATH)")
+    parser.add_argument("--text", help="Print the entities found in this text and exit")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    tagger = EntityTagger.from_file(args.gazetteer)
+    if args.text is not None:
+        print(tagger.find(args.text))
+        return
+
+    db: Session = SessionLocal()
+    try:
+        started = time.perf_counter()
+        stats = tagger.backfill(db, batch_size=args.batch_size)
+        print(f"Scanned {stats['scanned']} posts, updated {stats['updated']} in {time.perf_counter() - started:.1f}s")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import signal
+from backend.app.db.database import SessionLocal, engine
+from backend.app.db.models import Job
+from backend.app.services.job_handlers import HANDLERS, TAG_POSTS, submit
+from backend.app.services.job_queue import JobQueue
+from backend.app.services.job_worker import JobWorker
+from backend.app.utils.ingest_signal import ingest_signal
+
+
+def serve(kinds):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(processName)s %(message)s")
+    queue = JobQueue(SessionLocal)
+    # Tagging follows ingest: new posts enqueue one (deduplicated) tag_posts job
+    watch = [(ingest_signal, lambda: submit(queue, TAG_POSTS))] if TAG_POSTS in kinds else []
+    worker = JobWorker(queue, {kind: HANDLERS[kind] for kind in kinds}, watch=watch)
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run job queue workers, or inspect the queue.")
+    parser.add_argument("--kinds", default=",".join(HANDLERS), help=f"Comma-separated job kinds to serve (default: all of {', '.join(HANDLERS)})")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes to run (default 1)")
+    parser.add_argument("--stats", action="store_true", help="Print job counts and exit")
+    parser.add_argument("--dead", action="store_true", help="List dead jobs and exit")
+    parser.add_argument("--requeue", type=int, metavar="JOB_ID", help="Give a dead job a fresh set of attempts and exit")
+    parser.add_argument("--purge-days", type=float, metavar="DAYS", help="Delete jobs finished more than DAYS ago and exit")
+    args = parser.parse_args()
+
+    Job.__table__.create(bind=engine, checkfirst=True)
+    queue = JobQueue(SessionLocal)
+    if args.stats:
+        print(json.dumps(queue.stats(), indent=2))
+        return
+    if args.dead:
+        for job in queue.list_jobs(status="dead", limit=100):
+            print(f"{job['id']:>6}  {job['kind']:<20} attempts={job['attempts']}  {job['last_error']}")
+        return
+    if args.requeue is not None:
+        print("Requeued" if queue.requeue(args.requeue) else f"Job {args.requeue} is not dead")
+        return
+    if args.purge_days is not None:
+        print(f"Purged {queue.purge(args.purge_days)} finished jobs")
+        return
+
+    kinds = [kind.strip() for kind in args.kinds.split(",") if kind.strip()]
+    unknown = set(kinds) - set(HANDLERS)
+    if unknown:
+        parser.error(f"Unknown job kinds: {', '.join(sorted(unknown))}")
+    if TAG_POSTS in kinds:
+        # Catch up on posts ingested while no worker was running
+        submit(queue, TAG_POSTS)
+    if args.processes <= 1:
+        serve(kinds)
+        return
+    engine.dispose()
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=serve, args=(kinds,), name=f"job-worker-{i + 1}") for i in range(args.processes)]
+    for process in processes:
+        process.start()
+    signal.signal(signal.SIGTERM, lambda signum, frame: [p.terminate() for p in processes])
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
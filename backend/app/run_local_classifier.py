@@ -0,0 +1,37 @@
+import argparse
+from sqlalchemy import func
+from backend.app.db.database import SessionLocal
+from backend.app.db.models import Post
+from backend.app.services.local_classifier import (
+    LOCAL_CLASSIFIER_MIN_POSTS, LOCAL_CLASSIFIER_PATH, LOCAL_CLASSIFIER_THRESHOLD, evaluate, train, training_samples,
+)
+from backend.app.services.tagging_engine import TAGGING_POSTS_PER_CALL
+from sqlalchemy.orm import Session
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or evaluate the local fast-path tag classifier.")
+    parser.add_argument("--train", action="store_true", help=f"Train on LLM-tagged posts and save to {LOCAL_CLASSIFIER_PATH}")
+    parser.add_argument("--report", action="store_true", help="Hold out posts and report coverage and agreement with the LLM")
+    parser.add_argument("--threshold", type=float, default=LOCAL_CLASSIFIER_THRESHOLD, help=f"Confidence needed to skip the LLM (default: {LOCAL_CLASSIFIER_THRESHOLD}, env LOCAL_CLASSIFIER_THRESHOLD)")
+    parser.add_argument("--limit", type=int, default=None, help="Use only the newest N tagged posts")
+    parser.add_argument("--min-posts", type=int, default=LOCAL_CLASSIFIER_MIN_POSTS)
+    args = parser.parse_args()
+
+    db: Session = SessionLocal()
+    try:
+        if args.report or not args.train:
+            report = evaluate(training_samples(db, limit=args.limit), threshold=args.threshold, posts_per_call=TAGGING_POSTS_PER_CALL)
+            print("Held-out evaluation:")
+            for key, value in report.items():
+                print(f"  {key:<17}: {value}")
+            print("Tagged posts by tagger:")
+            for tagged_by, count in db.query(Post.tagged_by, func.count(Post.id)).filter(Post.tag_status == "tagged").group_by(Post.tagged_by):
+                print(f"  {tagged_by or 'llm (before tagged_by)':<17}: {count}")
+        if args.train:
+            model = train(db, min_posts=args.min_posts, limit=args.limit)
+            print(f"Trained on {model.trained_on} posts, {len(model.classes)} categories, {len(model.tag_vocab)} known tags")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import argparse
+from backend.app.db.database import SessionLocal
+from backend.app.services.retention_service import RetentionService, RETENTION_HOT_DAYS, DEFAULT_BATCH_SIZE
+from sqlalchemy.orm import Session
+
+def main():
+    parser = argparse.ArgumentParser(description="Move bodies of old posts to the compressed archive tier.")
+    parser.add_argument("--days", type=int, default=RETENTION_HOT_DAYS, help=f"Keep posts newer than this hot (default: {RETENTION_HOT_DAYS}, env RETENTION_HOT_DAYS)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be archived")
+    parser.add_argument("--restore", type=int, action="append", metavar="POST_ID", help="Restore a post's body to the hot tier (repeatable)")
+    parser.add_argument("--vacuum", action="store_true", help="Reclaim freed space afterwards (SQLite only)")
+    parser.add_argument("--stats", action="store_true", help="Print tier sizes and exit")
+    args = parser.parse_args()
+
+    db: Session = SessionLocal()
+    try:
+        service = RetentionService(db, hot_days=args.days, batch_size=args.batch_size)
+        if args.stats:
+            for key, value in service.stats().items():
+                print(f"  {key:<15}: {value}")
+            return
+        if args.restore:
+            print(f"Restored {service.restore(args.restore)} post bodies")
+            return
+        result = service.archive(dry_run=args.dry_run)
+        verb = "Would archive" if args.dry_run else "Archived"
+        print(f"{verb} {result['archived']} post bodies older than {result['cutoff']} ({result['pinned']} pinned posts kept hot)")
+        if not args.dry_run:
+            print(f"  restored : {result['restored']} pinned posts")
+            print(f"  bytes    : {result['bytes_before']} -> {result['bytes_after']} compressed")
+            if args.vacuum and service.vacuum():
+                print("  vacuumed database")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
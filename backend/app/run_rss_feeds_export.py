@@ -1,39 +1,66 @@
 import os
-import json
+import argparse
 from backend.app.db.database import SessionLocal
-from backend.app.db.models import Post
+from backend.app.services.post_export_service import export_chunks, EXPORT_FORMATS, DEFAULT_BATCH_SIZE
 from sqlalchemy.orm import Session
-from datetime import datetime
 
 # Path to output JSON file
 output_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'rss_feeds.json')
 
-def post_to_dict(post):
-    return {
-        "id": post.id,
-        "source": post.source,
-        "platform": post.platform,
-        "url": post.url,
-        "title": post.title,
-        "content": post.content,
-        "summary": post.summary,
-        "timestamp": post.timestamp.isoformat() if post.timestamp else None,
-        "thumbnail": post.thumbnail,
-        "author": post.author,
-        "created_at": post.created_at.isoformat() if post.created_at else None,
-        "updated_at": post.updated_at.isoformat() if post.updated_at else None,
-    }
-
-def export_posts_to_json():
+def export_posts(path: str, fmt: str = "json", gzip: bool = False, batch_size: int = DEFAULT_BATCH_SIZE, **filters) -> int:
+    """
+    Stream posts to a file in batches; memory use does not grow with the table.
+    Returns:
+        int: Number of bytes written
+    """
     db: Session = SessionLocal()
+    written = 0
     try:
-        posts = db.query(Post).order_by(Post.timestamp.desc()).all()
-        posts_data = [post_to_dict(p) for p in posts]
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump({"posts": posts_data}, f, ensure_ascii=False, indent=2)
-        print(f"Exported {len(posts_data)} posts to {output_path}")
+        with open(path, 'wb') as f:
+            for chunk in export_chunks(db, fmt=fmt, gzip=gzip, batch_size=batch_size, **filters):
+                f.write(chunk)
+                written += len(chunk)
     finally:
         db.close()
+    return written
+
+def export_posts_to_json():
+    written = export_posts(output_path, fmt="json")
+    print(f"Exported posts ({written} bytes) to {output_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Export posts as JSON, NDJSON or CSV.")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="json")
+    parser.add_argument("--output", help="Output file (default: rss_feeds.json, or posts.<format>[.gz])")
+    parser.add_argument("--gzip", action="store_true", help="Gzip the output")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--source", action="append", help="Filter by source (repeatable)")
+    parser.add_argument("--category")
+    parser.add_argument("--tag")
+    parser.add_argument("--tag-status")
+    parser.add_argument("--start-date", help="YYYY-MM-DD")
+    parser.add_argument("--end-date", help="YYYY-MM-DD")
+    args = parser.parse_args()
+
+    path = args.output
+    if not path:
+        if args.format == "json" and not args.gzip:
+            path = output_path
+        else:
+            path = f"posts.{args.format}" + (".gz" if args.gzip else "")
+    written = export_posts(
+        path,
+        fmt=args.format,
+        gzip=args.gzip,
+        batch_size=args.batch_size,
+        sources=args.source,
+        category=args.category,
+        tag=args.tag,
+        tag_status=args.tag_status,
+        start_date=args.start_date,
+        end_date=args.end_date,
+    )
+    print(f"Exported posts ({written} bytes) to {path}")
 
 if __name__ == "__main__":
-    export_posts_to_json() 
\ No newline at end of file
+    main()
@@ -6,25 +6,34 @@ from datetime import datetime, timezone
 from backend.app.db.database import SessionLocal
 from backend.app.db.models import RssScrapeRun
 from backend.app.scrapers.rss_scraper import scrape_and_save_rss_feed
+from backend.app.utils.data_versions import data_versions, RSS_RUNS
 
-# Configure logging
-log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
-os.makedirs(log_dir, exist_ok=True)
-log_file = os.path.join(log_dir, 'rss_scraper.log')
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s %(levelname)s %(name)s %(message)s',
-    handlers=[
-        logging.FileHandler(log_file, mode='a', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+RSS_SOURCES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'rss_sources.json')
 
-logger = logging.getLogger(__name__)
-logger.info("Starting RSS scraper...")
 
-rss_sources_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'rss_sources.json')
-if os.path.exists(rss_sources_path):
+def configure_logging():
+    log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = os.path.join(log_dir, 'rss_scraper.log')
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)s %(name)s %(message)s',
+        handlers=[
+            logging.FileHandler(log_file, mode='a', encoding='utf-8'),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
+
+def run_scrape(rss_sources_path: str = RSS_SOURCES_PATH) -> dict:
+    """
+    Scrape every feed in rss_sources.json, recorded as one RssScrapeRun.
+    Run by the scrape_rss_all job (services/job_handlers.py) or directly.
+    Returns:
+        dict: Run id and source/article counts
+    """
+    if not os.path.exists(rss_sources_path):
+        raise FileNotFoundError(f"rss_sources.json not found at {rss_sources_path}")
     with open(rss_sources_path, 'r', encoding='utf-8') as f:
         feeds = json.load(f)
     db = SessionLocal()
@@ -36,6 +45,8 @@ if os.path.exists(rss_sources_path):
     db.add(run)
     db.commit()
     db.refresh(run)
+    run_id = run.id
+    data_versions.bump(RSS_RUNS)
     imported_count = 0
     skipped_count = 0
     failed_count = 0
@@ -82,6 +93,7 @@ if os.path.exists(rss_sources_path):
         run.error_message = None
         run.skipped_sources_details = json.dumps(skipped_sources_details, ensure_ascii=False)
         db.commit()
+        data_versions.bump(RSS_RUNS)
         logging.info(f"RSS import complete. Imported: {imported_count}, Skipped: {skipped_count}, Failed: {failed_count}, Total: {len(feeds)}.")
     except Exception as e:
         end_time = datetime.utcnow()
@@ -91,8 +103,25 @@ if os.path.exists(rss_sources_path):
         run.error_message = str(e)
         run.skipped_sources_details = json.dumps(skipped_sources_details, ensure_ascii=False)
         db.commit()
+        data_versions.bump(RSS_RUNS)
         logging.error(f"RSS scraping run failed: {e}")
+        raise
     finally:
         db.close()
-else:
-    logging.error(f"rss_sources.json not found at {rss_sources_path}") 
\ No newline at end of file
+    return {
+        "run_id": run_id,
+        "sources": len(feeds),
+        "captured": imported_count,
+        "skipped": skipped_count,
+        "failed": failed_count,
+        "articles": article_count,
+    }
+
+
+if __name__ == "__main__":
+    configure_logging()
+    logging.info("Starting RSS scraper...")
+    try:
+        run_scrape()
+    except FileNotFoundError as e:
+        logging.error(str(e))
@@ -0,0 +1,29 @@
+import os
+import argparse
+from backend.app.db.database import SessionLocal
+from backend.app.services.snapshot_export_service import SnapshotExportService, SNAPSHOT_TABLES, DEFAULT_BATCH_SIZE
+from sqlalchemy.orm import Session
+
+# Default location of the Parquet snapshot datasets
+output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'snapshots')
+
+def main():
+    parser = argparse.ArgumentParser(description="Write an incremental Parquet snapshot of posts, tags, runs and summaries.")
+    parser.add_argument("--output-dir", default=output_dir)
+    parser.add_argument("--table", action="append", choices=SNAPSHOT_TABLES, help="Table to export (repeatable, default: all)")
+    parser.add_argument("--full", action="store_true", help="Ignore the saved watermark and export every row")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    db: Session = SessionLocal()
+    try:
+        service = SnapshotExportService(db, args.output_dir, batch_size=args.batch_size)
+        result = service.run(tables=args.table or SNAPSHOT_TABLES, full=args.full)
+    finally:
+        db.close()
+    print(f"Snapshot {result['snapshot_id']} written to {args.output_dir}")
+    for table, rows in result["tables"].items():
+        print(f"  {table:<10}: {rows} changed rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import argparse
+from backend.app.db.database import SessionLocal
+from backend.app.services.tagging_cache import TaggingCache
+from sqlalchemy.orm import Session
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or purge the content-hash tagging cache.")
+    parser.add_argument("--purge", action="store_true", help="Delete entries from older prompt versions or models")
+    args = parser.parse_args()
+
+    db: Session = SessionLocal()
+    try:
+        cache = TaggingCache()
+        if args.purge:
+            print(f"Purged {cache.purge_stale(db)} stale entries")
+        for key, value in cache.stats(db).items():
+            print(f"  {key:<15}: {value}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
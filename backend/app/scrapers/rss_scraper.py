@@ -14,6 +14,10 @@ from bs4 import BeautifulSoup
 from sqlalchemy.orm import Session
 from ..db.models import Post
 import logging
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db import async_queries
+from ..utils.data_versions import data_versions, POSTS
 
 class RSSFeedError(Exception):
     """Base class for RSS feed errors."""
@@ -185,6 +189,8 @@ def save_posts_to_db(db: Session, posts: list):
             continue
     try:
         db.commit()
+        if new_posts:
+            data_versions.bump(POSTS)
         logging.info(f"Saved {new_posts} new posts to the database (out of {len(posts)} scraped).")
     except Exception as e:
         logging.error(f"Error committing posts to database: {str(e)}")
@@ -211,4 +217,18 @@ def scrape_and_save_rss_feed(db: Session, url: str, source: str, platform: str =
     posts = scrape_rss_feed(url, source, platform)
     save_posts_to_db(db, posts)
     logging.info(f"Scrape and save complete for feed: {source} ({url})")
-    return posts 
\ No newline at end of file
+    return posts
+
+async def scrape_and_save_rss_feed_async(session: AsyncSession, url: str, source: str, platform: str = "RSS"):
+    """
+    Async variant of scrape_and_save_rss_feed. The blocking feed fetch runs in a
+    worker thread and posts are saved through an AsyncSession.
+
+    Returns:
+        list: List of post dictionaries (all posts scraped, not just new ones)
+    """
+    logging.info(f"Starting async scrape and save for feed: {source} ({url})")
+    posts = await asyncio.to_thread(scrape_rss_feed, url, source, platform)
+    await async_queries.save_posts(session, posts)
+    logging.info(f"Scrape and save complete for feed: {source} ({url})")
+    return posts
@@ -5,6 +5,7 @@ from typing import List, Dict
 from ..db.models import Post
 from sqlalchemy.orm import Session
 import logging
+from ..utils.data_versions import data_versions, POSTS
 
 class SubstackScraperError(Exception):
     pass
@@ -83,6 +84,8 @@ def save_substack_articles(db: Session, articles: List[Dict]) -> List[Post]:
             continue
 
     db.commit()
+    if saved_posts:
+        data_versions.bump(POSTS)
     return saved_posts
 
 def scrape_and_save_substack(db: Session, url: str) -> List[Post]:
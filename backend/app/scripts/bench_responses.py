@@ -0,0 +1,103 @@
+"""
+Benchmark the real /api/posts handler (backend.app.main.app): bytes on the
+wire and p50/p95 latency uncompressed, with gzip and with brotli (when installed).
+
+The app is imported against a throwaway SQLite database (and data version
+directory, LLM cache) seeded with --posts posts, so the app's own database is
+not touched.
+
+Usage:
+    python -m backend.app.scripts.bench_responses --posts 2000 --limit 200 --requests 50
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def seed(session_factory, num_posts: int):
+    from backend.app.db.models import Post
+    base = datetime(2025, 5, 1)
+    paragraph = "Researchers released a new open-weight model with improved reasoning benchmarks. " * 25
+    with session_factory() as db:
+        db.add_all([
+            Post(
+                source="arXiv" if i % 3 else "OpenAI Blog",
+                platform="RSS",
+                url=f"https://example.com/posts/{i}",
+                title=f"Post {i}: scaling laws revisited",
+                content=paragraph,
+                timestamp=base + timedelta(hours=i),
+                thumbnail="https://placehold.co/64x64?text=No+Image",
+                author="Example Author",
+                tags='["LLM", "Scaling", "Benchmarks"]',
+                category="AI Research",
+                tag_status="tagged",
+            )
+            for i in range(num_posts)
+        ])
+        db.commit()
+
+
+def measure(client, path: str, num_requests: int, accept_encoding: str) -> dict:
+    headers = {"Accept-Encoding": accept_encoding}
+    client.get(path, headers=headers)  # warm up
+    latencies = []
+    wire_bytes = 0
+    for _ in range(num_requests):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        wire_bytes = int(response.headers.get("content-length", len(response.content)))
+    latencies.sort()
+    return {
+        "bytes": wire_bytes,
+        "encoding": response.headers.get("content-encoding", "identity"),
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[max(0, int(len(latencies) * 0.95) - 1)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=2000, help="Posts to seed")
+    parser.add_argument("--limit", type=int, default=200, help="Page size requested (max 200)")
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-responses-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'posts.db')}"
+    os.environ["DATA_VERSION_DIR"] = os.path.join(workdir, "data_versions")
+    os.environ["LLM_CACHE_DIR"] = os.path.join(workdir, "llm_cache")
+    # main.py logs every request and runs its console menu on stdout; keep both out of the results
+    logging.disable(logging.INFO)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            from fastapi.testclient import TestClient
+            from backend.app.db.database import SessionLocal
+            from backend.app.main import app
+            from backend.app.utils.compression import brotli
+            seed(SessionLocal, args.posts)
+            client = TestClient(app)
+            path = f"/api/posts?limit={args.limit}"
+            variants = [("identity", "identity"), ("gzip", "gzip")]
+            if brotli is not None:
+                variants.append(("br", "br, gzip"))
+            results = [(name, measure(client, path, args.requests, accept)) for name, accept in variants]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"GET {path} over {args.posts} seeded posts, {args.requests} requests each")
+    print(f"{'accept-encoding':<18}{'encoding':<10}{'bytes':>12}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, r in results:
+        print(f"{name:<18}{r['encoding']:<10}{r['bytes']:>12}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
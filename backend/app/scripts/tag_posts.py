@@ -4,34 +4,24 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from app.db.database import SessionLocal
 from app.services.tagging_service import TaggingService
+from app.services.tagging_worker import TaggingWorker, WorkerLockHeld
 import logging
-import time
+import signal
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def main():
-    db = SessionLocal()
-    tagging_service = TaggingService()
-    
+    worker = TaggingWorker(TaggingService(), SessionLocal)
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
     try:
-        while True:
-            # Tag the last 3 untagged posts
-            stats = tagging_service.tag_new_posts(db, batch_size=3)
-            logger.info(f"Tagged batch: {stats}")
-            
-            if stats["total_processed"] == 0:
-                logger.info("No untagged posts found")
-                # Wait for 1 minute before checking again
-                time.sleep(60)
-            else:
-                # If we found and processed posts, check again immediately
-                continue
-                
+        worker.run()
+    except WorkerLockHeld as e:
+        # Launching again while a worker runs is harmless
+        logger.info(f"{e}; exiting")
     except KeyboardInterrupt:
         logger.info("Tagging process interrupted by user")
-    finally:
-        db.close()
+        worker.stop()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
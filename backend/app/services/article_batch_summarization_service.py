@@ -1,70 +1,222 @@
+import asyncio
 import logging
+import inspect
+import os
+from contextlib import aclosing
+from typing import Tuple
+from ..utils.rate_limiter import TokenRateLimiter
+from .article_summarization_service import ARTICLE_MAX_OUTPUT_TOKENS
+from .prompt_builder import PromptBuilder, PromptStats, count_tokens, log_stats
+from .hierarchical_summarizer import HierarchicalSummarizer
 
 logger = logging.getLogger(__name__)
 
+# Token budgets for the combined summary: whole prompt, each article, and the reply
+SUMMARY_PROMPT_TOKENS = int(os.getenv("SUMMARY_PROMPT_TOKENS", "12000"))
+SUMMARY_ITEM_TOKENS = int(os.getenv("SUMMARY_ITEM_TOKENS", "600"))
+SUMMARY_MAX_OUTPUT_TOKENS = int(os.getenv("SUMMARY_MAX_OUTPUT_TOKENS", "1500"))
+# Per-article summaries: calls in flight, provider TPM budget, and summaries stored per commit
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "4"))
+SUMMARY_TOKENS_PER_MINUTE = int(os.getenv("SUMMARY_TOKENS_PER_MINUTE", "60000"))
+SUMMARY_COMMIT_EVERY = int(os.getenv("SUMMARY_COMMIT_EVERY", "20"))
+
+COMBINED_SYSTEM_PROMPT = (
+    "You are an expert analyst tracking AI and tech news."
+    " Read through them as a whole and extract the most important"
+    " overarching trends, themes, or insights."
+    " Do not summarize each article individually—"
+    "combine the information to generate a single unified list of key takeaways.:"
+    "- Group related articles into themes"
+    "- Provide a bullet list of the **most important updates**"
+    "- Identify any **emerging trends or patterns**"
+    "- End with a short executive summary (3 sentences max)"
+    "- Reference claims where possible with source and URLs"
+    "Output format:"
+    "## Themes"
+    "- Theme Name: summary and which articles relate"
+    "[...]"
+    "## Key Updates"
+    "- Bullet list of top news"
+    "[...]"
+    "## Executive Summary"
+    "- 3 sentences max"
+)
+
+async def _resolve(value):
+    # Fetch and storage services may be sync (Session) or async (AsyncSession) implementations
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
 class ArticleBatchSummarizationService:
-    def __init__(self, fetch_service, summarization_service, storage_service):
+    def __init__(self, fetch_service, summarization_service, storage_service, summarizer=None,
+                 max_concurrency: int = SUMMARY_CONCURRENCY,
+                 tokens_per_minute: int = SUMMARY_TOKENS_PER_MINUTE,
+                 commit_every: int = SUMMARY_COMMIT_EVERY):
         self.fetch_service = fetch_service
         self.summarization_service = summarization_service
         self.storage_service = storage_service
+        # Map-reduce path for digests that do not fit one prompt (no chunk cache unless given one)
+        self.summarizer = summarizer or HierarchicalSummarizer(summarization_service.lm_client)
+        self.max_concurrency = max(1, max_concurrency)
+        # Shared by every request this service handles
+        self.limiter = TokenRateLimiter(tokens_per_minute)
+        self.commit_every = max(1, commit_every)
 
-    async def summarize_articles(self, sources, start_date, end_date):
-        logger.info("Called summarize_articles (per-article)")
-        summaries = []
+    async def fetch_articles(self, sources, start_date, end_date):
+        all_posts = []
         for source in sources:
-            posts = self.fetch_service.fetch_articles(source, start_date, end_date)
-            for post in posts:
-                summary = await self.summarization_service.summarize_article(post)
-                self.storage_service.store_summary(post.id, summary)
-                summaries.append({"post_id": post.id, "source": source, "summary": summary})
-        return summaries
+            posts = await _resolve(self.fetch_service.fetch_articles(source, start_date, end_date))
+            all_posts.extend(posts)
+        return all_posts
+
+    async def summarize_articles(self, sources, start_date, end_date, policy=None, on_progress=None):
+        """
+        Summarize and store each article, up to max_concurrency at a time under
+        the tokens-per-minute limiter. With a PriorityPolicy the articles the
+        user cares about most are started first; otherwise source by source.
+        Summaries are stored commit_every at a time. Results keep that order;
+        an article whose call failed gets {"post_id", "source", "error"}
+        instead of a summary and does not stop the rest.
+        on_progress (sync or async) is called with done, failed and total
+        keywords before the first article and after each one.
+        """
+        logger.info("Called summarize_articles (per-article)")
+        posts = await self.fetch_articles(sources, start_date, end_date)
+        if policy is not None:
+            posts = policy.rank(posts)
+        results = [None] * len(posts)
+        done = failed = 0
+        if on_progress is not None:
+            await _resolve(on_progress(done=0, failed=0, total=len(posts)))
+        async for index, result in self._summarize_posts(posts):
+            results[index] = result
+            done += 1
+            failed += "error" in result
+            if on_progress is not None:
+                await _resolve(on_progress(done=done, failed=failed, total=len(posts)))
+        failed = sum(1 for r in results if "error" in r)
+        if failed:
+            logger.warning(f"{failed} of {len(posts)} article summaries failed")
+        return results
+
+    async def iter_article_summaries(self, sources, start_date, end_date, policy=None):
+        """
+        Same work as summarize_articles, yielding each result as soon as its
+        article is done. Closing the generator cancels the calls still running.
+        """
+        posts = await self.fetch_articles(sources, start_date, end_date)
+        if policy is not None:
+            posts = policy.rank(posts)
+        async with aclosing(self._summarize_posts(posts)) as results:
+            async for _, result in results:
+                yield result
 
-    async def summarize_articles_combined(self, sources, start_date, end_date):
+    async def _summarize_posts(self, posts):
+        """Yield (index in posts, result) in completion order, storing summaries in batches."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def summarize(index, post):
+            async with semaphore:
+                try:
+                    prompt = self.summarization_service.build_prompt(post)
+                    await self.limiter.acquire(count_tokens(prompt) + ARTICLE_MAX_OUTPUT_TOKENS)
+                    return index, await self.summarization_service.summarize_article(post, prompt)
+                except Exception as e:
+                    logger.error(f"Summarizing post {post.id} failed: {e}")
+                    return index, e
+
+        tasks = [asyncio.ensure_future(summarize(i, post)) for i, post in enumerate(posts)]
+        pending = []
+        try:
+            for finished in asyncio.as_completed(tasks):
+                index, outcome = await finished
+                post = posts[index]
+                if isinstance(outcome, Exception):
+                    yield index, {"post_id": post.id, "source": post.source, "error": str(outcome)}
+                    continue
+                pending.append((post.id, outcome))
+                if len(pending) >= self.commit_every:
+                    batch, pending = pending, []
+                    await _resolve(self.storage_service.store_summaries(batch))
+                yield index, {"post_id": post.id, "source": post.source, "summary": outcome}
+            if pending:
+                batch, pending = pending, []
+                await _resolve(self.storage_service.store_summaries(batch))
+        finally:
+            for task in tasks:
+                task.cancel()
+            if pending:
+                # Stopped early: keep the summaries already paid for
+                try:
+                    await _resolve(self.storage_service.store_summaries(pending))
+                except Exception as e:
+                    logger.warning(f"Could not store {len(pending)} summaries: {e}")
+
+    async def summarize_articles_combined(self, sources, start_date, end_date, on_progress=None):
+        """
+        One digest of all the articles. on_progress (sync or async) is called
+        once with the article count and whether the digest is built hierarchically.
+        """
         logger.info("Called summarize_articles_combined")
         # Gather all posts from all sources in the date range
-        all_posts = []
-        for source in sources:
-            posts = self.fetch_service.fetch_articles(source, start_date, end_date)
-            all_posts.extend(posts)
+        all_posts = await self.fetch_articles(sources, start_date, end_date)
         if not all_posts:
             return "No articles found for the given sources and date range."
 
-        # Build a prompt listing all articles
-        prompt_lines = []
-        for idx, post in enumerate(all_posts, 1):
-            prompt_lines.append(f"Article {idx}:")
-            prompt_lines.append(f"Source: {getattr(post, 'source', '')}")
-            prompt_lines.append(f"URL: {getattr(post, 'url', '')}")
-            prompt_lines.append(f"Publish Date: {getattr(post, 'timestamp', '')}")
-            prompt_lines.append(f"Title: {getattr(post, 'title', '')}")
-            prompt_lines.append(f"Content: {getattr(post, 'content', '')}")
-            prompt_lines.append(f"Author: {getattr(post, 'author', '')}")
-            prompt_lines.append("")
-        prompt = "\n".join(prompt_lines)
+        prompt, stats = self.build_combined_prompt(all_posts)
+        # Articles shortened only to the per-article cap still fit one prompt
+        hierarchical = bool(stats.dropped or stats.squeezed)
+        if on_progress is not None:
+            await _resolve(on_progress(articles=len(all_posts), hierarchical=hierarchical))
+        if hierarchical:
+            # The articles overflow the prompt: summarize chunks, then merge the notes
+            logger.info(f"{len(all_posts)} articles exceed one prompt ({stats.squeezed} squeezed, "
+                        f"{stats.dropped} dropped); summarizing hierarchically")
+            return await self.summarizer.summarize(all_posts, COMBINED_SYSTEM_PROMPT, SUMMARY_MAX_OUTPUT_TOKENS)
+        log_stats(stats, "Combined summary prompt")
+        logger.debug(f"Combined prompt: {prompt}")
+        return await self.summarization_service.lm_client.generate_response(
+            prompt, COMBINED_SYSTEM_PROMPT, max_tokens=SUMMARY_MAX_OUTPUT_TOKENS
+        )
 
-        logger.info(f"Combined prompt: {prompt}")
+    async def stream_articles_combined(self, sources, start_date, end_date):
+        """Like summarize_articles_combined, but yields the digest as the model writes it."""
+        all_posts = await self.fetch_articles(sources, start_date, end_date)
+        if not all_posts:
+            yield "No articles found for the given sources and date range."
+            return
+        prompt, stats = self.build_combined_prompt(all_posts)
+        if stats.dropped or stats.squeezed:
+            pieces = self.summarizer.stream(all_posts, COMBINED_SYSTEM_PROMPT, SUMMARY_MAX_OUTPUT_TOKENS)
+        else:
+            log_stats(stats, "Combined summary prompt")
+            pieces = self.summarization_service.lm_client.stream_response(
+                prompt, COMBINED_SYSTEM_PROMPT, max_tokens=SUMMARY_MAX_OUTPUT_TOKENS
+            )
+        async with aclosing(pieces):
+            async for piece in pieces:
+                yield piece
 
-        # Use the same system prompt as in ArticleSummarizationService
-        system_prompt = (
-            "You are an expert analyst tracking AI and tech news."
-            " Read through them as a whole and extract the most important"
-            " overarching trends, themes, or insights."
-            " Do not summarize each article individually—"
-            "combine the information to generate a single unified list of key takeaways.:"
-            "- Group related articles into themes"
-            "- Provide a bullet list of the **most important updates**"
-            "- Identify any **emerging trends or patterns**"
-            "- End with a short executive summary (3 sentences max)"
-            "- Reference claims where possible with source and URLs"
-            "Output format:"
-            "## Themes"
-            "- Theme Name: summary and which articles relate"
-            "[...]"
-            "## Key Updates"
-            "- Bullet list of top news"
-            "[...]"
-            "## Executive Summary"
-            "- 3 sentences max"
-        )
-        return await self.summarization_service.lm_client.generate_response(prompt, system_prompt)
+    @staticmethod
+    def build_combined_prompt(posts, total_budget: int = SUMMARY_PROMPT_TOKENS,
+                              item_budget: int = SUMMARY_ITEM_TOKENS) -> Tuple[str, PromptStats]:
+        """
+        One prompt listing the articles in order, each body cut to its most
+        informative sentences so the whole prompt stays within total_budget.
+        Articles that no longer fit are left out (latest in the list first).
+        """
+        builder = PromptBuilder(total_budget, item_budget)
+        for idx, post in enumerate(posts, 1):
+            header = (
+                f"Article {idx}:\n"
+                f"Source: {getattr(post, 'source', '')}\n"
+                f"URL: {getattr(post, 'url', '')}\n"
+                f"Publish Date: {getattr(post, 'timestamp', '')}\n"
+                f"Title: {getattr(post, 'title', '')}\n"
+                f"Author: {getattr(post, 'author', '')}\n"
+                "Content: "
+            )
+            builder.add(getattr(post, 'content', ''), header=header, title=getattr(post, 'title', '') or "")
+        return builder.build(system_prompt=COMBINED_SYSTEM_PROMPT)
     
\ No newline at end of file
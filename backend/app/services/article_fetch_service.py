@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from backend.app.db.models import Post
 from datetime import datetime
+from backend.app.db import async_queries
+from backend.app.services.retention_service import hydrate_bodies
 
 class ArticleFetchService:
     def __init__(self, db_session: Session):
@@ -13,8 +15,21 @@ class ArticleFetchService:
             date_end = datetime.strptime(end_date, "%Y-%m-%d").replace(hour=23, minute=59, second=59)
         except ValueError:
             raise ValueError(f"start_date and end_date must be in YYYY-MM-DD format. Got start_date='{start_date}', end_date='{end_date}'")
-        return self.db_session.query(Post).filter(
+        posts = self.db_session.query(Post).filter(
             Post.source == source,
             Post.timestamp >= date_start,
             Post.timestamp <= date_end
-        ).all() 
\ No newline at end of file
+        ).all()
+        return hydrate_bodies(self.db_session, posts)
+
+class AsyncArticleFetchService:
+    """
+    Async counterpart of ArticleFetchService. Opens a short-lived AsyncSession
+    per call instead of holding one session for the life of the process.
+    """
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    async def fetch_articles(self, source: str, start_date: str, end_date: str):
+        async with self.session_factory() as session:
+            return await async_queries.fetch_articles(session, [source], start_date, end_date)
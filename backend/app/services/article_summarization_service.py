@@ -1,44 +1,51 @@
+import os
 from backend.app.services.lm_studio_client import LMStudioClient
+from backend.app.services.prompt_builder import PromptBuilder, log_stats
 from backend.app.db.models import Post
 
+# Token budgets for one article's summary prompt and reply
+ARTICLE_PROMPT_TOKENS = int(os.getenv("ARTICLE_PROMPT_TOKENS", "3000"))
+ARTICLE_MAX_OUTPUT_TOKENS = int(os.getenv("ARTICLE_MAX_OUTPUT_TOKENS", "600"))
+
+SYSTEM_PROMPT = (
+    "You are an expert analyst tracking AI and tech news."
+    "Based on this article, generate a summary following the instructions below:"
+    "- Provide a bullet list of the **most important updates**"
+    "- Identify any **emerging trends or patterns**"
+    "- End with a short executive summary (3 sentences max)"
+    "- Reference claims where possible with source and URLs"
+    "Output format:"
+    "## Key Updates"
+    "- Bullet list of top news"
+    "[...]"
+    "## Executive Summary"
+    "- 3 sentences max"
+)
+
 class ArticleSummarizationService:
     def __init__(self, lm_client: LMStudioClient):
         self.lm_client = lm_client
 
-    async def summarize_article(self, post: Post):
-        prompt = (
-            "You are given a list of recent AI-related articles."
-            "Read through them as a whole and extract the most important overarching trends, themes, or" 
-            "insights."
-            "Do not summarize each article individually—combine the information to generate a single unified list of key takeaways."
-            "Article 1:\n"
-            "Source: {post.source}\n"
-            "URL: {post.url}\n"
-            "Publish Date: {post.timestamp}\n"
-            "Title: {post.title}\n"
-            "Content: {post.content}\n"
-            "Author: {post.author}\n"
-            "Article 2:\n"
-            "Source: ...\n"
-            "...\n"
+    def build_prompt(self, post: Post) -> str:
+        builder = PromptBuilder(ARTICLE_PROMPT_TOKENS, ARTICLE_PROMPT_TOKENS)
+        builder.add(
+            post.content,
+            header=(
+                "Summarize the key points of this AI-related article.\n"
+                f"Source: {post.source}\n"
+                f"URL: {post.url}\n"
+                f"Publish Date: {post.timestamp}\n"
+                f"Title: {post.title}\n"
+                f"Author: {post.author}\n"
+                "Content: "
+            ),
+            title=post.title or "",
         )
-        system_prompt = (
-            "You are an expert analyst tracking AI and tech news."
-            "Based on this list, generate one summary of the data based on the instructions below:"
-            "- Group related articles into themes"
-            "- Provide a bullet list of the **most important updates**"
-            "- Identify any **emerging trends or patterns**"
-            "- End with a short executive summary (3 sentences max)"
-            "- Reference claims where possible with source and URLs"
-            "Output format:"
-            "## Themes"
-            "- Theme Name: summary and which articles relate"
-            "[...]"
-            "## Key Updates"
-            "- Bullet list of top news"
-            "[...]"
-            "## Executive Summary"
-            "- 3 sentences max"
+        prompt, stats = builder.build(system_prompt=SYSTEM_PROMPT)
+        log_stats(stats, f"Summary prompt for post {post.id}")
+        return prompt
+
+    async def summarize_article(self, post: Post, prompt: str = None):
+        return await self.lm_client.generate_response(
+            prompt or self.build_prompt(post), SYSTEM_PROMPT, max_tokens=ARTICLE_MAX_OUTPUT_TOKENS
         )
-        return await self.lm_client.generate_response(prompt, system_prompt) 
-    
\ No newline at end of file
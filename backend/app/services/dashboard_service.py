@@ -0,0 +1,64 @@
+import json
+import os
+from datetime import date
+from typing import List, Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from backend.app.db.models import Post, UserPreferences
+from backend.app.services.post_query_service import PostQueryService, DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+
+# Seconds a built dashboard payload is reused (entries are also keyed by data versions)
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "30"))
+
+
+class DashboardService:
+    """
+    Everything the dashboard renders on load, gathered with indexed queries:
+    the day's posts matching the user's preferences, saved posts and preferences.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.query_service = PostQueryService(db_session)
+
+    def get_preferences(self) -> dict:
+        prefs = self.db_session.get(UserPreferences, 1)
+        return {
+            "preferred_sources": prefs.get_sources() if prefs else [],
+            "preferred_categories": prefs.get_categories() if prefs else [],
+        }
+
+    def todays_posts(self, day: date, sources: List[str], categories: List[str], limit: int = MAX_PAGE_LIMIT):
+        """
+        Cards for posts published on day, newest first, that match a preferred source
+        or a preferred category (by category or tag); all of the day's posts if no
+        preferences are set. The date bounds use the (timestamp, id) index.
+        Returns:
+            tuple: (posts, truncated) where truncated means more than limit matched
+        """
+        query = self.query_service.filtered_query(start_date=day.isoformat(), end_date=day.isoformat())
+        clauses = []
+        if sources:
+            clauses.append(Post.source.in_(sources))
+        if categories:
+            clauses.append(Post.category.in_(categories))
+            clauses.extend(Post.tags.contains(json.dumps(c), autoescape=True) for c in categories)
+        if clauses:
+            query = query.filter(or_(*clauses))
+        query = self.query_service.with_card_projection(query)
+        rows = query.order_by(Post.timestamp.desc(), Post.id.desc()).limit(limit + 1).all()
+        return rows[:limit], len(rows) > limit
+
+    def bootstrap(self, day: date, saved_limit: int = DEFAULT_PAGE_LIMIT) -> dict:
+        preferences = self.get_preferences()
+        posts, truncated = self.todays_posts(day, preferences["preferred_sources"], preferences["preferred_categories"])
+        saved, saved_cursor = self.query_service.list_saved(limit=saved_limit)
+        return {
+            "date": day.isoformat(),
+            "posts": posts,
+            "truncated": truncated,
+            "saved_ids": self.query_service.saved_post_ids(),
+            "saved": saved,
+            "saved_next_cursor": saved_cursor,
+            "preferences": preferences,
+        }
@@ -0,0 +1,137 @@
+import json
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from backend.app.db.models import Post
+from backend.app.services.retention_service import load_archived_bodies
+from backend.app.utils.aho_corasick import AhoCorasick
+from backend.app.utils.data_versions import data_versions, POSTS
+
+GAZETTEER_PATH = os.getenv(
+    "ENTITY_GAZETTEER_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "entity_gazetteer.json"),
+)
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _lower(text: str) -> str:
+    """Lowercase without changing the length, so match offsets index the original text."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class EntityTagger:
+    """
+    Deterministic tagger for known models, labs, companies and products.
+    Every name and alias in the gazetteer goes into one Aho-Corasick automaton,
+    so a post is scanned once however many entities there are. Matches must
+    start and end on word boundaries; overlapping matches keep the longest.
+    """
+
+    def __init__(self, entities: Sequence[dict]):
+        self.automaton = AhoCorasick()
+        self.names = []
+        for entry in entities:
+            name = entry["name"]
+            self.names.append(name)
+            case_sensitive = bool(entry.get("case_sensitive"))
+            for alias in [name] + list(entry.get("aliases", [])):
+                self.automaton.add(_lower(alias), (name, alias if case_sensitive else None))
+        self.automaton.build()
+
+    @classmethod
+    def from_file(cls, path: str = GAZETTEER_PATH) -> "EntityTagger":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["entities"])
+
+    def find(self, text: Optional[str]) -> List[str]:
+        """Canonical names of the entities mentioned in text, in order of first mention."""
+        if not text:
+            return []
+        lowered = _lower(text)
+        end_of_text = len(text)
+        matches = []
+        for start, end, (name, exact) in self.automaton.iter(lowered):
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if end < end_of_text and _is_word_char(text[end]):
+                continue
+            if exact is not None and text[start:end] != exact:
+                continue
+            matches.append((start, end, name))
+        # Longest match wins where matches overlap, e.g. "Google DeepMind" over "Google"
+        matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        found = []
+        covered_to = 0
+        for start, end, name in matches:
+            if start < covered_to:
+                continue
+            covered_to = end
+            if name not in found:
+                found.append(name)
+        return found
+
+    def tag_post(self, post: Post, body: Optional[str] = None) -> bool:
+        """
+        Recompute post.entities from title and body (default post.content) and
+        swap them into post.tags, keeping tags from other taggers.
+        Returns:
+            bool: True if entities or tags changed
+        """
+        entities = self.find(f"{post.title or ''}\n{post.content if body is None else body}")
+        old_entities, old_tags = post.get_entities(), post.get_tags()
+        post.set_entities(entities)
+        post.apply_tags([t for t in old_tags if t not in old_entities])
+        return entities != old_entities or post.get_tags() != old_tags
+
+    def backfill(self, db_session: Session, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+        """
+        Tag every stored post, in id order with one commit per batch. Archived
+        posts are scanned with their full body.
+        Returns:
+            dict: Posts scanned and updated
+        """
+        stats = {"scanned": 0, "updated": 0}
+        last_id = 0
+        while True:
+            posts = db_session.query(Post).filter(Post.id > last_id).order_by(Post.id).limit(batch_size).all()
+            if not posts:
+                break
+            last_id = posts[-1].id
+            bodies = load_archived_bodies(db_session, [p.id for p in posts if p.archived_at is not None])
+            updates = []
+            for post in posts:
+                if self.tag_post(post, bodies.get(post.id)):
+                    updates.append({"id": post.id, "entities": post.entities, "tags": post.tags})
+            # Bulk UPDATE by primary key rather than flushing each object
+            db_session.expunge_all()
+            if updates:
+                db_session.execute(update(Post), updates)
+            db_session.commit()
+            stats["scanned"] += len(posts)
+            stats["updated"] += len(updates)
+        if stats["updated"]:
+            data_versions.bump(POSTS)
+        logging.info(f"Entity tagger scanned {stats['scanned']} posts, updated {stats['updated']}")
+        return stats
+
+
+@lru_cache(maxsize=1)
+def get_entity_tagger() -> Optional[EntityTagger]:
+    """The shared tagger for GAZETTEER_PATH, or None if the gazetteer is missing or invalid."""
+    try:
+        tagger = EntityTagger.from_file(GAZETTEER_PATH)
+    except (OSError, ValueError, KeyError) as e:
+        logging.warning(f"Entity tagging disabled, cannot load gazetteer {GAZETTEER_PATH}: {e}")
+        return None
+    logging.info(f"Loaded {len(tagger.names)} entities ({len(tagger.automaton)} patterns) from {GAZETTEER_PATH}")
+    return tagger
@@ -0,0 +1,324 @@
+"""
+Map-reduce summarization for combined digests too large for one prompt.
+
+Articles are chunked by day and theme (their tagged category). Within a
+chunk the articles are ordered by source, and a theme with too many
+articles for one prompt is split in that order. The same day's articles
+therefore always form the same chunks. Chunks are summarized concurrently
+into short notes (map). The notes are then merged into the final digest
+(reduce), over several rounds if they do not fit in one prompt. Chunk
+notes are cached by content, so a date range that overlaps an earlier
+request only summarizes the days it has not seen.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from backend.app.db.inserts import insert_missing
+from backend.app.db.models import SummaryCacheEntry
+from .prompt_builder import PromptBuilder, count_tokens, log_stats, MESSAGE_OVERHEAD_TOKENS
+
+# Token budgets for one chunk: prompt, each article in it, and the notes returned
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "6000"))
+SUMMARY_CHUNK_ITEM_TOKENS = int(os.getenv("SUMMARY_CHUNK_ITEM_TOKENS", "500"))
+SUMMARY_CHUNK_OUTPUT_TOKENS = int(os.getenv("SUMMARY_CHUNK_OUTPUT_TOKENS", "500"))
+# Prompt budget of each reduce step (merging notes, and the final digest)
+SUMMARY_REDUCE_TOKENS = int(os.getenv("SUMMARY_REDUCE_TOKENS", "12000"))
+# Chunk and merge calls in flight at once
+SUMMARY_MAP_CONCURRENCY = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "4"))
+
+CHUNK_SYSTEM_PROMPT = (
+    "You are an expert analyst tracking AI and tech news."
+    " You get a group of articles on one theme from one day."
+    " Write compact notes for a later digest:"
+    "- One bullet per distinct development, merging articles that report the same thing"
+    "- Keep names, numbers and dates"
+    "- End each bullet with its sources and URLs in parentheses"
+    "- No introduction or conclusion"
+)
+MERGE_SYSTEM_PROMPT = (
+    "You are an expert analyst tracking AI and tech news."
+    " You get notes on groups of articles."
+    " Merge them into one set of compact notes:"
+    "- One bullet per distinct development, combining duplicates"
+    "- Keep names, numbers, dates, sources and URLs"
+    "- Drop minor items first if space is short"
+    "- No introduction or conclusion"
+)
+# Changes whenever the chunk prompt does, so notes from older prompts stop matching
+PROMPT_VERSION = hashlib.sha256(CHUNK_SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:16]
+
+UNCATEGORIZED = "Uncategorized"
+
+
+def article_header(post) -> str:
+    return (
+        f"Source: {getattr(post, 'source', '')}\n"
+        f"URL: {getattr(post, 'url', '')}\n"
+        f"Publish Date: {getattr(post, 'timestamp', '')}\n"
+        f"Title: {getattr(post, 'title', '')}\n"
+        "Content: "
+    )
+
+
+def _day(post) -> str:
+    moment = getattr(post, "timestamp", None) or getattr(post, "created_at", None)
+    return moment.strftime("%Y-%m-%d") if moment else "undated"
+
+
+def _theme(post) -> str:
+    return (getattr(post, "category", None) or "").strip() or UNCATEGORIZED
+
+
+@dataclass
+class Chunk:
+    day: str
+    theme: str
+    posts: list = field(default_factory=list)
+
+    def label(self) -> str:
+        sources = sorted({getattr(p, "source", "") or "" for p in self.posts})
+        return f"{self.day} | {self.theme} | {', '.join(sources)}"
+
+
+def chunk_articles(posts: Sequence, budget: int = SUMMARY_CHUNK_TOKENS,
+                   item_budget: int = SUMMARY_CHUNK_ITEM_TOKENS) -> List[Chunk]:
+    """
+    Group posts by (day, theme), split a group in source order where its
+    articles (each capped at item_budget) would exceed budget.
+    """
+    overhead = count_tokens(CHUNK_SYSTEM_PROMPT) + 2 * MESSAGE_OVERHEAD_TOKENS + 32
+    groups: Dict[Tuple[str, str], list] = {}
+    for post in posts:
+        groups.setdefault((_day(post), _theme(post)), []).append(post)
+    chunks = []
+    for (day, theme), members in sorted(groups.items()):
+        members.sort(key=lambda p: (getattr(p, "source", "") or "", str(getattr(p, "timestamp", "")), getattr(p, "id", 0) or 0))
+        chunk, used = Chunk(day, theme), overhead
+        for post in members:
+            cost = min(count_tokens(getattr(post, "content", "")), item_budget) + count_tokens(article_header(post)) + 2
+            if chunk.posts and used + cost > budget:
+                chunks.append(chunk)
+                chunk, used = Chunk(day, theme), overhead
+            chunk.posts.append(post)
+            used += cost
+        chunks.append(chunk)
+    return chunks
+
+
+class SummaryChunkCache:
+    """
+    Chunk notes keyed by sha256 of the chunk's articles (id, title and body),
+    the prompt version and the model. Methods take a sync Session; writes are
+    flushed with the caller's transaction.
+    """
+
+    def __init__(self, model: str = "", prompt_version: str = PROMPT_VERSION):
+        self.model = model
+        self.prompt_version = prompt_version
+
+    def key(self, chunk: Chunk) -> str:
+        digest = hashlib.sha256(f"{self.prompt_version}\0{self.model}\0{chunk.day}\0{chunk.theme}".encode("utf-8"))
+        for post in chunk.posts:
+            text = f"\0{getattr(post, 'id', '')}\0{getattr(post, 'title', '') or ''}\0{getattr(post, 'content', '') or ''}"
+            digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def lookup(self, session: Session, keys: Iterable[str]) -> Dict[str, str]:
+        keys = list(set(keys))
+        if not keys:
+            return {}
+        now = datetime.utcnow()
+        found = {}
+        for entry in session.query(SummaryCacheEntry).filter(SummaryCacheEntry.key.in_(keys)):
+            entry.hits += 1
+            entry.last_hit_at = now
+            found[entry.key] = entry.summary
+        return found
+
+    def store(self, session: Session, notes: Dict[str, Tuple[str, int]]):
+        """Add (summary, post_count) for keys not cached yet; overlapping digests may store the same keys."""
+        insert_missing(session, SummaryCacheEntry, [
+            {"key": key, "prompt_version": self.prompt_version, "model": self.model,
+             "summary": summary, "post_count": post_count, "hits": 0}
+            for key, (summary, post_count) in notes.items()
+        ])
+
+    def purge_stale(self, session: Session) -> int:
+        """Delete notes written under another prompt version or model. Commits."""
+        deleted = session.query(SummaryCacheEntry).filter(
+            (SummaryCacheEntry.prompt_version != self.prompt_version) | (SummaryCacheEntry.model != self.model)
+        ).delete(synchronize_session=False)
+        session.commit()
+        return deleted
+
+    def stats(self, session: Session) -> dict:
+        current = (SummaryCacheEntry.prompt_version == self.prompt_version) & (SummaryCacheEntry.model == self.model)
+        entries, hits = session.query(
+            func.count(SummaryCacheEntry.key), func.coalesce(func.sum(SummaryCacheEntry.hits), 0)
+        ).filter(current).one()
+        return {"prompt_version": self.prompt_version, "model": self.model, "entries": entries, "hits": int(hits)}
+
+
+class HierarchicalSummarizer:
+    """
+    Args:
+        lm_client: Client with generate_response(prompt, system_prompt, max_tokens)
+        session_factory: Callable returning a sync Session for the chunk cache;
+            None disables caching
+        concurrency: Chunk and merge calls in flight at once
+    """
+
+    def __init__(
+        self,
+        lm_client,
+        session_factory: Optional[Callable[[], Session]] = None,
+        concurrency: int = SUMMARY_MAP_CONCURRENCY,
+        chunk_tokens: int = SUMMARY_CHUNK_TOKENS,
+        chunk_item_tokens: int = SUMMARY_CHUNK_ITEM_TOKENS,
+        chunk_output_tokens: int = SUMMARY_CHUNK_OUTPUT_TOKENS,
+        reduce_tokens: int = SUMMARY_REDUCE_TOKENS,
+    ):
+        self.lm_client = lm_client
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.chunk_tokens = chunk_tokens
+        self.chunk_item_tokens = chunk_item_tokens
+        self.chunk_output_tokens = chunk_output_tokens
+        self.reduce_tokens = reduce_tokens
+        self.cache = SummaryChunkCache(model=getattr(lm_client, "model", "") or "")
+        # Counters of the most recently finished summary; each call keeps its own while it runs
+        self.last_stats: Dict[str, int] = {}
+
+    def _lookup(self, keys: List[str]) -> Dict[str, str]:
+        with self.session_factory() as session:
+            found = self.cache.lookup(session, keys)
+            session.commit()
+            return found
+
+    def _store(self, notes: Dict[str, Tuple[str, int]]):
+        with self.session_factory() as session:
+            self.cache.store(session, notes)
+            session.commit()
+
+    async def _call(self, semaphore: asyncio.Semaphore, stats: Dict[str, int], prompt: str, system_prompt: str,
+                    max_tokens: int) -> str:
+        async with semaphore:
+            stats["llm_calls"] += 1
+            return await self.lm_client.generate_response(prompt, system_prompt, max_tokens=max_tokens)
+
+    def chunk_prompt(self, chunk: Chunk) -> str:
+        builder = PromptBuilder(self.chunk_tokens, self.chunk_item_tokens)
+        for post in chunk.posts:
+            builder.add(getattr(post, "content", ""), header=article_header(post), title=getattr(post, "title", "") or "")
+        prompt, stats = builder.build(preamble=f"Theme: {chunk.theme}\nDate: {chunk.day}\n\n",
+                                      system_prompt=CHUNK_SYSTEM_PROMPT)
+        log_stats(stats, f"Chunk prompt {chunk.label()}")
+        return prompt
+
+    def _notes_prompt(self, notes: Sequence[Tuple[str, str]], system_prompt: str, preamble: str) -> Tuple[str, object]:
+        builder = PromptBuilder(self.reduce_tokens, self.reduce_tokens)
+        for label, text in notes:
+            builder.add(text, header=f"### {label}\n", title=label)
+        return builder.build(preamble=preamble, system_prompt=system_prompt)
+
+    def _pack(self, notes: Sequence[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """Consecutive groups of notes that each fit one merge prompt."""
+        budget = self.reduce_tokens - count_tokens(MERGE_SYSTEM_PROMPT) - 2 * MESSAGE_OVERHEAD_TOKENS - 32
+        groups, current, used = [], [], 0
+        for label, text in notes:
+            cost = count_tokens(text) + count_tokens(label) + 8
+            if current and used + cost > budget:
+                groups.append(current)
+                current, used = [], 0
+            current.append((label, text))
+            used += cost
+        if current:
+            groups.append(current)
+        return groups
+
+    async def _digest_prompt(self, semaphore, stats: Dict[str, int], notes: List[Tuple[str, str]],
+                             system_prompt: str) -> str:
+        preamble = "Notes on the articles, grouped by date and theme:\n\n"
+        while True:
+            prompt, prompt_stats = self._notes_prompt(notes, system_prompt, preamble)
+            groups = self._pack(notes)
+            # Merge rounds until the notes fit whole, or can no longer be combined
+            if not (prompt_stats.dropped or prompt_stats.truncated) or len(groups) >= len(notes):
+                log_stats(prompt_stats, "Digest prompt")
+                return prompt
+            stats["merge_rounds"] += 1
+            merged = await asyncio.gather(*(
+                self._call(semaphore, stats, self._notes_prompt(group, MERGE_SYSTEM_PROMPT, "")[0],
+                           MERGE_SYSTEM_PROMPT, 2 * self.chunk_output_tokens)
+                for group in groups
+            ))
+            notes = [(f"{group[0][0]} ... {group[-1][0]}" if len(group) > 1 else group[0][0], text)
+                     for group, text in zip(groups, merged)]
+
+    async def digest_prompt(self, posts: Sequence, system_prompt: str, stats: Optional[Dict[str, int]] = None) -> str:
+        """
+        Summarize the chunks (map) and merge the notes until they fit the final prompt.
+        Counters for this call are written to stats, if given.
+        """
+        stats = {} if stats is None else stats
+        stats.update(articles=len(posts), chunks=0, cached=0, failed=0, llm_calls=0, merge_rounds=0)
+        chunks = chunk_articles(posts, self.chunk_tokens, self.chunk_item_tokens)
+        stats["chunks"] = len(chunks)
+        keys = [self.cache.key(chunk) for chunk in chunks]
+        cached = await asyncio.to_thread(self._lookup, keys) if self.session_factory else {}
+        stats["cached"] = sum(key in cached for key in keys)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        todo = [(chunk, key) for chunk, key in zip(chunks, keys) if key not in cached]
+        results = await asyncio.gather(
+            *(self._call(semaphore, stats, self.chunk_prompt(chunk), CHUNK_SYSTEM_PROMPT, self.chunk_output_tokens)
+              for chunk, _ in todo),
+            return_exceptions=True,
+        )
+        fresh = {}
+        for (chunk, key), result in zip(todo, results):
+            if isinstance(result, Exception):
+                stats["failed"] += 1
+                logging.warning(f"Chunk {chunk.label()} failed to summarize: {result}")
+            else:
+                fresh[key] = (result, len(chunk.posts))
+        if fresh and self.session_factory:
+            try:
+                await asyncio.to_thread(self._store, fresh)
+            except SQLAlchemyError as e:
+                # The notes are paid for; a failed cache write must not fail the digest
+                logging.warning(f"Could not cache chunk notes: {e}")
+        notes = {**cached, **{key: summary for key, (summary, _) in fresh.items()}}
+        ordered = [(chunk.label(), notes[key]) for chunk, key in zip(chunks, keys) if key in notes]
+        if not ordered:
+            raise RuntimeError(f"All {len(chunks)} chunks failed to summarize")
+        return await self._digest_prompt(semaphore, stats, ordered, system_prompt)
+
+    async def summarize(self, posts: Sequence, system_prompt: str, max_tokens: int) -> str:
+        """Digest of posts in the format asked for by system_prompt."""
+        stats: Dict[str, int] = {}
+        prompt = await self.digest_prompt(posts, system_prompt, stats)
+        stats["llm_calls"] += 1
+        digest = await self.lm_client.generate_response(prompt, system_prompt, max_tokens=max_tokens)
+        logging.info(f"Hierarchical summary: {stats}")
+        self.last_stats = stats
+        return digest
+
+    async def stream(self, posts: Sequence, system_prompt: str, max_tokens: int) -> AsyncIterator[str]:
+        """Like summarize, but yields the final digest as the model writes it."""
+        stats: Dict[str, int] = {}
+        prompt = await self.digest_prompt(posts, system_prompt, stats)
+        stats["llm_calls"] += 1
+        async with aclosing(self.lm_client.stream_response(prompt, system_prompt, max_tokens=max_tokens)) as pieces:
+            async for piece in pieces:
+                yield piece
+        logging.info(f"Hierarchical summary: {stats}")
+        self.last_stats = stats
@@ -0,0 +1,155 @@
+"""
+Job kinds served by run_job_worker and the helpers that enqueue them.
+
+    scrape_rss_all      every feed in rss_sources.json, as one RssScrapeRun
+    scrape_rss          one feed: {"url", "source", "platform"}
+    tag_posts           drain pending posts, or one pass over failed ones:
+                        {"status_filter": "pending"|"error", "batch_size"}
+    summarize_articles  {"sources", "start_date", "end_date", "combined"}
+
+Handlers take (payload, job) and return a JSON-serializable result; long ones
+report how far they are with job.report_progress(...).
+"""
+import asyncio
+import hashlib
+import json
+from typing import Any, Dict, Optional
+from backend.app.db.database import SessionLocal
+from .job_queue import JobQueue, LeasedJob, PermanentJobError, RetryLaterError
+from .tagging_worker import SingleInstanceLock, TaggingWorker, WorkerLockHeld, TAGGING_WORKER_BATCH_SIZE
+
+SCRAPE_RSS_ALL = "scrape_rss_all"
+SCRAPE_RSS = "scrape_rss"
+TAG_POSTS = "tag_posts"
+SUMMARIZE_ARTICLES = "summarize_articles"
+
+# Someone waiting on a summary beats tagging, which beats scraping
+DEFAULT_PRIORITIES = {
+    SUMMARIZE_ARTICLES: 20,
+    TAG_POSTS: 10,
+    SCRAPE_RSS: 0,
+    SCRAPE_RSS_ALL: 0,
+}
+# Tagging for posts the user is looking at (services/work_priority.py) jumps ahead of queued summaries
+FOCUS_PRIORITY = 30
+
+
+def _require(payload: Dict[str, Any], *keys: str):
+    missing = [key for key in keys if not payload.get(key)]
+    if missing:
+        raise PermanentJobError(f"Missing payload fields: {', '.join(missing)}")
+
+
+def scrape_rss_all(payload: Dict[str, Any], job: LeasedJob) -> dict:
+    from backend.app.run_rss_scraper import run_scrape
+    try:
+        return run_scrape()
+    except FileNotFoundError as e:
+        raise PermanentJobError(str(e))
+
+
+def scrape_rss(payload: Dict[str, Any], job: LeasedJob) -> dict:
+    from backend.app.scrapers.rss_scraper import scrape_and_save_rss_feed, InvalidFeedURLError
+    _require(payload, "url", "source")
+    with SessionLocal() as db:
+        try:
+            posts = scrape_and_save_rss_feed(db, payload["url"], payload["source"], payload.get("platform", "RSS"))
+        except InvalidFeedURLError as e:
+            raise PermanentJobError(str(e))
+    return {"scraped": len(posts) if posts else 0}
+
+
+_tagging_service = None
+
+
+def _worker_tagging_service():
+    """One TaggingService per worker process, so tag_posts jobs share its cache and local classifier."""
+    global _tagging_service
+    if _tagging_service is None:
+        from .tagging_service import TaggingService
+        _tagging_service = TaggingService()
+    return _tagging_service
+
+
+def tag_posts(payload: Dict[str, Any], job: LeasedJob) -> dict:
+    status_filter = payload.get("status_filter", "pending")
+    batch_size = int(payload.get("batch_size") or TAGGING_WORKER_BATCH_SIZE)
+    # Shares the tagging worker's lock so a standalone tag_posts script and a job never tag concurrently
+    lock = SingleInstanceLock()
+    try:
+        lock.acquire()
+    except WorkerLockHeld as e:
+        # Another worker is tagging; try again once it is likely done rather than dropping this run
+        raise RetryLaterError(str(e))
+    try:
+        if status_filter == "pending":
+            worker = TaggingWorker(_worker_tagging_service(), SessionLocal, batch_size=batch_size, lock=lock)
+            worker.drain()
+            return worker.stats
+        # Failed posts stay failed when they fail again, so retry them in one pass only
+        with SessionLocal() as db:
+            return _worker_tagging_service().tag_new_posts(db, batch_size=batch_size, status_filter=status_filter)
+    finally:
+        lock.release()
+
+
+def summarize_articles(payload: Dict[str, Any], job: LeasedJob) -> dict:
+    from .article_batch_summarization_service import ArticleBatchSummarizationService
+    from .article_fetch_service import ArticleFetchService
+    from .article_summarization_service import ArticleSummarizationService
+    from .hierarchical_summarizer import HierarchicalSummarizer
+    from .llm_providers import ProviderRegistry, TASK_SUMMARIZATION
+    from .llm_response_cache import with_response_cache
+    from .summary_storage_service import SummaryStorageService
+    from .work_priority import PriorityPolicy
+    _require(payload, "sources", "start_date", "end_date")
+
+    async def report(**progress):
+        await asyncio.to_thread(job.report_progress, **progress)
+
+    async def run(db):
+        # The pool belongs to this run's event loop, so the registry lives as long as the run
+        async with ProviderRegistry.from_env() as registry:
+            client = with_response_cache(registry.client(TASK_SUMMARIZATION))
+            service = ArticleBatchSummarizationService(
+                ArticleFetchService(db), ArticleSummarizationService(client), SummaryStorageService(db),
+                HierarchicalSummarizer(client, SessionLocal),
+            )
+            args = (payload["sources"], payload["start_date"], payload["end_date"])
+            if payload.get("combined"):
+                return {"summary": await service.summarize_articles_combined(*args, on_progress=report)}
+            return {"summaries": await service.summarize_articles(*args, policy=PriorityPolicy.load(db),
+                                                                  on_progress=report)}
+
+    with SessionLocal() as db:
+        try:
+            return asyncio.run(run(db))
+        except ValueError as e:  # bad dates
+            raise PermanentJobError(str(e))
+
+
+HANDLERS = {
+    SCRAPE_RSS_ALL: scrape_rss_all,
+    SCRAPE_RSS: scrape_rss,
+    TAG_POSTS: tag_posts,
+    SUMMARIZE_ARTICLES: summarize_articles,
+}
+
+
+def dedupe_key(kind: str, payload: Optional[dict]) -> str:
+    canonical = json.dumps(payload or {}, sort_keys=True, separators=(",", ":"))
+    return f"{kind}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]}"
+
+
+def submit(queue: JobQueue, kind: str, payload: Optional[dict] = None, priority: Optional[int] = None,
+           dedupe: bool = True, **kwargs) -> int:
+    """
+    Enqueue a known job kind with its default priority. Identical unfinished
+    jobs (same kind and payload) are merged unless dedupe is False.
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind '{kind}'")
+    if priority is None:
+        priority = DEFAULT_PRIORITIES.get(kind, 0)
+    return queue.enqueue(kind, payload, priority=priority,
+                         dedupe_key=dedupe_key(kind, payload) if dedupe else None, **kwargs)
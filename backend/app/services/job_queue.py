@@ -0,0 +1,334 @@
+"""
+Persistent job queue in the application database.
+
+A job is enqueued as `queued`. A worker leases it: the job becomes `leased`
+to that worker until lease_expires_at, and the worker extends the lease with
+heartbeats while it runs. ack() marks it `done` with its result. fail()
+requeues it with exponential backoff, or marks it `dead` (the dead-letter
+list) once max_attempts is used up. A lease that expires without ack or
+fail, for example because the worker process died, is taken over by the
+next worker, so a crash never loses work.
+
+Leasing is safe across processes. On PostgreSQL the candidate row is locked
+with FOR UPDATE SKIP LOCKED. Elsewhere (SQLite) the lease is a conditional
+UPDATE that only one worker can win, and losers pick the next candidate.
+"""
+import json
+import logging
+import os
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+from backend.app.db.models import Job
+from backend.app.utils.ingest_signal import IngestSignal, job_signal
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+UNFINISHED = (QUEUED, LEASED)
+
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+# Retry n waits about JOB_RETRY_BASE_SECONDS * 2**(n-1), capped at JOB_RETRY_MAX_SECONDS
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "30"))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "3600"))
+# A job that cannot run yet (RetryLaterError) is tried again after this long
+JOB_DEFER_SECONDS = float(os.getenv("JOB_DEFER_SECONDS", "30"))
+# Losing this many lease races in a row gives up until the next poll
+LEASE_RETRIES = 5
+MAX_ERROR_CHARS = 4000
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help (e.g. an invalid payload); the job goes straight to dead."""
+
+
+class RetryLaterError(Exception):
+    """
+    Raised by a handler that cannot run yet (e.g. another worker holds a lock it
+    needs); the job is requeued after `delay` seconds without using up an attempt.
+    """
+
+    def __init__(self, message: str, delay: float = JOB_DEFER_SECONDS):
+        super().__init__(message)
+        self.delay = delay
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def retry_delay(attempts: int, base: float = JOB_RETRY_BASE_SECONDS, cap: float = JOB_RETRY_MAX_SECONDS) -> float:
+    """Backoff before the next attempt after `attempts` failures, with +-25% jitter so retries spread out."""
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    return delay * (0.75 + random.random() / 2)
+
+
+@dataclass
+class LeasedJob:
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    priority: int
+    worker_id: str
+    lease_expires_at: datetime
+    lease_lost: bool = field(default=False)
+    # Set by the worker; handlers report through report_progress
+    progress_callback: Optional[Callable[[dict], Any]] = field(default=None, repr=False)
+
+    def report_progress(self, **progress):
+        """Record how far the handler has got, e.g. report_progress(done=3, total=10)."""
+        if self.progress_callback is not None:
+            self.progress_callback(progress)
+
+
+def job_to_dict(job: Job) -> dict:
+    def iso(value):
+        return value.isoformat() + "Z" if value else None
+
+    def seconds(start, end):
+        return round((end - start).total_seconds(), 3) if start and end else None
+    now = utcnow()
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "priority": job.priority,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "payload": job.get_payload(),
+        "result": job.get_result(),
+        "progress": job.get_progress(),
+        "last_error": job.last_error,
+        "lease_owner": job.lease_owner,
+        "run_at": iso(job.run_at),
+        "created_at": iso(job.created_at),
+        "started_at": iso(job.started_at),
+        "finished_at": iso(job.finished_at),
+        "wait_seconds": seconds(job.created_at, job.started_at or (None if job.finished_at else now)),
+        "run_seconds": seconds(job.started_at, job.finished_at or (now if job.status == LEASED else None)),
+    }
+
+
+class JobQueue:
+    """
+    Args:
+        session_factory: Callable returning a new sync Session; every operation
+            runs in its own short transaction
+        signal: Notified on enqueue so idle workers wake without polling
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], signal: IngestSignal = job_signal):
+        self.session_factory = session_factory
+        self.signal = signal
+
+    def enqueue(self, kind: str, payload: Optional[dict] = None, priority: int = 0,
+                max_attempts: int = JOB_MAX_ATTEMPTS, delay: float = 0, dedupe_key: Optional[str] = None) -> int:
+        """
+        Add a job and return its id. With a dedupe_key, an unfinished job with
+        the same key is reused instead (its priority raised if lower).
+        """
+        now = utcnow()
+        with self.session_factory() as db:
+            if dedupe_key:
+                existing = db.execute(
+                    select(Job).where(Job.dedupe_key == dedupe_key, Job.status.in_(UNFINISHED)).order_by(Job.id).limit(1)
+                ).scalar_one_or_none()
+                if existing is not None:
+                    if priority > existing.priority:
+                        existing.priority = priority
+                        db.commit()
+                    return existing.id
+            job = Job(
+                kind=kind,
+                payload=json.dumps(payload or {}, ensure_ascii=False),
+                status=QUEUED,
+                priority=priority,
+                attempts=0,
+                max_attempts=max_attempts,
+                run_at=now + timedelta(seconds=delay),
+                dedupe_key=dedupe_key,
+                created_at=now,
+            )
+            db.add(job)
+            db.commit()
+            job_id = job.id
+        self.signal.notify()
+        logging.info(f"Enqueued job {job_id} ({kind}, priority {priority})")
+        return job_id
+
+    @staticmethod
+    def _ready(now: datetime, kinds: Optional[Sequence[str]]):
+        condition = or_(
+            and_(Job.status == QUEUED, Job.run_at <= now),
+            and_(Job.status == LEASED, Job.lease_expires_at < now),
+        )
+        if kinds:
+            condition = and_(condition, Job.kind.in_(list(kinds)))
+        return condition
+
+    def _bury_expired(self, db: Session, now: datetime):
+        """Expired leases with no attempts left go to the dead-letter list rather than running again."""
+        db.execute(
+            update(Job)
+            .where(Job.status == LEASED, Job.lease_expires_at < now, Job.attempts >= Job.max_attempts)
+            .values(status=DEAD, finished_at=now, lease_owner=None,
+                    last_error=func.coalesce(Job.last_error, "Lease expired with no attempts left"))
+            .execution_options(synchronize_session=False)
+        )
+
+    def lease(self, worker_id: str, kinds: Optional[Sequence[str]] = None,
+              lease_seconds: float = JOB_LEASE_SECONDS) -> Optional[LeasedJob]:
+        """
+        Lease the highest-priority ready job (oldest run_at first), or return
+        None when there is none. Counts as an attempt.
+        """
+        with self.session_factory() as db:
+            postgres = db.get_bind().dialect.name == "postgresql"
+            now = utcnow()
+            self._bury_expired(db, now)
+            db.commit()
+            for _ in range(LEASE_RETRIES):
+                now = utcnow()
+                expires = now + timedelta(seconds=lease_seconds)
+                query = (
+                    select(Job.id)
+                    .where(self._ready(now, kinds))
+                    .order_by(Job.priority.desc(), Job.run_at, Job.id)
+                    .limit(1)
+                )
+                if postgres:
+                    query = query.with_for_update(skip_locked=True)
+                job_id = db.execute(query).scalar()
+                if job_id is None:
+                    db.rollback()
+                    return None
+                won = db.execute(
+                    update(Job)
+                    .where(Job.id == job_id, self._ready(now, kinds))
+                    .values(status=LEASED, lease_owner=worker_id, lease_expires_at=expires,
+                            attempts=Job.attempts + 1, started_at=func.coalesce(Job.started_at, now), progress=None)
+                    .execution_options(synchronize_session=False)
+                ).rowcount == 1
+                db.commit()
+                if won:
+                    job = db.get(Job, job_id)
+                    return LeasedJob(
+                        id=job.id, kind=job.kind, payload=job.get_payload(), attempts=job.attempts,
+                        max_attempts=job.max_attempts, priority=job.priority, worker_id=worker_id,
+                        lease_expires_at=expires,
+                    )
+            return None
+
+    def _update_owned(self, job: LeasedJob, **values) -> bool:
+        """Apply values if the worker still holds the lease; False if it was lost to another worker."""
+        with self.session_factory() as db:
+            owned = db.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.status == LEASED, Job.lease_owner == job.worker_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            ).rowcount == 1
+            db.commit()
+        if not owned:
+            job.lease_lost = True
+            logging.warning(f"Job {job.id} ({job.kind}) is no longer leased by {job.worker_id}")
+        return owned
+
+    def heartbeat(self, job: LeasedJob, lease_seconds: float = JOB_LEASE_SECONDS) -> bool:
+        """Extend the lease; returns False if it expired and another worker took the job."""
+        expires = utcnow() + timedelta(seconds=lease_seconds)
+        if self._update_owned(job, lease_expires_at=expires):
+            job.lease_expires_at = expires
+            return True
+        return False
+
+    def progress(self, job: LeasedJob, progress: Any) -> bool:
+        """Store the handler's progress report; False if the lease was lost."""
+        return self._update_owned(job, progress=json.dumps(progress, ensure_ascii=False, default=str))
+
+    def ack(self, job: LeasedJob, result: Any = None) -> bool:
+        return self._update_owned(
+            job, status=DONE, result=json.dumps(result, ensure_ascii=False, default=str),
+            finished_at=utcnow(), lease_owner=None, lease_expires_at=None, last_error=None,
+        )
+
+    def fail(self, job: LeasedJob, error: str, retry: bool = True) -> bool:
+        """Requeue with backoff, or bury in the dead-letter list when out of attempts or not retryable."""
+        error = (error or "")[:MAX_ERROR_CHARS]
+        now = utcnow()
+        if retry and job.attempts < job.max_attempts:
+            delay = retry_delay(job.attempts)
+            logging.warning(f"Job {job.id} ({job.kind}) failed attempt {job.attempts}/{job.max_attempts}, "
+                            f"retrying in {delay:.0f}s: {error}")
+            return self._update_owned(job, status=QUEUED, run_at=now + timedelta(seconds=delay),
+                                      last_error=error, lease_owner=None, lease_expires_at=None)
+        logging.error(f"Job {job.id} ({job.kind}) is dead after {job.attempts} attempts: {error}")
+        return self._update_owned(job, status=DEAD, finished_at=now, last_error=error,
+                                  lease_owner=None, lease_expires_at=None)
+
+    def defer(self, job: LeasedJob, delay: float, reason: str = "") -> bool:
+        """Requeue to run after delay seconds; the lease does not count as an attempt."""
+        logging.info(f"Job {job.id} ({job.kind}) deferred for {delay:.0f}s: {reason}")
+        return self._update_owned(job, status=QUEUED, run_at=utcnow() + timedelta(seconds=delay),
+                                  attempts=Job.attempts - 1, last_error=(reason or "")[:MAX_ERROR_CHARS] or None,
+                                  lease_owner=None, lease_expires_at=None)
+
+    def get(self, job_id: int) -> Optional[dict]:
+        with self.session_factory() as db:
+            job = db.get(Job, job_id)
+            return job_to_dict(job) if job is not None else None
+
+    def list_jobs(self, status: Optional[str] = None, kind: Optional[str] = None, limit: int = 50) -> List[dict]:
+        """Most recent jobs first; status="dead" lists the dead letters."""
+        with self.session_factory() as db:
+            query = select(Job).order_by(Job.id.desc()).limit(limit)
+            if status:
+                query = query.where(Job.status == status)
+            if kind:
+                query = query.where(Job.kind == kind)
+            return [job_to_dict(job) for job in db.execute(query).scalars()]
+
+    def requeue(self, job_id: int) -> bool:
+        """Give a dead job a fresh set of attempts."""
+        with self.session_factory() as db:
+            requeued = db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == DEAD)
+                .values(status=QUEUED, attempts=0, run_at=utcnow(), finished_at=None)
+                .execution_options(synchronize_session=False)
+            ).rowcount == 1
+            db.commit()
+        if requeued:
+            self.signal.notify()
+        return requeued
+
+    def stats(self) -> dict:
+        """Job counts by status, and by kind and status."""
+        with self.session_factory() as db:
+            rows = db.execute(select(Job.kind, Job.status, func.count()).group_by(Job.kind, Job.status)).all()
+        stats = {status: 0 for status in (QUEUED, LEASED, DONE, DEAD)}
+        by_kind: Dict[str, Dict[str, int]] = {}
+        for kind, status, count in rows:
+            stats[status] = stats.get(status, 0) + count
+            by_kind.setdefault(kind, {})[status] = count
+        stats["by_kind"] = by_kind
+        return stats
+
+    def purge(self, older_than_days: float = 7, include_dead: bool = False) -> int:
+        """Delete finished jobs older than the cutoff; dead letters are kept unless include_dead."""
+        statuses = [DONE, DEAD] if include_dead else [DONE]
+        cutoff = utcnow() - timedelta(days=older_than_days)
+        with self.session_factory() as db:
+            deleted = db.execute(
+                delete(Job).where(Job.status.in_(statuses), Job.finished_at < cutoff)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+        return deleted
@@ -0,0 +1,163 @@
+"""
+Worker loop for the job queue (services/job_queue.py). Any number of workers,
+in any number of processes, can serve the same queue: each leases one job at a
+time, keeps the lease alive with a heartbeat thread while the handler runs,
+and acks or fails it. Idle workers sleep until an enqueue is signalled.
+"""
+import logging
+import os
+import socket
+import threading
+import traceback
+import uuid
+from typing import Any, Callable, Dict, Optional, Sequence
+from .job_queue import JobQueue, LeasedJob, PermanentJobError, RetryLaterError, JOB_LEASE_SECONDS
+from ..utils.ingest_signal import IngestSignal, job_signal
+
+JOB_IDLE_SECONDS = float(os.getenv("JOB_IDLE_SECONDS", "30"))
+
+Handler = Callable[[Dict[str, Any], LeasedJob], Any]
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class _Heartbeat(threading.Thread):
+    """Renews a job's lease every third of the lease period until stopped."""
+
+    def __init__(self, queue: JobQueue, job: LeasedJob, lease_seconds: float):
+        super().__init__(daemon=True, name=f"job-{job.id}-heartbeat")
+        self.queue = queue
+        self.job = job
+        self.lease_seconds = lease_seconds
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.wait(self.lease_seconds / 3):
+            try:
+                if not self.queue.heartbeat(self.job, self.lease_seconds):
+                    return
+            except Exception as e:
+                logging.warning(f"Heartbeat for job {self.job.id} failed: {e}")
+
+
+class JobWorker:
+    """
+    Args:
+        queue: JobQueue to serve
+        handlers: Handler per job kind, called as handler(payload, job); the
+            return value is stored as the job result
+        kinds: Kinds to lease (default: all kinds in handlers)
+        lease_seconds: Lease period, renewed by heartbeats while a job runs
+        idle_seconds: Poll anyway after this long without an enqueue signal
+        watch: Extra (signal, callback) pairs; the callback runs when the
+            signal fires, e.g. to enqueue tagging when posts are ingested
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, Handler],
+        kinds: Optional[Sequence[str]] = None,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        idle_seconds: float = JOB_IDLE_SECONDS,
+        signal: IngestSignal = job_signal,
+        watch: Sequence = (),
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.kinds = list(kinds or handlers)
+        unknown = set(self.kinds) - set(handlers)
+        if unknown:
+            raise ValueError(f"No handler for job kinds: {', '.join(sorted(unknown))}")
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.idle_seconds = idle_seconds
+        self.signal = signal
+        self.watch = list(watch)
+        self.stop_event = threading.Event()
+        self.stats = {"done": 0, "retried": 0, "dead": 0, "deferred": 0, "lost": 0}
+
+    def stop(self):
+        self.stop_event.set()
+        self.signal.wake()
+
+    def process(self, job: LeasedJob):
+        job.progress_callback = lambda progress: self.queue.progress(job, progress)
+        heartbeat = _Heartbeat(self.queue, job, self.lease_seconds)
+        heartbeat.start()
+        try:
+            result = self.handlers[job.kind](job.payload, job)
+        except PermanentJobError as e:
+            self.queue.fail(job, f"{type(e).__name__}: {e}", retry=False)
+            self.stats["dead"] += 1
+            return
+        except RetryLaterError as e:
+            self.queue.defer(job, e.delay, str(e))
+            self.stats["deferred"] += 1
+            return
+        except Exception as e:
+            logging.debug(traceback.format_exc())
+            self.queue.fail(job, f"{type(e).__name__}: {e}")
+            self.stats["retried" if job.attempts < job.max_attempts else "dead"] += 1
+            return
+        finally:
+            heartbeat.done.set()
+            heartbeat.join()
+        if self.queue.ack(job, result):
+            self.stats["done"] += 1
+        else:
+            # The lease expired and another worker took the job over; its run counts
+            self.stats["lost"] += 1
+
+    def run_one(self) -> bool:
+        """Lease and process one job; False if none was ready."""
+        job = self.queue.lease(self.worker_id, self.kinds, self.lease_seconds)
+        if job is None:
+            return False
+        logging.info(f"Worker {self.worker_id} running job {job.id} ({job.kind}, attempt {job.attempts})")
+        self.process(job)
+        return True
+
+    def drain(self, max_jobs: Optional[int] = None) -> int:
+        """Process ready jobs until none are left (or max_jobs ran). Returns the number processed."""
+        processed = 0
+        while not self.stop_event.is_set() and (max_jobs is None or processed < max_jobs):
+            if not self.run_one():
+                break
+            processed += 1
+        return processed
+
+    def _idle(self, token: str, watched: list):
+        """Sleep until an enqueue, a watched signal, idle_seconds, or stop."""
+        waited = 0.0
+        step = self.signal.check_interval
+        while not self.stop_event.is_set() and waited < self.idle_seconds:
+            if self.signal.wait(token, timeout=step, stop=self.stop_event):
+                return
+            waited += step
+            for i, (signal, callback) in enumerate(self.watch):
+                current = signal.token()
+                if current != watched[i]:
+                    watched[i] = current
+                    callback()
+                    return
+
+    def run(self):
+        """Alternate draining with waiting for new jobs; returns once stop() is called."""
+        logging.info(f"Job worker {self.worker_id} started for: {', '.join(self.kinds)}")
+        watched = [signal.token() for signal, _ in self.watch]
+        while not self.stop_event.is_set():
+            # Read the token before draining so jobs enqueued mid-drain trigger another pass
+            token = self.signal.token()
+            try:
+                self.drain()
+            except Exception as e:
+                # Queue unreachable (e.g. database locked); handler errors never get here
+                logging.error(f"Job worker {self.worker_id} failed to lease: {e}")
+                self.stop_event.wait(self.signal.check_interval * 5)
+                continue
+            self._idle(token, watched)
+        logging.info(f"Job worker {self.worker_id} stopped: {self.stats}")
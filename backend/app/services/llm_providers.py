@@ -0,0 +1,317 @@
+"""
+LLM providers and per-task model routing.
+
+A provider is an OpenAI-compatible endpoint (OpenAI itself, LM Studio, or
+any other server speaking /v1/chat/completions) with one pooled keep-alive
+HTTP client and a limit on concurrent requests. ProviderRegistry holds the
+providers and routes each task to a provider and model:
+
+    LLM_ROUTE_TAGGING=lmstudio:qwen2.5-7b-instruct
+    LLM_ROUTE_SUMMARIZATION=openai:gpt-4o-mini
+    LLM_ROUTE_GENERATE=openai            (provider's default model)
+
+Built-in providers are "openai" (key from ChatGPT_API_KEY, VITE_ChatGPT_API_KEY
+or OPENAI_API_KEY) and "lmstudio" (LM_STUDIO_BASE_URL). More can be added with
+LLM_PROVIDERS, a JSON object of name -> {"base_url", "api_key_env", "model",
+"max_concurrency", "timeout"}, or with ProviderRegistry.register.
+
+The API creates one registry for the app's lifetime (see main.py's lifespan);
+scripts and job handlers that run their own event loop use one per run, as
+`async with ProviderRegistry.from_env() as registry`.
+"""
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional, Tuple
+import httpx
+from openai import AsyncOpenAI
+
+TASK_TAGGING = "tagging"
+TASK_SUMMARIZATION = "summarization"
+TASK_GENERATE = "generate"
+
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+LM_STUDIO_BASE_URL = os.getenv("LM_STUDIO_BASE_URL", "http://127.0.0.1:1234/v1")
+LM_STUDIO_MODEL = os.getenv("LM_STUDIO_MODEL", "deepseek-r1-distill-qwen-7b")
+LM_STUDIO_MAX_CONCURRENCY = int(os.getenv("LM_STUDIO_MAX_CONCURRENCY", "2"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+# Idle keep-alive connections are closed after this long
+LLM_KEEPALIVE_SECONDS = float(os.getenv("LLM_KEEPALIVE_SECONDS", "30"))
+
+SUMMARY_SYSTEM_PROMPT = "You are a helpful assistant that creates concise summaries. Focus on the main points and key information."
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderNotConfigured(ValueError):
+    """A task was routed to a provider that is unknown or has no API key."""
+
+
+@dataclass
+class ProviderConfig:
+    name: str
+    base_url: Optional[str] = None  # None: the OpenAI API
+    api_key: Optional[str] = None
+    model: str = "gpt-3.5-turbo"  # default model for routes that name only the provider
+    max_concurrency: int = 4
+    timeout: float = LLM_TIMEOUT_SECONDS
+    requires_key: bool = True
+    organization: Optional[str] = None
+    project: Optional[str] = None
+
+
+def default_providers() -> Dict[str, ProviderConfig]:
+    providers = {
+        "openai": ProviderConfig(
+            name="openai",
+            api_key=os.getenv("ChatGPT_API_KEY") or os.getenv("VITE_ChatGPT_API_KEY") or os.getenv("OPENAI_API_KEY"),
+            organization=os.getenv("OPENAI_ORG_ID"),
+            project=os.getenv("OPENAI_PROJECT_ID"),
+            max_concurrency=OPENAI_MAX_CONCURRENCY,
+        ),
+        "lmstudio": ProviderConfig(
+            name="lmstudio", base_url=LM_STUDIO_BASE_URL, model=LM_STUDIO_MODEL,
+            max_concurrency=LM_STUDIO_MAX_CONCURRENCY, requires_key=False,
+        ),
+    }
+    extra = os.getenv("LLM_PROVIDERS")
+    if extra:
+        for name, spec in json.loads(extra).items():
+            providers[name] = ProviderConfig(
+                name=name,
+                base_url=spec.get("base_url"),
+                api_key=os.getenv(spec["api_key_env"]) if spec.get("api_key_env") else None,
+                model=spec.get("model", "gpt-3.5-turbo"),
+                max_concurrency=int(spec.get("max_concurrency", 4)),
+                timeout=float(spec.get("timeout", LLM_TIMEOUT_SECONDS)),
+                requires_key=bool(spec.get("api_key_env")),
+            )
+    return providers
+
+
+def default_routes() -> Dict[str, str]:
+    from .tagging_engine import TAGGING_MODEL
+    routes = {
+        TASK_TAGGING: f"openai:{TAGGING_MODEL}",
+        TASK_SUMMARIZATION: "openai:gpt-3.5-turbo",
+        TASK_GENERATE: "openai:gpt-3.5-turbo",
+    }
+    for task in list(routes):
+        routes[task] = os.getenv(f"LLM_ROUTE_{task.upper()}", routes[task])
+    return routes
+
+
+class Provider:
+    """
+    One OpenAI-compatible endpoint. The HTTP pool, the AsyncOpenAI client on
+    top of it and the concurrency semaphore are created on first use and
+    belong to that event loop; use from another loop gets its own set.
+    """
+
+    def __init__(self, config: ProviderConfig):
+        self.config = config
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._loop = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._openai: Optional[AsyncOpenAI] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    def check_configured(self):
+        if self.config.requires_key and not self.config.api_key:
+            raise ProviderNotConfigured(f"No API key configured for LLM provider '{self.name}'")
+
+    def _ensure(self):
+        loop = asyncio.get_running_loop()
+        if self._openai is not None and self._loop is loop:
+            return
+        self.check_configured()
+        if self._openai is not None:
+            logger.debug(f"LLM provider {self.name} used from a new event loop; opening a new pool")
+        limits = httpx.Limits(max_connections=self.config.max_concurrency,
+                              max_keepalive_connections=self.config.max_concurrency,
+                              keepalive_expiry=LLM_KEEPALIVE_SECONDS)
+        self._http = httpx.AsyncClient(limits=limits, timeout=self.config.timeout)
+        self._openai = AsyncOpenAI(
+            api_key=self.config.api_key or "not-needed", base_url=self.config.base_url,
+            organization=self.config.organization, project=self.config.project, http_client=self._http,
+        )
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        self._loop = loop
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the provider's max_concurrency request slots."""
+        self._ensure()
+        async with self._semaphore:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                yield self._openai
+            finally:
+                self.in_flight -= 1
+
+    async def aclose(self):
+        if self._http is not None:
+            try:
+                await self._http.aclose()
+            except RuntimeError as e:  # pool opened on a loop that has since closed
+                logger.debug(f"Closing LLM provider {self.name}: {e}")
+        self._http = self._openai = self._semaphore = self._loop = None
+
+    def stats(self) -> dict:
+        return {
+            "base_url": self.config.base_url or "https://api.openai.com/v1",
+            "max_concurrency": self.config.max_concurrency,
+            "configured": bool(self.config.api_key) or not self.config.requires_key,
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+
+class _Completions:
+    def __init__(self, provider: Provider):
+        self.provider = provider
+
+    async def create(self, **kwargs):
+        async with self.provider.slot() as client:
+            return await client.chat.completions.create(**kwargs)
+
+
+@dataclass
+class _Chat:
+    completions: _Completions
+
+
+class ProviderClient:
+    """
+    Client for one (provider, model) route, with the interface of OpenAIClient
+    (generate_summary, generate_response, stream_response) plus
+    chat.completions.create for code written against AsyncOpenAI, such as
+    BatchTaggingEngine. Every call waits for a provider slot.
+    """
+
+    def __init__(self, provider: Provider, model: str):
+        self.provider = provider
+        self.model = model
+        self.chat = _Chat(_Completions(provider))
+
+    async def _complete(self, messages, max_tokens: int) -> str:
+        response = await self.chat.completions.create(
+            model=self.model, messages=messages, temperature=0.7, max_tokens=max_tokens,
+        )
+        return response.choices[0].message.content
+
+    async def generate_summary(self, text: str, max_tokens: int = 150) -> str:
+        try:
+            return await self._complete([
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Please summarize the following text in {max_tokens} tokens or less:\n\n{text}"},
+            ], max_tokens)
+        except ProviderNotConfigured:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to generate summary: {str(e)}")
+
+    async def generate_response(self, prompt: str, system_prompt: str = None, max_tokens: int = 2048) -> str:
+        messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        messages.append({"role": "user", "content": prompt})
+        try:
+            return await self._complete(messages, max_tokens)
+        except ProviderNotConfigured:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to generate response: {str(e)}")
+
+    async def stream_response(self, prompt: str, system_prompt: str = None, max_tokens: int = 2048) -> AsyncIterator[str]:
+        """Yield text as it is generated; the provider slot is held until the stream ends or is closed."""
+        messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        messages.append({"role": "user", "content": prompt})
+        async with self.provider.slot() as client:
+            stream = await client.chat.completions.create(
+                model=self.model, messages=messages, temperature=0.7, max_tokens=max_tokens, stream=True,
+            )
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                await stream.close()
+
+    async def close(self):
+        # The connection pool belongs to the registry
+        pass
+
+
+class ProviderRegistry:
+    """
+    Args:
+        providers: Provider configs by name (default: default_providers())
+        routes: "provider" or "provider:model" per task (default: default_routes())
+    """
+
+    def __init__(self, providers: Optional[Dict[str, ProviderConfig]] = None, routes: Optional[Dict[str, str]] = None):
+        self.providers: Dict[str, Provider] = {
+            name: Provider(config) for name, config in (providers if providers is not None else default_providers()).items()
+        }
+        self.routes: Dict[str, str] = dict(routes if routes is not None else default_routes())
+        self._clients: Dict[Tuple[str, str], ProviderClient] = {}
+
+    @classmethod
+    def from_env(cls) -> "ProviderRegistry":
+        return cls()
+
+    def register(self, config: ProviderConfig):
+        """Add or replace a provider."""
+        old = self.providers.get(config.name)
+        self.providers[config.name] = Provider(config)
+        self._clients = {key: client for key, client in self._clients.items() if key[0] != config.name}
+        return old
+
+    def route(self, task: str) -> Tuple[Provider, str]:
+        spec = self.routes.get(task)
+        if not spec:
+            raise ProviderNotConfigured(f"No LLM route for task '{task}'")
+        name, _, model = spec.partition(":")
+        provider = self.providers.get(name)
+        if provider is None:
+            raise ProviderNotConfigured(f"Task '{task}' is routed to unknown LLM provider '{name}'")
+        return provider, model or provider.config.model
+
+    def client(self, task: str) -> ProviderClient:
+        """Client for a task's route; one per (provider, model), sharing the provider's pool."""
+        provider, model = self.route(task)
+        key = (provider.name, model)
+        if key not in self._clients:
+            self._clients[key] = ProviderClient(provider, model)
+        return self._clients[key]
+
+    def describe(self) -> dict:
+        routes = {}
+        for task, spec in self.routes.items():
+            try:
+                provider, model = self.route(task)
+                routes[task] = f"{provider.name}:{model}"
+            except ProviderNotConfigured:
+                routes[task] = spec
+        return {"providers": {name: p.stats() for name, p in self.providers.items()}, "routes": routes}
+
+    async def aclose(self):
+        for provider in self.providers.values():
+            await provider.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
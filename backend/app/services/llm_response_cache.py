@@ -0,0 +1,279 @@
+"""
+On-disk cache of LLM completions shared by the API and job worker processes.
+
+CachedLLMClient wraps OpenAIClient or LMStudioClient. Requests are keyed by
+sha256 of (method, model, system prompt, prompt, max_tokens); a hit skips the
+model call, and identical requests already in flight share one upstream call.
+Entries are JSON files under LLM_CACHE_DIR that expire after
+LLM_CACHE_TTL_SECONDS; past LLM_CACHE_MAX_BYTES the least recently used go first.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Optional
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 3600)))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "llm_cache")
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(method: str, model: str, prompt: str, system_prompt: Optional[str], max_tokens: int) -> str:
+    raw = json.dumps([method, model, system_prompt or "", prompt, max_tokens], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Completions stored one file per key, in subdirectories by key prefix.
+    A hit touches the file's mtime, which is what eviction orders by; the
+    creation time inside the file decides expiry. Writes are atomic
+    (temp file + rename), so several processes can share the directory.
+    """
+
+    def __init__(self, cache_dir: str = LLM_CACHE_DIR, ttl: float = LLM_CACHE_TTL_SECONDS,
+                 max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._size: Optional[int] = None  # bytes on disk, counted lazily
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield path, st.st_size, st.st_mtime
+
+    def _remove(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        if self._size is not None:
+            self._size -= size
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self.misses += 1
+                return None
+            if entry.get("created_at", 0) + self.ttl <= time.time():
+                self._remove(path)
+                self.misses += 1
+                return None
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self.hits += 1
+            return entry["response"]
+
+    def set(self, key: str, response: str, model: str = ""):
+        path = self._path(key)
+        data = json.dumps({"key": key, "model": model, "created_at": time.time(), "response": response})
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not write LLM cache entry {key[:12]}: {e}")
+                return
+            self.stores += 1
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(data.encode("utf-8"))
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        now = time.time()
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        self._size = sum(size for _, size, _ in entries)
+        for path, size, mtime in entries:
+            # mtime is at least the creation time, so an untouched-for-ttl file is expired
+            if self._size <= self.max_bytes and mtime + self.ttl > now:
+                continue
+            self._remove(path)
+            self.evictions += 1
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = 0
+            for path, _, _ in list(self._entries()):
+                self._remove(path)
+                removed += 1
+            self._size = 0
+            return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = list(self._entries())
+            self._size = sum(size for _, size, _ in entries)
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+            }
+
+
+class _StreamAbandoned(Exception):
+    """The stream a request joined was closed before it finished."""
+
+
+class CachedLLMClient:
+    """
+    Same interface as the wrapped client (generate_summary, generate_response,
+    close, model, ...). Failed calls are not cached. A caller that is cancelled
+    does not cancel the shared upstream call other callers are waiting on.
+    """
+
+    def __init__(self, client, cache: Optional[ResponseCache] = None):
+        self.client = client
+        self.cache = cache or ResponseCache()
+        self.coalesced = 0
+        self.upstream_calls = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def __getattr__(self, name):
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    async def _cached(self, key: str, call):
+        while True:
+            if key not in self._inflight:
+                cached = await asyncio.to_thread(self.cache.get, key)
+                if cached is not None:
+                    return cached
+            task = self._inflight.get(key)
+            if task is not None:
+                self.coalesced += 1
+            else:
+                task = asyncio.ensure_future(self._fetch(key, call))
+                self._inflight[key] = task
+                task.add_done_callback(lambda t: self._done(key, t))
+            try:
+                return await asyncio.shield(task)
+            except _StreamAbandoned:
+                continue  # its client went away mid-stream; make the call without it
+
+    async def _fetch(self, key: str, call) -> str:
+        self.upstream_calls += 1
+        response = await call()
+        if response is not None:
+            await asyncio.to_thread(self.cache.set, key, response, getattr(self.client, "model", ""))
+        return response
+
+    def _done(self, key: str, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every waiter was cancelled
+
+    async def generate_summary(self, text: str, max_tokens: int = 150) -> str:
+        key = request_key("summary", self.client.model, text, None, max_tokens)
+        return await self._cached(key, lambda: self.client.generate_summary(text, max_tokens))
+
+    async def generate_response(self, prompt: str, system_prompt: str = None, max_tokens: int = 2048) -> str:
+        key = request_key("response", self.client.model, prompt, system_prompt, max_tokens)
+        return await self._cached(key, lambda: self.client.generate_response(prompt, system_prompt, max_tokens))
+
+    async def stream_response(self, prompt: str, system_prompt: str = None, max_tokens: int = 2048) -> AsyncIterator[str]:
+        """
+        A cached response comes back as one piece; otherwise the upstream stream
+        is passed through and stored once it completes. Identical requests made
+        meanwhile, streamed or not, wait for it and get the whole text in one piece.
+        """
+        key = request_key("response", self.client.model, prompt, system_prompt, max_tokens)
+        while True:
+            task = self._inflight.get(key)
+            if task is None:
+                cached = await asyncio.to_thread(self.cache.get, key)
+                if cached is not None:
+                    yield cached
+                    return
+                task = self._inflight.get(key)
+            if task is None:
+                break
+            self.coalesced += 1
+            try:
+                text = await asyncio.shield(task)
+            except _StreamAbandoned:
+                continue
+            yield text
+            return
+
+        done = asyncio.get_running_loop().create_future()
+        self._inflight[key] = done
+        done.add_done_callback(lambda f: self._done(key, f))
+        self.upstream_calls += 1
+        pieces = []
+        try:
+            async with aclosing(self.client.stream_response(prompt, system_prompt, max_tokens)) as stream:
+                async for piece in stream:
+                    pieces.append(piece)
+                    yield piece
+            text = "".join(pieces)
+            await asyncio.to_thread(self.cache.set, key, text, getattr(self.client, "model", ""))
+            done.set_result(text)
+        except Exception as e:
+            if not done.done():
+                done.set_exception(e)
+            raise
+        finally:
+            # Closed early (client disconnected): requests waiting on it make their own call
+            if not done.done():
+                done.set_exception(_StreamAbandoned())
+
+    def stats(self) -> dict:
+        stats = self.cache.stats()
+        stats.update(coalesced=self.coalesced, upstream_calls=self.upstream_calls, in_flight=len(self._inflight))
+        return stats
+
+    async def close(self):
+        await self.client.close()
+
+
+def with_response_cache(client, cache: Optional[ResponseCache] = None):
+    """Wrap client in a CachedLLMClient unless LLM_CACHE_ENABLED is off."""
+    if not LLM_CACHE_ENABLED:
+        return client
+    return CachedLLMClient(client, cache)
@@ -1,3 +1,5 @@
+import json
+from typing import AsyncIterator
 import httpx
 
 class LMStudioClient:
@@ -33,7 +35,7 @@ class LMStudioClient:
         except Exception as e:
             raise Exception(f"Failed to generate summary: {str(e)}")
 
-    async def generate_response(self, prompt: str, system_prompt: str = None) -> str:
+    async def generate_response(self, prompt: str, system_prompt: str = None, max_tokens: int = 2048) -> str:
         try:
             messages = []
             if system_prompt:
@@ -46,7 +48,7 @@ class LMStudioClient:
                     "model": self.model,
                     "messages": messages,
                     "temperature": 0.7,
-                    "max_tokens": -1,
+                    "max_tokens": max_tokens,
                     "stream": False
                 }
             )
@@ -56,5 +58,39 @@ class LMStudioClient:
         except Exception as e:
             raise Exception(f"Failed to generate response: {str(e)}")
 
+    async def stream_response(self, prompt: str, system_prompt: str = None, max_tokens: int = 2048) -> AsyncIterator[str]:
+        """
+        Yield the completion text as LM Studio generates it (OpenAI-style SSE).
+        Closing the generator closes the connection, which stops generation.
+        """
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        async with self.client.stream(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            json={
+                "model": self.model,
+                "messages": messages,
+                "temperature": 0.7,
+                "max_tokens": max_tokens,
+                "stream": True
+            }
+        ) as response:
+            if response.is_error:
+                await response.aread()
+                raise Exception(f"Failed to generate response: {response.status_code} {response.text}")
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                text = (choices[0].get("delta") or {}).get("content")
+                if text:
+                    yield text
+
     async def close(self):
         await self.client.aclose() 
\ No newline at end of file
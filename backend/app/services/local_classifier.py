@@ -0,0 +1,267 @@
+import json
+import logging
+import math
+import os
+import random
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from backend.app.db.models import Post
+from backend.app.services.retention_service import hydrate_bodies
+from backend.app.services.tagging_cache import normalize_text
+
+LOCAL_CLASSIFIER_PATH = os.getenv(
+    "LOCAL_CLASSIFIER_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "tag_classifier.json"),
+)
+LOCAL_CLASSIFIER_ENABLED = os.getenv("LOCAL_CLASSIFIER_ENABLED", "true").lower() in ("1", "true", "yes")
+# Predictions below this probability are escalated to the LLM
+LOCAL_CLASSIFIER_THRESHOLD = float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", "0.95"))
+# Refuse to train on fewer LLM-tagged posts than this
+LOCAL_CLASSIFIER_MIN_POSTS = int(os.getenv("LOCAL_CLASSIFIER_MIN_POSTS", "200"))
+
+# Characters of each post used for features
+MAX_CHARS_PER_POST = 4000
+N_FEATURES = 2 ** 18
+MAX_TAGS = 10
+# Local results need at least this many known tags found in the text
+MIN_TAGS = 2
+# A tag must appear on this many training posts to be reused
+MIN_TAG_COUNT = 2
+MAX_TAG_WORDS = 4
+# Archived training posts whose full bodies are loaded per query
+TRAINING_HYDRATE_BATCH = 500
+# Additive smoothing of per-class feature mass
+SMOOTHING = 0.01
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*")
+
+Sample = Tuple[str, str, List[str]]  # (text, category, tags)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall(normalize_text(text))
+
+
+def post_text(post) -> str:
+    """Title and body as the classifier and the LLM see them."""
+    return f"{post.title or ''}\n{post.content or ''}"[:MAX_CHARS_PER_POST]
+
+
+def _bucket(feature: str) -> int:
+    # crc32 rather than hash(): buckets must be stable across processes
+    return zlib.crc32(feature.encode("utf-8")) % N_FEATURES
+
+
+def hashed_counts(tokens: Sequence[str]) -> Counter:
+    """Unigram and bigram counts hashed into N_FEATURES buckets."""
+    counts = Counter(_bucket(t) for t in tokens)
+    counts.update(_bucket(f"{a} {b}") for a, b in zip(tokens, tokens[1:]))
+    return counts
+
+
+class LocalTagClassifier:
+    """
+    CPU classifier over the tagging taxonomy: hashed unigram/bigram TF-IDF
+    features with multinomial naive Bayes, a linear model in log space that
+    trains in one pass over the posts. Tags are not generated; they are picked
+    from the tags the LLM has already used, when the tag phrase occurs in the
+    post. Categories are learned as stored on the posts.
+    """
+
+    def __init__(self, threshold: float = LOCAL_CLASSIFIER_THRESHOLD):
+        self.threshold = threshold
+        self.idf: Dict[int, float] = {}
+        self.default_idf = 1.0
+        self.classes: List[str] = []
+        # Per class: log prior, log probability of an unseen feature, and the
+        # log-probability gain of each seen feature over an unseen one
+        self.bias: Dict[str, float] = {}
+        self.unseen: Dict[str, float] = {}
+        self.weights: Dict[str, Dict[int, float]] = {}
+        self.tag_vocab: Dict[str, str] = {}  # normalized phrase -> tag, most used first
+        self.trained_on = 0
+
+    def _vectorize(self, text: str) -> Dict[int, float]:
+        counts = hashed_counts(tokenize(text))
+        vector = {f: (1 + math.log(c)) * self.idf.get(f, self.default_idf) for f, c in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        return {f: v / norm for f, v in vector.items()}
+
+    def _proba(self, vector: Dict[int, float]) -> Dict[str, float]:
+        mass = sum(vector.values())
+        scores = {}
+        for label in self.classes:
+            w = self.weights[label]
+            scores[label] = self.bias[label] + self.unseen[label] * mass + sum(w.get(f, 0.0) * v for f, v in vector.items())
+        top = max(scores.values())
+        exp = {label: math.exp(s - top) for label, s in scores.items()}
+        total = sum(exp.values())
+        return {label: e / total for label, e in exp.items()}
+
+    def fit(self, samples: Sequence[Sample]) -> "LocalTagClassifier":
+        if not samples:
+            raise ValueError("No samples to train on")
+        docs = [hashed_counts(tokenize(text)) for text, _, _ in samples]
+        df = Counter(f for doc in docs for f in doc)
+        n = len(docs)
+        self.idf = {f: math.log((1 + n) / (1 + d)) + 1 for f, d in df.items()}
+        self.default_idf = math.log(1 + n) + 1
+
+        labels = Counter(category for _, category, _ in samples)
+        self.classes = sorted(labels)
+        mass = {label: Counter() for label in self.classes}
+        for text, category, _ in samples:
+            mass[category].update(self._vectorize(text))
+        for label in self.classes:
+            denominator = math.log(sum(mass[label].values()) + SMOOTHING * N_FEATURES)
+            self.bias[label] = math.log(labels[label] / n)
+            self.unseen[label] = math.log(SMOOTHING) - denominator
+            self.weights[label] = {f: math.log(1 + m / SMOOTHING) for f, m in mass[label].items()}
+
+        tag_counts = Counter()
+        display = {}
+        for _, _, tags in samples:
+            for tag in tags:
+                phrase = " ".join(tokenize(tag))
+                if phrase and len(phrase.split()) <= MAX_TAG_WORDS:
+                    tag_counts[phrase] += 1
+                    display.setdefault(phrase, tag)
+        self.tag_vocab = {p: display[p] for p, c in tag_counts.most_common() if c >= MIN_TAG_COUNT}
+        self.trained_on = n
+        return self
+
+    def extract_tags(self, text: str) -> List[str]:
+        """Known tags whose phrase occurs in the text, most used first."""
+        tokens = tokenize(text)
+        grams = {" ".join(tokens[i:i + k]) for k in range(1, MAX_TAG_WORDS + 1) for i in range(len(tokens) - k + 1)}
+        return [tag for phrase, tag in self.tag_vocab.items() if phrase in grams][:MAX_TAGS]
+
+    def predict(self, text: str) -> Tuple[List[str], str, float]:
+        """(tags, category, probability of category)."""
+        proba = self._proba(self._vectorize(text))
+        category = max(proba, key=proba.get)
+        return self.extract_tags(text), category, proba[category]
+
+    def confident(self, text: str) -> Optional[Tuple[List[str], str]]:
+        """(tags, category) when the prediction can skip the LLM, else None."""
+        tags, category, probability = self.predict(text)
+        if probability >= self.threshold and len(tags) >= MIN_TAGS:
+            return tags, category
+        return None
+
+    def to_dict(self) -> dict:
+        return {
+            "n_features": N_FEATURES,
+            "trained_on": self.trained_on,
+            "default_idf": self.default_idf,
+            "idf": self.idf,
+            "classes": self.classes,
+            "bias": self.bias,
+            "unseen": self.unseen,
+            "weights": {label: {f: round(v, 6) for f, v in w.items()} for label, w in self.weights.items()},
+            "tag_vocab": list(self.tag_vocab.items()),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LocalTagClassifier":
+        if data.get("n_features") != N_FEATURES:
+            raise ValueError("Classifier was trained with a different feature size")
+        model = cls()
+        model.trained_on = data["trained_on"]
+        model.default_idf = data["default_idf"]
+        model.idf = {int(f): v for f, v in data["idf"].items()}
+        model.classes = data["classes"]
+        model.bias = data["bias"]
+        model.unseen = data["unseen"]
+        model.weights = {label: {int(f): v for f, v in w.items()} for label, w in data["weights"].items()}
+        model.tag_vocab = dict(data["tag_vocab"])
+        return model
+
+    def save(self, path: str = LOCAL_CLASSIFIER_PATH):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = LOCAL_CLASSIFIER_PATH) -> Optional["LocalTagClassifier"]:
+        """The saved classifier, or None when disabled, untrained or unreadable."""
+        if not LOCAL_CLASSIFIER_ENABLED or not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Ignoring local tag classifier at {path}: {e}")
+            return None
+
+
+def training_samples(db_session: Session, limit: Optional[int] = None) -> List[Sample]:
+    """
+    LLM-tagged posts, newest first. Posts tagged by the local classifier are
+    excluded so it never learns from its own output. Archived posts are read
+    with their full body from post_archive, not the hot table's stub.
+    """
+    query = db_session.query(Post).filter(
+        Post.tag_status == "tagged",
+        Post.category.isnot(None),
+        or_(Post.tagged_by.is_(None), Post.tagged_by != "local"),
+    ).order_by(Post.id.desc())
+    if limit:
+        query = query.limit(limit)
+    posts = query.all()
+    samples = []
+    for start in range(0, len(posts), TRAINING_HYDRATE_BATCH):
+        for post in hydrate_bodies(db_session, posts[start:start + TRAINING_HYDRATE_BATCH]):
+            samples.append((post_text(post), post.category.strip(), post.get_tags()))
+    return samples
+
+
+def evaluate(samples: Sequence[Sample], threshold: float = LOCAL_CLASSIFIER_THRESHOLD, holdout: float = 0.2,
+             posts_per_call: int = 1, seed: int = 0) -> dict:
+    """
+    Train on part of the LLM-tagged posts and replay the rest through the
+    fast path, comparing local categories with the LLM's.
+    Returns:
+        dict: coverage (share answered locally), agreement on those, overall
+        accuracy and the LLM calls the local answers would have saved
+    """
+    samples = list(samples)
+    random.Random(seed).shuffle(samples)
+    split = max(1, int(len(samples) * holdout))
+    test, train = samples[:split], samples[split:]
+    if not train:
+        raise ValueError("Not enough samples to hold some out")
+    model = LocalTagClassifier(threshold).fit(train)
+    local = agreed = correct = 0
+    for text, expected, _ in test:
+        predicted = model.predict(text)[1]
+        correct += predicted == expected
+        if model.confident(text) is not None:
+            local += 1
+            agreed += predicted == expected
+    return {
+        "trained_on": len(train),
+        "held_out": len(test),
+        "threshold": threshold,
+        "answered_locally": local,
+        "coverage": round(local / len(test), 3),
+        "agreement": round(agreed / local, 3) if local else None,
+        "overall_accuracy": round(correct / len(test), 3),
+        "llm_calls_saved": math.ceil(local / posts_per_call) if local else 0,
+    }
+
+
+def train(db_session: Session, path: str = LOCAL_CLASSIFIER_PATH, min_posts: int = LOCAL_CLASSIFIER_MIN_POSTS,
+          limit: Optional[int] = None) -> LocalTagClassifier:
+    samples = training_samples(db_session, limit=limit)
+    if len(samples) < min_posts:
+        raise ValueError(f"Only {len(samples)} LLM-tagged posts; need at least {min_posts} to train")
+    model = LocalTagClassifier().fit(samples)
+    model.save(path)
+    logging.info(f"Trained local tag classifier on {len(samples)} posts ({len(model.tag_vocab)} known tags)")
+    return model
@@ -1,5 +1,6 @@
 import os
 import asyncio
+from typing import AsyncIterator
 from openai import AsyncOpenAI
 
 class OpenAIClient:
@@ -27,7 +28,7 @@ class OpenAIClient:
         except Exception as e:
             raise Exception(f"Failed to generate summary: {str(e)}")
 
-    async def generate_response(self, prompt: str, system_prompt: str = None) -> str:
+    async def generate_response(self, prompt: str, system_prompt: str = None, max_tokens: int = 2048) -> str:
         try:
             messages = []
             if system_prompt:
@@ -37,12 +38,38 @@ class OpenAIClient:
                 model=self.model,
                 messages=messages,
                 temperature=0.7,
-                max_tokens=2048
+                max_tokens=max_tokens
             )
             return response.choices[0].message.content
         except Exception as e:
             raise Exception(f"Failed to generate response: {str(e)}")
 
+    async def stream_response(self, prompt: str, system_prompt: str = None, max_tokens: int = 2048) -> AsyncIterator[str]:
+        """
+        Yield the completion text as it is generated. Closing the generator
+        (e.g. when the HTTP client disconnects) closes the upstream stream.
+        """
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=max_tokens,
+                stream=True
+            )
+        except Exception as e:
+            raise Exception(f"Failed to generate response: {str(e)}")
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
     async def close(self):
         # No explicit close needed for openai.AsyncOpenAI, but keep for interface compatibility
         pass 
\ No newline at end of file
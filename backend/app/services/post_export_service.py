@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator
+from sqlalchemy.orm import Session
+from backend.app.db.models import Post
+from backend.app.services.post_query_service import PostQueryService
+from backend.app.services.retention_service import load_archived_bodies
+from backend.app.utils.fast_json import dumps
+
+EXPORT_FORMATS = ("ndjson", "csv", "json")
+DEFAULT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    Post.id, Post.source, Post.platform, Post.url, Post.title, Post.content,
+    Post.summary, Post.timestamp, Post.thumbnail, Post.author, Post.created_at,
+    Post.updated_at, Post.tags, Post.category, Post.tag_status,
+)
+FIELDNAMES = [c.key for c in EXPORT_COLUMNS]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "json": "application/json",
+}
+
+
+def _row_to_dict(row) -> dict:
+    data = dict(row._mapping)
+    for key in ("timestamp", "created_at", "updated_at"):
+        if isinstance(data[key], datetime):
+            data[key] = data[key].isoformat()
+    return data
+
+
+class PostExportService:
+    """
+    Streams posts out of the database in id order with server-side batching,
+    so memory stays constant regardless of table size.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+
+    def iter_rows(self, batch_size: int = DEFAULT_BATCH_SIZE, **filters) -> Iterator[dict]:
+        """
+        Iterate over each matching post as a plain dict.
+        Args:
+            batch_size: Rows fetched per round trip (yield_per)
+            **filters: Keyword filters accepted by PostQueryService.filtered_query
+        """
+        query = (
+            PostQueryService(self.db_session)
+            .filtered_query(**filters)
+            .with_entities(*EXPORT_COLUMNS, Post.archived_at)
+            .order_by(Post.id)
+            .yield_per(batch_size)
+        )
+        # Filters are validated here; rows are only fetched as the caller iterates
+        return self._with_full_bodies((_row_to_dict(row) for row in query), batch_size)
+
+    def _with_full_bodies(self, rows: Iterable[dict], batch_size: int) -> Iterator[dict]:
+        """Swap archived stubs for full bodies, one archive lookup per batch."""
+        for batch in _batched(rows, batch_size):
+            archived = {row["id"]: row for row in batch if row.pop("archived_at")}
+            for post_id, body in load_archived_bodies(self.db_session, archived).items():
+                archived[post_id]["content"] = body
+            yield from batch
+
+
+def _batched(rows: Iterable[dict], batch_size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def encode_ndjson(rows: Iterable[dict], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[bytes]:
+    for batch in _batched(rows, batch_size):
+        lines = []
+        for row in batch:
+            row["tags"] = json.loads(row["tags"]) if row["tags"] else []
+            lines.append(dumps(row))
+        yield b"\n".join(lines) + b"\n"
+
+
+def encode_csv(rows: Iterable[dict], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDNAMES)
+    writer.writeheader()
+    for batch in _batched(rows, batch_size):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def encode_json(rows: Iterable[dict], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[bytes]:
+    """Stream the {"posts": [...]} document used by rss_feeds.json."""
+    yield b'{"posts": ['
+    first = True
+    for batch in _batched(rows, batch_size):
+        for row in batch:
+            row["tags"] = json.loads(row["tags"]) if row["tags"] else []
+        chunk = b",".join(dumps(row) for row in batch)
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]}"
+
+
+ENCODERS = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+    "json": encode_json,
+}
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Incrementally gzip a stream of byte chunks."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(db_session: Session, fmt: str = "ndjson", gzip: bool = False, batch_size: int = DEFAULT_BATCH_SIZE, **filters) -> Iterator[bytes]:
+    """
+    Encoded (and optionally gzipped) export of the posts table as a byte stream.
+    Raises ValueError for an unknown format or invalid filters.
+    """
+    if fmt not in ENCODERS:
+        raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}. Got '{fmt}'")
+    rows = PostExportService(db_session).iter_rows(batch_size=batch_size, **filters)
+    chunks = ENCODERS[fmt](rows, batch_size=batch_size)
+    return gzip_chunks(chunks) if gzip else chunks
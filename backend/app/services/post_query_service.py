@@ -0,0 +1,193 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, or_, func, exists
+from sqlalchemy.orm import Session, load_only, with_expression
+from backend.app.db.models import Post, SavedPost
+from backend.app.services.retention_service import hydrate_bodies
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+EXCERPT_LENGTH = 280
+
+# Columns a post card renders; content and summary stay unloaded in list views
+CARD_COLUMNS = (
+    Post.id, Post.source, Post.platform, Post.url, Post.title, Post.thumbnail,
+    Post.author, Post.timestamp, Post.tags, Post.category, Post.tag_status,
+)
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(timestamp: Optional[datetime], post_id: int) -> str:
+    """
+    Encode the (timestamp, id) keyset position of a post into an opaque URL-safe token.
+    """
+    raw = f"{timestamp.isoformat() if timestamp else ''}|{post_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    Decode a token produced by encode_cursor back into (timestamp, id).
+    Raises InvalidCursorError if the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        ts_part, id_part = raw.rsplit("|", 1)
+        timestamp = datetime.fromisoformat(ts_part) if ts_part else None
+        return timestamp, int(id_part)
+    except (ValueError, UnicodeError, binascii.Error) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+
+def parse_date_range(start_date: Optional[str], end_date: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Parse optional YYYY-MM-DD bounds; the end date is inclusive of the whole day.
+    """
+    try:
+        date_start = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
+        date_end = datetime.strptime(end_date, "%Y-%m-%d").replace(hour=23, minute=59, second=59, microsecond=999999) if end_date else None
+    except ValueError:
+        raise ValueError(f"start_date and end_date must be in YYYY-MM-DD format. Got start_date='{start_date}', end_date='{end_date}'")
+    return date_start, date_end
+
+
+class PostQueryService:
+    """
+    Keyset-paginated, filterable reads over the posts table.
+    Posts are ordered newest first on (timestamp, id), with undated posts last.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+
+    def filtered_query(
+        self,
+        sources: Optional[List[str]] = None,
+        category: Optional[str] = None,
+        tag: Optional[str] = None,
+        tag_status: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ):
+        date_start, date_end = parse_date_range(start_date, end_date)
+        query = self.db_session.query(Post)
+        if sources:
+            query = query.filter(Post.source.in_(sources))
+        if category:
+            query = query.filter(Post.category == category)
+        if tag:
+            # Tags are stored as a JSON array string, so match the quoted element
+            query = query.filter(Post.tags.contains(json.dumps(tag), autoescape=True))
+        if tag_status:
+            query = query.filter(Post.tag_status == tag_status)
+        if date_start:
+            query = query.filter(Post.timestamp >= date_start)
+        if date_end:
+            query = query.filter(Post.timestamp <= date_end)
+        return query
+
+    @staticmethod
+    def card_options() -> tuple:
+        """
+        Loader options restricting Post to the card columns, with the excerpt and
+        the saved flag computed in SQL (an indexed EXISTS on saved_posts.post_id).
+        """
+        excerpt = func.substr(func.coalesce(Post.summary, Post.content), 1, EXCERPT_LENGTH)
+        is_saved = exists().where(SavedPost.post_id == Post.id).correlate_except(SavedPost)
+        return (
+            load_only(*CARD_COLUMNS),
+            with_expression(Post.excerpt, excerpt),
+            with_expression(Post.is_saved, is_saved),
+        )
+
+    @classmethod
+    def with_card_projection(cls, query):
+        """
+        Restrict a Post query to the card columns and compute the excerpt in SQL,
+        so full bodies are never transferred or hydrated.
+        """
+        return query.options(*cls.card_options())
+
+    def get_post(self, post_id: int) -> Optional[Post]:
+        """A single post with its full body, read back from the archive if it has been tiered out."""
+        post = self.db_session.get(Post, post_id)
+        if post is not None:
+            hydrate_bodies(self.db_session, [post])
+        return post
+
+    def list_posts(
+        self,
+        limit: int = DEFAULT_PAGE_LIMIT,
+        cursor: Optional[str] = None,
+        compact: bool = False,
+        **filters,
+    ) -> Tuple[List[Post], Optional[str]]:
+        """
+        Fetch one page of posts matching the given filters.
+        Args:
+            limit: Page size, capped at MAX_PAGE_LIMIT
+            cursor: Token returned as next_cursor by the previous page
+            compact: Load only CARD_COLUMNS plus a SQL-computed excerpt
+            **filters: Keyword filters accepted by filtered_query
+        Returns:
+            tuple: (posts, next_cursor); next_cursor is None on the last page
+        """
+        limit = max(1, min(limit, MAX_PAGE_LIMIT))
+        query = self.filtered_query(**filters)
+        if compact:
+            query = self.with_card_projection(query)
+        if cursor:
+            cursor_ts, cursor_id = decode_cursor(cursor)
+            if cursor_ts is None:
+                query = query.filter(Post.timestamp.is_(None), Post.id < cursor_id)
+            else:
+                query = query.filter(or_(
+                    Post.timestamp < cursor_ts,
+                    and_(Post.timestamp == cursor_ts, Post.id < cursor_id),
+                    Post.timestamp.is_(None),
+                ))
+        # Fetch one extra row to know whether another page exists
+        rows = query.order_by(Post.timestamp.desc().nullslast(), Post.id.desc()).limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last.timestamp, last.id)
+        return rows, next_cursor
+
+    def list_saved(self, limit: int = DEFAULT_PAGE_LIMIT, cursor: Optional[str] = None) -> Tuple[List[Tuple[SavedPost, Post]], Optional[str]]:
+        """
+        One page of saved posts, most recently saved first, as (SavedPost, Post card)
+        pairs from a single joined query keyset-paginated on (saved_at, id).
+        """
+        limit = max(1, min(limit, MAX_PAGE_LIMIT))
+        query = (
+            self.db_session.query(SavedPost, Post)
+            .join(Post, SavedPost.post_id == Post.id)
+            .options(*self.card_options())
+        )
+        if cursor:
+            cursor_ts, cursor_id = decode_cursor(cursor)
+            if cursor_ts is None:
+                raise InvalidCursorError(f"Invalid cursor: {cursor}")
+            query = query.filter(or_(
+                SavedPost.saved_at < cursor_ts,
+                and_(SavedPost.saved_at == cursor_ts, SavedPost.id < cursor_id),
+            ))
+        rows = query.order_by(SavedPost.saved_at.desc(), SavedPost.id.desc()).limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1][0]
+            next_cursor = encode_cursor(last.saved_at, last.id)
+        return rows, next_cursor
+
+    def saved_post_ids(self) -> List[int]:
+        """Ids of all saved posts, read from the saved_posts.post_id index alone."""
+        return [post_id for (post_id,) in self.db_session.query(SavedPost.post_id).distinct().order_by(SavedPost.post_id)]
@@ -0,0 +1,59 @@
+from collections import defaultdict
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from backend.app.db.models import PostCounter
+from backend.app.db.counters import TOTAL_DAY
+from backend.app.services.post_query_service import parse_date_range
+
+
+class PostStatsService:
+    """
+    Dashboard aggregates over posts, read from the post_counters rollups
+    instead of scanning the posts table.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+
+    def summary(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> dict:
+        """
+        Post counts by source, category and tag_status.
+        Without a date range the running totals are used; with one, the daily
+        rollups in range are summed and a per-day series is included.
+        Raises ValueError for malformed dates.
+        """
+        date_start, date_end = parse_date_range(start_date, end_date)
+        query = self.db_session.query(
+            PostCounter.day, PostCounter.source, PostCounter.category, PostCounter.tag_status,
+            func.sum(PostCounter.count),
+        )
+        ranged = bool(date_start or date_end)
+        if ranged:
+            query = query.filter(PostCounter.day != TOTAL_DAY)
+            if date_start:
+                query = query.filter(PostCounter.day >= date_start.date().isoformat())
+            if date_end:
+                query = query.filter(PostCounter.day <= date_end.date().isoformat())
+        else:
+            query = query.filter(PostCounter.day == TOTAL_DAY)
+        rows = query.group_by(PostCounter.day, PostCounter.source, PostCounter.category, PostCounter.tag_status).all()
+
+        by_source = defaultdict(int)
+        by_category = defaultdict(int)
+        by_tag_status = defaultdict(int)
+        daily = defaultdict(int)
+        for day, source, category, tag_status, count in rows:
+            if not count:
+                continue
+            by_source[source or "unknown"] += count
+            by_category[category or "uncategorized"] += count
+            by_tag_status[tag_status or "unknown"] += count
+            daily[day] += count
+        return {
+            "total": sum(by_source.values()),
+            "by_source": dict(sorted(by_source.items(), key=lambda item: -item[1])),
+            "by_category": dict(sorted(by_category.items(), key=lambda item: -item[1])),
+            "by_tag_status": dict(by_tag_status),
+            "daily": [{"day": day, "count": count} for day, count in sorted(daily.items())] if ranged else [],
+        }
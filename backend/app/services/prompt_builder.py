@@ -0,0 +1,237 @@
+"""
+Token-budgeted prompt building shared by tagging and summarization.
+
+Items (posts, articles) are fitted into a total prompt budget with a per-item
+cap. Budget left unused by short items is shared among the longer ones. An
+item over its share is cut down to its most informative sentences, or simply
+truncated. Items that would get less than a useful minimum are dropped, lowest
+priority (latest added) first. The resulting PromptStats say how many tokens
+were sent and what was cut.
+"""
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # optional: exact counts for OpenAI models
+    tiktoken = None
+
+# Below this many tokens an item carries too little to be worth sending
+MIN_ITEM_TOKENS = 48
+# Per chat message framing overhead (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])|\n{2,}")
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9+#\-]{2,}")
+_NUMBER_RE = re.compile(r"\d")
+STOPWORDS = frozenset(
+    "the and for with that this from are was were have has had not but you your our their its into over "
+    "about more than they them then there these those which will would can could also been being such "
+    "what when where who how all any each other some most very just only new one two use used using".split()
+)
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: Optional[str]):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding("cl100k_base")
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: Optional[str], model: Optional[str] = None) -> int:
+    """Token count with tiktoken when installed, else about 4 characters per token."""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_RE.split(text or "") if s and s.strip()]
+
+
+def truncate_to_tokens(text: str, budget: int, counter: Callable[[str], int] = count_tokens) -> str:
+    """Longest prefix of text within budget tokens, cut at a word boundary where possible."""
+    if counter(text) <= budget:
+        return text
+    if budget <= 0:
+        return ""
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if counter(text[:mid]) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    cut = text[:lo]
+    space = cut.rfind(" ")
+    return cut[:space] if space > lo * 0.8 else cut
+
+
+def select_sentences(text: str, budget: int, title: str = "", counter: Callable[[str], int] = count_tokens) -> str:
+    """
+    The most informative sentences of text that fit in budget tokens, in their
+    original order. Sentences score by the document frequency of their content
+    words, overlap with the title, numbers, and a lead bias, with the score
+    normalized by sentence length.
+    """
+    if counter(text) <= budget:
+        return text
+    sentences = split_sentences(text)
+    if len(sentences) <= 1:
+        return truncate_to_tokens(text, budget, counter)
+    words = [[w.lower() for w in _WORD_RE.findall(s) if w.lower() not in STOPWORDS] for s in sentences]
+    frequency = Counter(w for ws in words for w in set(ws))
+    title_words = {w.lower() for w in _WORD_RE.findall(title or "")} - STOPWORDS
+    scored = []
+    for i, (sentence, ws) in enumerate(zip(sentences, words)):
+        if not ws:
+            continue
+        score = sum(math.log1p(frequency[w]) for w in ws) / math.sqrt(len(ws))
+        score += 1.5 * len(title_words.intersection(ws))
+        score += 0.5 if _NUMBER_RE.search(sentence) else 0.0
+        score += 2.0 / (1 + i) ** 2  # news leads carry the gist
+        scored.append((score, i))
+    chosen = []
+    used = 0
+    for _, i in sorted(scored, reverse=True):
+        cost = counter(sentences[i]) + 1
+        if used + cost <= budget:
+            chosen.append(i)
+            used += cost
+    if not chosen:
+        return truncate_to_tokens(sentences[0], budget, counter)
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+@dataclass
+class PromptItem:
+    body: str
+    key: Any = None
+    header: str = ""
+    title: str = ""
+    tokens: int = 0
+    budget: int = 0
+    text: str = ""
+
+
+@dataclass
+class PromptStats:
+    total_tokens: int = 0
+    budget: int = 0
+    items: int = 0
+    truncated: int = 0
+    dropped: int = 0
+    squeezed: int = 0  # kept items cut below item_budget to fit the total budget
+    item_tokens: List[int] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "prompt_tokens": self.total_tokens,
+            "budget": self.budget,
+            "items": self.items,
+            "truncated": self.truncated,
+            "dropped": self.dropped,
+        }
+
+
+class PromptBuilder:
+    """
+    Builds one prompt from a fixed preamble plus items within a token budget.
+    Args:
+        total_budget: Tokens allowed for the whole prompt (system and user messages)
+        item_budget: Cap on the body tokens of any single item
+        strategy: "select" keeps the most informative sentences, "truncate" keeps a prefix
+        model: Model name, for exact counts when tiktoken is installed
+    """
+
+    def __init__(self, total_budget: int, item_budget: int, strategy: str = "select",
+                 model: Optional[str] = None, min_item_tokens: int = MIN_ITEM_TOKENS):
+        if strategy not in ("select", "truncate"):
+            raise ValueError(f"Unknown prompt strategy '{strategy}'")
+        self.total_budget = total_budget
+        self.item_budget = item_budget
+        self.strategy = strategy
+        self.model = model
+        self.min_item_tokens = min_item_tokens
+        self.items: List[PromptItem] = []
+
+    def count(self, text: str) -> int:
+        return count_tokens(text, self.model)
+
+    def add(self, body: Optional[str], header: str = "", title: str = "", key: Any = None):
+        """Add an item; items added first are kept first when the budget runs out."""
+        body = body or ""
+        self.items.append(PromptItem(body=body, key=key, header=header, title=title, tokens=self.count(body)))
+
+    def fit_text(self, body: str, budget: int, title: str = "") -> str:
+        if self.strategy == "select":
+            return select_sentences(body, budget, title=title, counter=self.count)
+        return truncate_to_tokens(body, budget, self.count)
+
+    def _allocate(self, available: int, items: Sequence[PromptItem]) -> bool:
+        """
+        Water-fill available tokens over items, capped at item_budget; returns
+        False if an item would get less than min_item_tokens.
+        """
+        remaining = sorted(items, key=lambda item: item.tokens)
+        while remaining:
+            share = available // len(remaining)
+            item = remaining.pop(0)
+            item.budget = min(item.tokens, self.item_budget, share)
+            if item.budget < min(item.tokens, self.min_item_tokens):
+                return False
+            available -= item.budget
+        return True
+
+    def fit(self, overhead: int = 0) -> Tuple[List[PromptItem], PromptStats]:
+        """
+        Fit item bodies into the budget left after overhead tokens (preamble,
+        system prompt, framing). Sets item.text on the kept items.
+        Returns:
+            tuple: (kept items in insertion order, PromptStats without total_tokens)
+        """
+        overhead += sum(self.count(item.header) + 2 for item in self.items)
+        kept = list(self.items)
+        while kept and not self._allocate(self.total_budget - overhead, kept):
+            dropped = kept.pop()
+            overhead -= self.count(dropped.header) + 2
+
+        stats = PromptStats(budget=self.total_budget, items=len(kept), dropped=len(self.items) - len(kept))
+        for item in kept:
+            item.text = item.body if item.budget >= item.tokens else self.fit_text(item.body, item.budget, item.title)
+            stats.truncated += item.text != item.body
+            stats.squeezed += item.budget < min(item.tokens, self.item_budget)
+            stats.item_tokens.append(self.count(item.text))
+        return kept, stats
+
+    def build(self, preamble: str = "", system_prompt: str = "",
+              join: Callable[[List[str]], str] = "\n\n".join) -> Tuple[str, PromptStats]:
+        """
+        Fit the items and join them (header + fitted body) after the preamble.
+        The system prompt sent alongside is counted against the budget.
+        Returns:
+            tuple: (user prompt text, PromptStats)
+        """
+        fixed = self.count(system_prompt) + MESSAGE_OVERHEAD_TOKENS if system_prompt else 0
+        kept, stats = self.fit(fixed + self.count(preamble) + MESSAGE_OVERHEAD_TOKENS)
+        prompt = preamble + join([f"{item.header}{item.text}" for item in kept])
+        stats.total_tokens = fixed + self.count(prompt) + MESSAGE_OVERHEAD_TOKENS
+        return prompt, stats
+
+
+def log_stats(stats: PromptStats, label: str = "Prompt"):
+    message = f"{label}: {stats.total_tokens}/{stats.budget} tokens, {stats.items} items"
+    if stats.truncated or stats.dropped:
+        message += f" ({stats.truncated} shortened, {stats.dropped} dropped)"
+    logging.info(message)
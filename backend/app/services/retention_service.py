@@ -0,0 +1,180 @@
+import os
+import re
+import zlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import func, update, delete
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from backend.app.db.models import Post, PostArchive, SavedPost, Note
+
+# Posts older than this many days (by timestamp) are moved to the cold tier
+RETENTION_HOT_DAYS = int(os.getenv("RETENTION_HOT_DAYS", "30"))
+DEFAULT_BATCH_SIZE = 500
+# Leading characters of the body kept in posts.content; at least
+# post_query_service.EXCERPT_LENGTH so list excerpts are unaffected
+STUB_LENGTH = 280
+
+URL_PATTERN = re.compile(r"https?://[^\s<>\"')\]]+")
+
+
+def compress_body(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 9)
+
+
+def decompress_body(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def load_archived_bodies(db_session: Session, post_ids: Iterable[int]) -> Dict[int, str]:
+    """Full bodies of archived posts, keyed by post id, in one query."""
+    post_ids = list(post_ids)
+    if not post_ids:
+        return {}
+    rows = db_session.query(PostArchive.post_id, PostArchive.content).filter(PostArchive.post_id.in_(post_ids)).all()
+    return {post_id: decompress_body(data) for post_id, data in rows}
+
+
+def hydrate_bodies(db_session: Session, posts: List[Post]) -> List[Post]:
+    """
+    Replace the stub content of archived posts with their full body.
+    The value is set as already-committed, so a later flush does not write it back
+    to the hot table.
+    """
+    archived = {p.id: p for p in posts if p.archived_at is not None}
+    for post_id, body in load_archived_bodies(db_session, archived).items():
+        set_committed_value(archived[post_id], "content", body)
+    return posts
+
+
+class RetentionService:
+    """
+    Hot/cold tiering for posts. Bodies of tagged posts older than hot_days are
+    compressed into post_archive and posts.content keeps only a STUB_LENGTH
+    prefix; every other column stays in the hot row. Saved posts and posts
+    linked from a note are pinned in the hot tier.
+
+    Archiving and restoring leave updated_at untouched: the post itself has not
+    changed, so caches and incremental snapshots need not see it again.
+    """
+
+    def __init__(self, db_session: Session, hot_days: int = RETENTION_HOT_DAYS, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.db_session = db_session
+        self.hot_days = hot_days
+        self.batch_size = batch_size
+
+    def pinned_post_ids(self) -> Set[int]:
+        """Ids of saved posts and of posts whose URL appears in a note."""
+        pinned = {post_id for (post_id,) in self.db_session.query(SavedPost.post_id).distinct()}
+        urls = set()
+        for title, description in self.db_session.query(Note.title, Note.description):
+            urls.update(URL_PATTERN.findall(f"{title or ''} {description or ''}"))
+        if urls:
+            pinned.update(post_id for (post_id,) in self.db_session.query(Post.id).filter(Post.url.in_(urls)))
+        return pinned
+
+    def _candidates(self, cutoff: datetime, pinned: Set[int]):
+        query = self.db_session.query(Post.id, Post.content, Post.updated_at).filter(
+            Post.archived_at.is_(None),
+            Post.timestamp < cutoff,
+            # Posts still waiting for (re)tagging need their full body hot
+            Post.tag_status == "tagged",
+            func.length(Post.content) > STUB_LENGTH,
+        )
+        if pinned:
+            query = query.filter(Post.id.notin_(pinned))
+        return query.order_by(Post.id)
+
+    def archive(self, dry_run: bool = False, now: Optional[datetime] = None) -> dict:
+        """
+        Move old bodies to the cold tier in batches, one commit per batch.
+        Pinned posts that were archived before being pinned are restored first.
+        Returns:
+            dict: archived/restored counts and body bytes before/after compression
+        """
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(days=self.hot_days)
+        pinned = self.pinned_post_ids()
+        stats = {"cutoff": cutoff.isoformat(), "pinned": len(pinned), "archived": 0, "restored": 0, "bytes_before": 0, "bytes_after": 0}
+        if dry_run:
+            rows = self._candidates(cutoff, pinned).all()
+            stats["archived"] = len(rows)
+            stats["bytes_before"] = sum(len(content.encode("utf-8")) for _, content, _ in rows)
+            return stats
+
+        stats["restored"] = self.restore(pinned)
+        while True:
+            rows = self._candidates(cutoff, pinned).limit(self.batch_size).all()
+            if not rows:
+                break
+            archives = []
+            updates = []
+            for post_id, content, updated_at in rows:
+                data = compress_body(content)
+                size = len(content.encode("utf-8"))
+                archives.append({"post_id": post_id, "content": data, "original_size": size, "archived_at": now})
+                updates.append({"id": post_id, "content": content[:STUB_LENGTH], "archived_at": now, "updated_at": updated_at})
+                stats["bytes_before"] += size
+                stats["bytes_after"] += len(data)
+            self.db_session.bulk_insert_mappings(PostArchive, archives)
+            self.db_session.execute(update(Post), updates)
+            self.db_session.commit()
+            stats["archived"] += len(rows)
+            logging.info(f"Archived {stats['archived']} post bodies so far (cutoff {cutoff.isoformat()})")
+        return stats
+
+    def restore(self, post_ids: Iterable[int]) -> int:
+        """Bring archived bodies of the given posts back into the hot table."""
+        post_ids = list(post_ids)
+        if not post_ids:
+            return 0
+        archived = self.db_session.query(Post.id, Post.updated_at).filter(
+            Post.id.in_(post_ids), Post.archived_at.isnot(None)
+        ).all()
+        if not archived:
+            return 0
+        bodies = load_archived_bodies(self.db_session, [post_id for post_id, _ in archived])
+        updates = [
+            {"id": post_id, "content": bodies[post_id], "archived_at": None, "updated_at": updated_at}
+            for post_id, updated_at in archived if post_id in bodies
+        ]
+        if updates:
+            self.db_session.execute(update(Post), updates)
+            self.db_session.execute(delete(PostArchive).where(PostArchive.post_id.in_([u["id"] for u in updates])))
+            self.db_session.commit()
+            # Drop any in-session copies still holding the stub
+            self.db_session.expire_all()
+        logging.info(f"Restored {len(updates)} archived post bodies to the hot tier")
+        return len(updates)
+
+    def pin_urls(self, text: Optional[str]) -> int:
+        """Restore archived posts linked from a piece of text (e.g. a note)."""
+        urls = set(URL_PATTERN.findall(text or ""))
+        if not urls:
+            return 0
+        return self.restore(post_id for (post_id,) in self.db_session.query(Post.id).filter(Post.url.in_(urls)))
+
+    def stats(self) -> dict:
+        archived, stored, original = self.db_session.query(
+            func.count(PostArchive.post_id),
+            func.coalesce(func.sum(func.length(PostArchive.content)), 0),
+            func.coalesce(func.sum(PostArchive.original_size), 0),
+        ).one()
+        return {
+            "hot": self.db_session.query(Post).filter(Post.archived_at.is_(None)).count(),
+            "archived": archived,
+            "archive_bytes": stored,
+            "original_bytes": original,
+            "hot_days": self.hot_days,
+        }
+
+    def vacuum(self) -> bool:
+        """Reclaim freed space; SQLite only (PostgreSQL autovacuum handles this)."""
+        bind = self.db_session.get_bind()
+        if bind.dialect.name != "sqlite":
+            return False
+        self.db_session.commit()
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("VACUUM")
+        return True
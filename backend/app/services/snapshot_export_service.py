@@ -0,0 +1,226 @@
+import json
+import os
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, load_only
+from backend.app.db.models import Post, RssScrapeRun, ArticleSummary
+from backend.app.services.retention_service import hydrate_bodies
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # pyarrow is optional; only needed for snapshot exports
+    pa = None
+    ds = None
+
+DEFAULT_BATCH_SIZE = 5000
+STATE_FILE = "_snapshot_state.json"
+SNAPSHOT_TABLES = ("posts", "tags", "runs", "summaries")
+
+
+class SnapshotExportError(Exception):
+    pass
+
+
+def _utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _month(value: Optional[datetime]) -> str:
+    return value.strftime("%Y-%m") if value else "unknown"
+
+
+def _chunked(rows, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _schemas() -> Dict[str, "pa.Schema"]:
+    ts = pa.timestamp("us")
+    return {
+        "posts": pa.schema([
+            ("id", pa.int64()), ("source", pa.string()), ("platform", pa.string()),
+            ("url", pa.string()), ("title", pa.string()), ("content", pa.string()),
+            ("summary", pa.string()), ("timestamp", ts), ("thumbnail", pa.string()),
+            ("author", pa.string()), ("created_at", ts), ("updated_at", ts),
+            ("tags", pa.list_(pa.string())), ("category", pa.string()), ("tag_status", pa.string()),
+            ("snapshot_id", pa.string()), ("month", pa.string()),
+        ]),
+        "tags": pa.schema([
+            ("post_id", pa.int64()), ("tag", pa.string()), ("category", pa.string()),
+            ("timestamp", ts), ("snapshot_id", pa.string()), ("month", pa.string()), ("source", pa.string()),
+        ]),
+        "runs": pa.schema([
+            ("id", pa.int64()), ("started_at", ts), ("ended_at", ts), ("duration_seconds", pa.float64()),
+            ("num_sources_total", pa.int64()), ("num_sources_skipped", pa.int64()),
+            ("num_sources_captured", pa.int64()), ("num_articles_captured", pa.int64()),
+            ("status", pa.string()), ("error_message", pa.string()), ("run_type", pa.string()),
+            ("snapshot_id", pa.string()), ("month", pa.string()), ("source", pa.string()),
+        ]),
+        "summaries": pa.schema([
+            ("id", pa.int64()), ("post_id", pa.int64()), ("summary", pa.string()), ("created_at", ts),
+            ("snapshot_id", pa.string()), ("month", pa.string()), ("source", pa.string()),
+        ]),
+    }
+
+
+class SnapshotExportService:
+    """
+    Writes posts, tags, scrape runs and article summaries as Hive-partitioned
+    Parquet datasets (month=YYYY-MM/source=...) under output_dir.
+
+    Snapshots are incremental: each run appends only rows created or updated
+    since the previous snapshot's watermark. A row that changes (or sits on the
+    watermark) is written again, so readers should keep the row with the latest
+    snapshot_id per id.
+    """
+
+    def __init__(self, db_session: Session, output_dir: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        if pa is None:
+            raise SnapshotExportError("pyarrow is required for snapshot exports: pip install pyarrow")
+        self.db_session = db_session
+        self.output_dir = output_dir
+        self.batch_size = batch_size
+        self.schemas = _schemas()
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    # --- watermark state ---
+    def _state_path(self) -> str:
+        return os.path.join(self.output_dir, STATE_FILE)
+
+    def load_state(self) -> dict:
+        if not os.path.exists(self._state_path()):
+            return {}
+        with open(self._state_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self, state: dict):
+        tmp_path = self._state_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self._state_path())
+
+    # --- writing ---
+    def _write(self, table_name: str, rows: list, snapshot_id: str, batch_no: int):
+        if not rows:
+            return
+        table = pa.Table.from_pylist(rows, schema=self.schemas[table_name])
+        partition_fields = [f for f in ("month", "source") if f in table.schema.names]
+        ds.write_dataset(
+            table,
+            os.path.join(self.output_dir, table_name),
+            format="parquet",
+            partitioning=ds.partitioning(pa.schema([table.schema.field(f) for f in partition_fields]), flavor="hive"),
+            basename_template=f"part-{snapshot_id}-{batch_no}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+    def _export(self, table_name: str, query, changed_col, to_rows, since: Optional[datetime], snapshot_id: str) -> dict:
+        if since is not None:
+            # Re-read the watermark's whole second. SQLite's CURRENT_TIMESTAMP stores
+            # "12:00:00", which sorts before the bound "12:00:00.000000", so ">= since"
+            # would skip rows committed in the same second as the last snapshot
+            query = query.filter(changed_col > since.replace(microsecond=0) - timedelta(microseconds=1))
+        query = query.add_columns(changed_col.label("_changed_at")).yield_per(self.batch_size)
+        count = 0
+        watermark = since
+        batch = []
+        batch_no = 0
+        for rows in _chunked(query, self.batch_size):
+            if table_name == "posts":
+                # Snapshots carry full bodies, including ones tiered out to post_archive
+                hydrate_bodies(self.db_session, [row[0] for row in rows])
+            for row in rows:
+                changed_at = _utc_naive(row._changed_at)
+                if changed_at and (watermark is None or changed_at > watermark):
+                    watermark = changed_at
+                batch.extend(to_rows(row[0], snapshot_id))
+                count += 1
+            if len(batch) >= self.batch_size:
+                self._write(table_name, batch, snapshot_id, batch_no)
+                batch, batch_no = [], batch_no + 1
+        self._write(table_name, batch, snapshot_id, batch_no)
+        logging.info(f"Snapshot {snapshot_id}: wrote {count} changed rows to {table_name}")
+        return {"rows": count, "watermark": watermark}
+
+    @staticmethod
+    def _post_rows(post: Post, snapshot_id: str) -> list:
+        timestamp = _utc_naive(post.timestamp)
+        return [{
+            "id": post.id, "source": post.source or "unknown", "platform": post.platform,
+            "url": post.url, "title": post.title, "content": post.content, "summary": post.summary,
+            "timestamp": timestamp, "thumbnail": post.thumbnail, "author": post.author,
+            "created_at": _utc_naive(post.created_at), "updated_at": _utc_naive(post.updated_at),
+            "tags": post.get_tags(), "category": post.category, "tag_status": post.tag_status,
+            "snapshot_id": snapshot_id, "month": _month(timestamp),
+        }]
+
+    @staticmethod
+    def _tag_rows(post: Post, snapshot_id: str) -> list:
+        timestamp = _utc_naive(post.timestamp)
+        return [{
+            "post_id": post.id, "tag": tag, "category": post.category, "timestamp": timestamp,
+            "snapshot_id": snapshot_id, "month": _month(timestamp), "source": post.source or "unknown",
+        } for tag in post.get_tags()]
+
+    @staticmethod
+    def _run_rows(run: RssScrapeRun, snapshot_id: str) -> list:
+        started_at = _utc_naive(run.started_at)
+        return [{
+            "id": run.id, "started_at": started_at, "ended_at": _utc_naive(run.ended_at),
+            "duration_seconds": run.duration_seconds, "num_sources_total": run.num_sources_total,
+            "num_sources_skipped": run.num_sources_skipped, "num_sources_captured": run.num_sources_captured,
+            "num_articles_captured": run.num_articles_captured, "status": run.status,
+            "error_message": run.error_message, "run_type": run.run_type,
+            "snapshot_id": snapshot_id, "month": _month(started_at), "source": run.source or "rss",
+        }]
+
+    @staticmethod
+    def _summary_rows(summary: ArticleSummary, snapshot_id: str) -> list:
+        created_at = _utc_naive(summary.created_at)
+        return [{
+            "id": summary.id, "post_id": summary.post_id, "summary": summary.summary, "created_at": created_at,
+            "snapshot_id": snapshot_id, "month": _month(created_at),
+            "source": (summary.post.source if summary.post else None) or "unknown",
+        }]
+
+    def run(self, tables: Iterable[str] = SNAPSHOT_TABLES, full: bool = False) -> dict:
+        """
+        Write one incremental snapshot.
+        Args:
+            tables: Subset of SNAPSHOT_TABLES to export
+            full: Ignore saved watermarks and export every row
+        Returns:
+            dict: Snapshot id and per-table row counts
+        """
+        state = {} if full else self.load_state()
+        snapshot_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        post_changed = func.coalesce(Post.updated_at, Post.created_at)
+        specs = {
+            "posts": (self.db_session.query(Post).order_by(Post.id), post_changed, self._post_rows),
+            "tags": (self.db_session.query(Post).filter(Post.tags.isnot(None)).order_by(Post.id), post_changed, self._tag_rows),
+            "runs": (self.db_session.query(RssScrapeRun).order_by(RssScrapeRun.id), func.coalesce(RssScrapeRun.ended_at, RssScrapeRun.started_at), self._run_rows),
+            "summaries": (self.db_session.query(ArticleSummary).options(joinedload(ArticleSummary.post).load_only(Post.source)).order_by(ArticleSummary.id), ArticleSummary.created_at, self._summary_rows),
+        }
+        result = {"snapshot_id": snapshot_id, "tables": {}}
+        for name in tables:
+            if name not in specs:
+                raise SnapshotExportError(f"Unknown snapshot table '{name}'. Choose from {', '.join(SNAPSHOT_TABLES)}")
+            query, changed_col, to_rows = specs[name]
+            since = datetime.fromisoformat(state[name]) if state.get(name) else None
+            stats = self._export(name, query, changed_col, to_rows, since, snapshot_id)
+            if stats["watermark"] is not None:
+                state[name] = stats["watermark"].isoformat()
+            result["tables"][name] = stats["rows"]
+        self._save_state(state)
+        return result
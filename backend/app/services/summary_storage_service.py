@@ -9,4 +9,26 @@ class SummaryStorageService:
         new_summary = ArticleSummary(post_id=post_id, summary=summary)
         self.db_session.add(new_summary)
         self.db_session.commit()
-        return new_summary 
\ No newline at end of file
+        return new_summary
+
+    def store_summaries(self, summaries):
+        """Store (post_id, summary) pairs in one commit."""
+        self.db_session.add_all(ArticleSummary(post_id=post_id, summary=summary) for post_id, summary in summaries)
+        self.db_session.commit()
+
+class AsyncSummaryStorageService:
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    async def store_summary(self, post_id: int, summary: str):
+        async with self.session_factory() as session:
+            new_summary = ArticleSummary(post_id=post_id, summary=summary)
+            session.add(new_summary)
+            await session.commit()
+            return new_summary
+
+    async def store_summaries(self, summaries):
+        """Store (post_id, summary) pairs in one commit."""
+        async with self.session_factory() as session:
+            session.add_all(ArticleSummary(post_id=post_id, summary=summary) for post_id, summary in summaries)
+            await session.commit()
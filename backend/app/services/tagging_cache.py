@@ -0,0 +1,86 @@
+import hashlib
+import html
+import json
+import logging
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from backend.app.db.inserts import insert_missing
+from backend.app.db.models import TaggingCacheEntry
+from backend.app.services.tagging_engine import BATCH_SYSTEM_PROMPT, TAGGING_MODEL
+
+# Changes whenever the taxonomy prompt does, so entries from older prompts stop matching
+PROMPT_VERSION = hashlib.sha256(BATCH_SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:16]
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Strip markup, unescape entities, lowercase and collapse whitespace."""
+    text = html.unescape(_TAG_RE.sub(" ", text or ""))
+    return _SPACE_RE.sub(" ", text).strip().lower()
+
+
+class TaggingCache:
+    """
+    Persistent tagging results keyed by sha256(normalized text, prompt version, model),
+    so identical content (cross-posts, reposted abstracts, retries) is tagged once.
+    Methods take a sync Session; AsyncSession callers use session.run_sync.
+    Writes are flushed with the caller's transaction rather than committed here.
+    """
+
+    def __init__(self, model: str = TAGGING_MODEL, prompt_version: str = PROMPT_VERSION):
+        self.model = model
+        self.prompt_version = prompt_version
+
+    def key(self, text: Optional[str]) -> str:
+        raw = f"{normalize_text(text)}\0{self.prompt_version}\0{self.model}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def lookup(self, session: Session, keys: Iterable[str]) -> Dict[str, Tuple[List[str], str]]:
+        """Cached (tags, category) for the given keys; bumps hit counters of the entries found."""
+        keys = list(set(keys))
+        if not keys:
+            return {}
+        entries = session.query(TaggingCacheEntry).filter(TaggingCacheEntry.key.in_(keys)).all()
+        now = datetime.utcnow()
+        found = {}
+        for entry in entries:
+            entry.hits += 1
+            entry.last_hit_at = now
+            found[entry.key] = (json.loads(entry.tags), entry.category)
+        return found
+
+    def store(self, session: Session, results: Dict[str, Tuple[List[str], str]]):
+        """Add results for keys not cached yet; keys another writer already stored are kept as they are."""
+        insert_missing(session, TaggingCacheEntry, [
+            {"key": key, "prompt_version": self.prompt_version, "model": self.model,
+             "tags": json.dumps(tags), "category": category, "hits": 0}
+            for key, (tags, category) in results.items()
+        ])
+
+    def purge_stale(self, session: Session) -> int:
+        """Delete entries written under another prompt version or model. Commits."""
+        deleted = session.query(TaggingCacheEntry).filter(
+            (TaggingCacheEntry.prompt_version != self.prompt_version) | (TaggingCacheEntry.model != self.model)
+        ).delete(synchronize_session=False)
+        session.commit()
+        logging.info(f"Purged {deleted} stale tagging cache entries")
+        return deleted
+
+    def stats(self, session: Session) -> dict:
+        current = (TaggingCacheEntry.prompt_version == self.prompt_version) & (TaggingCacheEntry.model == self.model)
+        entries, hits = session.query(
+            func.count(TaggingCacheEntry.key), func.coalesce(func.sum(TaggingCacheEntry.hits), 0)
+        ).filter(current).one()
+        total = session.query(func.count(TaggingCacheEntry.key)).scalar()
+        return {
+            "prompt_version": self.prompt_version,
+            "model": self.model,
+            "entries": entries,
+            "stale_entries": total - entries,
+            "hits": int(hits),
+        }
@@ -0,0 +1,228 @@
+"""
+Batched, concurrent LLM tagging.
+
+Several posts are packed into one JSON prompt and the model answers with one
+result per post id. Batches run concurrently on the async OpenAI client,
+bounded by a semaphore and a tokens-per-minute limiter, and results are handed
+to the caller in chunks so it can commit as it goes.
+"""
+import asyncio
+import inspect
+import json
+import logging
+import os
+import re
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from ..utils.rate_limiter import TokenRateLimiter
+from .prompt_builder import PromptBuilder, PromptStats, MESSAGE_OVERHEAD_TOKENS, count_tokens
+
+TAGGING_MODEL = os.getenv("TAGGING_MODEL", "gpt-3.5-turbo")
+TAGGING_POSTS_PER_CALL = int(os.getenv("TAGGING_POSTS_PER_CALL", "10"))
+TAGGING_CONCURRENCY = int(os.getenv("TAGGING_CONCURRENCY", "4"))
+TAGGING_TOKENS_PER_MINUTE = int(os.getenv("TAGGING_TOKENS_PER_MINUTE", "60000"))
+TAGGING_COMMIT_EVERY = int(os.getenv("TAGGING_COMMIT_EVERY", "50"))
+# Prompt budgets in tokens: per post body, and per call (system prompt included)
+TAGGING_ITEM_TOKENS = int(os.getenv("TAGGING_ITEM_TOKENS", "800"))
+TAGGING_PROMPT_TOKENS = int(os.getenv("TAGGING_PROMPT_TOKENS", "8000"))
+# Completion tokens reserved per post in a batch
+OUTPUT_TOKENS_PER_POST = 120
+
+CATEGORIES = (
+    "Artificial General Intelligence (AGI)",
+    "Large Language Models (LLMs)",
+    "Natural Language Processing (NLP)",
+    "Computer Vision",
+    "Reinforcement Learning",
+    "Robotics",
+    "AI Ethics & Safety",
+    "AI Research",
+    "AI Applications (e.g. healthcare, finance, education)",
+    "AI Infrastructure & Tooling (e.g. GPUs, frameworks, APIs)",
+    "AI Policy & Regulation",
+    "AI Startups & Business",
+    "Multimodal AI",
+    "Open-Source AI",
+    "Other",
+)
+
+BATCH_SYSTEM_PROMPT = (
+    "You are an expert content classifier and keyword extractor focused on AI-related content.\n"
+    "You receive a JSON array of posts, each with an \"id\" and a \"text\". For every post return:\n"
+    "1. A list of 3-8 descriptive tags for the topics, methods and themes of the text.\n"
+    "   Named models, labs, companies and products are tagged separately, so leave them out.\n"
+    "2. The main category, chosen from this AI-focused taxonomy:\n"
+    + "\n".join(f"   - {c}" for c in CATEGORIES) + "\n"
+    "Return only JSON of the form:\n"
+    "{\"results\": [{\"id\": <post id>, \"tags\": [...], \"category\": \"...\"}, ...]}\n"
+    "with exactly one result per input id."
+)
+
+Outcome = Union[Tuple[List[str], str], Exception]
+
+
+class TaggingResponseError(Exception):
+    pass
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count for rate limiting (see prompt_builder.count_tokens)."""
+    return count_tokens(text, TAGGING_MODEL)
+
+
+def normalize_category(category: Optional[str]) -> str:
+    if not category:
+        return "Other"
+    for known in CATEGORIES:
+        if category.strip().lower() == known.lower():
+            return known
+    return "Other"
+
+
+def build_messages(
+    items: Sequence[Tuple[int, str]],
+    model: str = TAGGING_MODEL,
+    total_budget: int = TAGGING_PROMPT_TOKENS,
+    item_budget: int = TAGGING_ITEM_TOKENS,
+) -> Tuple[List[dict], PromptStats]:
+    """
+    The batch prompt, with post texts fitted to the token budgets. Posts that do
+    not fit are left out; tag_batch retries them on their own.
+    """
+    builder = PromptBuilder(total_budget, item_budget, model=model)
+    for post_id, text in items:
+        # The header only accounts for each post's JSON framing
+        builder.add(text, header=json.dumps({"id": post_id, "text": ""}), key=post_id)
+    overhead = count_tokens(BATCH_SYSTEM_PROMPT, model) + 2 * MESSAGE_OVERHEAD_TOKENS
+    kept, stats = builder.fit(overhead)
+    posts = [{"id": item.key, "text": item.text} for item in kept]
+    messages = [
+        {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+        {"role": "user", "content": json.dumps(posts, ensure_ascii=False)},
+    ]
+    stats.total_tokens = sum(count_tokens(m["content"], model) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+    return messages, stats
+
+
+def parse_results(content: str, post_ids: Sequence[int]) -> Dict[int, Tuple[List[str], str]]:
+    """
+    Map the model's JSON answer back to post ids. Ids the model skipped or
+    invented are left out; raises TaggingResponseError if the JSON is unusable.
+    """
+    content = re.sub(r'^```json\s*|^```\s*|```$', '', (content or "").strip(), flags=re.MULTILINE)
+    try:
+        parsed = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise TaggingResponseError(f"Tagging response is not valid JSON: {e}") from e
+    results = parsed.get("results") if isinstance(parsed, dict) else parsed
+    if not isinstance(results, list):
+        raise TaggingResponseError("Tagging response has no results list")
+    wanted = {str(post_id): post_id for post_id in post_ids}
+    mapped = {}
+    for result in results:
+        if not isinstance(result, dict) or str(result.get("id")) not in wanted:
+            continue
+        tags = [str(t) for t in result.get("tags") or [] if t]
+        mapped[wanted[str(result["id"])]] = (tags, normalize_category(result.get("category")))
+    return mapped
+
+
+async def _resolve(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class BatchTaggingEngine:
+    """
+    Tags (post_id, text) items with batched prompts on an async OpenAI-compatible client.
+    Args:
+        client: AsyncOpenAI (or compatible) client
+        posts_per_call: Posts packed into one prompt
+        max_concurrency: Batches in flight at once
+        tokens_per_minute: Provider TPM budget shared by all batches
+        commit_every: Results handed to on_results per chunk
+    """
+
+    def __init__(
+        self,
+        client,
+        model: str = TAGGING_MODEL,
+        posts_per_call: int = TAGGING_POSTS_PER_CALL,
+        max_concurrency: int = TAGGING_CONCURRENCY,
+        tokens_per_minute: int = TAGGING_TOKENS_PER_MINUTE,
+        commit_every: int = TAGGING_COMMIT_EVERY,
+    ):
+        self.client = client
+        self.model = model
+        self.posts_per_call = max(1, posts_per_call)
+        self.max_concurrency = max(1, max_concurrency)
+        self.limiter = TokenRateLimiter(tokens_per_minute)
+        self.commit_every = max(1, commit_every)
+        self.calls = 0
+        self.prompt_tokens = 0
+
+    async def _call(self, items: Sequence[Tuple[int, str]]) -> Dict[int, Tuple[List[str], str]]:
+        messages, stats = build_messages(items, self.model)
+        max_tokens = OUTPUT_TOKENS_PER_POST * stats.items + 50
+        estimated = stats.total_tokens + max_tokens
+        self.calls += 1
+        self.prompt_tokens += stats.total_tokens
+        logging.debug(f"Tagging call: {stats.total_tokens} prompt tokens for {stats.items} posts "
+                      f"({stats.truncated} shortened, {stats.dropped} left out)")
+        await self.limiter.acquire(estimated)
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.2,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+        )
+        usage = getattr(response, "usage", None)
+        if usage is not None and isinstance(getattr(usage, "total_tokens", None), int):
+            self.limiter.record(estimated, usage.total_tokens)
+        return parse_results(response.choices[0].message.content, [post_id for post_id, _ in items])
+
+    async def tag_batch(self, items: Sequence[Tuple[int, str]]) -> Dict[int, Outcome]:
+        """
+        Tag one batch. Posts the model left out are retried once on their own;
+        a post that still has no result, or whose call failed, maps to the exception.
+        """
+        try:
+            results: Dict[int, Outcome] = dict(await self._call(items))
+        except Exception as e:
+            logging.error(f"Tagging batch of {len(items)} posts failed: {e}")
+            return {post_id: e for post_id, _ in items}
+        missing = [item for item in items if item[0] not in results]
+        if missing and len(items) > 1:
+            logging.warning(f"Tagging response skipped {len(missing)} of {len(items)} posts; retrying them individually")
+            for item in missing:
+                results.update(await self.tag_batch([item]))
+        elif missing:
+            results[missing[0][0]] = TaggingResponseError(f"No tagging result for post {missing[0][0]}")
+        return results
+
+    async def run(
+        self,
+        items: Sequence[Tuple[int, str]],
+        on_results: Callable[[Dict[int, Outcome]], Union[None, Awaitable[None]]],
+    ) -> int:
+        """
+        Tag all items and pass results to on_results in chunks of about commit_every
+        (a sync or async callable, e.g. one that commits). Returns the number of items tagged.
+        """
+        batches = [items[i:i + self.posts_per_call] for i in range(0, len(items), self.posts_per_call)]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_batch(batch):
+            async with semaphore:
+                return await self.tag_batch(batch)
+
+        pending: Dict[int, Outcome] = {}
+        for finished in asyncio.as_completed([run_batch(b) for b in batches]):
+            pending.update(await finished)
+            if len(pending) >= self.commit_every:
+                await _resolve(on_results(pending))
+                pending = {}
+        if pending:
+            await _resolve(on_results(pending))
+        return len(items)
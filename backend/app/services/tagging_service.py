@@ -1,5 +1,3 @@
-import os
-import json
 import requests
 from typing import Tuple, List, Optional
 from dotenv import load_dotenv
@@ -8,76 +6,112 @@ from sqlalchemy import and_
 from datetime import datetime, timedelta
 from ..db.models import Post
 import logging
-from openai import OpenAI
-import re
+import math
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db import async_queries
 from ..utils.tagging_logger import TaggingLogger
+from .tagging_engine import BatchTaggingEngine, TAGGING_POSTS_PER_CALL
+from .llm_providers import ProviderRegistry, TASK_TAGGING
+from .tagging_cache import TaggingCache
+from .local_classifier import LocalTagClassifier, post_text
+from .work_priority import PriorityPolicy
+from ..utils.data_versions import data_versions, POSTS
 
 load_dotenv()
 
 class TaggingService:
-    def __init__(self):
-        self.api_key = os.getenv("ChatGPT_API_KEY") or os.getenv("VITE_ChatGPT_API_KEY")
-        self.org_id = os.getenv("OPENAI_ORG_ID")  # Optional
-        self.project_id = os.getenv("OPENAI_PROJECT_ID")  # Optional
-        if not self.api_key:
-            raise ValueError("ChatGPT_API_KEY or VITE_ChatGPT_API_KEY not found in environment variables")
-        self.client = OpenAI(
-            api_key=self.api_key,
-            organization=self.org_id,
-            project=self.project_id
-        )
-        self.model = "qwen/qwen3-0.6b-04-28:free"  # Kept for reference, not used for HF
-        
-    def get_tags_and_category(self, text: str):
-        system_prompt = """
-        You are an expert content classifier and keyword extractor focused on AI-related content.
-        Given a text snippet, return:
-        1. A list of 5–10 descriptive tags (keywords or phrases relevant to the text).
-        2. The main category this text belongs to, chosen from the following AI-focused taxonomy:
-           - Artificial General Intelligence (AGI)
-           - Large Language Models (LLMs)
-           - Natural Language Processing (NLP)
-           - Computer Vision
-           - Reinforcement Learning
-           - Robotics
-           - AI Ethics & Safety
-           - AI Research
-           - AI Applications (e.g. healthcare, finance, education)
-           - AI Infrastructure & Tooling (e.g. GPUs, frameworks, APIs)
-           - AI Policy & Regulation
-           - AI Startups & Business
-           - Multimodal AI
-           - Open-Source AI
-           - Other
-        Return the result in JSON format:
-        {
-          "tags": [...],
-          "category": "..."
-        }
+    def __init__(self, registry: Optional[ProviderRegistry] = None):
+        """
+        Args:
+            registry: App-lifetime ProviderRegistry whose pooled client serves the
+                tagging route; without one, each tagging run opens and closes its own
         """
+        self.registry = registry
+        # Fails here, as before, when the tagging provider has no API key
+        provider, self.tagging_model = (registry or ProviderRegistry.from_env()).route(TASK_TAGGING)
+        provider.check_configured()
+        self.model = "qwen/qwen3-0.6b-04-28:free"  # Kept for reference, not used for HF
+        self.cache = TaggingCache(model=self.tagging_model)
+        # None until trained with run_local_classifier --train
+        self.local = LocalTagClassifier.load()
+
+    async def _run_engine(self, items, on_results, logger: TaggingLogger) -> int:
+        if self.registry is not None:
+            return await self._run_with(self.registry, items, on_results, logger)
+        # A pool only lives as long as its event loop, so runs under asyncio.run get their own
+        async with ProviderRegistry.from_env() as registry:
+            return await self._run_with(registry, items, on_results, logger)
+
+    async def _run_with(self, registry: ProviderRegistry, items, on_results, logger: TaggingLogger) -> int:
+        client = registry.client(TASK_TAGGING)
+        engine = BatchTaggingEngine(client, model=client.model)
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": text}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
-            print("RAW OPENAI RESPONSE:", response)
-            content = response.choices[0].message.content
-            # Remove markdown code block if present
-            content = re.sub(r'^```json\s*|^```\s*|```$', '', content.strip(), flags=re.MULTILINE)
-            parsed = json.loads(content)
-            return parsed.get("tags", []), parsed.get("category", "Other")
-        except Exception as e:
-            logging.error(f"Error calling OpenAI API: {str(e)}")
-            return [], "Other"
+            return await engine.run(items, on_results)
+        finally:
+            logger.log_llm_calls(engine.calls, engine.prompt_tokens)
+
+    def _plan(self, db: Session, posts: list) -> Tuple[dict, dict, list, dict, dict]:
+        """
+        Split posts into cache hits, confident local-classifier results and LLM work.
+        Posts with identical normalized content share one prediction or engine item,
+        led by the first post of the group.
+        Returns:
+            tuple: (cached results by post id, local results by post id, engine items,
+                    post ids per leading post id, cache key per post id)
+        """
+        posts_by_id = {post.id: post for post in posts}
+        keys = {post.id: self.cache.key(post.content) for post in posts}
+        cached = self.cache.lookup(db, keys.values())
+        hits = {post_id: cached[key] for post_id, key in keys.items() if key in cached}
+        groups = {}
+        items = []
+        for post in posts:
+            key = keys[post.id]
+            if key in cached:
+                continue
+            if key not in groups:
+                groups[key] = []
+                items.append((post.id, post.content))
+            groups[key].append(post.id)
+        followers = {group[0]: group for group in groups.values()}
+        local = {}
+        if self.local is not None:
+            remaining = []
+            for post_id, content in items:
+                outcome = self.local.confident(post_text(posts_by_id[post_id]))
+                if outcome is None:
+                    remaining.append((post_id, content))
+                else:
+                    local.update((member, outcome) for member in followers[post_id])
+            items = remaining
+        return hits, local, items, followers, keys
+
+    def _expand(self, db: Session, results: dict, followers: dict, keys: dict) -> dict:
+        """Fan engine results out to every post sharing the content, caching the successes."""
+        self.cache.store(db, {keys[lead]: outcome for lead, outcome in results.items() if not isinstance(outcome, Exception)})
+        return {post_id: outcome for lead, outcome in results.items() for post_id in followers[lead]}
+
+    @staticmethod
+    def _log_local(logger: TaggingLogger, local: dict):
+        logger.log_local(len(local), math.ceil(len(local) / TAGGING_POSTS_PER_CALL))
+
+    @staticmethod
+    def _record_outcomes(logger: TaggingLogger, results: dict):
+        for post_id, outcome in results.items():
+            if isinstance(outcome, Exception):
+                logger.log_processed(status="error", error_message=f"Post {post_id}: {outcome}")
+                logging.error(f"Error tagging post {post_id}: {outcome}")
+            else:
+                logger.log_processed(status="success")
+                logging.info(f"Tagged post {post_id}: {outcome[0]}, {outcome[1]}")
 
     def tag_new_posts(self, db: Session, batch_size: int = 3, status_filter: str = "pending") -> dict:
         """
         Tag posts in the database based on their tag_status.
+        Posts are tagged several per prompt with concurrent calls (see BatchTaggingEngine)
+        and committed in chunks. Must not be called from a running event loop; async
+        callers use tag_new_posts_async.
         Args:
             db (Session): SQLAlchemy database session
             batch_size (int): Number of posts to process
@@ -87,24 +121,35 @@ class TaggingService:
         """
         logger = TaggingLogger()
         try:
-            # Get posts based on status filter
-            new_posts = db.query(Post).filter(Post.tag_status == status_filter).order_by(Post.created_at.desc()).limit(batch_size).all()
-
-            for post in new_posts:
-                try:
-                    tags, category = self.get_tags_and_category(post.content)
-                    post.set_tags(tags)
-                    post.category = category
-                    post.tag_status = "tagged"
-                    logger.log_processed(status="success")
-                    logging.info(f"Tagged post {post.id}: {tags}, {category}")
-                except Exception as e:
-                    error_msg = str(e)
-                    post.tag_status = "error"
-                    logger.log_processed(status="error", error_message=error_msg)
-                    logging.error(f"Error tagging post {post.id}: {error_msg}")
-
-            db.commit()
+            # Posts with the status, highest priority first (focus, preferences, source weight, recency)
+            policy = PriorityPolicy.load(db)
+            new_posts = db.query(Post).filter(Post.tag_status == status_filter).order_by(*policy.order_by()).limit(batch_size).all()
+            posts_by_id = {post.id: post for post in new_posts}
+            hits, local, items, followers, keys = self._plan(db, new_posts)
+
+            def apply(results: dict, tagged_by: str = "llm"):
+                for post_id, outcome in results.items():
+                    post = posts_by_id[post_id]
+                    if isinstance(outcome, Exception):
+                        post.tag_status = "error"
+                    else:
+                        tags, category = outcome
+                        post.apply_tags(tags)
+                        post.category = category
+                        post.tag_status = "tagged"
+                        post.tagged_by = tagged_by
+                self._record_outcomes(logger, results)
+                db.commit()
+                data_versions.bump(POSTS)
+
+            if hits:
+                logger.log_cache_hits(len(hits))
+                apply(hits)
+            if local:
+                self._log_local(logger, local)
+                apply(local, tagged_by="local")
+            if items:
+                asyncio.run(self._run_engine(items, lambda results: apply(self._expand(db, results, followers, keys)), logger))
             logger.print_summary()
             return logger.stats
 
@@ -123,4 +168,39 @@ class TaggingService:
         Returns:
             dict: Statistics about the retry process
         """
-        return self.tag_new_posts(db, batch_size=batch_size, status_filter="error") 
\ No newline at end of file
+        return self.tag_new_posts(db, batch_size=batch_size, status_filter="error")
+
+    async def tag_new_posts_async(self, session: AsyncSession, batch_size: int = 3, status_filter: str = "pending") -> dict:
+        """
+        Async variant of tag_new_posts for AsyncSession callers; results are committed in chunks.
+        Args:
+            session (AsyncSession): Async SQLAlchemy session
+            batch_size (int): Number of posts to process
+            status_filter (str): Filter posts by tag_status ("pending" or "error")
+        Returns:
+            dict: Statistics about the tagging process
+        """
+        logger = TaggingLogger()
+        policy = await session.run_sync(PriorityPolicy.load)
+        posts = await async_queries.fetch_posts_for_tagging(
+            session, status_filter=status_filter, batch_size=batch_size, order_by=policy.order_by()
+        )
+        hits, local, items, followers, keys = await session.run_sync(self._plan, posts)
+
+        async def commit_chunk(results: dict):
+            results = await session.run_sync(self._expand, results, followers, keys)
+            self._record_outcomes(logger, results)
+            await async_queries.apply_tagging_results(session, results)
+
+        if hits:
+            logger.log_cache_hits(len(hits))
+            self._record_outcomes(logger, hits)
+            await async_queries.apply_tagging_results(session, hits)
+        if local:
+            self._log_local(logger, local)
+            self._record_outcomes(logger, local)
+            await async_queries.apply_tagging_results(session, local, tagged_by="local")
+        if items:
+            await self._run_engine(items, commit_chunk, logger)
+        logger.print_summary()
+        return logger.stats
@@ -0,0 +1,141 @@
+"""
+Long-lived tagging worker. It drains pending posts in large batches, then
+sleeps until ingest signals new posts (utils/ingest_signal.py) instead of
+polling the database every minute. An exclusive lock file keeps it to one
+instance per database, however often it is launched.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+from ..utils.ingest_signal import IngestSignal, ingest_signal
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+TAGGING_WORKER_BATCH_SIZE = int(os.getenv("TAGGING_WORKER_BATCH_SIZE", "200"))
+# Safety net: drain anyway after this long without a signal
+TAGGING_WORKER_IDLE_SECONDS = float(os.getenv("TAGGING_WORKER_IDLE_SECONDS", "600"))
+# Pause after a failed batch before trying again
+TAGGING_WORKER_ERROR_BACKOFF = float(os.getenv("TAGGING_WORKER_ERROR_BACKOFF", "30"))
+TAGGING_WORKER_LOCK = os.getenv(
+    "TAGGING_WORKER_LOCK",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "tagging_worker.lock"),
+)
+
+
+class WorkerLockHeld(Exception):
+    pass
+
+
+class SingleInstanceLock:
+    """Non-blocking exclusive lock on a file; released on close or process exit."""
+
+    def __init__(self, path: str = TAGGING_WORKER_LOCK):
+        self.path = path
+        self._file = None
+
+    def acquire(self):
+        handle = open(self.path, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            handle.close()
+            raise WorkerLockHeld(f"Another tagging worker holds {self.path}")
+        handle.seek(0)
+        handle.truncate()
+        handle.write(str(os.getpid()))
+        handle.flush()
+        self._file = handle
+
+    def release(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class TaggingWorker:
+    """
+    Args:
+        tagging_service: TaggingService (or anything with tag_new_posts(db, batch_size))
+        session_factory: Callable returning a new sync Session
+        signal: Ingest signal to wait on
+        batch_size: Posts per tag_new_posts call while draining
+    """
+
+    def __init__(
+        self,
+        tagging_service,
+        session_factory: Callable[[], Session],
+        signal: IngestSignal = ingest_signal,
+        batch_size: int = TAGGING_WORKER_BATCH_SIZE,
+        idle_seconds: float = TAGGING_WORKER_IDLE_SECONDS,
+        error_backoff: float = TAGGING_WORKER_ERROR_BACKOFF,
+        lock: Optional[SingleInstanceLock] = None,
+    ):
+        self.tagging_service = tagging_service
+        self.session_factory = session_factory
+        self.signal = signal
+        self.batch_size = batch_size
+        self.idle_seconds = idle_seconds
+        self.error_backoff = error_backoff
+        self.lock = lock or SingleInstanceLock()
+        self.stop_event = threading.Event()
+        self.stats = {"batches": 0, "tagged": 0, "failed": 0, "wakeups": 0}
+
+    def stop(self):
+        self.stop_event.set()
+        self.signal.wake()
+
+    def drain(self) -> int:
+        """Tag pending posts until none are left. Returns the number processed."""
+        processed = 0
+        db = self.session_factory()
+        try:
+            while not self.stop_event.is_set():
+                stats = self.tagging_service.tag_new_posts(db, batch_size=self.batch_size)
+                if stats["total_processed"] == 0:
+                    break
+                self.stats["batches"] += 1
+                self.stats["tagged"] += stats["successful"]
+                self.stats["failed"] += stats["failed"]
+                processed += stats["total_processed"]
+        finally:
+            db.close()
+        return processed
+
+    def run(self):
+        """Hold the lock and alternate draining with waiting for ingest; returns once stop() is called."""
+        with self.lock:
+            logging.info(f"Tagging worker {os.getpid()} started (batch size {self.batch_size})")
+            while not self.stop_event.is_set():
+                # Read the token before draining so posts landing mid-drain trigger another pass
+                token = self.signal.token()
+                try:
+                    started = time.monotonic()
+                    processed = self.drain()
+                    if processed:
+                        logging.info(f"Tagging worker processed {processed} posts in {time.monotonic() - started:.1f}s")
+                except Exception as e:
+                    logging.error(f"Tagging worker batch failed: {e}")
+                    self.stop_event.wait(self.error_backoff)
+                    continue
+                if self.signal.wait(token, timeout=self.idle_seconds, stop=self.stop_event):
+                    self.stats["wakeups"] += 1
+            logging.info(f"Tagging worker {os.getpid()} stopped: {self.stats}")
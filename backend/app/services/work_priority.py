@@ -0,0 +1,130 @@
+"""
+Order of background LLM work (tagging, per-article summaries) over posts.
+
+With a limited LLM budget the posts the user cares about should be enriched
+first. A post scores by:
+- focus: the user opened it, or a client reported it on screen, within
+  WORK_FOCUS_TTL_SECONDS (see focus_posts)
+- preference: its source (or, once tagged, its category) is in UserPreferences
+- source weight: WORK_SOURCE_WEIGHTS, e.g. '{"arXiv": -50}' to push bulk feeds back
+- recency: ingested within WORK_RECENT_HOURS
+Ties go to the newest post. The same score is available as a SQL expression,
+for picking pending posts in the database, and in Python, for ranking a list
+that is already loaded.
+"""
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence
+from sqlalchemy import case, literal, update
+from sqlalchemy.orm import Session
+from backend.app.db.models import Post, UserPreferences
+
+WORK_FOCUS_WEIGHT = int(os.getenv("WORK_FOCUS_WEIGHT", "1000"))
+WORK_FOCUS_TTL_SECONDS = float(os.getenv("WORK_FOCUS_TTL_SECONDS", "3600"))
+WORK_PREFERRED_SOURCE_WEIGHT = int(os.getenv("WORK_PREFERRED_SOURCE_WEIGHT", "100"))
+WORK_PREFERRED_CATEGORY_WEIGHT = int(os.getenv("WORK_PREFERRED_CATEGORY_WEIGHT", "50"))
+WORK_RECENT_WEIGHT = int(os.getenv("WORK_RECENT_WEIGHT", "20"))
+WORK_RECENT_HOURS = float(os.getenv("WORK_RECENT_HOURS", "48"))
+
+
+def _load_source_weights() -> Dict[str, int]:
+    raw = os.getenv("WORK_SOURCE_WEIGHTS", "")
+    if not raw:
+        return {}
+    try:
+        return {str(source): int(weight) for source, weight in json.loads(raw).items()}
+    except (ValueError, AttributeError) as e:
+        logging.warning(f"Ignoring invalid WORK_SOURCE_WEIGHTS: {e}")
+        return {}
+
+
+WORK_SOURCE_WEIGHTS = _load_source_weights()
+
+
+def _utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class PriorityPolicy:
+    def __init__(
+        self,
+        preferred_sources: Iterable[str] = (),
+        preferred_categories: Iterable[str] = (),
+        source_weights: Optional[Dict[str, int]] = None,
+        now: Optional[datetime] = None,
+    ):
+        self.preferred_sources = sorted(set(preferred_sources))
+        self.preferred_categories = sorted(set(preferred_categories))
+        self.source_weights = WORK_SOURCE_WEIGHTS if source_weights is None else source_weights
+        self.now = _utc_naive(now) or datetime.now(timezone.utc).replace(tzinfo=None)
+        self.focus_since = self.now - timedelta(seconds=WORK_FOCUS_TTL_SECONDS)
+        self.recent_since = self.now - timedelta(hours=WORK_RECENT_HOURS)
+
+    @classmethod
+    def load(cls, db_session: Session, **kwargs) -> "PriorityPolicy":
+        """Policy for the saved preferences (works with AsyncSession.run_sync too)."""
+        prefs = db_session.get(UserPreferences, 1)
+        if prefs is None:
+            return cls(**kwargs)
+        return cls(prefs.get_sources(), prefs.get_categories(), **kwargs)
+
+    def score_expression(self):
+        score = case((Post.focused_at >= self.focus_since, WORK_FOCUS_WEIGHT), else_=0)
+        score = score + case((Post.created_at >= self.recent_since, WORK_RECENT_WEIGHT), else_=0)
+        if self.preferred_sources:
+            score = score + case((Post.source.in_(self.preferred_sources), WORK_PREFERRED_SOURCE_WEIGHT), else_=0)
+        if self.preferred_categories:
+            score = score + case((Post.category.in_(self.preferred_categories), WORK_PREFERRED_CATEGORY_WEIGHT), else_=0)
+        if self.source_weights:
+            score = score + case(self.source_weights, value=Post.source, else_=literal(0))
+        return score
+
+    def order_by(self) -> list:
+        """ORDER BY clauses, highest priority first."""
+        return [self.score_expression().desc(), Post.created_at.desc(), Post.id.desc()]
+
+    def score(self, post) -> int:
+        score = 0
+        focused_at = _utc_naive(getattr(post, "focused_at", None))
+        if focused_at is not None and focused_at >= self.focus_since:
+            score += WORK_FOCUS_WEIGHT
+        created_at = _utc_naive(getattr(post, "created_at", None))
+        if created_at is not None and created_at >= self.recent_since:
+            score += WORK_RECENT_WEIGHT
+        source = getattr(post, "source", None)
+        if source in self.preferred_sources:
+            score += WORK_PREFERRED_SOURCE_WEIGHT
+        if getattr(post, "category", None) in self.preferred_categories:
+            score += WORK_PREFERRED_CATEGORY_WEIGHT
+        return score + self.source_weights.get(source, 0)
+
+    def rank(self, posts: Sequence) -> List:
+        """posts sorted highest priority first, newest first within a score."""
+        oldest = datetime.min
+        return sorted(
+            posts,
+            key=lambda p: (self.score(p), _utc_naive(getattr(p, "created_at", None)) or oldest, getattr(p, "id", 0) or 0),
+            reverse=True,
+        )
+
+
+def focus_posts(db_session: Session, post_ids: Sequence[int]) -> int:
+    """
+    Mark untagged posts the user is looking at so they are tagged next.
+    Returns:
+        int: Posts marked (already tagged posts are left alone)
+    """
+    if not post_ids:
+        return 0
+    marked = db_session.execute(
+        update(Post)
+        .where(Post.id.in_(list(post_ids)), Post.tag_status.in_(("pending", "error")))
+        .values(focused_at=datetime.now(timezone.utc).replace(tzinfo=None))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db_session.commit()
+    return marked
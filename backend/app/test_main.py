@@ -16,7 +16,7 @@ def test_get_posts():
         post = data["data"][0]
         assert "id" in post
         assert "title" in post
-        assert "content" in post
+        assert "excerpt" in post
         assert "timestamp" in post
 
 def test_save_and_list_and_delete_saved_post():
@@ -1 +1,20 @@
- 
\ No newline at end of file
+"""
+Runtime state that the code under test writes by default under backend/app/db
+(data version files, the LLM response cache, the tagging worker lock, the local
+classifier model) goes to a temporary directory for the test run instead.
+"""
+import atexit
+import os
+import shutil
+import tempfile
+
+_RUNTIME_DIR = tempfile.mkdtemp(prefix="backend-tests-")
+atexit.register(shutil.rmtree, _RUNTIME_DIR, ignore_errors=True)
+
+for _name, _path in (
+    ("DATA_VERSION_DIR", "data_versions"),
+    ("LLM_CACHE_DIR", "llm_cache"),
+    ("TAGGING_WORKER_LOCK", "tagging_worker.lock"),
+    ("LOCAL_CLASSIFIER_PATH", "tag_classifier.json"),
+):
+    os.environ.setdefault(_name, os.path.join(_RUNTIME_DIR, _path))
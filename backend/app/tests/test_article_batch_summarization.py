@@ -0,0 +1,110 @@
+import asyncio
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.db.models import ArticleSummary, Base, Post
+from backend.app.services.article_batch_summarization_service import ArticleBatchSummarizationService
+from backend.app.services.article_summarization_service import ArticleSummarizationService
+from backend.app.services.summary_storage_service import SummaryStorageService
+from backend.app.services.work_priority import PriorityPolicy
+
+
+class SlowClient:
+    """Records how many calls overlap; fails for prompts containing fail_on."""
+
+    def __init__(self, fail_on=None):
+        self.in_flight = 0
+        self.peak = 0
+        self.fail_on = fail_on
+
+    async def generate_response(self, prompt, system_prompt=None, max_tokens=2048):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail_on and self.fail_on in prompt:
+                raise RuntimeError("model error")
+            return "summary of " + prompt.split("Title: ")[1].split("\n")[0]
+        finally:
+            self.in_flight -= 1
+
+
+class TestConcurrentArticleSummaries(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        self.commits = 0
+
+        @event.listens_for(self.db, "after_commit")
+        def count(session):
+            self.commits += 1
+
+        for i in range(10):
+            self.db.add(Post(source="Anthropic" if i == 7 else "arXiv", platform="RSS", url=f"http://example.com/{i}",
+                             title=f"Post {i}", content="Labs shipped a model.", timestamp=datetime(2026, 10, 1, 12)))
+        self.db.commit()
+        self.commits = 0
+
+    def tearDown(self):
+        self.db.close()
+
+    def service(self, client, **kwargs):
+        fetch = MagicMock()
+        fetch.fetch_articles = MagicMock(side_effect=lambda source, start, end: self.db.query(Post).filter(Post.source == source).order_by(Post.id).all())
+        return ArticleBatchSummarizationService(fetch, ArticleSummarizationService(client), SummaryStorageService(self.db),
+                                                MagicMock(), **kwargs)
+
+    async def test_bounded_concurrency_and_batched_commits(self):
+        client = SlowClient()
+        service = self.service(client, max_concurrency=3, commit_every=4)
+        results = await service.summarize_articles(["arXiv", "Anthropic"], "2026-10-01", "2026-10-01")
+        self.assertEqual(client.peak, 3)
+        self.assertEqual([r["summary"] for r in results], [f"summary of Post {i}" for i in [0, 1, 2, 3, 4, 5, 6, 8, 9, 7]])
+        self.assertEqual(self.db.query(ArticleSummary).count(), 10)
+        self.assertEqual(self.commits, 3)  # 4 + 4 + 2
+
+    async def test_failed_articles_return_errors_and_the_rest_are_stored(self):
+        service = self.service(SlowClient(fail_on="Title: Post 3"), max_concurrency=4, commit_every=100)
+        results = await service.summarize_articles(["arXiv"], "2026-10-01", "2026-10-01")
+        failed = [r for r in results if "error" in r]
+        self.assertEqual(len(results), 9)
+        self.assertEqual(failed, [{"post_id": 4, "source": "arXiv", "error": "model error"}])
+        self.assertEqual(self.db.query(ArticleSummary).count(), 8)
+        self.assertEqual(self.commits, 1)
+
+    async def test_progress_is_reported_per_article(self):
+        reports = []
+        service = self.service(SlowClient(fail_on="Title: Post 3"), max_concurrency=4)
+        await service.summarize_articles(["arXiv"], "2026-10-01", "2026-10-01", on_progress=lambda **p: reports.append(p))
+        self.assertEqual(len(reports), 10)
+        self.assertEqual(reports[0], {"done": 0, "failed": 0, "total": 9})
+        self.assertEqual(reports[-1], {"done": 9, "failed": 1, "total": 9})
+
+    async def test_closing_the_stream_cancels_the_rest(self):
+        client = SlowClient()
+        service = self.service(client, max_concurrency=2, commit_every=100)
+        stream = service.iter_article_summaries(["arXiv"], "2026-10-01", "2026-10-01")
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+        self.assertIn("summary", first)
+        self.assertEqual(client.in_flight, 0)
+        # Only what finished before the close was summarized, and it was kept
+        stored = self.db.query(ArticleSummary).count()
+        self.assertGreaterEqual(stored, 1)
+        self.assertLess(stored, 9)
+
+    async def test_results_follow_the_priority_order(self):
+        service = self.service(SlowClient(), max_concurrency=2)
+        policy = PriorityPolicy(["Anthropic"], source_weights={})
+        results = await service.summarize_articles(["arXiv", "Anthropic"], "2026-10-01", "2026-10-01", policy=policy)
+        self.assertEqual(results[0]["source"], "Anthropic")
+
+
+if __name__ == "__main__":
+    unittest.main()
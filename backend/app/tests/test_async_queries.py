@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from backend.app.db.models import Base, Post
+from backend.app.db import async_queries
+from backend.app.db.database import to_async_url, engine_kwargs
+
+
+class TestDatabaseUrls(unittest.TestCase):
+    def test_to_async_url(self):
+        self.assertEqual(to_async_url("sqlite:///posts.db"), "sqlite+aiosqlite:///posts.db")
+        self.assertEqual(
+            to_async_url("postgresql+psycopg2://u:p@db:5432/news"),
+            "postgresql+asyncpg://u:p@db:5432/news",
+        )
+        with self.assertRaises(ValueError):
+            to_async_url("mysql://u@db/news")
+
+    def test_engine_kwargs(self):
+        self.assertEqual(engine_kwargs("sqlite:///posts.db"), {"connect_args": {"check_same_thread": False}})
+        self.assertIn("pool_size", engine_kwargs("postgresql+asyncpg://u@db/news"))
+
+
+class TestAsyncQueries(unittest.IsolatedAsyncioTestCase):
+    """Runs the async queries against SQLite (aiosqlite), or against PostgreSQL
+    when TEST_POSTGRES_URL points at a scratch database.
+    """
+
+    async def asyncSetUp(self):
+        self.tmpdir = None
+        url = os.getenv("TEST_POSTGRES_URL")
+        if url:
+            url = to_async_url(url)
+        else:
+            self.tmpdir = tempfile.TemporaryDirectory()
+            url = f"sqlite+aiosqlite:///{os.path.join(self.tmpdir.name, 'posts.db')}"
+        self.engine = create_async_engine(url)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+        base = datetime(2025, 5, 1, 12, 0, 0)
+        async with self.Session() as session:
+            for i in range(4):
+                session.add(Post(
+                    source="arXiv" if i % 2 else "OpenAI Blog",
+                    platform="RSS",
+                    url=f"http://example.com/{i}",
+                    content="content",
+                    timestamp=base + timedelta(days=i),
+                    tag_status="tagged" if i == 0 else "pending",
+                ))
+            await session.commit()
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        if self.tmpdir:
+            self.tmpdir.cleanup()
+
+    async def test_fetch_articles_by_source_and_date(self):
+        async with self.Session() as session:
+            posts = await async_queries.fetch_articles(session, ["arXiv"], "2025-05-01", "2025-05-04")
+        self.assertEqual([p.url for p in posts], ["http://example.com/1", "http://example.com/3"])
+
+    async def test_save_posts_skips_existing_urls(self):
+        scraped = [
+            {"source": "arXiv", "platform": "RSS", "url": "http://example.com/1", "content": "dup"},
+            {"source": "arXiv", "platform": "RSS", "url": "http://example.com/new", "content": "new"},
+            {"source": "arXiv", "platform": "RSS", "url": "http://example.com/new", "content": "new"},
+        ]
+        async with self.Session() as session:
+            saved = await async_queries.save_posts(session, scraped)
+            counts = await async_queries.count_by_tag_status(session)
+        self.assertEqual(saved, 1)
+        self.assertEqual(counts, {"tagged": 1, "pending": 4})
+
+    async def test_apply_tagging_results(self):
+        async with self.Session() as session:
+            posts = await async_queries.fetch_posts_for_tagging(session, batch_size=2)
+            ok, failed = posts
+            await async_queries.apply_tagging_results(session, {
+                ok.id: (["LLM"], "AI Research"),
+                failed.id: RuntimeError("rate limited"),
+            })
+            counts = await async_queries.count_by_tag_status(session)
+            tagged = await session.get(Post, ok.id)
+        self.assertEqual(counts, {"tagged": 2, "pending": 1, "error": 1})
+        self.assertEqual(tagged.get_tags(), ["LLM"])
+        self.assertEqual(tagged.category, "AI Research")
+
+
+if __name__ == "__main__":
+    unittest.main()
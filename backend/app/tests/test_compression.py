@@ -0,0 +1,59 @@
+import unittest
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from backend.app.utils.compression import CompressionMiddleware, accepted_encodings, strip_encoding_suffix
+from backend.app.utils.fast_json import fast_json, dumps
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+@app.get("/big")
+def big():
+    response = fast_json({"data": ["x" * 50] * 20})
+    response.headers["ETag"] = '"abc"'
+    return response
+
+@app.get("/small")
+def small():
+    return fast_json({"ok": True})
+
+@app.get("/stream")
+def stream():
+    return StreamingResponse(iter([b"a" * 200, b"b" * 200]), media_type="text/plain")
+
+client = TestClient(app)
+
+class TestCompression(unittest.TestCase):
+    """Unit tests for CompressionMiddleware and the fast JSON helpers."""
+
+    def test_large_body_is_gzipped(self):
+        """Bodies above minimum_size are compressed and the ETag is made per-encoding."""
+        response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["etag"], '"abc-gzip"')
+        self.assertEqual(strip_encoding_suffix(response.headers["etag"]), '"abc"')
+        self.assertEqual(len(response.json()["data"]), 20)
+
+    def test_encodings_refused_with_q_zero_are_not_used(self):
+        """A coding with q=0 is never chosen, even when it is listed."""
+        for accept in ("gzip;q=0", "br;q=0, gzip;q=0", "*;q=0", "identity"):
+            self.assertNotIn("content-encoding", client.get("/big", headers={"Accept-Encoding": accept}).headers, accept)
+        response = client.get("/big", headers={"Accept-Encoding": "br;q=0, gzip;q=0.5"})
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(accepted_encodings("br;q=0.2, GZIP , x;q=bad"), {"br": 0.2, "gzip": 1.0, "x": 0.0})
+
+    def test_small_and_streaming_bodies_pass_through(self):
+        """Small bodies and streaming responses are not compressed."""
+        self.assertNotIn("content-encoding", client.get("/small", headers={"Accept-Encoding": "gzip"}).headers)
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(len(response.content), 400)
+
+    def test_dumps_handles_datetimes(self):
+        """dumps serializes datetimes the same way as isoformat()."""
+        self.assertEqual(dumps({"t": datetime(2025, 5, 1, 12, 30)}), b'{"t":"2025-05-01T12:30:00"}')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import time
+import unittest
+from datetime import date, datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.main import app
+from backend.app.db.models import Base, Post, SavedPost, UserPreferences
+from backend.app.services.dashboard_service import DashboardService
+from backend.app.utils.ttl_cache import TTLCache
+from backend.app.utils.data_versions import data_versions, POSTS
+
+client = TestClient(app)
+DAY = date(2025, 5, 2)
+
+
+class TestDashboardService(unittest.TestCase):
+    """Unit tests for the dashboard bootstrap on an in-memory SQLite database."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        specs = [
+            ("arXiv", "AI Research", ["LLM"], datetime(2025, 5, 2, 8, 0)),
+            ("OpenAI Blog", "Robotics", ["Agents"], datetime(2025, 5, 2, 9, 0)),
+            ("Substack", "Policy", ["LLM"], datetime(2025, 5, 2, 10, 0)),
+            ("Substack", "Policy", [], datetime(2025, 5, 2, 23, 59, 59)),
+            ("arXiv", "AI Research", ["LLM"], datetime(2025, 5, 1, 23, 0)),
+        ]
+        for i, (source, category, tags, timestamp) in enumerate(specs):
+            post = Post(source=source, platform="RSS", url=f"http://example.com/{i}", content="c",
+                        category=category, timestamp=timestamp)
+            post.set_tags(tags)
+            self.db.add(post)
+        self.db.commit()
+        self.db.add(SavedPost(post_id=1))
+        self.db.commit()
+        self.service = DashboardService(self.db)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_without_preferences_returns_whole_day(self):
+        data = self.service.bootstrap(DAY)
+        self.assertEqual([p.id for p in data["posts"]], [4, 3, 2, 1])
+        self.assertFalse(data["truncated"])
+        self.assertEqual(data["saved_ids"], [1])
+        self.assertEqual([saved.post_id for saved, _ in data["saved"]], [1])
+        self.assertEqual(data["preferences"], {"preferred_sources": [], "preferred_categories": []})
+
+    def test_preferences_match_source_category_or_tag(self):
+        prefs = UserPreferences(id=1)
+        prefs.set_sources(["OpenAI Blog"])
+        prefs.set_categories(["LLM"])
+        self.db.add(prefs)
+        self.db.commit()
+        data = self.service.bootstrap(DAY)
+        self.assertEqual([p.id for p in data["posts"]], [3, 2, 1])
+        self.assertTrue(data["posts"][-1].is_saved)
+
+    def test_truncation(self):
+        posts, truncated = self.service.todays_posts(DAY, [], [], limit=2)
+        self.assertEqual(len(posts), 2)
+        self.assertTrue(truncated)
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_expiry_and_eviction(self):
+        cache = TTLCache(ttl=0.05, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), 3)
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("c"))
+
+
+class TestDashboardEndpoint(unittest.TestCase):
+    def test_bootstrap_cached_until_ingest(self):
+        first = client.get("/api/dashboard", params={"date": "2025-05-02"})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(set(first.json()["data"]), {
+            "date", "posts", "truncated", "saved_ids", "saved", "saved_next_cursor", "preferences",
+        })
+        etag = first.headers["etag"]
+        self.assertEqual(client.get("/api/dashboard", params={"date": "2025-05-02"}, headers={"If-None-Match": etag}).status_code, 304)
+        data_versions.bump(POSTS)
+        self.assertEqual(client.get("/api/dashboard", params={"date": "2025-05-02"}, headers={"If-None-Match": etag}).status_code, 200)
+
+    def test_invalid_date(self):
+        self.assertEqual(client.get("/api/dashboard", params={"date": "05/02/2025"}).status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.utils.data_versions import DataVersionTracker, data_versions, PREFERENCES
+
+client = TestClient(app)
+
+class TestDataVersionTracker(unittest.TestCase):
+    """Unit tests for DataVersionTracker and the conditional GET dependency."""
+
+    def test_bump_changes_version_and_etag(self):
+        """Bumping a resource changes its version and any ETag built from it."""
+        tracker = DataVersionTracker(tempfile.mkdtemp())
+        self.assertEqual(tracker.get_version("posts"), "0")
+        etag_before = tracker.etag(["posts"])
+        tracker.bump("posts")
+        self.assertNotEqual(tracker.get_version("posts"), "0")
+        self.assertNotEqual(tracker.etag(["posts"]), etag_before)
+        self.assertNotEqual(tracker.etag(["posts"], "a"), tracker.etag(["posts"], "b"))
+
+    def test_preferences_not_modified(self):
+        """GET /api/preferences answers 304 for a current ETag and 200 after a bump."""
+        first = client.get("/api/preferences")
+        etag = first.headers["etag"]
+        self.assertIn("no-cache", first.headers["cache-control"])
+        second = client.get("/api/preferences", headers={"If-None-Match": etag})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.headers["etag"], etag)
+        data_versions.bump(PREFERENCES)
+        third = client.get("/api/preferences", headers={"If-None-Match": etag})
+        self.assertEqual(third.status_code, 200)
+
+if __name__ == "__main__":
+    unittest.main()
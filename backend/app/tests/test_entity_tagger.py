@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+import json
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.db.models import Base, Post
+from backend.app.services.entity_tagger import EntityTagger, GAZETTEER_PATH
+from backend.app.utils.aho_corasick import AhoCorasick
+
+ENTITIES = [
+    {"name": "GPT-4o", "type": "model", "aliases": ["GPT 4o"]},
+    {"name": "GPT-4", "type": "model"},
+    {"name": "Google", "type": "company", "case_sensitive": True},
+    {"name": "Google DeepMind", "type": "lab", "aliases": ["DeepMind"]},
+    {"name": "Hugging Face", "type": "lab", "aliases": ["HuggingFace"]},
+    {"name": "Meta AI", "type": "lab", "aliases": ["Meta"], "case_sensitive": True},
+]
+
+
+class TestAhoCorasick(unittest.TestCase):
+    def test_finds_overlapping_patterns(self):
+        for use_native in (False, True):
+            automaton = AhoCorasick(use_native=use_native)
+            for word in ("he", "she", "his", "hers"):
+                automaton.add(word, word)
+            found = sorted((start, end, value) for start, end, value in automaton.iter("ushers"))
+            self.assertEqual(found, [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")])
+
+    def test_empty_automaton(self):
+        self.assertEqual(list(AhoCorasick(use_native=False).iter("text")), [])
+
+
+class TestEntityTagger(unittest.TestCase):
+    def setUp(self):
+        self.tagger = EntityTagger(ENTITIES)
+
+    def test_word_boundaries_case_and_longest_match(self):
+        text = "Google DeepMind and huggingface? No: HuggingFace ships gpt 4o, not GPT-4s"
+        self.assertEqual(self.tagger.find(text), ["Google DeepMind", "Hugging Face", "GPT-4o"])
+        self.assertEqual(self.tagger.find("Meta releases a model; meta-learning and metadata do not count"), ["Meta AI"])
+        self.assertEqual(self.tagger.find("google it"), [])
+
+    def test_shipped_gazetteer_loads(self):
+        tagger = EntityTagger.from_file(GAZETTEER_PATH)
+        self.assertIn("NVIDIA", tagger.find("NVIDIA H100 clusters run PyTorch"))
+
+
+class TestEntityTaggingAtIngest(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_new_posts_get_entity_tags_and_keep_them_after_llm_tagging(self):
+        post = Post(source="OpenAI Blog", platform="RSS", url="http://example.com/1",
+                    title="Hello GPT-4o", content="Built with PyTorch on NVIDIA H100s")
+        self.db.add(post)
+        self.db.commit()
+        self.assertEqual(post.get_entities(), ["GPT-4o", "PyTorch", "NVIDIA", "H100"])
+        self.assertEqual(post.get_tags(), post.get_entities())
+        self.assertEqual(post.tag_status, "pending")
+
+        post.apply_tags(["multimodal models", "pytorch"])
+        self.assertEqual(post.get_tags(), ["GPT-4o", "PyTorch", "NVIDIA", "H100", "multimodal models"])
+
+    def test_backfill_retags_when_gazetteer_changes(self):
+        for i in range(5):
+            self.db.add(Post(source="arXiv", platform="RSS", url=f"http://example.com/{i}", content="Weights on Hugging Face"))
+        self.db.commit()
+        post = self.db.query(Post).first()
+        post.apply_tags(["open weights"])
+        self.db.commit()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "gazetteer.json")
+            with open(path, "w") as f:
+                json.dump({"entities": [{"name": "HF Hub", "type": "product", "aliases": ["Hugging Face"]}]}, f)
+            stats = EntityTagger.from_file(path).backfill(self.db, batch_size=2)
+        self.assertEqual(stats, {"scanned": 5, "updated": 5})
+        post = self.db.get(Post, post.id)
+        self.assertEqual(post.get_entities(), ["HF Hub"])
+        self.assertEqual(post.get_tags(), ["HF Hub", "open weights"])
+        # Nothing left to change on a second run
+        self.assertEqual(EntityTagger(ENTITIES).backfill(self.db)["updated"], 5)
+        self.assertEqual(EntityTagger(ENTITIES).backfill(self.db)["updated"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+import asyncio
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.db.models import Base, SummaryCacheEntry
+from backend.app.services.article_batch_summarization_service import ArticleBatchSummarizationService, COMBINED_SYSTEM_PROMPT
+from backend.app.services.hierarchical_summarizer import (
+    CHUNK_SYSTEM_PROMPT, MERGE_SYSTEM_PROMPT, HierarchicalSummarizer, chunk_articles,
+)
+
+WORDS = "Model labs shipped new releases with better benchmark scores and lower prices for developers. "
+
+
+def make_post(post_id, day, source, category, sentences=5):
+    return SimpleNamespace(
+        id=post_id, source=source, category=category, url=f"http://example.com/{post_id}",
+        title=f"Post {post_id}", author="", timestamp=datetime(2026, 10, day, 12), content=WORDS * sentences,
+    )
+
+
+class FakeClient:
+    model = "fake-model"
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    async def generate_response(self, prompt, system_prompt=None, max_tokens=2048):
+        self.calls.append((system_prompt, prompt))
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("model error")
+        await asyncio.sleep(0)
+        if system_prompt == CHUNK_SYSTEM_PROMPT:
+            return f"- notes on {prompt.count('Source:')} articles"
+        if system_prompt == MERGE_SYSTEM_PROMPT:
+            return "- merged notes"
+        return "## Themes\n- digest"
+
+    def count(self, system_prompt):
+        return sum(1 for system, _ in self.calls if system == system_prompt)
+
+
+class TestChunking(unittest.TestCase):
+    def test_groups_by_day_and_theme_in_source_order(self):
+        posts = [
+            make_post(1, 2, "B", "Research"),
+            make_post(2, 1, "A", "Research"),
+            make_post(3, 1, "C", "Products"),
+            make_post(4, 1, "A", None),
+            make_post(5, 1, "B", "Research"),
+        ]
+        chunks = chunk_articles(posts)
+        self.assertEqual([(c.day, c.theme, [p.id for p in c.posts]) for c in chunks], [
+            ("2026-10-01", "Products", [3]),
+            ("2026-10-01", "Research", [2, 5]),
+            ("2026-10-01", "Uncategorized", [4]),
+            ("2026-10-02", "Research", [1]),
+        ])
+        self.assertEqual(chunks[1].label(), "2026-10-01 | Research | A, B")
+
+    def test_large_theme_is_split_within_budget(self):
+        posts = [make_post(i, 1, f"S{i:02d}", "Research", sentences=40) for i in range(12)]
+        chunks = chunk_articles(posts, budget=1500, item_budget=300)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual([p.id for c in chunks for p in c.posts], list(range(12)))
+        # Same input, same chunks: the cache keys stay stable
+        self.assertEqual([[p.id for p in c.posts] for c in chunk_articles(posts, budget=1500, item_budget=300)],
+                         [[p.id for p in c.posts] for c in chunks])
+
+
+class TestHierarchicalSummarizer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.Session = sessionmaker(bind=engine)
+
+    async def test_map_then_reduce(self):
+        client = FakeClient()
+        posts = [make_post(i, 1 + i % 3, "A", ["Research", "Products"][i % 2]) for i in range(12)]
+        summarizer = HierarchicalSummarizer(client, concurrency=2)
+        digest = await summarizer.summarize(posts, COMBINED_SYSTEM_PROMPT, 500)
+        self.assertEqual(digest, "## Themes\n- digest")
+        self.assertEqual(client.count(CHUNK_SYSTEM_PROMPT), 6)
+        self.assertEqual(client.count(COMBINED_SYSTEM_PROMPT), 1)
+        final_prompt = client.calls[-1][1]
+        self.assertIn("### 2026-10-01 | Products | A", final_prompt)
+        self.assertEqual(summarizer.last_stats["llm_calls"], 7)
+
+    async def test_overlapping_range_reuses_cached_chunks(self):
+        week = [make_post(i, 1 + i % 7, "A", "Research") for i in range(14)]
+        first = FakeClient()
+        await HierarchicalSummarizer(first, self.Session).summarize(week, COMBINED_SYSTEM_PROMPT, 500)
+        self.assertEqual(first.count(CHUNK_SYSTEM_PROMPT), 7)
+
+        # Days 4-7 again plus two new days
+        shifted = [p for p in week if p.timestamp.day >= 4] + [make_post(100 + i, 8 + i % 2, "A", "Research") for i in range(4)]
+        second = FakeClient()
+        summarizer = HierarchicalSummarizer(second, self.Session)
+        await summarizer.summarize(shifted, COMBINED_SYSTEM_PROMPT, 500)
+        self.assertEqual(second.count(CHUNK_SYSTEM_PROMPT), 2)
+        self.assertEqual((summarizer.last_stats["chunks"], summarizer.last_stats["cached"]), (6, 4))
+        with self.Session() as db:
+            self.assertEqual(db.query(SummaryCacheEntry).count(), 9)
+
+    async def test_overlapping_digests_store_the_same_chunks(self):
+        posts = [make_post(i, 1 + i % 3, "A", "Research") for i in range(6)]
+        first, second = HierarchicalSummarizer(FakeClient(), self.Session), HierarchicalSummarizer(FakeClient(), self.Session)
+        # Both look the chunks up before either stores them
+        digests = await asyncio.gather(first.summarize(posts, COMBINED_SYSTEM_PROMPT, 500),
+                                       second.summarize(posts, COMBINED_SYSTEM_PROMPT, 500))
+        self.assertEqual(digests, ["## Themes\n- digest"] * 2)
+        with self.Session() as db:
+            self.assertEqual(db.query(SummaryCacheEntry).count(), 3)
+            # A store of keys that are already cached keeps the existing notes
+            first.cache.store(db, {first.cache.key(chunk): ("- other notes", 1) for chunk in chunk_articles(posts)})
+            db.commit()
+            self.assertEqual({e.summary for e in db.query(SummaryCacheEntry)}, {"- notes on 2 articles"})
+
+    async def test_concurrent_digests_keep_their_own_stats(self):
+        summarizer = HierarchicalSummarizer(FakeClient(), concurrency=2)
+        small = [make_post(i, 1, "A", "Research") for i in range(2)]
+        large = [make_post(10 + i, 1 + i % 3, "A", "Research") for i in range(9)]
+        small_stats, large_stats = {}, {}
+        await asyncio.gather(summarizer.digest_prompt(small, COMBINED_SYSTEM_PROMPT, small_stats),
+                             summarizer.digest_prompt(large, COMBINED_SYSTEM_PROMPT, large_stats))
+        self.assertEqual((small_stats["articles"], small_stats["chunks"], small_stats["llm_calls"]), (2, 1, 1))
+        self.assertEqual((large_stats["articles"], large_stats["chunks"], large_stats["llm_calls"]), (9, 3, 3))
+
+    async def test_changed_article_invalidates_its_chunk(self):
+        posts = [make_post(i, 1 + i % 2, "A", "Research") for i in range(4)]
+        await HierarchicalSummarizer(FakeClient(), self.Session).summarize(posts, COMBINED_SYSTEM_PROMPT, 500)
+        posts[0].content += " Correction: the release slipped a week."
+        client = FakeClient()
+        await HierarchicalSummarizer(client, self.Session).summarize(posts, COMBINED_SYSTEM_PROMPT, 500)
+        self.assertEqual(client.count(CHUNK_SYSTEM_PROMPT), 1)
+
+    async def test_notes_over_budget_are_merged_in_rounds(self):
+        client = FakeClient()
+        client_notes = "- " + "long note about a release " * 60
+
+        async def verbose(prompt, system_prompt=None, max_tokens=2048):
+            client.calls.append((system_prompt, prompt))
+            return client_notes if system_prompt == CHUNK_SYSTEM_PROMPT else "- merged"
+        client.generate_response = verbose
+
+        posts = [make_post(i, 1 + i % 10, "A", "Research") for i in range(10)]
+        summarizer = HierarchicalSummarizer(client, reduce_tokens=1500)
+        await summarizer.summarize(posts, COMBINED_SYSTEM_PROMPT, 500)
+        self.assertGreaterEqual(summarizer.last_stats["merge_rounds"], 1)
+        self.assertGreater(client.count(MERGE_SYSTEM_PROMPT), 1)
+        self.assertEqual(client.count(COMBINED_SYSTEM_PROMPT), 1)
+
+    async def test_failed_chunks_are_skipped(self):
+        client = FakeClient(fail_on="Date: 2026-10-02")
+        posts = [make_post(i, 1 + i % 2, "A", "Research") for i in range(4)]
+        summarizer = HierarchicalSummarizer(client, self.Session)
+        await summarizer.summarize(posts, COMBINED_SYSTEM_PROMPT, 500)
+        self.assertEqual(summarizer.last_stats["failed"], 1)
+        self.assertNotIn("2026-10-02", client.calls[-1][1])
+        with self.Session() as db:
+            self.assertEqual(db.query(SummaryCacheEntry).count(), 1)
+
+        with self.assertRaises(RuntimeError):
+            await HierarchicalSummarizer(FakeClient(fail_on="Theme:")).summarize(posts, COMBINED_SYSTEM_PROMPT, 500)
+
+
+class TestCombinedSummaryRouting(unittest.IsolatedAsyncioTestCase):
+    def service(self, posts):
+        fetch = MagicMock()
+        fetch.fetch_articles = MagicMock(return_value=posts)
+        summarization = MagicMock()
+        summarization.lm_client = FakeClient()
+        summarizer = MagicMock()
+        summarizer.summarize = AsyncMock(return_value="hierarchical")
+        return ArticleBatchSummarizationService(fetch, summarization, MagicMock(), summarizer), summarization.lm_client
+
+    async def test_small_digest_uses_one_prompt(self):
+        service, client = self.service([make_post(1, 1, "A", "Research")])
+        self.assertEqual(await service.summarize_articles_combined(["A"], "2026-10-01", "2026-10-01"), "## Themes\n- digest")
+        service.summarizer.summarize.assert_not_called()
+
+    async def test_long_article_in_a_small_digest_uses_one_prompt(self):
+        # One article runs past the per-article cap, but the digest fits one prompt
+        posts = [make_post(1, 1, "A", "Research"), make_post(2, 1, "A", "Research", sentences=60)]
+        service, client = self.service(posts)
+        self.assertEqual(await service.summarize_articles_combined(["A"], "2026-10-01", "2026-10-01"), "## Themes\n- digest")
+        self.assertEqual(len(client.calls), 1)
+        self.assertIn("Article 2:", client.calls[0][1])
+        service.summarizer.summarize.assert_not_called()
+
+    async def test_oversized_digest_goes_hierarchical(self):
+        posts = [make_post(i, 1, "A", "Research", sentences=60) for i in range(60)]
+        service, client = self.service(posts)
+        self.assertEqual(await service.summarize_articles_combined(["A"], "2026-10-01", "2026-10-07"), "hierarchical")
+        self.assertEqual(client.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
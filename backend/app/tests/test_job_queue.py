@@ -0,0 +1,317 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import timedelta
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.db.models import Base, Job
+from backend.app.services import job_handlers
+from backend.app.services.job_queue import JobQueue, PermanentJobError, RetryLaterError, retry_delay, utcnow
+from backend.app.services.job_worker import JobWorker
+from backend.app.utils.data_versions import DataVersionTracker
+from backend.app.utils.ingest_signal import IngestSignal
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.Session = sessionmaker(bind=engine)
+        tracker = DataVersionTracker(os.path.join(self.tmpdir.name, "versions"))
+        self.signal = IngestSignal(tracker, check_interval=0.05, resource="jobs")
+        self.queue = JobQueue(self.Session, signal=self.signal)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def expire_lease(self, job_id):
+        with self.Session() as db:
+            db.execute(update(Job).where(Job.id == job_id).values(lease_expires_at=utcnow() - timedelta(seconds=1)))
+            db.commit()
+
+    def test_lease_follows_priority_then_age(self):
+        low = self.queue.enqueue("a", {"n": 1}, priority=0)
+        high = self.queue.enqueue("a", {"n": 2}, priority=5)
+        low_later = self.queue.enqueue("a", {"n": 3}, priority=0)
+        order = [self.queue.lease("w").id for _ in range(3)]
+        self.assertEqual(order, [high, low, low_later])
+        self.assertIsNone(self.queue.lease("w"))
+
+    def test_lease_filters_kinds_and_skips_delayed_jobs(self):
+        self.queue.enqueue("scrape", {})
+        self.queue.enqueue("tag", {}, delay=3600)
+        self.assertIsNone(self.queue.lease("w", kinds=["tag"]))
+        job = self.queue.lease("w", kinds=["scrape", "tag"])
+        self.assertEqual(job.kind, "scrape")
+        self.assertEqual(job.attempts, 1)
+
+    def test_dedupe_key_reuses_unfinished_job(self):
+        first = self.queue.enqueue("tag", {}, priority=1, dedupe_key="tag")
+        self.assertEqual(self.queue.enqueue("tag", {}, priority=9, dedupe_key="tag"), first)
+        self.assertEqual(self.queue.get(first)["priority"], 9)
+        job = self.queue.lease("w")
+        self.queue.ack(job, {"ok": True})
+        self.assertNotEqual(self.queue.enqueue("tag", {}, dedupe_key="tag"), first)
+
+    def test_ack_stores_result(self):
+        job_id = self.queue.enqueue("a", {"x": 1})
+        job = self.queue.lease("w")
+        self.assertEqual(job.payload, {"x": 1})
+        self.assertTrue(self.queue.ack(job, {"count": 3}))
+        stored = self.queue.get(job_id)
+        self.assertEqual(stored["status"], "done")
+        self.assertEqual(stored["result"], {"count": 3})
+        self.assertIsNotNone(stored["finished_at"])
+
+    def test_progress_and_timing(self):
+        job_id = self.queue.enqueue("a", {})
+        queued = self.queue.get(job_id)
+        self.assertIsNone(queued["run_seconds"])
+        self.assertGreaterEqual(queued["wait_seconds"], 0)
+        job = self.queue.lease("w")
+        job.progress_callback = lambda progress: self.queue.progress(job, progress)
+        job.report_progress(done=1, total=4)
+        running = self.queue.get(job_id)
+        self.assertEqual(running["progress"], {"done": 1, "total": 4})
+        self.assertGreaterEqual(running["run_seconds"], 0)
+        self.queue.ack(job, "ok")
+        done = self.queue.get(job_id)
+        self.assertEqual(done["progress"], {"done": 1, "total": 4})
+        self.assertIsNotNone(done["run_seconds"])
+        # A lost lease cannot overwrite progress
+        self.assertFalse(self.queue.progress(job, {"done": 2}))
+
+    def test_fail_backs_off_then_dead_letters(self):
+        job_id = self.queue.enqueue("a", {}, max_attempts=2)
+        job = self.queue.lease("w")
+        self.queue.fail(job, "boom")
+        stored = self.queue.get(job_id)
+        self.assertEqual(stored["status"], "queued")
+        self.assertEqual(stored["last_error"], "boom")
+        self.assertIsNone(self.queue.lease("w"))  # backing off
+
+        with self.Session() as db:
+            db.execute(update(Job).where(Job.id == job_id).values(run_at=utcnow()))
+            db.commit()
+        job = self.queue.lease("w")
+        self.assertEqual(job.attempts, 2)
+        self.queue.fail(job, "boom again")
+        self.assertEqual(self.queue.get(job_id)["status"], "dead")
+        self.assertEqual([j["id"] for j in self.queue.list_jobs(status="dead")], [job_id])
+
+        self.assertTrue(self.queue.requeue(job_id))
+        self.assertEqual(self.queue.lease("w").attempts, 1)
+
+    def test_retry_delay_grows_exponentially_with_cap(self):
+        self.assertTrue(22.5 <= retry_delay(1, base=30, cap=3600) <= 37.5)
+        self.assertTrue(90 <= retry_delay(3, base=30, cap=3600) <= 150)
+        self.assertLessEqual(retry_delay(20, base=30, cap=3600), 3600 * 1.25)
+
+    def test_expired_lease_is_taken_over(self):
+        job_id = self.queue.enqueue("a", {})
+        stale = self.queue.lease("crashed")
+        self.assertIsNone(self.queue.lease("other"))
+        self.expire_lease(job_id)
+        job = self.queue.lease("other")
+        self.assertEqual((job.id, job.attempts), (job_id, 2))
+        # The original worker lost its lease and can no longer ack or heartbeat
+        self.assertFalse(self.queue.heartbeat(stale))
+        self.assertFalse(self.queue.ack(stale, "late"))
+        self.assertTrue(self.queue.ack(job, "ok"))
+
+    def test_expired_lease_without_attempts_left_is_dead(self):
+        job_id = self.queue.enqueue("a", {}, max_attempts=1)
+        self.queue.lease("crashed")
+        self.expire_lease(job_id)
+        self.assertIsNone(self.queue.lease("other"))
+        self.assertEqual(self.queue.get(job_id)["status"], "dead")
+
+    def test_heartbeat_extends_lease(self):
+        self.queue.enqueue("a", {})
+        job = self.queue.lease("w", lease_seconds=1)
+        before = job.lease_expires_at
+        self.assertTrue(self.queue.heartbeat(job, lease_seconds=60))
+        self.assertGreater(job.lease_expires_at, before + timedelta(seconds=30))
+
+    def test_stats_and_purge(self):
+        self.queue.enqueue("a", {})
+        self.queue.enqueue("b", {})
+        self.queue.ack(self.queue.lease("w", kinds=["a"]), None)
+        stats = self.queue.stats()
+        self.assertEqual((stats["queued"], stats["done"]), (1, 1))
+        self.assertEqual(stats["by_kind"], {"a": {"done": 1}, "b": {"queued": 1}})
+        self.assertEqual(self.queue.purge(older_than_days=1), 0)
+        self.assertEqual(self.queue.purge(older_than_days=-1), 1)
+
+    def test_enqueue_signals_workers(self):
+        token = self.signal.token()
+        self.queue.enqueue("a", {})
+        self.assertNotEqual(self.signal.token(), token)
+
+    def test_submit_uses_kind_defaults(self):
+        job_id = job_handlers.submit(self.queue, job_handlers.TAG_POSTS)
+        self.assertEqual(job_handlers.submit(self.queue, job_handlers.TAG_POSTS), job_id)
+        self.assertEqual(self.queue.get(job_id)["priority"], job_handlers.DEFAULT_PRIORITIES[job_handlers.TAG_POSTS])
+        with self.assertRaises(ValueError):
+            job_handlers.submit(self.queue, "unknown")
+
+
+class TestConcurrentLeasing(unittest.TestCase):
+    """Workers with their own engines on one database file, as separate processes would be."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.url = f"sqlite:///{os.path.join(self.tmpdir.name, 'jobs.db')}"
+        self.engines = []
+        Base.metadata.create_all(bind=self.engine())
+        self.tracker = DataVersionTracker(os.path.join(self.tmpdir.name, "versions"))
+
+    def tearDown(self):
+        for engine in self.engines:
+            engine.dispose()
+        self.tmpdir.cleanup()
+
+    def engine(self):
+        engine = create_engine(self.url, connect_args={"check_same_thread": False, "timeout": 30})
+        self.engines.append(engine)
+        return engine
+
+    def queue(self):
+        return JobQueue(sessionmaker(bind=self.engine()), signal=IngestSignal(self.tracker, resource="jobs"))
+
+    def test_each_job_is_leased_once(self):
+        producer = self.queue()
+        for i in range(40):
+            producer.enqueue("a", {"n": i})
+        leased = []
+        lock = threading.Lock()
+
+        def work(queue, name):
+            while True:
+                job = queue.lease(name)
+                if job is None:
+                    return
+                with lock:
+                    leased.append(job.payload["n"])
+                queue.ack(job)
+
+        threads = [threading.Thread(target=work, args=(self.queue(), f"w{i}")) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(leased), list(range(40)))
+        self.assertEqual(producer.stats()["done"], 40)
+
+
+class TestJobWorker(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        # A file database: the worker's heartbeat thread needs its own connection
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, 'jobs.db')}",
+                                    connect_args={"check_same_thread": False, "timeout": 30})
+        Base.metadata.create_all(bind=self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.tracker = DataVersionTracker(os.path.join(self.tmpdir.name, "versions"))
+        self.signal = IngestSignal(self.tracker, check_interval=0.05, resource="jobs")
+        self.queue = JobQueue(self.Session, signal=self.signal)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_drain_acks_retries_and_buries(self):
+        def ok(payload, job):
+            return payload["n"] * 2
+
+        def flaky(payload, job):
+            raise RuntimeError("upstream down")
+
+        def invalid(payload, job):
+            raise PermanentJobError("bad payload")
+
+        ok_id = self.queue.enqueue("ok", {"n": 21})
+        flaky_id = self.queue.enqueue("flaky", {})
+        invalid_id = self.queue.enqueue("invalid", {})
+        worker = JobWorker(self.queue, {"ok": ok, "flaky": flaky, "invalid": invalid}, signal=self.signal)
+        self.assertEqual(worker.drain(), 3)
+        self.assertEqual(self.queue.get(ok_id)["result"], 42)
+        self.assertEqual(self.queue.get(flaky_id)["status"], "queued")
+        self.assertEqual(self.queue.get(flaky_id)["last_error"], "RuntimeError: upstream down")
+        self.assertEqual(self.queue.get(invalid_id)["status"], "dead")
+        self.assertEqual(worker.stats, {"done": 1, "retried": 1, "dead": 1, "deferred": 0, "lost": 0})
+
+    def test_handlers_report_progress(self):
+        def counting(payload, job):
+            for n in range(1, 4):
+                job.report_progress(done=n, total=3)
+            return n
+
+        job_id = self.queue.enqueue("count", {})
+        JobWorker(self.queue, {"count": counting}, signal=self.signal).drain()
+        self.assertEqual(self.queue.get(job_id)["progress"], {"done": 3, "total": 3})
+
+    def test_deferred_job_is_requeued_without_using_an_attempt(self):
+        def busy(payload, job):
+            raise RetryLaterError("lock held", delay=60)
+
+        job_id = self.queue.enqueue("busy", {}, max_attempts=1)
+        worker = JobWorker(self.queue, {"busy": busy}, signal=self.signal)
+        worker.drain()
+        job = self.queue.get(job_id)
+        self.assertEqual((job["status"], job["attempts"], job["last_error"]), ("queued", 0, "lock held"))
+        self.assertEqual(worker.stats["deferred"], 1)
+        self.assertIsNone(self.queue.lease("w"))  # not before the delay
+
+    def test_heartbeat_keeps_long_job_leased(self):
+        other = JobQueue(self.Session, signal=self.signal)
+        stolen = []
+
+        def slow(payload, job):
+            deadline = time.monotonic() + 1.0
+            while time.monotonic() < deadline:
+                stolen.append(other.lease("thief"))
+                time.sleep(0.1)
+            return "done"
+
+        job_id = self.queue.enqueue("slow", {})
+        worker = JobWorker(self.queue, {"slow": slow}, lease_seconds=0.3, signal=self.signal)
+        worker.drain()
+        self.assertEqual([job for job in stolen if job is not None], [])
+        self.assertEqual(self.queue.get(job_id)["status"], "done")
+
+    def test_unknown_kind_is_rejected(self):
+        with self.assertRaises(ValueError):
+            JobWorker(self.queue, {"ok": lambda payload, job: None}, kinds=["ok", "missing"])
+
+    def test_run_wakes_on_enqueue_and_watched_signal(self):
+        done = threading.Event()
+        ingest = IngestSignal(self.tracker, check_interval=0.05)
+
+        def handler(payload, job):
+            done.set()
+
+        worker = JobWorker(self.queue, {"tag": handler}, idle_seconds=30, signal=self.signal,
+                           watch=[(ingest, lambda: self.queue.enqueue("tag", {}, dedupe_key="tag"))])
+        thread = threading.Thread(target=worker.run)
+        thread.start()
+        try:
+            time.sleep(0.2)
+            ingest.notify()
+            self.assertTrue(done.wait(5))
+            done.clear()
+            self.queue.enqueue("tag", {"again": True})
+            self.assertTrue(done.wait(5))
+        finally:
+            worker.stop()
+            thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(worker.stats["done"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
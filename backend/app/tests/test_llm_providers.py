@@ -0,0 +1,126 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from backend.app.services.llm_providers import (
+    ProviderConfig, ProviderNotConfigured, ProviderRegistry, TASK_GENERATE, TASK_SUMMARIZATION, TASK_TAGGING,
+)
+
+
+class MockOpenAIServer:
+    """OpenAI-compatible /v1/chat/completions on 127.0.0.1; replies "<name>:<model>"."""
+
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.delay = delay
+        self.requests = []
+        self.connections = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                server.requests.append(body)
+                server.connections.add(self.client_address)
+                time.sleep(server.delay)
+                text = f"{server.name}:{body['model']}"
+                if body.get("stream"):
+                    chunks = [{"id": "c1", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                               "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                              for piece in (server.name, ":", body["model"])]
+                    data = "".join(f"data: {json.dumps(c)}\n\n" for c in chunks) + "data: [DONE]\n\n"
+                    self._send(data.encode("utf-8"), "text/event-stream")
+                else:
+                    data = {"id": "c1", "object": "chat.completion", "created": 0, "model": body["model"],
+                            "choices": [{"index": 0, "finish_reason": "stop",
+                                         "message": {"role": "assistant", "content": text}}]}
+                    self._send(json.dumps(data).encode("utf-8"), "application/json")
+
+            def _send(self, data, content_type):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestProviderRegistry(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.remote = MockOpenAIServer("remote", delay=0.05)
+        self.local = MockOpenAIServer("local", delay=0.05)
+        self.registry = ProviderRegistry(
+            providers={
+                "remote": ProviderConfig("remote", base_url=self.remote.base_url, api_key="k", model="big",
+                                         max_concurrency=3),
+                "local": ProviderConfig("local", base_url=self.local.base_url, model="small",
+                                        max_concurrency=1, requires_key=False),
+            },
+            routes={TASK_TAGGING: "local", TASK_SUMMARIZATION: "remote:medium", TASK_GENERATE: "remote"},
+        )
+
+    async def asyncTearDown(self):
+        await self.registry.aclose()
+        self.remote.stop()
+        self.local.stop()
+
+    async def test_tasks_go_to_their_provider_and_model(self):
+        self.assertEqual(await self.registry.client(TASK_TAGGING).generate_response("hi"), "local:small")
+        self.assertEqual(await self.registry.client(TASK_SUMMARIZATION).generate_summary("text"), "remote:medium")
+        self.assertEqual(await self.registry.client(TASK_GENERATE).generate_response("hi", "sys"), "remote:big")
+        self.assertEqual(len(self.local.requests), 1)
+        self.assertEqual(self.remote.requests[1]["messages"][0], {"role": "system", "content": "sys"})
+        self.assertEqual(self.registry.describe()["routes"],
+                         {TASK_TAGGING: "local:small", TASK_SUMMARIZATION: "remote:medium", TASK_GENERATE: "remote:big"})
+
+    async def test_stream_response(self):
+        client = self.registry.client(TASK_SUMMARIZATION)
+        pieces = [p async for p in client.stream_response("hi")]
+        self.assertEqual(pieces, ["remote", ":", "medium"])
+        self.assertTrue(self.remote.requests[0]["stream"])
+        self.assertEqual(self.registry.providers["remote"].in_flight, 0)
+
+    async def test_concurrency_is_limited_per_provider(self):
+        remote = self.registry.client(TASK_GENERATE)
+        local = self.registry.client(TASK_TAGGING)
+        await asyncio.gather(*[remote.generate_response(f"r{i}") for i in range(8)],
+                             *[local.generate_response(f"l{i}") for i in range(3)])
+        stats = self.registry.describe()["providers"]
+        self.assertEqual((stats["remote"]["calls"], stats["remote"]["peak_in_flight"]), (8, 3))
+        self.assertEqual((stats["local"]["calls"], stats["local"]["peak_in_flight"]), (3, 1))
+
+    async def test_connections_are_reused(self):
+        client = self.registry.client(TASK_TAGGING)
+        for i in range(4):
+            await client.generate_response(f"p{i}")
+        # One keep-alive connection serves every sequential request
+        self.assertEqual(len(self.local.connections), 1)
+        self.assertIs(self.registry.client(TASK_TAGGING), client)
+
+    async def test_unknown_provider_or_missing_key(self):
+        self.registry.routes[TASK_GENERATE] = "nowhere:model"
+        with self.assertRaises(ProviderNotConfigured):
+            self.registry.client(TASK_GENERATE)
+        self.registry.register(ProviderConfig("remote", base_url=self.remote.base_url, api_key=None))
+        with self.assertRaises(ProviderNotConfigured):
+            await self.registry.client(TASK_SUMMARIZATION).generate_response("hi")
+        self.assertEqual(self.remote.requests, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
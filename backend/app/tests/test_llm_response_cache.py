@@ -0,0 +1,151 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from backend.app.services.llm_response_cache import CachedLLMClient, ResponseCache
+
+
+class CountingClient:
+    model = "fake-model"
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+        self.closed = False
+
+    async def generate_response(self, prompt, system_prompt=None, max_tokens=2048):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        if self.fail:
+            raise RuntimeError("model error")
+        return f"answer to {prompt}"
+
+    async def stream_response(self, prompt, system_prompt=None, max_tokens=2048):
+        self.calls += 1
+        for piece in ("answer ", "to ", prompt):
+            await asyncio.sleep(0.01)
+            yield piece
+
+    async def generate_summary(self, text, max_tokens=150):
+        self.calls += 1
+        return f"summary of {text}"
+
+    async def close(self):
+        self.closed = True
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_round_trip_and_ttl(self):
+        cache = ResponseCache(self.dir, ttl=60)
+        self.assertIsNone(cache.get("ab" * 32))
+        cache.set("ab" * 32, "hello", "m")
+        self.assertEqual(cache.get("ab" * 32), "hello")
+        # A second process sees the same entry
+        self.assertEqual(ResponseCache(self.dir, ttl=60).get("ab" * 32), "hello")
+        expired = ResponseCache(self.dir, ttl=0)
+        self.assertIsNone(expired.get("ab" * 32))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_evicts_least_recently_used_over_max_bytes(self):
+        cache = ResponseCache(self.dir, ttl=3600, max_bytes=1500)  # four ~340-byte entries fit
+        keys = [f"{i:02d}" * 32 for i in range(4)]
+        for age, key in enumerate(keys):
+            cache.set(key, "x" * 200)
+            # Spread mtimes so the order is unambiguous
+            past = time.time() - 100 + age
+            os.utime(cache._path(key), (past, past))
+        cache.get(keys[0])  # touched: now the most recent
+        cache.set("ff" * 32, "x" * 200)
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        stats = cache.stats()
+        self.assertLessEqual(stats["bytes"], 1500)
+        self.assertGreaterEqual(stats["evictions"], 1)
+
+
+class TestCachedLLMClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    async def test_repeat_requests_hit_the_cache(self):
+        upstream = CountingClient()
+        client = CachedLLMClient(upstream, ResponseCache(self.dir))
+        first = await client.generate_response("q", "sys", max_tokens=100)
+        second = await client.generate_response("q", "sys", max_tokens=100)
+        await client.generate_response("q", "other system prompt", max_tokens=100)
+        self.assertEqual(first, second)
+        self.assertEqual(upstream.calls, 2)
+        await client.generate_summary("text")
+        await client.generate_summary("text")
+        self.assertEqual(upstream.calls, 3)
+        stats = client.stats()
+        self.assertEqual((stats["hits"], stats["upstream_calls"], stats["entries"]), (2, 3, 3))
+        self.assertEqual(client.model, "fake-model")
+        await client.close()
+        self.assertTrue(upstream.closed)
+
+    async def test_concurrent_identical_requests_are_coalesced(self):
+        upstream = CountingClient()
+        client = CachedLLMClient(upstream, ResponseCache(self.dir))
+        results = await asyncio.gather(*[client.generate_response("q", "sys") for _ in range(5)])
+        self.assertEqual(set(results), {"answer to q"})
+        self.assertEqual(upstream.calls, 1)
+        self.assertEqual(client.coalesced, 4)
+
+    async def test_failures_are_shared_but_not_cached(self):
+        upstream = CountingClient(fail=True)
+        client = CachedLLMClient(upstream, ResponseCache(self.dir))
+        results = await asyncio.gather(client.generate_response("q"), client.generate_response("q"), return_exceptions=True)
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertEqual(upstream.calls, 1)
+        upstream.fail = False
+        self.assertEqual(await client.generate_response("q"), "answer to q")
+
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        upstream = CountingClient()
+        client = CachedLLMClient(upstream, ResponseCache(self.dir))
+        first = asyncio.ensure_future(client.generate_response("q"))
+        second = asyncio.ensure_future(client.generate_response("q"))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        self.assertEqual(await second, "answer to q")
+        self.assertEqual(upstream.calls, 1)
+
+    async def test_concurrent_identical_streams_are_coalesced(self):
+        upstream = CountingClient()
+        client = CachedLLMClient(upstream, ResponseCache(self.dir))
+
+        async def read(stream):
+            return [piece async for piece in stream]
+        first, second, plain = await asyncio.gather(read(client.stream_response("q")), read(client.stream_response("q")),
+                                                    client.generate_response("q"))
+        self.assertEqual(first, ["answer ", "to ", "q"])
+        self.assertEqual((second, plain), (["answer to q"], "answer to q"))
+        self.assertEqual((upstream.calls, client.coalesced), (1, 2))
+        self.assertEqual(client.stats()["in_flight"], 0)
+
+    async def test_waiters_on_an_abandoned_stream_make_their_own_call(self):
+        upstream = CountingClient()
+        client = CachedLLMClient(upstream, ResponseCache(self.dir))
+        stream = client.stream_response("q")
+        self.assertEqual(await stream.__anext__(), "answer ")
+        waiter = asyncio.ensure_future(client.generate_response("q"))
+        await asyncio.sleep(0)
+        await stream.aclose()
+        self.assertEqual(await waiter, "answer to q")
+        self.assertEqual(upstream.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
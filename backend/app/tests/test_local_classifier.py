@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import patch
+from backend.app.db.models import Base, Post, PostArchive
+from backend.app.services import local_classifier
+from backend.app.services.local_classifier import LocalTagClassifier, evaluate, training_samples
+from backend.app.services.retention_service import compress_body
+from backend.app.services.tagging_engine import BatchTaggingEngine
+from backend.app.services.tagging_service import TaggingService
+
+INFRA = ("PyTorch release speeds up GPU kernels and CUDA graphs for training clusters", ["PyTorch", "GPU", "CUDA"], "AI Infrastructure & Tooling")
+VISION = ("New image segmentation model improves object detection on video frames", ["image segmentation", "object detection", "video"], "Computer Vision")
+
+
+def corpus(n=30):
+    samples = []
+    for i in range(n):
+        for text, tags, category in (INFRA, VISION):
+            samples.append((f"{text} variant {i}", tags, category))
+    return samples
+
+
+engine_calls = []
+
+async def fake_tag_batch(self, items):
+    engine_calls.append([post_id for post_id, _ in items])
+    return {post_id: (["LLM"], "AI Research") for post_id, _ in items}
+
+
+class TestLocalTagClassifier(unittest.TestCase):
+    def setUp(self):
+        self.samples = [(text, category, tags) for text, tags, category in corpus()]
+        self.model = LocalTagClassifier().fit(self.samples)
+
+    def test_predicts_category_and_known_tags(self):
+        tags, category, probability = self.model.predict("Faster CUDA kernels land in the next PyTorch release")
+        self.assertEqual(category, "AI Infrastructure & Tooling")
+        self.assertGreater(probability, 0.5)
+        self.assertEqual(set(tags), {"PyTorch", "CUDA"})
+        self.assertIsNone(self.model.confident("A poem about autumn leaves"))
+
+    def test_round_trips_through_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.json")
+            self.model.save(path)
+            loaded = LocalTagClassifier.load(path)
+        text = "object detection for video"
+        tags, category, probability = loaded.predict(text)
+        self.assertEqual((tags, category), self.model.predict(text)[:2])
+        self.assertAlmostEqual(probability, self.model.predict(text)[2], places=4)
+        self.assertIsNone(LocalTagClassifier.load(os.path.join(tmp, "missing.json")))
+
+    def test_evaluate_reports_coverage_and_agreement(self):
+        report = evaluate(self.samples, threshold=0.5, posts_per_call=10)
+        self.assertEqual(report["held_out"], 12)
+        self.assertEqual(report["agreement"], 1.0)
+        self.assertGreater(report["answered_locally"], 0)
+        self.assertEqual(report["llm_calls_saved"], 1 + (report["answered_locally"] - 1) // 10)
+
+
+class TestFastPathTagging(unittest.TestCase):
+    """Confident local predictions skip the LLM; uncertain posts are escalated."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        for i, (text, tags, category) in enumerate(corpus()):
+            post = Post(source="arXiv", platform="RSS", url=f"http://example.com/train/{i}", content=text,
+                        category=category, tag_status="tagged", tagged_by="llm")
+            post.set_tags(tags)
+            self.db.add(post)
+        self.db.commit()
+        engine_calls.clear()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_archived_posts_train_on_their_full_body(self):
+        body = "Archived write-up on CUDA graph capture. " * 20
+        post = Post(source="arXiv", platform="RSS", url="http://example.com/archived", content=body[:280],
+                    category="AI Infrastructure & Tooling", tag_status="tagged", tagged_by="llm",
+                    archived_at=datetime(2026, 1, 1))
+        post.set_tags(["CUDA"])
+        self.db.add(post)
+        self.db.flush()
+        self.db.add(PostArchive(post_id=post.id, content=compress_body(body), original_size=len(body)))
+        self.db.commit()
+        text = training_samples(self.db, limit=1)[0][0]
+        self.assertEqual(text, f"\n{body}")
+
+    @patch.object(BatchTaggingEngine, "tag_batch", new=fake_tag_batch)
+    def test_only_uncertain_posts_reach_llm(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.json")
+            local_classifier.train(self.db, path=path, min_posts=10)
+            self.db.add(Post(source="arXiv", platform="RSS", url="http://example.com/a", content="PyTorch adds CUDA graph capture for GPU training"))
+            self.db.add(Post(source="arXiv", platform="RSS", url="http://example.com/b", content="Thoughts on the weekend"))
+            self.db.commit()
+            service = TaggingService()
+            service.local = LocalTagClassifier.load(path)
+            service.local.threshold = 0.5
+            stats = service.tag_new_posts(self.db, batch_size=10)
+
+        self.assertEqual(stats["local"], 1)
+        self.assertEqual(stats["llm_calls_saved"], 1)
+        self.assertEqual(sum(len(c) for c in engine_calls), 1)
+        fast = self.db.query(Post).filter_by(url="http://example.com/a").one()
+        self.assertEqual((fast.category, fast.tagged_by), ("AI Infrastructure & Tooling", "local"))
+        slow = self.db.query(Post).filter_by(url="http://example.com/b").one()
+        self.assertEqual(slow.tagged_by, "llm")
+        # Local results are never used as training data
+        self.assertEqual(len(training_samples(self.db)), 61)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 from backend.app.main import app
 
@@ -39,18 +40,17 @@ class TestAPIEndpoints(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTrue(isinstance(response.json(), list))
 
-    def test_pipeline_refresh_all(self):
-        """Test the /api/pipeline/refresh-all endpoint returns expected structure."""
+    @patch("backend.app.main.start_job_worker")
+    def test_pipeline_refresh_all(self, start_job_worker):
+        """Test the /api/pipeline/refresh-all endpoint queues scraping and tagging jobs."""
         response = client.post("/api/pipeline/refresh-all")
         self.assertEqual(response.status_code, 200)
         data = response.json()
-        self.assertIn("status", data)
-        self.assertIn("summary", data)
-        summary = data["summary"]
-        self.assertIn("scraping", summary)
-        self.assertIn("tagging", summary)
-        # Accept both success and error status
-        self.assertIn(data["status"], ["success", "error"])
+        self.assertEqual(data["status"], "queued")
+        self.assertEqual(set(data["jobs"]), {"scraping", "tagging"})
+        for kind, job_id in (("scrape_rss_all", data["jobs"]["scraping"]), ("tag_posts", data["jobs"]["tagging"])):
+            self.assertEqual(client.get(f"/api/jobs/{job_id}").json()["data"]["kind"], kind)
+        start_job_worker.assert_called_once()
 
     # Add more endpoint tests as needed, e.g. POST/DELETE, error cases, etc.
 
@@ -0,0 +1,83 @@
+import unittest
+from datetime import datetime
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from backend.app.db.models import Base, Post, PostCounter
+from backend.app.db import counters
+from backend.app.services.post_stats_service import PostStatsService
+
+
+class TestPostCounters(unittest.TestCase):
+    """The post_counters rollups follow inserts, tagging and deletes, and match a full rebuild."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        for i in range(5):
+            self.db.add(Post(
+                source="arXiv" if i < 3 else "OpenAI Blog",
+                platform="RSS",
+                url=f"http://example.com/{i}",
+                content="content",
+                timestamp=datetime(2025, 5, 1 + i % 2, 12, 0, 0),
+            ))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def counter_rows(self):
+        rows = self.db.query(PostCounter.day, PostCounter.source, PostCounter.category, PostCounter.tag_status, PostCounter.count)
+        return {tuple(row[:4]): row[4] for row in rows if row[4]}
+
+    def assert_matches_rebuild(self):
+        incremental = self.counter_rows()
+        counters.rebuild(self.db)
+        self.assertEqual(incremental, self.counter_rows())
+
+    def test_ingest_counts(self):
+        stats = PostStatsService(self.db).summary()
+        self.assertEqual(stats["total"], 5)
+        self.assertEqual(stats["by_source"], {"arXiv": 3, "OpenAI Blog": 2})
+        self.assertEqual(stats["by_tag_status"], {"pending": 5})
+        self.assert_matches_rebuild()
+
+    def test_tagging_moves_buckets(self):
+        post = self.db.query(Post).filter(Post.url == "http://example.com/0").one()
+        post.set_tags(["LLM"])
+        post.category = "AI Research"
+        post.tag_status = "tagged"
+        self.db.commit()
+        stats = PostStatsService(self.db).summary()
+        self.assertEqual(stats["by_tag_status"], {"pending": 4, "tagged": 1})
+        self.assertEqual(stats["by_category"], {"uncategorized": 4, "AI Research": 1})
+        self.assert_matches_rebuild()
+
+    def test_rollback_and_delete(self):
+        post = self.db.query(Post).first()
+        post.tag_status = "error"
+        self.db.flush()
+        self.db.rollback()
+        self.assertEqual(PostStatsService(self.db).summary()["by_tag_status"], {"pending": 5})
+        self.db.delete(self.db.query(Post).first())
+        self.db.commit()
+        self.assertEqual(PostStatsService(self.db).summary()["total"], 4)
+        self.assert_matches_rebuild()
+
+    def test_daily_range(self):
+        stats = PostStatsService(self.db).summary(start_date="2025-05-02", end_date="2025-05-31")
+        self.assertEqual(stats["total"], 2)
+        self.assertEqual(stats["daily"], [{"day": "2025-05-02", "count": 2}])
+        with self.assertRaises(ValueError):
+            PostStatsService(self.db).summary(start_date="May 2")
+
+    def test_ensure_counters_backfills_empty_table(self):
+        self.db.query(PostCounter).delete()
+        self.db.commit()
+        counters.ensure_counters(self.db)
+        self.assertEqual(self.db.query(func.sum(PostCounter.count)).filter(PostCounter.day == counters.TOTAL_DAY).scalar(), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import csv
+import gzip
+import io
+import json
+import unittest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.db.models import Base, Post
+from backend.app.services.post_export_service import export_chunks
+
+class TestPostExportService(unittest.TestCase):
+    """Unit tests for the streaming NDJSON/CSV/JSON export."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        for i in range(5):
+            post = Post(source="arXiv" if i % 2 else "OpenAI Blog", platform="RSS", url=f"http://example.com/{i}",
+                        title=f"Post {i}", content=f"Body, with \"quotes\" {i}", timestamp=datetime(2025, 5, i + 1))
+            post.set_tags(["AI"])
+            self.db.add(post)
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_ndjson_in_small_batches(self):
+        """Each post becomes one NDJSON line, emitted over several chunks."""
+        chunks = list(export_chunks(self.db, fmt="ndjson", batch_size=2))
+        self.assertEqual(len(chunks), 3)
+        rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+        self.assertEqual([r["id"] for r in rows], [1, 2, 3, 4, 5])
+        self.assertEqual(rows[0]["tags"], ["AI"])
+        self.assertEqual(rows[0]["timestamp"], "2025-05-01T00:00:00")
+
+    def test_csv_gzip_with_filter(self):
+        """Gzipped CSV output round-trips and honours filters."""
+        data = gzip.decompress(b"".join(export_chunks(self.db, fmt="csv", gzip=True, batch_size=2, sources=["arXiv"])))
+        rows = list(csv.DictReader(io.StringIO(data.decode("utf-8"))))
+        self.assertEqual([r["title"] for r in rows], ["Post 1", "Post 3"])
+        self.assertEqual(rows[0]["content"], 'Body, with "quotes" 1')
+
+    def test_json_document(self):
+        """JSON format produces the rss_feeds.json document shape."""
+        doc = json.loads(b"".join(export_chunks(self.db, fmt="json", batch_size=2)))
+        self.assertEqual(len(doc["posts"]), 5)
+
+    def test_invalid_format(self):
+        """Unknown formats are rejected before streaming starts."""
+        with self.assertRaises(ValueError):
+            export_chunks(self.db, fmt="xml")
+
+if __name__ == "__main__":
+    unittest.main()
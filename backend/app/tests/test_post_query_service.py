@@ -0,0 +1,117 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from backend.app.db.models import Base, Post, SavedPost
+from backend.app.services.post_query_service import (
+    PostQueryService, InvalidCursorError, encode_cursor, decode_cursor
+)
+
+class TestPostQueryService(unittest.TestCase):
+    """Unit tests for keyset pagination and filtering in PostQueryService.
+    Uses an in-memory SQLite database so ordering and filters run as real SQL.
+    """
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        base = datetime(2025, 5, 1, 12, 0, 0)
+        for i in range(7):
+            post = Post(
+                source="arXiv" if i % 2 else "OpenAI Blog",
+                platform="RSS",
+                url=f"http://example.com/{i}",
+                title=f"Post {i}",
+                content="content",
+                # Posts 2 and 3 share a timestamp to exercise the id tie-breaker
+                timestamp=base + timedelta(days=min(i, 2) if i < 4 else i),
+                category="AI Research" if i < 3 else "Robotics",
+                tag_status="tagged" if i < 5 else "pending",
+            )
+            post.set_tags(["LLM"] if i == 4 else ["AI"])
+            self.db.add(post)
+        self.db.add(Post(source="Substack", platform="Substack", url="http://example.com/undated", content="c"))
+        self.db.commit()
+        self.service = PostQueryService(self.db)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_pages_cover_all_posts_in_order(self):
+        """Walking next_cursor visits every post exactly once, newest first, undated last."""
+        seen = []
+        cursor = None
+        while True:
+            posts, cursor = self.service.list_posts(limit=3, cursor=cursor)
+            seen.extend(posts)
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), 8)
+        self.assertEqual(len({p.id for p in seen}), 8)
+        self.assertIsNone(seen[-1].timestamp)
+        keys = [(p.timestamp, p.id) for p in seen[:-1]]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_filters(self):
+        """Source, category, tag and tag_status filters are applied in SQL."""
+        posts, _ = self.service.list_posts(sources=["arXiv"])
+        self.assertTrue(posts and all(p.source == "arXiv" for p in posts))
+        posts, _ = self.service.list_posts(category="Robotics", tag_status="pending")
+        self.assertEqual({p.title for p in posts}, {"Post 5", "Post 6"})
+        posts, _ = self.service.list_posts(tag="LLM")
+        self.assertEqual([p.title for p in posts], ["Post 4"])
+
+    def test_date_range(self):
+        """start_date and end_date are inclusive whole days."""
+        posts, _ = self.service.list_posts(start_date="2025-05-03", end_date="2025-05-03")
+        self.assertEqual({p.title for p in posts}, {"Post 2", "Post 3"})
+        with self.assertRaises(ValueError):
+            self.service.list_posts(start_date="05/03/2025")
+
+    def test_compact_projection(self):
+        """compact=True leaves content and summary unloaded and computes an excerpt."""
+        self.db.expunge_all()
+        posts, _ = self.service.list_posts(limit=2, compact=True)
+        unloaded = inspect(posts[0]).unloaded
+        self.assertIn("content", unloaded)
+        self.assertIn("summary", unloaded)
+        self.assertNotIn("title", unloaded)
+        self.assertEqual(posts[0].excerpt, "content")
+
+    def test_saved_pages_and_flags(self):
+        """Saved posts page in one joined query, newest save first, with the saved flag on cards."""
+        posts = self.db.query(Post).order_by(Post.id).all()
+        saved_at = datetime(2025, 6, 1, 9, 0, 0)
+        for i, post in enumerate(posts[:5]):
+            self.db.add(SavedPost(post_id=post.id, saved_at=saved_at + timedelta(hours=min(i, 3))))
+        self.db.commit()
+        self.db.expunge_all()
+
+        seen = []
+        cursor = None
+        while True:
+            rows, cursor = self.service.list_saved(limit=2, cursor=cursor)
+            seen.extend(rows)
+            if cursor is None:
+                break
+        self.assertEqual([post.id for _, post in seen], [5, 4, 3, 2, 1])
+        self.assertTrue(all(saved.post_id == post.id and post.is_saved for saved, post in seen))
+        self.assertIn("content", inspect(seen[0][1]).unloaded)
+
+        self.assertEqual(self.service.saved_post_ids(), [1, 2, 3, 4, 5])
+        cards, _ = self.service.list_posts(limit=10, compact=True)
+        self.assertEqual({p.id for p in cards if p.is_saved}, {1, 2, 3, 4, 5})
+        with self.assertRaises(InvalidCursorError):
+            self.service.list_saved(cursor=encode_cursor(None, 3))
+
+    def test_cursor_round_trip(self):
+        """Cursors encode and decode (timestamp, id), and garbage is rejected."""
+        ts = datetime(2025, 5, 1, 12, 0, 0)
+        self.assertEqual(decode_cursor(encode_cursor(ts, 42)), (ts, 42))
+        self.assertEqual(decode_cursor(encode_cursor(None, 7)), (None, 7))
+        with self.assertRaises(InvalidCursorError):
+            decode_cursor("not-a-cursor")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -29,4 +29,13 @@ def test_get_post_not_found():
 #     data = {"title": "Test", "content": "Test content", "url": "http://example.com"}
 #     response = client.post("/api/posts", json=data)
 #     assert response.status_code == 201
-#     assert response.json()["title"] == "Test" 
\ No newline at end of file
+#     assert response.json()["title"] == "Test" 
+def test_get_posts_returns_compact_cards():
+    """Test GET /api/posts list items omit the full body and carry an excerpt."""
+    response = client.get("/api/posts?limit=5")
+    assert response.status_code == 200
+    data = response.json()
+    assert "next_cursor" in data
+    for post in data["data"]:
+        assert "excerpt" in post
+        assert "content" not in post
@@ -0,0 +1,75 @@
+import json
+import unittest
+from types import SimpleNamespace
+from backend.app.services.prompt_builder import (
+    PromptBuilder, count_tokens, select_sentences, split_sentences, truncate_to_tokens,
+)
+from backend.app.services.tagging_engine import build_messages
+from backend.app.services.article_batch_summarization_service import ArticleBatchSummarizationService
+
+ARTICLE = (
+    "OpenAI released a new reasoning model on Monday. "
+    "The weather in the city was mild. "
+    "The reasoning model scores 87% on the benchmark, up from 60%. "
+    "Lunch was served at noon. "
+    "Researchers say the reasoning model generalizes to new tasks."
+)
+
+
+class TestPromptBuilder(unittest.TestCase):
+    def test_truncate_and_select(self):
+        self.assertEqual(len(split_sentences(ARTICLE)), 5)
+        self.assertLessEqual(count_tokens(truncate_to_tokens(ARTICLE, 10)), 10)
+        selected = select_sentences(ARTICLE, 35, title="New reasoning model")
+        self.assertLessEqual(count_tokens(selected), 35)
+        self.assertIn("87%", selected)
+        self.assertNotIn("weather", selected)
+        self.assertTrue(selected.startswith("OpenAI released"))
+
+    def test_short_items_leave_budget_to_long_ones(self):
+        builder = PromptBuilder(total_budget=400, item_budget=300, min_item_tokens=10)
+        builder.add("short text", header="A: ")
+        builder.add("long sentence here. " * 200, header="B: ")
+        prompt, stats = builder.build()
+        self.assertLessEqual(stats.total_tokens, 400)
+        self.assertEqual((stats.items, stats.truncated, stats.dropped), (2, 1, 0))
+        self.assertIn("A: short text", prompt)
+        self.assertGreater(stats.item_tokens[1], 250)
+
+    def test_items_cut_only_to_the_item_cap_are_not_squeezed(self):
+        builder = PromptBuilder(total_budget=2000, item_budget=100, min_item_tokens=10)
+        builder.add("short text", header="A: ")
+        builder.add("long sentence here. " * 200, header="B: ")
+        _, stats = builder.build()
+        self.assertEqual((stats.truncated, stats.squeezed, stats.dropped), (1, 0, 0))
+
+    def test_drops_latest_items_when_budget_runs_out(self):
+        builder = PromptBuilder(total_budget=300, item_budget=200, min_item_tokens=100)
+        for i in range(5):
+            builder.add("word " * 400, header=f"Item {i}: ")
+        prompt, stats = builder.build(system_prompt="Summarize.")
+        self.assertEqual((stats.items, stats.dropped, stats.squeezed), (2, 3, 2))
+        self.assertIn("Item 1:", prompt)
+        self.assertNotIn("Item 2:", prompt)
+        self.assertLessEqual(stats.total_tokens, 300)
+
+    def test_tagging_messages_respect_budgets(self):
+        items = [(i, "token " * 2000) for i in range(10)]
+        messages, stats = build_messages(items, total_budget=3000, item_budget=400)
+        posts = json.loads(messages[1]["content"])
+        self.assertLessEqual(stats.total_tokens, 3000)
+        self.assertEqual(len(posts), stats.items)
+        self.assertTrue(all(count_tokens(p["text"]) <= 400 for p in posts))
+
+    def test_combined_summary_prompt_fits(self):
+        posts = [SimpleNamespace(source="arXiv", url=f"http://example.com/{i}", timestamp="2025-05-01",
+                                 title=f"Paper {i}", author="A", content=ARTICLE * 50) for i in range(40)]
+        prompt, stats = ArticleBatchSummarizationService.build_combined_prompt(posts, total_budget=5000, item_budget=300)
+        self.assertLessEqual(stats.total_tokens, 5000)
+        self.assertGreater(stats.items, 10)
+        self.assertEqual(stats.items + stats.dropped, 40)
+        self.assertIn("Article 1:\nSource: arXiv", prompt)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.db.models import Base, Post, PostArchive, SavedPost, Note
+from backend.app.services.retention_service import RetentionService, STUB_LENGTH
+from backend.app.services.post_query_service import PostQueryService, EXCERPT_LENGTH
+from backend.app.services.post_export_service import PostExportService
+
+NOW = datetime(2025, 6, 30, 12, 0, 0)
+BODY = "Long article body. " * 100
+
+
+class TestRetentionService(unittest.TestCase):
+    """Unit tests for hot/cold tiering of post bodies on an in-memory SQLite database."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        old = NOW - timedelta(days=90)
+        specs = {
+            "old": dict(timestamp=old, tag_status="tagged"),
+            "saved": dict(timestamp=old, tag_status="tagged"),
+            "noted": dict(timestamp=old, tag_status="tagged"),
+            "pending": dict(timestamp=old, tag_status="pending"),
+            "recent": dict(timestamp=NOW - timedelta(days=2), tag_status="tagged"),
+        }
+        self.posts = {}
+        for name, fields in specs.items():
+            post = Post(source="arXiv", platform="RSS", url=f"http://example.com/{name}", content=BODY, **fields)
+            self.db.add(post)
+            self.posts[name] = post
+        self.db.commit()
+        self.db.add(SavedPost(post_id=self.posts["saved"].id))
+        self.db.add(Note(title="Reading list", description="See http://example.com/noted for details"))
+        self.db.commit()
+        self.service = RetentionService(self.db, hot_days=30)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_stub_covers_list_excerpt(self):
+        self.assertGreaterEqual(STUB_LENGTH, EXCERPT_LENGTH)
+
+    def test_archives_only_old_unpinned_tagged_posts(self):
+        dry = self.service.archive(dry_run=True, now=NOW)
+        self.assertEqual(dry["archived"], 1)
+        self.assertEqual(self.db.query(PostArchive).count(), 0)
+
+        stats = self.service.archive(now=NOW)
+        self.assertEqual(stats["archived"], 1)
+        self.assertEqual(stats["pinned"], 2)
+        self.assertLess(stats["bytes_after"], stats["bytes_before"])
+        self.db.expire_all()
+        archived = [name for name, post in self.posts.items() if post.archived_at is not None]
+        self.assertEqual(archived, ["old"])
+        self.assertEqual(self.posts["old"].content, BODY[:STUB_LENGTH])
+        # Second run has nothing left to do
+        self.assertEqual(self.service.archive(now=NOW)["archived"], 0)
+
+    def test_archiving_keeps_updated_at(self):
+        self.db.expire_all()
+        before = self.posts["old"].updated_at
+        self.service.archive(now=NOW)
+        self.db.expire_all()
+        self.assertEqual(self.posts["old"].updated_at, before)
+
+    def test_detail_and_export_read_archived_bodies(self):
+        self.service.archive(now=NOW)
+        self.db.expire_all()
+        post = PostQueryService(self.db).get_post(self.posts["old"].id)
+        self.assertEqual(post.content, BODY)
+        # The full body is not flushed back into the hot row
+        self.db.commit()
+        self.db.expire_all()
+        self.assertEqual(self.posts["old"].content, BODY[:STUB_LENGTH])
+
+        rows = list(PostExportService(self.db).iter_rows(batch_size=2))
+        self.assertEqual({row["content"] for row in rows}, {BODY})
+        self.assertNotIn("archived_at", rows[0])
+
+    def test_pinning_restores_archived_body(self):
+        self.service.archive(now=NOW)
+        old_id = self.posts["old"].id
+        self.db.add(SavedPost(post_id=old_id))
+        self.db.commit()
+        stats = self.service.archive(now=NOW)
+        self.assertEqual(stats["restored"], 1)
+        post = self.db.get(Post, old_id)
+        self.assertIsNone(post.archived_at)
+        self.assertEqual(post.content, BODY)
+        self.assertEqual(self.db.query(PostArchive).count(), 0)
+
+    def test_pin_urls(self):
+        self.service.archive(now=NOW)
+        self.assertEqual(self.service.pin_urls("no links here"), 0)
+        self.assertEqual(self.service.pin_urls("Revisit (http://example.com/old)."), 1)
+        self.assertEqual(self.service.stats()["archived"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,12 @@ def test_get_saved():
     assert response.status_code == 200
     assert isinstance(response.json(), list)
 
+def test_get_saved_ids():
+    """Test GET /api/saved/ids returns the ids of saved posts."""
+    response = client.get("/api/saved/ids")
+    assert response.status_code == 200
+    assert isinstance(response.json()["data"], list)
+
 # def test_save_post():
 #     """Test POST /api/saved saves a post for the user."""
 #     data = {"post_id": 1}
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import os
+import unittest
+from contextlib import aclosing
+from unittest.mock import patch
+import httpx
+from fastapi.testclient import TestClient
+from backend.app import main
+from backend.app.services.lm_studio_client import LMStudioClient
+from backend.app.services.openai_client import OpenAIClient
+from backend.app.utils.sse import sse_response
+
+PIECES = ["Model ", "labs ", "shipped."]
+
+
+def sse_body(pieces):
+    chunks = [{"choices": [{"index": 0, "delta": {"content": p}, "finish_reason": None}]} for p in pieces]
+    lines = [f"data: {json.dumps({'id': 'c1', 'object': 'chat.completion.chunk', 'created': 0, 'model': 'm', **c})}\n\n"
+             for c in chunks]
+    return ("".join(lines) + "data: [DONE]\n\n").encode("utf-8")
+
+
+def mock_transport(requests):
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, content=sse_body(PIECES), headers={"content-type": "text/event-stream"})
+    return httpx.MockTransport(handler)
+
+
+def parse_events(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields.get("event"), json.loads(fields["data"])))
+    return events
+
+
+class TestClientStreaming(unittest.IsolatedAsyncioTestCase):
+    async def test_lm_studio_stream(self):
+        requests = []
+        client = LMStudioClient("http://lmstudio.test/v1")
+        client.client = httpx.AsyncClient(transport=mock_transport(requests))
+        pieces = [p async for p in client.stream_response("hi", "sys", max_tokens=50)]
+        await client.close()
+        self.assertEqual(pieces, PIECES)
+        self.assertTrue(requests[0]["stream"])
+        self.assertEqual(requests[0]["messages"][0], {"role": "system", "content": "sys"})
+
+    async def test_openai_stream(self):
+        from openai import AsyncOpenAI
+        requests = []
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+            client = OpenAIClient()
+        client.client = AsyncOpenAI(api_key="test-key", base_url="http://openai.test/v1",
+                                    http_client=httpx.AsyncClient(transport=mock_transport(requests)))
+        pieces = [p async for p in client.stream_response("hi", max_tokens=50)]
+        self.assertEqual(pieces, PIECES)
+        self.assertTrue(requests[0]["stream"])
+
+
+class FakeStreamingClient:
+    model = "fake"
+
+    def __init__(self):
+        self.closed_early = False
+
+    async def stream_response(self, prompt, system_prompt=None, max_tokens=2048):
+        try:
+            for piece in PIECES:
+                await asyncio.sleep(0)
+                yield piece
+        except GeneratorExit:
+            self.closed_early = True
+            raise
+
+
+class DisconnectingRequest:
+    """Reports a disconnect once the first event has been sent."""
+    url = httpx.URL("http://test/api/lm/generate")
+
+    def __init__(self):
+        self.checks = 0
+
+    async def is_disconnected(self):
+        self.checks += 1
+        return self.checks > 1
+
+
+class TestDisconnect(unittest.IsolatedAsyncioTestCase):
+    async def test_disconnect_closes_the_upstream_stream(self):
+        upstream = FakeStreamingClient()
+
+        async def tokens():
+            async with aclosing(upstream.stream_response("hi")) as pieces:
+                async for text in pieces:
+                    yield "token", {"text": text}
+
+        response = sse_response(DisconnectingRequest(), tokens())
+        sent = [chunk async for chunk in response.body_iterator]
+        self.assertEqual(len(sent), 1)  # no "done" after a disconnect
+        self.assertTrue(upstream.closed_early)
+
+
+class TestStreamingEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(main.app)
+
+    def test_generate_streams_tokens(self):
+        with patch.object(main, "generate_client", FakeStreamingClient()):
+            response = self.client.post("/api/lm/generate", json={"prompt": "hi", "stream": True})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        events = parse_events(response.text)
+        self.assertEqual(events, [("token", {"text": p}) for p in PIECES] + [("done", {})])
+
+    def test_stream_errors_become_error_events(self):
+        response = self.client.post("/api/lm/summarize-articles", json={
+            "sources": ["A"], "start_date": "not-a-date", "end_date": "2026-10-01", "stream": True,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(parse_events(response.text)[-1][0], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app import main
+from backend.app.db.models import Base
+from backend.app.services import job_handlers
+from backend.app.services.job_queue import JobQueue
+from backend.app.utils.data_versions import DataVersionTracker
+from backend.app.utils.ingest_signal import IngestSignal
+
+REQUEST = {"sources": ["Anthropic", "arXiv"], "start_date": "2026-10-01", "end_date": "2026-10-07"}
+
+
+class TestSummarizationJobs(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        signal = IngestSignal(DataVersionTracker(os.path.join(self.tmpdir.name, "versions")), resource="jobs")
+        self.queue = JobQueue(sessionmaker(bind=engine), signal=signal)
+        patches = [patch.object(main, "job_queue", self.queue), patch.object(main, "start_job_worker", lambda: None)]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+        self.client = TestClient(main.app)
+
+    def test_submit_returns_job_at_once_and_dedupes(self):
+        first = self.client.post("/api/lm/summarize-articles/jobs", json=REQUEST)
+        self.assertEqual(first.status_code, 202)
+        job_id = first.json()["job_id"]
+        self.assertEqual(first.json()["data"]["status"], "queued")
+        again = self.client.post("/api/lm/summarize-articles/jobs", json=REQUEST)
+        self.assertEqual(again.json()["job_id"], job_id)
+        combined = self.client.post("/api/lm/summarize-articles/jobs", json={**REQUEST, "combined": True})
+        self.assertNotEqual(combined.json()["job_id"], job_id)
+
+    def test_poll_reports_progress_and_result(self):
+        job_id = self.client.post("/api/lm/summarize-articles/jobs", json=REQUEST).json()["job_id"]
+        job = self.queue.lease("w")
+        self.queue.progress(job, {"done": 2, "failed": 0, "total": 5})
+        running = self.client.get(f"/api/lm/summarize-articles/jobs/{job_id}").json()["data"]
+        self.assertEqual((running["status"], running["progress"]), ("leased", {"done": 2, "failed": 0, "total": 5}))
+        self.queue.ack(job, {"summaries": []})
+        done = self.client.get(f"/api/lm/summarize-articles/jobs/{job_id}").json()["data"]
+        self.assertEqual((done["status"], done["result"]), ("done", {"summaries": []}))
+        self.assertIsNotNone(done["run_seconds"])
+
+    def test_invalid_requests_and_unknown_jobs(self):
+        bad = self.client.post("/api/lm/summarize-articles/jobs", json={**REQUEST, "start_date": "10/01/2026"})
+        self.assertEqual(bad.status_code, 400)
+        self.assertEqual(self.client.post("/api/lm/summarize-articles/jobs", json={**REQUEST, "sources": []}).status_code, 400)
+        self.assertEqual(self.client.get("/api/lm/summarize-articles/jobs/999").status_code, 404)
+        other = job_handlers.submit(self.queue, job_handlers.TAG_POSTS)
+        self.assertEqual(self.client.get(f"/api/lm/summarize-articles/jobs/{other}").status_code, 404)
+
+    def test_sync_endpoint_reports_errors_with_status_codes(self):
+        response = self.client.post("/api/lm/summarize-articles", json={**REQUEST, "start_date": "bad"})
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("trace", response.json())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import patch
+from backend.app.db.models import Base, Post, TaggingCacheEntry
+from backend.app.services.tagging_cache import TaggingCache, normalize_text
+from backend.app.services.tagging_engine import BatchTaggingEngine
+from backend.app.services.tagging_service import TaggingService
+
+engine_calls = []
+
+async def fake_tag_batch(self, items):
+    engine_calls.append([post_id for post_id, _ in items])
+    return {post_id: (["LLM"], "AI Research") for post_id, _ in items}
+
+
+class TestTaggingCache(unittest.TestCase):
+    """The tagging cache answers repeated content without calling the engine."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        engine_calls.clear()
+
+    def tearDown(self):
+        self.db.close()
+
+    def add_posts(self, contents):
+        for i, content in enumerate(contents):
+            self.db.add(Post(source="arXiv", platform="RSS", url=f"http://example.com/{len(engine_calls)}/{content}/{i}", content=content))
+        self.db.commit()
+
+    def test_key_ignores_markup_and_case_but_not_prompt(self):
+        cache = TaggingCache(model="m", prompt_version="v1")
+        self.assertEqual(normalize_text("<p>Hello&nbsp;  World</p>"), "hello world")
+        self.assertEqual(cache.key("<p>Hello World</p>"), cache.key("hello   world"))
+        self.assertNotEqual(cache.key("hello world"), TaggingCache(model="m", prompt_version="v2").key("hello world"))
+        self.assertNotEqual(cache.key("hello world"), TaggingCache(model="m2", prompt_version="v1").key("hello world"))
+
+    @patch.object(BatchTaggingEngine, "tag_batch", new=fake_tag_batch)
+    def test_duplicates_and_reruns_hit_cache(self):
+        self.add_posts(["Same abstract", "<b>same</b> abstract", "Other text"])
+        stats = TaggingService().tag_new_posts(self.db, batch_size=10)
+        self.assertEqual(stats["successful"], 3)
+        self.assertEqual(sum(len(c) for c in engine_calls), 2)
+        self.assertEqual(self.db.query(TaggingCacheEntry).count(), 2)
+
+        self.add_posts(["SAME ABSTRACT"])
+        stats = TaggingService().tag_new_posts(self.db, batch_size=10)
+        self.assertEqual(stats["cache_hits"], 1)
+        self.assertEqual(sum(len(c) for c in engine_calls), 2)
+        self.assertEqual(self.db.query(Post).filter(Post.tag_status == "tagged").count(), 4)
+        self.assertEqual(TaggingCache().stats(self.db)["hits"], 1)
+
+    def test_purge_stale(self):
+        old = TaggingCache(prompt_version="old")
+        old.store(self.db, {old.key("x"): (["A"], "Other")})
+        current = TaggingCache()
+        current.store(self.db, {current.key("x"): (["A"], "Other")})
+        self.db.commit()
+        self.assertEqual(current.stats(self.db)["stale_entries"], 1)
+        self.assertEqual(current.purge_stale(self.db), 1)
+        self.assertEqual(current.stats(self.db)["entries"], 1)
+
+    def test_store_keeps_entries_another_writer_stored(self):
+        cache = TaggingCache()
+        cache.store(self.db, {cache.key("x"): (["A"], "Other")})
+        self.db.commit()
+        # A second worker that tagged the same text before seeing the entry
+        cache.store(self.db, {cache.key("x"): (["B"], "Other"), cache.key("y"): (["C"], "Other")})
+        self.db.commit()
+        self.assertEqual(cache.lookup(self.db, [cache.key("x"), cache.key("y")]),
+                         {cache.key("x"): (["A"], "Other"), cache.key("y"): (["C"], "Other")})
+
+
+if __name__ == "__main__":
+    unittest.main()
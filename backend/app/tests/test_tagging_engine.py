@@ -0,0 +1,97 @@
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from backend.app.services.tagging_engine import (
+    BatchTaggingEngine, TaggingResponseError, parse_results, normalize_category,
+)
+from backend.app.utils.rate_limiter import TokenRateLimiter
+
+
+class FakeCompletions:
+    """Answers batch prompts with one result per post, optionally skipping or failing."""
+
+    def __init__(self, skip_ids=(), fail=False):
+        self.skip_ids = set(skip_ids)
+        self.fail = fail
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, model, messages, **kwargs):
+        posts = json.loads(messages[-1]["content"])
+        self.calls.append([p["id"] for p in posts])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if self.fail:
+            raise RuntimeError("rate limited")
+        # A skipped id is only left out of multi-post batches
+        results = [
+            {"id": p["id"], "tags": ["LLM", p["text"]], "category": "ai research"}
+            for p in posts if not (p["id"] in self.skip_ids and len(posts) > 1)
+        ]
+        content = json.dumps({"results": results})
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(total_tokens=100),
+        )
+
+
+def fake_client(**kwargs):
+    completions = FakeCompletions(**kwargs)
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions)), completions
+
+
+class TestBatchTaggingEngine(unittest.IsolatedAsyncioTestCase):
+    async def test_batches_concurrency_and_chunks(self):
+        client, completions = fake_client()
+        engine = BatchTaggingEngine(client, posts_per_call=10, max_concurrency=2, tokens_per_minute=10**6, commit_every=10)
+        chunks = []
+        items = [(i, f"post {i}") for i in range(25)]
+        await engine.run(items, chunks.append)
+        self.assertEqual(sorted(len(c) for c in completions.calls), [5, 10, 10])
+        self.assertLessEqual(completions.max_in_flight, 2)
+        merged = {k: v for chunk in chunks for k, v in chunk.items()}
+        self.assertEqual(set(merged), set(range(25)))
+        self.assertEqual(merged[3], (["LLM", "post 3"], "AI Research"))
+        self.assertTrue(all(len(c) >= 10 for c in chunks[:-1]))
+
+    async def test_skipped_posts_retried_individually(self):
+        client, completions = fake_client(skip_ids={2})
+        engine = BatchTaggingEngine(client, posts_per_call=5, tokens_per_minute=10**6)
+        results = await engine.tag_batch([(i, "t") for i in range(5)])
+        self.assertEqual(set(results), set(range(5)))
+        self.assertEqual(completions.calls[-1], [2])
+
+    async def test_failed_call_marks_every_post(self):
+        client, _ = fake_client(fail=True)
+        engine = BatchTaggingEngine(client, tokens_per_minute=10**6)
+        results = await engine.tag_batch([(1, "a"), (2, "b")])
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results.values()))
+
+    async def test_rate_limiter_waits_for_refill(self):
+        limiter = TokenRateLimiter(tokens_per_minute=6000)  # 100 tokens per second
+        await limiter.acquire(6000)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await limiter.acquire(5)
+        self.assertGreaterEqual(loop.time() - start, 0.04)
+
+
+class TestParseResults(unittest.TestCase):
+    def test_maps_ids_and_ignores_unknown(self):
+        content = '```json\n{"results": [{"id": "1", "tags": ["A"], "category": "Robotics"}, {"id": 9, "tags": []}]}\n```'
+        self.assertEqual(parse_results(content, [1, 2]), {1: (["A"], "Robotics")})
+        with self.assertRaises(TaggingResponseError):
+            parse_results("not json", [1])
+
+    def test_normalize_category(self):
+        self.assertEqual(normalize_category("computer vision"), "Computer Vision")
+        self.assertEqual(normalize_category("Quantum"), "Other")
+        self.assertEqual(normalize_category(None), "Other")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.db import ingest_events
+from backend.app.db.models import Base, Post
+from backend.app.services.tagging_worker import SingleInstanceLock, TaggingWorker, WorkerLockHeld
+from backend.app.utils.data_versions import DataVersionTracker
+from backend.app.utils.ingest_signal import IngestSignal
+
+
+class FakeTaggingService:
+    def __init__(self):
+        self.calls = []
+
+    def tag_new_posts(self, db, batch_size=3):
+        posts = db.query(Post).filter(Post.tag_status == "pending").limit(batch_size).all()
+        for post in posts:
+            post.tag_status = "tagged"
+        db.commit()
+        self.calls.append(len(posts))
+        return {"total_processed": len(posts), "successful": len(posts), "failed": 0}
+
+
+class TestTaggingWorker(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        # A file database: the test polls from its own thread while the worker runs
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, 'posts.db')}",
+                                    connect_args={"check_same_thread": False, "timeout": 30})
+        Base.metadata.create_all(bind=self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.signal = IngestSignal(DataVersionTracker(os.path.join(self.tmpdir.name, "versions")), check_interval=0.05)
+        self.lock_path = os.path.join(self.tmpdir.name, "worker.lock")
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def add_posts(self, count, prefix):
+        db = self.Session()
+        for i in range(count):
+            db.add(Post(source="arXiv", platform="RSS", url=f"http://example.com/{prefix}/{i}", content="text"))
+        db.commit()
+        db.close()
+
+    def pending(self):
+        db = self.Session()
+        try:
+            return db.query(Post).filter(Post.tag_status == "pending").count()
+        finally:
+            db.close()
+
+    def test_commit_of_new_posts_signals_ingest(self):
+        with patch.object(ingest_events, "ingest_signal", self.signal):
+            token = self.signal.token()
+            self.add_posts(1, "signal")
+            self.assertNotEqual(self.signal.token(), token)
+            token = self.signal.token()
+            db = self.Session()
+            db.query(Post).first().tag_status = "tagged"
+            db.commit()
+            db.close()
+            self.assertEqual(self.signal.token(), token)
+
+    def test_wait_times_out_without_signal(self):
+        started = time.monotonic()
+        self.assertFalse(self.signal.wait(self.signal.token(), timeout=0.1))
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_single_instance(self):
+        with SingleInstanceLock(self.lock_path):
+            with self.assertRaises(WorkerLockHeld):
+                SingleInstanceLock(self.lock_path).acquire()
+        with SingleInstanceLock(self.lock_path):
+            pass
+
+    def test_drains_backlog_then_wakes_on_ingest(self):
+        self.add_posts(25, "backlog")
+        service = FakeTaggingService()
+        worker = TaggingWorker(service, self.Session, signal=self.signal, batch_size=10,
+                               idle_seconds=60, lock=SingleInstanceLock(self.lock_path))
+        thread = threading.Thread(target=worker.run)
+        thread.start()
+        try:
+            deadline = time.monotonic() + 5
+            while self.pending() and time.monotonic() < deadline:
+                time.sleep(0.02)
+            self.assertEqual(self.pending(), 0)
+            self.assertEqual(service.calls[:3], [10, 10, 5])
+
+            self.add_posts(3, "fresh")
+            self.signal.notify()
+            deadline = time.monotonic() + 5
+            while self.pending() and time.monotonic() < deadline:
+                time.sleep(0.02)
+            self.assertEqual(self.pending(), 0)
+            self.assertEqual(worker.stats["tagged"], 28)
+            self.assertGreaterEqual(worker.stats["wakeups"], 1)
+        finally:
+            worker.stop()
+            thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
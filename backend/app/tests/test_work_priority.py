@@ -0,0 +1,82 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.db.models import Base, Post, UserPreferences
+from backend.app.services.work_priority import PriorityPolicy, focus_posts
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class TestPriorityPolicy(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        self.now = utcnow()
+
+    def tearDown(self):
+        self.db.close()
+
+    def add(self, name, source, age_hours, **kwargs):
+        post = Post(source=source, platform="RSS", url=f"http://example.com/{name}", title=name, content="text",
+                    created_at=self.now - timedelta(hours=age_hours), **kwargs)
+        self.db.add(post)
+        self.db.commit()
+        return post
+
+    def pending_order(self, policy):
+        posts = self.db.query(Post).filter(Post.tag_status == "pending").order_by(*policy.order_by()).all()
+        return [p.title for p in posts]
+
+    def test_without_preferences_newest_first(self):
+        self.add("old", "arXiv", 100)
+        self.add("new", "arXiv", 1)
+        self.add("mid", "Blog", 10)
+        self.assertEqual(self.pending_order(PriorityPolicy.load(self.db)), ["new", "mid", "old"])
+
+    def test_preferred_sources_and_weights_outrank_recency(self):
+        self.add("bulk", "arXiv", 1)
+        self.add("starred", "Anthropic", 5)
+        self.add("stale-starred", "Anthropic", 200)
+        self.add("blog", "Blog", 2)
+        prefs = UserPreferences(id=1)
+        prefs.set_sources(["Anthropic"])
+        self.db.add(prefs)
+        self.db.commit()
+        policy = PriorityPolicy.load(self.db, source_weights={"arXiv": -50})
+        self.assertEqual(self.pending_order(policy), ["starred", "stale-starred", "blog", "bulk"])
+
+    def test_focused_posts_jump_the_queue(self):
+        self.add("starred", "Anthropic", 1)
+        viewed = self.add("viewed", "arXiv", 300)
+        self.add("tagged", "arXiv", 1, tag_status="tagged")
+        policy_args = dict(preferred_sources=["Anthropic"], source_weights={})
+        self.assertEqual(self.pending_order(PriorityPolicy(**policy_args)), ["starred", "viewed"])
+
+        self.assertEqual(focus_posts(self.db, [viewed.id, 3]), 1)  # the tagged post is left alone
+        self.assertEqual(self.pending_order(PriorityPolicy(**policy_args)), ["viewed", "starred"])
+        # Focus wears off
+        later = PriorityPolicy(now=utcnow() + timedelta(days=1), **policy_args)
+        self.assertEqual(self.pending_order(later)[0], "starred")
+
+    def test_rank_matches_sql_order(self):
+        for name, source, age in [("a", "arXiv", 1), ("b", "Anthropic", 30), ("c", "Blog", 60), ("d", "Anthropic", 1)]:
+            self.add(name, source, age, category="Research" if name == "c" else None)
+        policy = PriorityPolicy(["Anthropic"], ["Research"], source_weights={"arXiv": -50})
+        posts = self.db.query(Post).all()
+        self.assertEqual([p.title for p in policy.rank(posts)], self.pending_order(policy))
+        self.assertEqual(self.pending_order(policy), ["d", "b", "c", "a"])
+
+    def test_rank_handles_plain_objects(self):
+        policy = PriorityPolicy(["Anthropic"], source_weights={})
+        posts = [SimpleNamespace(id=1, source="arXiv"), SimpleNamespace(id=2, source="Anthropic")]
+        self.assertEqual([p.id for p in policy.rank(posts)], [2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Aho-Corasick multi-pattern matcher: finds every occurrence of any of the
+added patterns in one pass over the text, independent of the pattern count.
+Uses the pyahocorasick C extension when installed, else a pure-Python automaton.
+"""
+from collections import deque
+from typing import Any, Dict, Iterator, List, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # optional accelerator
+    ahocorasick = None
+
+Match = Tuple[int, int, Any]  # (start, end, value), text[start:end] is the pattern
+
+
+class AhoCorasick:
+    def __init__(self, use_native: bool = True):
+        self._patterns: Dict[str, List[Any]] = {}
+        self._native = None
+        self._use_native = use_native and ahocorasick is not None
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def add(self, pattern: str, value: Any):
+        if not pattern:
+            raise ValueError("Empty pattern")
+        self._patterns.setdefault(pattern, []).append(value)
+        self._built = False
+
+    def build(self) -> "AhoCorasick":
+        if self._use_native:
+            self._native = ahocorasick.Automaton()
+            for pattern, values in self._patterns.items():
+                self._native.add_word(pattern, (len(pattern), values))
+            if self._patterns:
+                self._native.make_automaton()
+        else:
+            self._build_python()
+        self._built = True
+        return self
+
+    def _build_python(self):
+        goto, out = [{}], [[]]
+        for pattern, values in self._patterns.items():
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].extend((len(pattern), value) for value in values)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+        self._goto, self._fail, self._out = goto, fail, out
+
+    def iter(self, text: str) -> Iterator[Match]:
+        """All (possibly overlapping) matches, ordered by end position."""
+        if not self._built:
+            self.build()
+        if self._native is not None:
+            if not self._patterns:
+                return
+            for end, (length, values) in self._native.iter(text):
+                for value in values:
+                    yield end + 1 - length, end + 1, value
+            return
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in out[state]:
+                yield i + 1 - length, i + 1, value
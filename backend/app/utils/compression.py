@@ -0,0 +1,113 @@
+import gzip
+from typing import Dict
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+DEFAULT_MINIMUM_SIZE = 1024
+ENCODING_SUFFIXES = ("-br", "-gzip")
+
+
+def strip_encoding_suffix(etag: str) -> str:
+    """Undo the per-encoding ETag suffix added by CompressionMiddleware."""
+    for suffix in ENCODING_SUFFIXES:
+        if etag.endswith(suffix + '"'):
+            return etag[: -len(suffix) - 1] + '"'
+    return etag
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """Content codings in an Accept-Encoding header with their q-values (1.0 when not given)."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Compress complete response bodies with brotli (when installed and accepted)
+    or gzip once they reach minimum_size bytes. Streaming responses (SSE, chunked
+    exports) and already-encoded bodies are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = DEFAULT_MINIMUM_SIZE, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose_encoding(self, scope: Scope):
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        # Highest q-value wins, brotli on a tie; q=0 means "not acceptable"
+        best, best_q = None, 0.0
+        for encoding in (("br",) if brotli is not None else ()) + ("gzip",):
+            q = accepted.get(encoding, accepted.get("*", 0.0))
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    @staticmethod
+    def _suffix_etag(headers: MutableHeaders, encoding: str):
+        # A strong ETag must differ between representations
+        etag = headers.get("etag")
+        if etag and etag.endswith('"') and strip_encoding_suffix(etag) == etag:
+            headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self._choose_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message = {}
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+            if message.get("more_body", False) or len(body) < self.minimum_size or "content-encoding" in headers:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+            compressed = self._compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            self._suffix_etag(headers, encoding)
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import time
+import logging
+from typing import Callable, Iterable, Optional
+from fastapi import HTTPException, Request, Response
+from .compression import strip_encoding_suffix
+
+POSTS = "posts"
+SAVED = "saved"
+PREFERENCES = "preferences"
+RSS_SOURCES = "rss_sources"
+RSS_RUNS = "rss_runs"
+# Bumped when new posts are committed (see utils/ingest_signal.py); not used for ETags
+INGEST = "ingest"
+# Bumped when jobs are enqueued (see services/job_queue.py); not used for ETags
+JOBS = "jobs"
+
+DEFAULT_VERSION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "data_versions")
+
+
+class DataVersionTracker:
+    """
+    Tracks a version token per logical resource (posts, saved, ...).
+    Versions live in small files so that bumps made by the scraper and tagger
+    processes are visible to the API without querying the database.
+    """
+
+    def __init__(self, version_dir: str = DEFAULT_VERSION_DIR):
+        self.version_dir = version_dir
+        os.makedirs(self.version_dir, exist_ok=True)
+
+    def _path(self, resource: str) -> str:
+        return os.path.join(self.version_dir, resource)
+
+    def get_version(self, resource: str) -> str:
+        try:
+            with open(self._path(resource), "r", encoding="utf-8") as f:
+                return f.read().strip() or "0"
+        except FileNotFoundError:
+            return "0"
+
+    def bump(self, *resources: str):
+        """Mark resources as changed; call after the corresponding commit succeeds."""
+        token = f"{time.time_ns()}-{os.getpid()}"
+        for resource in resources:
+            tmp_path = f"{self._path(resource)}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(token)
+                os.replace(tmp_path, self._path(resource))
+            except OSError as e:
+                logging.warning(f"Could not bump data version for {resource}: {e}")
+
+    def etag(self, resources: Iterable[str], variant: str = "") -> str:
+        """
+        Strong ETag for a response built from the given resources.
+        variant distinguishes responses of the same resources (e.g. query strings).
+        """
+        key = "|".join(f"{r}={self.get_version(r)}" for r in resources) + "|" + variant
+        return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+data_versions = DataVersionTracker(os.getenv("DATA_VERSION_DIR", DEFAULT_VERSION_DIR))
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [strip_encoding_suffix(c.strip()) for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def conditional_get(*resources: str, cache_control: str = "private, no-cache", variant: Optional[Callable[[Request], str]] = None):
+    """
+    Build a route dependency that emits ETag/Cache-Control for the given resources
+    and answers 304 before any other dependency (such as get_db) is resolved.
+    Use it in the route decorator: dependencies=[Depends(conditional_get(POSTS))].
+    variant adds request-dependent input to the ETag beyond path and query string
+    (e.g. the current date for "today" views).
+    """
+    def dependency(request: Request, response: Response):
+        key = f"{request.url.path}?{request.url.query}"
+        if variant is not None:
+            key += f"|{variant(request)}"
+        etag = data_versions.etag(resources, variant=key)
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+    return dependency
@@ -0,0 +1,53 @@
+import json
+from datetime import date, datetime
+from typing import Any, Optional
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+def _default(obj):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize JSON-native content (plus datetimes) to compact UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when it is installed.
+    Only for trusted, pre-built dicts and lists: FastAPI's jsonable_encoder and
+    response_model validation are skipped when an endpoint returns this directly.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_json(content: Any, response: Optional[Response] = None, status_code: int = 200) -> FastJSONResponse:
+    """
+    Build a FastJSONResponse, carrying over headers that dependencies set on the
+    injected sub-response (e.g. ETag), which FastAPI drops for returned Responses.
+    """
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
+
+
+def raw_json(body: bytes, response: Optional[Response] = None, status_code: int = 200) -> Response:
+    """Like fast_json, for a body that is already encoded JSON (e.g. from a cache)."""
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+    return Response(body, status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,59 @@
+"""
+Wake-up signal for work that follows ingest (e.g. the tagging worker).
+
+notify() sets an in-process event, so a worker thread in the same process wakes
+at once, and bumps the INGEST data version, so a worker in another process
+(scrapers and the API run separately) sees the change on its next cheap file
+check. The file is checked about once a second and the database is never polled.
+The job queue uses the same mechanism with its own resource (JOBS).
+"""
+import threading
+import time
+from typing import Optional
+from .data_versions import data_versions, INGEST, JOBS, DataVersionTracker
+
+# Seconds between checks of the version file while waiting
+CHECK_INTERVAL = 1.0
+
+
+class IngestSignal:
+    def __init__(self, tracker: DataVersionTracker = data_versions, check_interval: float = CHECK_INTERVAL,
+                 resource: str = INGEST):
+        self.tracker = tracker
+        self.resource = resource
+        self.check_interval = check_interval
+        self._event = threading.Event()
+
+    def token(self) -> str:
+        return self.tracker.get_version(self.resource)
+
+    def notify(self):
+        self.tracker.bump(self.resource)
+        self._event.set()
+
+    def wake(self):
+        """Wake in-process waiters without signalling a change (e.g. to stop them)."""
+        self._event.set()
+
+    def wait(self, since: str, timeout: Optional[float] = None, stop: Optional[threading.Event] = None) -> bool:
+        """
+        Block until a change was signalled after token since, timeout seconds
+        pass, or stop is set. Returns True if woken by a signal.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not (stop is not None and stop.is_set()):
+            if self._event.is_set() or self.token() != since:
+                self._event.clear()
+                return True
+            wait_for = self.check_interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait_for = min(wait_for, remaining)
+            self._event.wait(wait_for)
+        return False
+
+
+ingest_signal = IngestSignal()
+job_signal = IngestSignal(resource=JOBS)
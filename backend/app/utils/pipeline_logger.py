@@ -3,6 +3,7 @@ from typing import Optional, Dict, Any
 from sqlalchemy.orm import Session
 from ..db.models import RssScrapeRun, Post, PipelineFailure
 import logging
+from .data_versions import data_versions, RSS_RUNS
 
 class PipelineLogger:
     def __init__(self, db: Session):
@@ -30,6 +31,7 @@ class PipelineLogger:
             self.db.add(self.current_run)
             logger.info(f"[PipelineLogger] Added RssScrapeRun to session")
             self.db.commit()
+            data_versions.bump(RSS_RUNS)
             logger.info(f"[PipelineLogger] Committed RssScrapeRun to DB")
             self.db.refresh(self.current_run)
             logger.info(f"[PipelineLogger] Refreshed RssScrapeRun from DB: id={self.current_run.id}")
@@ -72,6 +74,7 @@ class PipelineLogger:
         self.current_run.num_sources_skipped = self.stats['skipped_items'] + self.stats['failed_items']
         
         self.db.commit()
+        data_versions.bump(RSS_RUNS)
         self.print_summary()
 
     def print_summary(self):
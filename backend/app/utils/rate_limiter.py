@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+
+class TokenRateLimiter:
+    """
+    Async token bucket for provider tokens-per-minute limits.
+    The bucket refills continuously at tokens_per_minute / 60 per second; callers
+    wait in FIFO order until their estimated token cost fits.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        if tokens_per_minute <= 0:
+            raise ValueError("tokens_per_minute must be positive")
+        self.capacity = tokens_per_minute
+        self.tokens = float(tokens_per_minute)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+
+    async def acquire(self, tokens: int):
+        # A single request larger than the bucket waits for a full bucket
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) * 60 / self.capacity)
+
+    def record(self, estimated: int, actual: int):
+        """Correct the bucket once the real usage of a request is known."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + estimated - actual)
@@ -0,0 +1,44 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Optional, Tuple
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Keep nginx and similar proxies from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_event(data: Any, event: Optional[str] = None) -> str:
+    """One Server-Sent Event; data is sent as JSON."""
+    lines = [f"event: {event}"] if event else []
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _events(request: Request, events: AsyncIterator[Tuple[str, Any]]):
+    try:
+        async for event, data in events:
+            if await request.is_disconnected():
+                logging.info(f"{request.url.path}: client disconnected, stopping")
+                break
+            yield format_event(data, event)
+        else:
+            yield format_event({}, "done")
+    except Exception as e:
+        logging.error(f"{request.url.path} stream failed: {e}")
+        yield format_event({"error": str(e)}, "error")
+    finally:
+        # Closing the source stops the upstream model call; this also runs
+        # when the server cancels the response because the client went away
+        await events.aclose()
+
+
+def sse_response(request: Request, events: AsyncIterator[Tuple[str, Any]]) -> StreamingResponse:
+    """
+    Stream (event, data) pairs as text/event-stream, ending with a "done" event,
+    or an "error" event if the source raises.
+    """
+    return StreamingResponse(_events(request, events), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -6,7 +6,12 @@ class TaggingLogger:
             'total_processed': 0,
             'successful': 0,
             'failed': 0,
-            'skipped': 0
+            'skipped': 0,
+            'cache_hits': 0,
+            'local': 0,
+            'llm_calls_saved': 0,
+            'llm_calls': 0,
+            'prompt_tokens': 0
         }
         self.errors = []
 
@@ -21,12 +26,34 @@ class TaggingLogger:
         elif status == 'skipped':
             self.stats['skipped'] += 1
 
+    def log_cache_hits(self, count: int):
+        """Count posts answered from the tagging cache (also logged as processed)."""
+        self.stats['cache_hits'] += count
+
+    def log_local(self, count: int, calls_saved: int):
+        """Count posts tagged by the local classifier and the LLM calls that avoided."""
+        self.stats['local'] += count
+        self.stats['llm_calls_saved'] += calls_saved
+
+    def log_llm_calls(self, calls: int, prompt_tokens: int):
+        """Count LLM calls made and the prompt tokens sent with them."""
+        self.stats['llm_calls'] += calls
+        self.stats['prompt_tokens'] += prompt_tokens
+
     def print_summary(self):
         print("\n----- Tagging Summary -----")
         print(f"Total Processed: {self.stats['total_processed']}")
         print(f"Successful     : {self.stats['successful']}")
         print(f"Failed         : {self.stats['failed']}")
         print(f"Skipped        : {self.stats['skipped']}")
+        if self.stats['total_processed']:
+            hit_rate = 100 * self.stats['cache_hits'] / self.stats['total_processed']
+            print(f"Cache Hits     : {self.stats['cache_hits']} ({hit_rate:.0f}%)")
+            if self.stats['local']:
+                print(f"Local Model    : {self.stats['local']} (saved ~{self.stats['llm_calls_saved']} LLM calls)")
+        if self.stats['llm_calls']:
+            average = self.stats['prompt_tokens'] // self.stats['llm_calls']
+            print(f"LLM Calls      : {self.stats['llm_calls']} ({self.stats['prompt_tokens']} prompt tokens, ~{average}/call)")
         if self.errors:
             print("Errors:")
             for err in self.errors:
@@ -93,7 +93,7 @@ export function PostCard({
   onSaved?: () => void;
 }) {
   const [saving, setSaving] = useState(false);
-  const [saved, setSaved] = useState(isSaved);
+  const [saved, setSaved] = useState(isSaved ?? post.saved ?? false);
 
   // Convert timestamp to Switzerland time zone
   const zurichTime = React.useMemo(() => {
@@ -122,10 +122,10 @@ export function PostCard({
 
   // Remove images, then sanitize and truncate HTML content
   const safeHtml = React.useMemo(() => {
-    const noImages = removeImages(post.content);
+    const noImages = removeImages(post.excerpt ?? post.content ?? "");
     const truncated = truncateText(noImages, 1200);
     return DOMPurify.sanitize(truncated);
-  }, [post.content]);
+  }, [post.excerpt, post.content]);
 
   const handleSave = async () => {
     setSaving(true);
@@ -1,7 +1,7 @@
 import { useEffect, useState, useRef, useCallback } from "react";
 import { PostCard } from "@/components/PostCard";
 import { useAppStore } from "@/lib/store";
-import { fetchPosts, API_BASE_URL } from "@/lib/api";
+import { fetchPosts, reportFocusedPosts, API_BASE_URL } from "@/lib/api";
 import { Button } from "@/components/ui/button";
 import { AlertCircle, RefreshCw, FilterIcon, ChevronDown, X, RotateCw } from "lucide-react";
 import { Skeleton } from "@/components/ui/skeleton";
@@ -165,7 +165,11 @@ export function PostsFeed({ platformFilter }: { platformFilter?: string } = {})
     setPostError(null);
     
     try {
-      const fetchedPosts = await fetchPosts();
+      // Show the first page as soon as it arrives; later pages are appended as they load
+      const fetchedPosts = await fetchPosts((loaded) => {
+        setPosts(loaded);
+        setIsLoadingPosts(false);
+      });
       setPosts(fetchedPosts); // Store posts as-is from API
       
       // Show success toast if posts were loaded
@@ -215,6 +219,17 @@ export function PostsFeed({ platformFilter }: { platformFilter?: string } = {})
   const totalPages = Math.ceil(filteredPosts.length / POSTS_PER_PAGE);
   const paginatedPosts = filteredPosts.slice((page - 1) * POSTS_PER_PAGE, page * POSTS_PER_PAGE);
 
+  // Untagged posts on the current page are tagged ahead of the backlog
+  const untaggedOnPage = paginatedPosts
+    .filter((post) => post.id !== undefined && post.tag_status !== "tagged")
+    .map((post) => post.id as number)
+    .join(",");
+  useEffect(() => {
+    if (untaggedOnPage) {
+      reportFocusedPosts(untaggedOnPage.split(",").map(Number));
+    }
+  }, [untaggedOnPage]);
+
   // Refresh Feeds handler
   const handleRefreshFeeds = async () => {
     setRefreshing(true);
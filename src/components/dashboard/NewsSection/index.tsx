@@ -1,44 +1,24 @@
-// NewsSection displays the most recent news articles for today, fetched from the API.
+// NewsSection displays the most recent news articles for today, as provided by the dashboard.
 // It allows users to load more articles incrementally.
 
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import { Card } from '@/components/ui/card';
 import { NewsList } from './NewsList';
 import { Post, NewsArticle } from '../types';
 
 /**
  * NewsSection component
- * Fetches and displays today's news articles, with incremental loading.
+ * Displays today's news articles, with incremental loading.
  *
- * Data is fetched from /api/posts and filtered to only include articles from today.
+ * Posts come from /api/dashboard, already limited to today and the user's preferences.
  * Uses NewsList to render the list of articles.
+ * @param posts - Today's posts, newest first
+ * @param loadingNews - Whether the dashboard data is still loading
  */
-export function NewsSection() {
-  // State for all news posts
-  const [news, setNews] = useState<Post[]>([]);
-  // Loading state for news
-  const [loadingNews, setLoadingNews] = useState(true);
+export function NewsSection({ posts, loadingNews }: { posts: Post[]; loadingNews: boolean }) {
   // Number of visible news articles
   const [newsVisibleCount, setNewsVisibleCount] = useState(10);
-
-  useEffect(() => {
-    // Fetch all news posts from the API
-    fetch("/api/posts")
-      .then((res) => res.json())
-      .then((data) => {
-        setNews(data.data || []);
-      })
-      .finally(() => setLoadingNews(false));
-  }, []);
-
-  // Filter news to only include today's articles
-  const todaysNews = news.filter((post) => {
-    const postDate = new Date(post.timestamp);
-    const now = new Date();
-    return postDate.getFullYear() === now.getFullYear() &&
-      postDate.getMonth() === now.getMonth() &&
-      postDate.getDate() === now.getDate();
-  });
+  const todaysNews = posts;
 
   // Map posts to NewsArticle shape for display
   const newsArticles: NewsArticle[] = todaysNews
@@ -46,7 +26,7 @@ export function NewsSection() {
     .map((post) => ({
       id: post.id?.toString() ?? post.url,
       title: post.title || "Untitled",
-      summary: post.summary || post.content?.slice(0, 120) + "...",
+      summary: post.summary || (post.excerpt ?? post.content)?.slice(0, 120) + "...",
       date: new Date(post.timestamp).toLocaleDateString() +
         " " +
         new Date(post.timestamp).toLocaleTimeString([], { hour: "2-digit", minute: "2-digit", hour12: false }),
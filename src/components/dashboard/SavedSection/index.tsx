@@ -1,5 +1,6 @@
 import * as React from 'react';
 import { Card } from '@/components/ui/card';
+import { Button } from '@/components/ui/button';
 import { Badge } from '@/components/ui/badge';
 import { Bookmark } from 'lucide-react';
 import { SavedPost } from '../types';
@@ -30,7 +31,7 @@ function SavedItem({ item }: { item: SavedPost }) {
           </span>
         </div>
         <p className="text-xs text-muted-foreground line-clamp-2 mt-1">
-          {post.summary || post.content?.slice(0, 120) + "..."}
+          {post.summary || (post.excerpt ?? post.content)?.slice(0, 120) + "..."}
         </p>
         <div className="flex items-center gap-2 mt-2 flex-wrap">
           {post.tags && post.tags.length > 0 && post.tags.map((tag) => (
@@ -65,17 +66,21 @@ function SavedList({ items }: { items: SavedPost[] }) {
  * Props for SavedSection
  * @property saved Array of saved posts
  * @property loadingSaved Loading state for saved posts
+ * @property onLoadMore Loads the next page of saved posts; the button is hidden when omitted
+ * @property loadingMore Whether the next page is being loaded
  */
 interface Props {
   saved: SavedPost[];
   loadingSaved: boolean;
+  onLoadMore?: () => void;
+  loadingMore?: boolean;
 }
 
 /**
  * SavedSection component
  * Displays the user's saved posts, or a loading/empty state.
  */
-const SavedSection: React.FC<Props> = ({ saved, loadingSaved }) => {
+const SavedSection: React.FC<Props> = ({ saved, loadingSaved, onLoadMore, loadingMore = false }) => {
   return (
     <>
       {loadingSaved ? (
@@ -85,6 +90,11 @@ const SavedSection: React.FC<Props> = ({ saved, loadingSaved }) => {
       ) : (
         <Card className="p-4">
           <SavedList items={saved} />
+          {onLoadMore && (
+            <Button variant="outline" size="sm" className="mt-2" onClick={onLoadMore} disabled={loadingMore}>
+              {loadingMore ? "Loading..." : "Load more"}
+            </Button>
+          )}
         </Card>
       )}
     </>
@@ -1,5 +1,5 @@
 import * as React from 'react';
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { Card } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogFooter } from '@/components/ui/dialog';
@@ -12,8 +12,72 @@ import { CalendarIcon } from 'lucide-react';
 /**
  * SummarySection component
  * Allows the user to generate a summary of news articles from selected sources and date range.
- * Fetches available sources from /api/rss-sources and sends summary requests to /api/lm/summarize-articles.
+ * Fetches available sources from /api/rss-sources. The summary is streamed from
+ * /api/lm/summarize-articles as Server-Sent Events and shown as it is written; with
+ * "Run in background" it is queued on /api/lm/summarize-articles/jobs and polled instead.
  */
+
+// How often a queued or running summarization job is polled
+const JOB_POLL_INTERVAL_MS = 2000;
+
+/**
+ * Error message from a failed API response: FastAPI errors carry it in "detail".
+ */
+function errorMessage(data: any, fallback: string): string {
+  if (typeof data?.detail === 'string') return data.detail;
+  if (typeof data?.error === 'string') return data.error;
+  return fallback;
+}
+
+/**
+ * Reads a text/event-stream response and calls onEvent for each event.
+ * Resolves on the "done" event and rejects on an "error" event.
+ */
+async function readEvents(response: Response, onEvent: (event: string, data: any) => void): Promise<void> {
+  if (!response.body) {
+    throw new Error('Streaming is not supported by this browser');
+  }
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  try {
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf('\n\n');
+        let event = 'message';
+        let data = '';
+        for (const line of block.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        }
+        const payload = data ? JSON.parse(data) : {};
+        if (event === 'done') return;
+        if (event === 'error') throw new Error(payload.error || 'Summarization failed');
+        onEvent(event, payload);
+      }
+    }
+    throw new Error('The summary stream ended unexpectedly');
+  } finally {
+    reader.cancel().catch(() => {});
+  }
+}
+
+/**
+ * Human-readable progress of a summarization job.
+ */
+function jobProgressText(job: any): string {
+  if (job.status === 'queued') return 'Queued...';
+  const progress = job.progress || {};
+  if (progress.total) return `Summarizing ${progress.done} of ${progress.total} articles...`;
+  if (progress.articles) return `Summarizing ${progress.articles} articles...`;
+  return 'Summarizing...';
+}
 const SummarySection: React.FC = () => {
   // Dialog open state
   const [isDialogOpen, setIsDialogOpen] = useState(false);
@@ -30,6 +94,18 @@ const SummarySection: React.FC = () => {
   const [summary, setSummary] = useState<string | null>(null);
   // Loading state for summary generation
   const [isLoading, setIsLoading] = useState(false);
+  // Progress of the running summarization job
+  const [progressText, setProgressText] = useState<string | null>(null);
+  // Queue the summary as a job instead of streaming it
+  const [runInBackground, setRunInBackground] = useState(false);
+  // Aborts an open summary stream when the section unmounts
+  const streamAbortRef = useRef<AbortController | null>(null);
+  // Stops polling once the section unmounts
+  const mountedRef = useRef(true);
+  useEffect(() => () => {
+    mountedRef.current = false;
+    streamAbortRef.current?.abort();
+  }, []);
 
   useEffect(() => {
     // Fetch available RSS sources for selection
@@ -67,32 +143,104 @@ const SummarySection: React.FC = () => {
     : selectedSources;
 
   /**
-   * Sends a request to generate a summary for the selected sources and date range.
-   * Handles API errors and updates summary state.
+   * Polls a summarization job until it is done or dead.
+   * @param jobId Id returned by /api/lm/summarize-articles/jobs
+   * @returns The combined summary
    */
-  const handleGenerateSummary = async () => {
-    setIsLoading(true);
+  const waitForJob = async (jobId: number): Promise<string> => {
+    while (mountedRef.current) {
+      const response = await fetch(`/api/lm/summarize-articles/jobs/${jobId}`);
+      const data = await response.json();
+      if (!response.ok) {
+        throw new Error(errorMessage(data, `Job status request failed: ${response.status}`));
+      }
+      const job = data.data;
+      if (job.status === 'done') {
+        if (typeof job.result?.summary !== 'string') {
+          throw new Error('Unexpected response format from server');
+        }
+        return job.result.summary;
+      }
+      if (job.status === 'dead') {
+        throw new Error(job.last_error || 'Summarization failed');
+      }
+      setProgressText(jobProgressText(job));
+      await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    }
+    throw new Error('Cancelled');
+  };
+
+  /**
+   * Queues the summary as a job and polls it for the result.
+   */
+  const runSummaryJob = async (body: object) => {
+    setProgressText('Queued...');
+    const response = await fetch('/api/lm/summarize-articles/jobs', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body)
+    });
+    const data = await response.json();
+    if (!response.ok) {
+      throw new Error(errorMessage(data, `Summary request failed: ${response.status}`));
+    }
+    const result = await waitForJob(data.job_id);
+    if (mountedRef.current) {
+      setSummary(result);
+    }
+  };
+
+  /**
+   * Streams the summary, showing the text as the model writes it.
+   * The loading skeleton is replaced by the first token.
+   */
+  const streamSummary = async (body: object) => {
+    setProgressText('Collecting articles...');
+    const controller = new AbortController();
+    streamAbortRef.current = controller;
     try {
       const response = await fetch('/api/lm/summarize-articles', {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          sources: sourcesToSend,
-          start_date: format(dateRange.from, 'yyyy-MM-dd'),
-          end_date: format(dateRange.to, 'yyyy-MM-dd'),
-          combined: true
-        })
+        headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+        body: JSON.stringify({ ...body, stream: true }),
+        signal: controller.signal
       });
-      const data = await response.json();
-      console.log('Summary API Response:', data);
-      if (data.error) {
-        console.error('Summary generation error:', data.error);
-        setSummary(`Error: ${data.error}`);
-      } else if (data.summary) {
-        setSummary(data.summary);
+      if (!response.ok) {
+        const data = await response.json().catch(() => ({}));
+        throw new Error(errorMessage(data, `Summary request failed: ${response.status}`));
+      }
+      let text = '';
+      await readEvents(response, (event, data) => {
+        if (event === 'token' && mountedRef.current) {
+          text += data.text;
+          setSummary(text);
+          setIsLoading(false);
+        }
+      });
+    } finally {
+      streamAbortRef.current = null;
+    }
+  };
+
+  /**
+   * Generates a summary of the selected sources and date range, streamed or as a background job.
+   * Handles API errors and updates summary state.
+   */
+  const handleGenerateSummary = async () => {
+    setIsLoading(true);
+    setSummary(null);
+    setIsDialogOpen(false);
+    const body = {
+      sources: sourcesToSend,
+      start_date: format(dateRange.from, 'yyyy-MM-dd'),
+      end_date: format(dateRange.to, 'yyyy-MM-dd'),
+      combined: true
+    };
+    try {
+      if (runInBackground) {
+        await runSummaryJob(body);
       } else {
-        console.error('Unexpected response format:', data);
-        setSummary('Error: Unexpected response format from server');
+        await streamSummary(body);
       }
     } catch (error) {
       let message = 'Unknown error';
@@ -102,10 +250,14 @@ const SummarySection: React.FC = () => {
         message = error;
       }
       console.error('Summary generation failed:', error);
-      setSummary(`Failed to generate summary: ${message}`);
+      if (mountedRef.current) {
+        setSummary(`Failed to generate summary: ${message}`);
+      }
     } finally {
-      setIsLoading(false);
-      setIsDialogOpen(false);
+      if (mountedRef.current) {
+        setIsLoading(false);
+        setProgressText(null);
+      }
     }
   };
 
@@ -118,6 +270,7 @@ const SummarySection: React.FC = () => {
       </div>
       {isLoading ? (
         <div className="space-y-4">
+          {progressText && <div className="text-sm text-muted-foreground">{progressText}</div>}
           <div className="h-24 bg-muted rounded-md animate-pulse" />
           <div className="space-y-2">
             <div className="h-4 bg-muted rounded-md w-3/4 animate-pulse" />
@@ -200,6 +353,16 @@ const SummarySection: React.FC = () => {
                 </PopoverContent>
               </Popover>
             </div>
+            <div className="flex items-center space-x-2">
+              <Checkbox
+                id="run-in-background"
+                checked={runInBackground}
+                onCheckedChange={checked => setRunInBackground(Boolean(checked))}
+              />
+              <label htmlFor="run-in-background" className="text-sm font-medium">
+                Run in background (for long date ranges)
+              </label>
+            </div>
           </div>
           <DialogFooter>
             <Button variant="outline" onClick={() => setIsDialogOpen(false)}>Cancel</Button>
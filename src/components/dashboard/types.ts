@@ -1,7 +1,8 @@
 export interface Post {
   id: number;
   title: string;
-  content: string;
+  content?: string;
+  excerpt?: string;
   summary?: string;
   tags?: string[];
   timestamp: string;
@@ -10,6 +11,7 @@ export interface Post {
   url: string;
   thumbnail?: string;
   category?: string;
+  saved?: boolean;
 }
 
 export interface SavedPost {
@@ -17,7 +17,8 @@ import { getApiUrl } from '../utils/env';
  * @property platform - The platform type (e.g., Blog, RSS).
  * @property url - The URL to the original post.
  * @property title - The title of the post (optional).
- * @property content - The full content of the post.
+ * @property content - The full content of the post (detail endpoint only).
+ * @property excerpt - Leading slice of the summary or content (list endpoints only).
  * @property summary - A summary of the post (optional).
  * @property timestamp - The publication timestamp (ISO string).
  * @property thumbnail - URL to a thumbnail image (optional).
@@ -27,6 +28,7 @@ import { getApiUrl } from '../utils/env';
  * @property tags - List of tags associated with the post (optional).
  * @property category - Category of the post (optional).
  * @property tag_status - Tagging status: pending, tagged, or error (optional).
+ * @property saved - Whether the post is saved (list endpoints only).
  */
 export interface Post {
   id?: number;
@@ -34,7 +36,8 @@ export interface Post {
   platform: string;
   url: string;
   title?: string;
-  content: string;
+  content?: string;
+  excerpt?: string;
   summary?: string;
   timestamp: string;
   thumbnail?: string;
@@ -44,34 +47,70 @@ export interface Post {
   tags?: string[];
   category?: string;
   tag_status?: string; // Tagging flag: pending, tagged, error
+  saved?: boolean;
 }
 
 export const API_BASE_URL = getApiUrl();
 
+/** Page size used when walking /api/posts (the backend caps it at 200). */
+export const POSTS_PAGE_LIMIT = 200;
+
+/**
+ * One page of posts and the cursor for the next one (null on the last page).
+ */
+export interface PostsPage {
+  posts: Post[];
+  nextCursor: string | null;
+}
+
+/**
+ * Fetches one page of posts, newest first.
+ * @param cursor - next_cursor from the previous page (omit for the first page).
+ * @param limit - Page size.
+ * @returns Promise resolving to the page's posts and the next cursor.
+ */
+export async function fetchPostsPage(cursor?: string | null, limit: number = POSTS_PAGE_LIMIT): Promise<PostsPage> {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) {
+    params.set('cursor', cursor);
+  }
+  const response = await fetch(`${API_BASE_URL}/posts?${params}`);
+  if (!response.ok) {
+    throw new Error(`Failed to fetch posts: ${response.status}`);
+  }
+  const data = await response.json();
+  return { posts: data.data || [], nextCursor: data.next_cursor ?? null };
+}
+
 /**
- * Fetches AI news articles from the API.
+ * Fetches AI news articles from the API, following next_cursor until the last page.
  * Attempts to fetch from the remote API, falls back to localStorage cache, and finally mock data if all else fails.
+ * @param onPage - Called with the posts loaded so far after each page, so the feed can render before the last page arrives.
  * @returns Promise resolving to an array of Post objects.
  */
-export async function fetchPosts(): Promise<Post[]> {
+export async function fetchPosts(onPage?: (posts: Post[]) => void): Promise<Post[]> {
+  const posts: Post[] = [];
   try {
-    // First attempt to fetch from the API
-    const response = await fetch(`${API_BASE_URL}/posts`);
-    
-    if (!response.ok) {
-      throw new Error(`Failed to fetch posts: ${response.status}`);
-    }
-    
-    const data = await response.json();
+    let cursor: string | null = null;
+    do {
+      const page = await fetchPostsPage(cursor);
+      posts.push(...page.posts);
+      cursor = page.nextCursor;
+      onPage?.([...posts]);
+    } while (cursor);
     // Save to localStorage for offline use
     try {
-      localStorage.setItem('cachedPosts', JSON.stringify(data.data));
+      localStorage.setItem('cachedPosts', JSON.stringify(posts));
     } catch (e) {
       // Ignore localStorage errors
     }
-    return data.data;
+    return posts;
   } catch (error) {
     console.error('Error fetching posts:', error);
+    // Keep the pages that did load
+    if (posts.length > 0) {
+      return posts;
+    }
     // Try to load from localStorage before falling back to mock data
     try {
       const cached = localStorage.getItem('cachedPosts');
@@ -150,6 +189,24 @@ export async function fetchPosts(): Promise<Post[]> {
   }
 }
 
+/**
+ * Reports posts the user has on screen, so untagged ones are tagged ahead of the backlog.
+ * Best effort: failures are logged and ignored.
+ * @param postIds - Ids of the visible posts that are not tagged yet.
+ */
+export async function reportFocusedPosts(postIds: number[]): Promise<void> {
+  if (postIds.length === 0) return;
+  try {
+    await fetch(`${API_BASE_URL}/posts/focus`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ post_ids: postIds }),
+    });
+  } catch (error) {
+    console.error('Error reporting focused posts:', error);
+  }
+}
+
 /**
  * Sends a user question to the AI assistant and returns the response.
  * If the API is unavailable, returns a polite offline message.
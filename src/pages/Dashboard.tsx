@@ -3,44 +3,62 @@ import { NewsSection } from '@/components/dashboard/NewsSection/index';
 import SummarySection from '@/components/dashboard/SummarySection';
 import PersonalizedContentSection from '@/components/dashboard/PersonalizedSection/index';
 import SavedSection from '@/components/dashboard/SavedSection';
-import { SavedPost } from '@/components/dashboard/types';
+import { Post, SavedPost } from '@/components/dashboard/types';
+
+// Local calendar date as YYYY-MM-DD, so "today" matches the user's day
+function localDate(): string {
+  const now = new Date();
+  const pad = (n: number) => String(n).padStart(2, "0");
+  return `${now.getFullYear()}-${pad(now.getMonth() + 1)}-${pad(now.getDate())}`;
+}
 
 // Main Dashboard component
 export default function Dashboard() {
-  // Saved posts state
+  // Today's posts, saved posts and preferences all come from one /api/dashboard call
+  const [news, setNews] = useState<Post[]>([]);
   const [saved, setSaved] = useState<SavedPost[]>([]);
-  const [loadingSaved, setLoadingSaved] = useState(true);
-  // News state is now handled in NewsSection
-  // User preferences state
+  // Cursor for the next page of /api/saved (null once every saved post is loaded)
+  const [savedCursor, setSavedCursor] = useState<string | null>(null);
+  const [loadingMoreSaved, setLoadingMoreSaved] = useState(false);
   const [preferredSources, setPreferredSources] = useState<string[]>([]);
   const [preferredTopics, setPreferredTopics] = useState<string[]>([]);
-  const [loadingPrefs, setLoadingPrefs] = useState(true);
-  // const [newsVisibleCount, setNewsVisibleCount] = useState(10);
+  const [loading, setLoading] = useState(true);
+  const loadingSaved = loading;
+  const loadingPrefs = loading;
 
   useEffect(() => {
-    // Fetch saved posts
-    fetch("/api/saved")
-      .then((res) => res.json())
-      .then(setSaved)
-      .finally(() => setLoadingSaved(false));
-    // Fetch user preferences
-    fetch("/api/preferences")
+    fetch(`/api/dashboard?date=${localDate()}`)
       .then((res) => res.json())
-      .then((prefs) => {
-        setPreferredSources(prefs.preferred_sources || []);
-        setPreferredTopics(prefs.preferred_categories || []);
-        console.log('Loaded preferences:', {
-          preferred_sources: prefs.preferred_sources,
-          preferred_categories: prefs.preferred_categories
-        });
+      .then(({ data }) => {
+        setNews(data?.posts || []);
+        setSaved(data?.saved || []);
+        setSavedCursor(data?.saved_next_cursor || null);
+        setPreferredSources(data?.preferences?.preferred_sources || []);
+        setPreferredTopics(data?.preferences?.preferred_categories || []);
       })
-      .finally(() => setLoadingPrefs(false));
+      .catch(() => {})
+      .finally(() => setLoading(false));
   }, []);
 
+  const loadMoreSaved = async () => {
+    if (!savedCursor) return;
+    setLoadingMoreSaved(true);
+    try {
+      const res = await fetch(`/api/saved?cursor=${encodeURIComponent(savedCursor)}`);
+      const page: SavedPost[] = await res.json();
+      setSaved((prev) => [...prev, ...page]);
+      setSavedCursor(res.headers.get("X-Next-Cursor"));
+    } catch {
+      // Keep what is already shown
+    } finally {
+      setLoadingMoreSaved(false);
+    }
+  };
+
   return (
     <div className="container mx-auto py-6 space-y-8">
       {/* News Section (moved to top) */}
-      <NewsSection />
+      <NewsSection posts={news} loadingNews={loading} />
 
       {/* Personalized Content Section */}
       <section>
@@ -65,7 +83,12 @@ export default function Dashboard() {
         <div className="flex items-center justify-between mb-4">
           <h2 className="text-xl font-bold text-foreground">Saved Content</h2>
         </div>
-        <SavedSection saved={saved} loadingSaved={loadingSaved} />
+        <SavedSection
+          saved={saved}
+          loadingSaved={loadingSaved}
+          onLoadMore={savedCursor ? loadMoreSaved : undefined}
+          loadingMore={loadingMoreSaved}
+        />
       </section>
 
       {/* Summary Section */}
@@ -4,7 +4,8 @@ import { useEffect, useState } from "react";
 type Post = {
   id: number;
   title: string;
-  content: string;
+  excerpt?: string;
+  content?: string;
   // ...other fields as needed
 };
 
@@ -19,14 +20,32 @@ export default function SavedContent() {
   const [saved, setSaved] = useState<SavedPost[]>([]);
   const [loading, setLoading] = useState(true);
   const [deleting, setDeleting] = useState<number | null>(null);
+  // /api/saved is paged; the next page's cursor comes in the X-Next-Cursor header
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const loadPage = async (cursor?: string | null) => {
+    const res = await fetch(cursor ? `/api/saved?cursor=${encodeURIComponent(cursor)}` : "/api/saved");
+    const page: SavedPost[] = await res.json();
+    setSaved((prev) => (cursor ? [...prev, ...page] : page));
+    setNextCursor(res.headers.get("X-Next-Cursor"));
+  };
 
   useEffect(() => {
-    fetch("/api/saved")
-      .then((res) => res.json())
-      .then(setSaved)
+    loadPage()
+      .catch(() => {})
       .finally(() => setLoading(false));
   }, []);
 
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    try {
+      await loadPage(nextCursor);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleDelete = async (post_id: number) => {
     setDeleting(post_id);
     await fetch(`/api/saved/${post_id}`, { method: "DELETE" });
@@ -47,7 +66,7 @@ export default function SavedContent() {
           {saved.map((item) => (
             <div key={item.id} className="border p-4 rounded bg-white shadow relative">
               <h2 className="text-xl font-semibold">{item.post.title}</h2>
-              <p className="text-gray-700">{item.post.content}</p>
+              <p className="text-gray-700">{item.post.excerpt ?? item.post.content}</p>
               <button
                 className="absolute top-2 right-2 text-red-500 hover:text-red-700"
                 onClick={() => handleDelete(item.post_id)}
@@ -66,6 +85,15 @@ export default function SavedContent() {
           ))}
         </div>
       )}
+      {nextCursor && (
+        <button
+          className="mt-4 px-4 py-2 border rounded bg-white shadow hover:bg-gray-50"
+          onClick={handleLoadMore}
+          disabled={loadingMore}
+        >
+          {loadingMore ? "Loading..." : "Load more"}
+        </button>
+      )}
     </div>
   );
 }